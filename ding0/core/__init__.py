@@ -23,8 +23,12 @@ from ding0.core.network.stations import *
 from ding0.core.structure.regions import *
 from ding0.core.powerflow import *
 from ding0.tools import pypsa_io
+from ding0.tools.geo import geoms_from_wkt
+from ding0.tools.profiling import ProfilerDing0
+from ding0.tools.checkpoint import CheckpointDing0
 from ding0.tools.animation import AnimationDing0
-from ding0.tools.plots import plot_mv_topology
+from ding0.tools.plots import plot_mv_topology, mv_topology_geometry
+from ding0.grid.lv_grid.lv_parallel import process_lv_grid_districts
 from ding0.flexopt.reinforce_grid import *
 
 import os
@@ -51,6 +55,52 @@ logger = logging.getLogger('ding0')
 package_path = ding0.__path__[0]
 
 
+def geom_as_text(session, geom, srid):
+    """
+    Returns SQL expression that selects geometry `geom` as WKT in `srid`
+
+    On PostgreSQL (PostGIS) geometries are transformed to `srid` and
+    converted to WKT in the database. Other database engines (e.g. SQLite
+    used in tests) are expected to store geometries as WKT in `srid`
+    already, the column is selected as it is.
+
+    Parameters
+    ----------
+    session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+        Database session
+    geom : :sqlalchemy:`SQLAlchemy column<core/metadata.html>`
+        Geometry column
+    srid : :obj:`str`
+        SRID of selected geometry
+
+    Returns
+    -------
+    :sqlalchemy:`SQLAlchemy column expression<core/sqlelement.html>`
+    """
+    if session.bind.dialect.name == 'postgresql':
+        return func.ST_AsText(func.ST_Transform(geom, srid))
+    return geom
+
+
+def partition_frame(df, column):
+    """
+    Partitions DataFrame by values of `column`
+
+    Parameters
+    ----------
+    df : :pandas:`pandas.DataFrame<dataframe>`
+        DataFrame to partition
+    column : :obj:`str`
+        Column to partition by
+
+    Returns
+    -------
+    :obj:`dict`
+        Partitions of `df` (row order is kept) keyed by value of `column`
+    """
+    return {key: group for key, group in df.groupby(column, sort=False)}
+
+
 class NetworkDing0:
     """
     Defines the DING0 Network - not a real grid but a container for the
@@ -74,6 +124,12 @@ class NetworkDing0:
         Ding0. This is usually the date and the time in some compressed
         format. e.g. 201901010900.
 
+    orm : :obj:`dict`
+        ORM mapping of input tables. If not set, it is imported by
+        :meth:`~.core.NetworkDing0.import_orm` according to config. Set it
+        to run ding0 on another database, e.g. an offline snapshot (see
+        :func:`~.ding0.tools.snapshot.open_snapshot`).
+
 
     Attributes
     ----------
@@ -132,7 +188,26 @@ class NetworkDing0:
         self._config = self.import_config()
         self._pf_config = self.import_pf_config()
         self._static_data = self.import_static_data()
-        self._orm = self.import_orm()
+        self._orm = kwargs.get('orm', None)
+        self._metrics = None
+        if self._orm is None:
+            self._orm = self.import_orm()
+
+    def __getstate__(self):
+        """Returns state for pickling
+
+        The ORM mapping (classes bound to the database) is not pickled.
+        """
+        state = self.__dict__.copy()
+        state['_orm'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restores pickled state (also of pickles without ORM mapping and
+        metrics)"""
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_orm', None)
+        self.__dict__.setdefault('_metrics', None)
 
     def mv_grid_districts(self):
         """
@@ -202,7 +277,23 @@ class NetworkDing0:
         """
         return self._orm
 
-    def run_ding0(self, session, mv_grid_districts_no=None, debug=False, export_figures=False):
+    @property
+    def metrics(self):
+        """
+        Getter for metrics of last profiled run (see :meth:`run_ding0`).
+
+        Returns
+        -------
+        :obj: `dict`
+            Metrics record (see
+            :meth:`~.ding0.tools.profiling.ProfilerDing0.record`) or None if
+            no profiled run was performed
+        """
+        return self._metrics
+
+    def run_ding0(self, session, mv_grid_districts_no=None, debug=False, export_figures=False,
+                  lazy_lv_grids=False, profile=False, checkpoint_path=None,
+                  checkpoint_steps=None, resume=False):
         """
         Let DING0 run by shouting at this method (or just call
         it from NetworkDing0 instance). This method is a wrapper
@@ -219,6 +310,27 @@ class NetworkDing0:
             If True, information is printed during process
         export_figures : :obj:`bool`, defaults to False
             If True, figures are shown or exported (default path: ~/.ding0/) during run.
+        lazy_lv_grids : :obj:`bool`, defaults to False
+            If True, LV grids are built lazily (only stations and
+            transformers) which is sufficient for MV studies. Remaining LV
+            steps are performed on first access of a LV grid, e.g. at export.
+        profile : :obj:`bool`, defaults to False
+            If True, metrics (wall time, CPU time, peak RSS, count of nodes,
+            branches and power flow calculations) are recorded per step and
+            MV grid district, see :attr:`metrics`.
+        checkpoint_path : :obj:`str`
+            If set, the state of the run is saved after the steps
+            `checkpoint_steps` to a directory keyed by run_id and MV grid
+            districts within `checkpoint_path` (see
+            :class:`~.ding0.tools.checkpoint.CheckpointDing0`). If run_id is
+            not set, it is set to the current date.
+        checkpoint_steps : :obj:`list` of :obj:`int`
+            Steps after which a checkpoint is saved. If None, steps are taken
+            from config (section `checkpoint`, key `steps`).
+        resume : :obj:`bool`, defaults to False
+            If True, the latest checkpoint of the run (same run_id, MV grid
+            districts and `checkpoint_path`) is loaded and completed steps are
+            skipped. Requires the run_id and `checkpoint_path` to be set.
 
         Returns
         -------
@@ -254,7 +366,9 @@ class NetworkDing0:
         * STEP 5: Build LV grids
 
             Builds LV grids for every non-aggregated LA in every MV Grid District
-            using model grids.
+            using model grids. If `lazy_lv_grids` is set, only transformers are
+            added to LV stations and this step as well as the LV part of
+            steps 7, 8 and 12 are postponed until a LV grid is accessed.
 
         * STEP 6: Build MV grids
 
@@ -299,67 +413,142 @@ class NetworkDing0:
         if debug:
             start = time.time()
 
+        profiler = ProfilerDing0(self, enabled=profile)
+
+        # restore state of checkpointed run, steps completed are skipped
+        msg = None
+        completed_step = 0
+        checkpoint = None
+        if resume and checkpoint_path is None:
+            raise ValueError('Resuming a run requires the checkpoint_path of '
+                             'the checkpointed run.')
+        if checkpoint_path is not None:
+            if not self._run_id:
+                if resume:
+                    raise ValueError('Resuming a run requires the run_id of '
+                                     'the checkpointed run.')
+                self._run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+            checkpoint = CheckpointDing0(self, checkpoint_path,
+                                         mv_grid_districts_no,
+                                         steps=checkpoint_steps)
+            if resume:
+                completed_step, msg = checkpoint.load()
+
+        def save_checkpoint(step):
+            if checkpoint is not None:
+                checkpoint.save(step, msg)
+
         # STEP 1: Import MV Grid Districts and subjacent objects
-        self.import_mv_grid_districts(session,
-                                      mv_grid_districts_no=mv_grid_districts_no)
+        if completed_step < 1:
+            with profiler.step(1, 'import_mv_grid_districts'):
+                self.import_mv_grid_districts(session,
+                                              mv_grid_districts_no=mv_grid_districts_no)
+            save_checkpoint(1)
 
         # STEP 2: Import generators
-        self.import_generators(session, debug=debug)
+        if completed_step < 2:
+            with profiler.step(2, 'import_generators'):
+                self.import_generators(session, debug=debug)
+            save_checkpoint(2)
 
         # STEP 3: Parametrize MV grid
-        self.mv_parametrize_grid(debug=debug)
+        if completed_step < 3:
+            with profiler.step(3, 'mv_parametrize_grid'):
+                self.mv_parametrize_grid(debug=debug)
+            save_checkpoint(3)
 
         # STEP 4: Validate MV Grid Districts
-        msg = self.validate_grid_districts()
+        if completed_step < 4:
+            with profiler.step(4, 'validate_grid_districts'):
+                msg = self.validate_grid_districts()
+            save_checkpoint(4)
 
         # STEP 5: Build LV grids
-        self.build_lv_grids()
+        if completed_step < 5:
+            with profiler.step(5, 'build_lv_grids'):
+                self.build_lv_grids(lazy=lazy_lv_grids)
+            save_checkpoint(5)
 
-        # STEP 6: Build MV grids
-        self.mv_routing(debug=False)
         if export_figures:
             grid = self._mv_grid_districts[0].mv_grid
-            plot_mv_topology(grid, subtitle='Routing completed', filename='1_routing_completed.png')
+
+        # STEP 6: Build MV grids
+        if completed_step < 6:
+            with profiler.step(6, 'mv_routing'):
+                self.mv_routing(debug=False)
+            if export_figures:
+                plot_mv_topology(grid, subtitle='Routing completed', filename='1_routing_completed.png')
+            save_checkpoint(6)
 
         # STEP 7: Connect MV and LV generators
-        self.connect_generators(debug=False)
-        if export_figures:
-            plot_mv_topology(grid, subtitle='Generators connected', filename='2_generators_connected.png')
+        if completed_step < 7:
+            with profiler.step(7, 'connect_generators'):
+                self.connect_generators(debug=False)
+            if export_figures:
+                plot_mv_topology(grid, subtitle='Generators connected', filename='2_generators_connected.png')
+            save_checkpoint(7)
 
         # STEP 8: Set IDs for all branches in MV and LV grids
-        self.set_branch_ids()
+        if completed_step < 8:
+            with profiler.step(8, 'set_branch_ids'):
+                self.set_branch_ids()
+            save_checkpoint(8)
 
         # STEP 9: Relocate switch disconnectors in MV grid
-        self.set_circuit_breakers(debug=debug)
-        if export_figures:
-            plot_mv_topology(grid, subtitle='Circuit breakers relocated', filename='3_circuit_breakers_relocated.png')
+        if completed_step < 9:
+            with profiler.step(9, 'set_circuit_breakers'):
+                self.set_circuit_breakers(debug=debug)
+            if export_figures:
+                plot_mv_topology(grid, subtitle='Circuit breakers relocated', filename='3_circuit_breakers_relocated.png')
+            save_checkpoint(9)
 
         # STEP 10: Open all switch disconnectors in MV grid
-        self.control_circuit_breakers(mode='open')
+        if completed_step < 10:
+            with profiler.step(10, 'open_circuit_breakers'):
+                self.control_circuit_breakers(mode='open')
+            save_checkpoint(10)
 
         # STEP 11: Do power flow analysis of MV grid
-        self.run_powerflow(session, method='onthefly', export_pypsa=False, debug=debug)
-        if export_figures:
-            plot_mv_topology(grid, subtitle='PF result (load case)',
-                             filename='4_PF_result_load.png',
-                             line_color='loading', node_color='voltage', testcase='load')
-            plot_mv_topology(grid, subtitle='PF result (feedin case)',
-                             filename='5_PF_result_feedin.png',
-                             line_color='loading', node_color='voltage', testcase='feedin')
+        if completed_step < 11:
+            with profiler.step(11, 'run_powerflow'):
+                self.run_powerflow(session, method='onthefly', export_pypsa=False, debug=debug)
+            if export_figures:
+                geometry = mv_topology_geometry(grid)
+                plot_mv_topology(grid, subtitle='PF result (load case)',
+                                 filename='4_PF_result_load.png',
+                                 line_color='loading', node_color='voltage', testcase='load',
+                                 geometry=geometry)
+                plot_mv_topology(grid, subtitle='PF result (feedin case)',
+                                 filename='5_PF_result_feedin.png',
+                                 line_color='loading', node_color='voltage', testcase='feedin',
+                                 geometry=geometry)
+            save_checkpoint(11)
 
         # STEP 12: Reinforce MV grid
-        self.reinforce_grid()
+        if completed_step < 12:
+            with profiler.step(12, 'reinforce_grid'):
+                self.reinforce_grid()
+            save_checkpoint(12)
 
         # STEP 13: Close all switch disconnectors in MV grid
-        self.control_circuit_breakers(mode='close')
+        if completed_step < 13:
+            with profiler.step(13, 'close_circuit_breakers'):
+                self.control_circuit_breakers(mode='close')
+            save_checkpoint(13)
 
         if export_figures:
+            geometry = mv_topology_geometry(grid)
             plot_mv_topology(grid, subtitle='Final grid PF result (load case)',
                              filename='6_final_grid_PF_result_load.png',
-                             line_color='loading', node_color='voltage', testcase='load')
+                             line_color='loading', node_color='voltage', testcase='load',
+                             geometry=geometry)
             plot_mv_topology(grid, subtitle='Final grid PF result (feedin case)',
                              filename='7_final_grid_PF_result_feedin.png',
-                             line_color='loading', node_color='voltage', testcase='feedin')
+                             line_color='loading', node_color='voltage', testcase='feedin',
+                             geometry=geometry)
+
+        if profile:
+            self._metrics = profiler.record()
 
         if debug:
             logger.info('Elapsed time for {0} MV Grid Districts (seconds): {1}'.format(
@@ -502,68 +691,71 @@ class NetworkDing0:
             # raise ValueError(
             #     'Load Area {} has no LVGD - please re-open #155'.format(
             #         repr(lv_load_area)))
-            geom = wkt_dumps(lv_load_area.geo_area)
-
-            lv_grid_districts = \
-                lv_grid_districts.append(
-                    pd.DataFrame(
-                        {'la_id': [lv_load_area.id_db],
-                         'geom': [geom],
-                         'population': [0],
-
-                         'peak_load_residential': [lv_load_area.peak_load_residential],
-                         'peak_load_retail': [lv_load_area.peak_load_retail],
-                         'peak_load_industrial': [lv_load_area.peak_load_industrial],
-                         'peak_load_agricultural': [lv_load_area.peak_load_agricultural],
-
-                         'sector_count_residential': [0],
-                         'sector_count_retail': [0],
-                         'sector_count_industrial': [0],
-                         'sector_count_agricultural': [0],
-
-                         'sector_consumption_residential': [0],
-                         'sector_consumption_retail': [0],
-                         'sector_consumption_industrial': [0],
-                         'sector_consumption_agricultural': [0]
-                         },
-                        index=[lv_load_area.id_db]
-                    )
-                )
+            lv_grid_districts = pd.DataFrame(
+                {'la_id': [lv_load_area.id_db],
+                 'geom': [lv_load_area.geo_area],
+                 'population': [0],
+
+                 'peak_load_residential': [lv_load_area.peak_load_residential],
+                 'peak_load_retail': [lv_load_area.peak_load_retail],
+                 'peak_load_industrial': [lv_load_area.peak_load_industrial],
+                 'peak_load_agricultural': [lv_load_area.peak_load_agricultural],
+
+                 'sector_count_residential': [0],
+                 'sector_count_retail': [0],
+                 'sector_count_industrial': [0],
+                 'sector_count_agricultural': [0],
+
+                 'sector_consumption_residential': [0],
+                 'sector_consumption_retail': [0],
+                 'sector_consumption_industrial': [0],
+                 'sector_consumption_agricultural': [0]
+                 },
+                index=[lv_load_area.id_db]
+            )
 
         lv_nominal_voltage = cfg_ding0.get('assumptions', 'lv_nominal_voltage')
 
+        # parse geometries at once (passed through if parsed already) and
+        # map LV stations' geometries to their ids
+        lv_grid_districts = lv_grid_districts.assign(
+            geom=geoms_from_wkt(lv_grid_districts['geom']))
+        if len(lv_stations) > 0:
+            lv_stations_geo_data = dict(zip(
+                lv_stations.index, geoms_from_wkt(lv_stations['geom'])))
+        else:
+            lv_stations_geo_data = {}
+
         # Associate lv_grid_district to load_area
-        for id, row in lv_grid_districts.iterrows():
+        for row in lv_grid_districts.itertuples():
+            id = row.Index
             lv_grid_district = LVGridDistrictDing0(
                 id_db=id,
                 lv_load_area=lv_load_area,
-                geo_data=wkt_loads(row['geom']),
-                population=0 if isnan(row['population']) else int(row['population']),
-                peak_load_residential=row['peak_load_residential'],
-                peak_load_retail=row['peak_load_retail'],
-                peak_load_industrial=row['peak_load_industrial'],
-                peak_load_agricultural=row['peak_load_agricultural'],
-                peak_load=(row['peak_load_residential'] +
-                               row['peak_load_retail'] +
-                               row['peak_load_industrial'] +
-                               row['peak_load_agricultural']),
-                sector_count_residential=int(row['sector_count_residential']),
-                sector_count_retail=int(row['sector_count_retail']),
-                sector_count_industrial=int(row['sector_count_industrial']),
-                sector_count_agricultural=int(row['sector_count_agricultural']),
-                sector_consumption_residential=row[
-                    'sector_consumption_residential'],
-                sector_consumption_retail=row['sector_consumption_retail'],
-                sector_consumption_industrial=row[
-                    'sector_consumption_industrial'],
-                sector_consumption_agricultural=row[
-                    'sector_consumption_agricultural'])
+                geo_data=row.geom,
+                population=0 if isnan(row.population) else int(row.population),
+                peak_load_residential=row.peak_load_residential,
+                peak_load_retail=row.peak_load_retail,
+                peak_load_industrial=row.peak_load_industrial,
+                peak_load_agricultural=row.peak_load_agricultural,
+                peak_load=(row.peak_load_residential +
+                               row.peak_load_retail +
+                               row.peak_load_industrial +
+                               row.peak_load_agricultural),
+                sector_count_residential=int(row.sector_count_residential),
+                sector_count_retail=int(row.sector_count_retail),
+                sector_count_industrial=int(row.sector_count_industrial),
+                sector_count_agricultural=int(row.sector_count_agricultural),
+                sector_consumption_residential=row.sector_consumption_residential,
+                sector_consumption_retail=row.sector_consumption_retail,
+                sector_consumption_industrial=row.sector_consumption_industrial,
+                sector_consumption_agricultural=row.sector_consumption_agricultural)
 
             # be aware, lv_grid takes grid district's geom!
             lv_grid = LVGridDing0(network=self,
                                   grid_district=lv_grid_district,
                                   id_db=id,
-                                  geo_data=wkt_loads(row['geom']),
+                                  geo_data=row.geom,
                                   v_level=lv_nominal_voltage)
 
             # create LV station
@@ -571,9 +763,8 @@ class NetworkDing0:
                 id_db=id,
                 grid=lv_grid,
                 lv_load_area=lv_load_area,
-                geo_data=wkt_loads(lv_stations.loc[id, 'geom'])
-                            if id in lv_stations.index.values
-                            else lv_load_area.geo_centre,
+                geo_data=lv_stations_geo_data.get(id,
+                                                  lv_load_area.geo_centre),
                 peak_load=lv_grid_district.peak_load)
 
             # assign created objects
@@ -599,7 +790,8 @@ class NetworkDing0:
         See Also
         --------
         build_mv_grid_district : used to instantiate MV grid_district objects
-        import_lv_load_areas : used to import load_areas for every single MV grid_district
+        import_lv_load_areas : used to import load_areas of all MV grid_districts
+        build_lv_load_areas : used to instantiate load_areas for every single MV grid_district
         ding0.core.structure.regions.MVGridDistrictDing0.add_peak_demand : used to summarize peak loads of underlying load_areas
         """
 
@@ -615,11 +807,11 @@ class NetworkDing0:
 
         # build SQL query
         grid_districts = session.query(self.orm['orm_mv_grid_districts'].subst_id,
-                                       func.ST_AsText(func.ST_Transform(
-                                           self.orm['orm_mv_grid_districts'].geom, srid)). \
+                                       geom_as_text(session,
+                                           self.orm['orm_mv_grid_districts'].geom, srid). \
                                        label('poly_geom'),
-                                       func.ST_AsText(func.ST_Transform(
-                                           self.orm['orm_mv_stations'].point, srid)). \
+                                       geom_as_text(session,
+                                           self.orm['orm_mv_stations'].point, srid). \
                                        label('subs_geom')).\
             join(self.orm['orm_mv_stations'], self.orm['orm_mv_grid_districts'].subst_id ==
                  self.orm['orm_mv_stations'].subst_id).\
@@ -633,14 +825,36 @@ class NetworkDing0:
                                     session.bind,
                                     index_col='subst_id')
 
+        # import lv_stations, lv_grid_districts and load areas of all
+        # grid_districts at once (one query per table) and partition them
+        lv_stations = self.import_lv_stations(session, mv_data.index.tolist())
+        lv_grid_districts = self.import_lv_grid_districts(
+            session, mv_data.index.tolist())
+        lv_load_areas = self.import_lv_load_areas(session,
+                                                  mv_data.index.tolist())
+
+        # parse geometries of each table at once
+        lv_stations['geom'] = geoms_from_wkt(lv_stations['geom'])
+        lv_grid_districts['geom'] = geoms_from_wkt(lv_grid_districts['geom'])
+        lv_load_areas['geo_area'] = geoms_from_wkt(lv_load_areas['geo_area'])
+        lv_load_areas['geo_centre'] = geoms_from_wkt(
+            lv_load_areas['geo_centre'])
+
+        lv_stations_per_load_area = partition_frame(lv_stations, 'la_id')
+        lv_grid_districts_per_load_area = partition_frame(lv_grid_districts,
+                                                          'la_id')
+        lv_load_areas_per_grid_district = partition_frame(lv_load_areas,
+                                                          'subst_id')
+
         # iterate over grid_district/station datasets and initiate objects
-        for poly_id, row in mv_data.iterrows():
+        for poly_id, region_geo_data, station_geo_data in zip(
+                mv_data.index,
+                geoms_from_wkt(mv_data['poly_geom']),
+                geoms_from_wkt(mv_data['subs_geom'])):
             subst_id = poly_id
-            region_geo_data = wkt_loads(row['poly_geom'])
 
             # transform `region_geo_data` to epsg 3035
             # to achieve correct area calculation of mv_grid_district
-            station_geo_data = wkt_loads(row['subs_geom'])
             # projection = partial(
             #     pyproj.transform,
             #     pyproj.Proj(init='epsg:4326'),  # source coordinate system
@@ -653,38 +867,35 @@ class NetworkDing0:
                                              region_geo_data,
                                              station_geo_data)
 
-            # import all lv_stations within mv_grid_district
-            lv_stations = self.import_lv_stations(session)
-
-            # import all lv_grid_districts within mv_grid_district
-            lv_grid_districts = self.import_lv_grid_districts(session, lv_stations)
-
-            # import load areas
-            self.import_lv_load_areas(session,
-                                      mv_grid_district,
-                                      lv_grid_districts,
-                                      lv_stations)
+            # build load areas incl. lv_grid_districts and lv_stations
+            self.build_lv_load_areas(
+                mv_grid_district,
+                lv_load_areas_per_grid_district.get(subst_id,
+                                                    lv_load_areas.iloc[0:0]),
+                lv_grid_districts_per_load_area,
+                lv_stations_per_load_area)
 
             # add sum of peak loads of underlying lv grid_districts to mv_grid_district
             mv_grid_district.add_peak_demand()
 
         logger.info('=====> MV Grid Districts imported')
 
-    def import_lv_load_areas(self, session, mv_grid_district, lv_grid_districts,
-                             lv_stations):
+    def import_lv_load_areas(self, session, mv_grid_districts_no):
         """
-        Imports load_areas (load areas) from database for a single MV grid_district
+        Imports load_areas (load areas) from database for given MV grid_districts
 
         Parameters
         ----------
         session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
             Database session
-        mv_grid_district : MV grid_district/station (instance of MVGridDistrictDing0 class) for
-            which the import of load areas is performed
-        lv_grid_districts: :pandas:`pandas.DataFrame<dataframe>`
-            LV grid districts within this mv_grid_district
-        lv_stations: :pandas:`pandas.DataFrame<dataframe>`
-            LV stations within this mv_grid_district
+        mv_grid_districts_no : :obj:`list` of :obj:`int`
+            MV grid_districts/stations for which the import of load areas is
+            performed
+
+        Returns
+        -------
+        lv_load_areas: :pandas:`pandas.DataFrame<dataframe>`
+            Table of load areas incl. id of MV grid_district (`subst_id`)
         """
 
         # get ding0s' standard CRS (SRID)
@@ -701,6 +912,7 @@ class NetworkDing0:
         # build SQL query
         lv_load_areas_sqla = session.query(
             self.orm['orm_lv_load_areas'].id.label('id_db'),
+            self.orm['orm_lv_load_areas'].subst_id,
             self.orm['orm_lv_load_areas'].zensus_sum,
             self.orm['orm_lv_load_areas'].zensus_count.label('zensus_cnt'),
             self.orm['orm_lv_load_areas'].ioer_sum,
@@ -719,9 +931,9 @@ class NetworkDing0:
             self.orm['orm_lv_load_areas'].sector_count_industrial,
             self.orm['orm_lv_load_areas'].sector_count_agricultural,
             self.orm['orm_lv_load_areas'].nuts.label('nuts_code'),
-            func.ST_AsText(func.ST_Transform(self.orm['orm_lv_load_areas'].geom, srid)).\
+            geom_as_text(session, self.orm['orm_lv_load_areas'].geom, srid).\
                 label('geo_area'),
-            func.ST_AsText(func.ST_Transform(self.orm['orm_lv_load_areas'].geom_centre, srid)).\
+            geom_as_text(session, self.orm['orm_lv_load_areas'].geom_centre, srid).\
                 label('geo_centre'),
             (self.orm['orm_lv_load_areas'].sector_peakload_residential * gw2kw).\
                 label('peak_load_residential'),
@@ -736,8 +948,7 @@ class NetworkDing0:
               + self.orm['orm_lv_load_areas'].sector_peakload_industrial
               + self.orm['orm_lv_load_areas'].sector_peakload_agricultural)
              * gw2kw).label('peak_load')). \
-            filter(self.orm['orm_lv_load_areas'].subst_id == mv_grid_district. \
-                   mv_grid._station.id_db).\
+            filter(self.orm['orm_lv_load_areas'].subst_id.in_(mv_grid_districts_no)).\
             filter(((self.orm['orm_lv_load_areas'].sector_peakload_residential  # only pick load areas with peak load > lv_loads_threshold
                      + self.orm['orm_lv_load_areas'].sector_peakload_retail
                      + self.orm['orm_lv_load_areas'].sector_peakload_industrial
@@ -750,8 +961,36 @@ class NetworkDing0:
                                           session.bind,
                                           index_col='id_db')
 
+        return lv_load_areas
+
+    def build_lv_load_areas(self, mv_grid_district, lv_load_areas,
+                            lv_grid_districts, lv_stations):
+        """
+        Instantiates load_areas (load areas) of a single MV grid_district
+        incl. their lv_grid_districts and lv_stations
+
+        Parameters
+        ----------
+        mv_grid_district : MV grid_district/station (instance of MVGridDistrictDing0 class) for
+            which the load areas are instantiated
+        lv_load_areas: :pandas:`pandas.DataFrame<dataframe>`
+            Load areas within this mv_grid_district
+        lv_grid_districts: :obj:`dict`
+            LV grid districts (:pandas:`pandas.DataFrame<dataframe>`) keyed
+            by id of load area
+        lv_stations: :obj:`dict`
+            LV stations (:pandas:`pandas.DataFrame<dataframe>`) keyed by id
+            of load area
+        """
+
+        # parse geometries at once (passed through if parsed already)
+        lv_load_areas = lv_load_areas.assign(
+            geo_area=geoms_from_wkt(lv_load_areas['geo_area']),
+            geo_centre=geoms_from_wkt(lv_load_areas['geo_centre']))
+
         # create load_area objects from rows and add them to graph
-        for id_db, row in lv_load_areas.iterrows():
+        for id_db, row in zip(lv_load_areas.index,
+                              lv_load_areas.to_dict('records')):
 
             # create LV load_area object
             lv_load_area = LVLoadAreaDing0(id_db=id_db,
@@ -761,10 +1000,10 @@ class NetworkDing0:
 
             # sub-selection of lv_grid_districts/lv_stations within one
             # specific load area
-            lv_grid_districts_per_load_area = lv_grid_districts.\
-                loc[lv_grid_districts['la_id'] == id_db]
-            lv_stations_per_load_area = lv_stations.\
-                loc[lv_stations['la_id'] == id_db]
+            lv_grid_districts_per_load_area = lv_grid_districts.get(
+                id_db, pd.DataFrame())
+            lv_stations_per_load_area = lv_stations.get(
+                id_db, pd.DataFrame())
 
             self.build_lv_grid_district(lv_load_area,
                                         lv_grid_districts_per_load_area,
@@ -772,7 +1011,7 @@ class NetworkDing0:
 
             # create new centre object for Load Area
             lv_load_area_centre = LVLoadAreaCentreDing0(id_db=id_db,
-                                                        geo_data=wkt_loads(row['geo_centre']),
+                                                        geo_data=row['geo_centre'],
                                                         lv_load_area=lv_load_area,
                                                         grid=mv_grid_district.mv_grid)
             # links the centre object to Load Area
@@ -781,13 +1020,16 @@ class NetworkDing0:
             # add Load Area to MV grid district (and add centre object to MV gris district's graph)
             mv_grid_district.add_lv_load_area(lv_load_area)
 
-    def import_lv_grid_districts(self, session, lv_stations):
-        """Imports all lv grid districts within given load area
+    def import_lv_grid_districts(self, session, mv_grid_districts_no):
+        """Imports all lv grid districts within given MV grid districts
 
         Parameters
         ----------
         session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
             Database session
+        mv_grid_districts_no : :obj:`list` of :obj:`int`
+            MV grid_districts/stations for which the import is performed. LV
+            grid districts are selected by their lv_stations.
 
         Returns
         -------
@@ -823,8 +1065,8 @@ class NetworkDing0:
               + self.orm['orm_lv_grid_district'].sector_peakload_industrial
               + self.orm['orm_lv_grid_district'].sector_peakload_agricultural)
              * gw2kw).label('peak_load'),
-            func.ST_AsText(func.ST_Transform(
-                self.orm['orm_lv_grid_district'].geom, srid)).label('geom'),
+            geom_as_text(session,
+                self.orm['orm_lv_grid_district'].geom, srid).label('geom'),
             self.orm['orm_lv_grid_district'].sector_count_residential,
             self.orm['orm_lv_grid_district'].sector_count_retail,
             self.orm['orm_lv_grid_district'].sector_count_industrial,
@@ -842,7 +1084,10 @@ class NetworkDing0:
                 label('sector_consumption_agricultural'),
             self.orm['orm_lv_grid_district'].mvlv_subst_id). \
             filter(self.orm['orm_lv_grid_district'].mvlv_subst_id.in_(
-            lv_stations.index.tolist())). \
+            session.query(self.orm['orm_lv_stations'].mvlv_subst_id).
+                filter(self.orm['orm_lv_stations'].subst_id.in_(
+                mv_grid_districts_no)).
+                filter(self.orm['version_condition_mvlvst']))). \
             filter(self.orm['version_condition_lvgd'])
 
         # read data from db
@@ -862,14 +1107,17 @@ class NetworkDing0:
 
         return lv_grid_districts
 
-    def import_lv_stations(self, session):
+    def import_lv_stations(self, session, mv_grid_districts_no=None):
         """
-        Import lv_stations within the given load_area
+        Import lv_stations within the given MV grid districts
 
         Parameters
         ----------
         session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
             Database session
+        mv_grid_districts_no : :obj:`list` of :obj:`int`, defaults to None
+            MV grid_districts/stations for which the import is performed. If
+            None, lv_stations of all imported MV grid_districts are imported.
 
         Returns
         -------
@@ -881,14 +1129,16 @@ class NetworkDing0:
         srid = str(int(cfg_ding0.get('geo', 'srid')))
 
         # get list of mv grid districts
-        mv_grid_districts = list(self.get_mvgd_lvla_lvgd_obj_from_id()[0])
+        if mv_grid_districts_no is None:
+            mv_grid_districts_no = list(self.get_mvgd_lvla_lvgd_obj_from_id()[0])
 
         lv_stations_sqla = session.query(self.orm['orm_lv_stations'].mvlv_subst_id,
+                                         self.orm['orm_lv_stations'].subst_id,
                                          self.orm['orm_lv_stations'].la_id,
-                                         func.ST_AsText(func.ST_Transform(
-                                           self.orm['orm_lv_stations'].geom, srid)). \
+                                         geom_as_text(session,
+                                           self.orm['orm_lv_stations'].geom, srid). \
                                          label('geom')).\
-            filter(self.orm['orm_lv_stations'].subst_id.in_(mv_grid_districts)). \
+            filter(self.orm['orm_lv_stations'].subst_id.in_(mv_grid_districts_no)). \
             filter(self.orm['version_condition_mvlvst'])
 
         # read data from db
@@ -913,6 +1163,10 @@ class NetworkDing0:
             Connection of generators is done later on in
             :class:`~.ding0.core.NetworkDing0`'s method
             :meth:`~.core.NetworkDing0.connect_generators`
+
+        See Also
+        --------
+        build_generators : used to instantiate generator objects
         """
 
         def import_res_generators():
@@ -931,13 +1185,13 @@ class NetworkDing0:
                 self.orm['orm_re_generators'].columns.generation_subtype,
                 self.orm['orm_re_generators'].columns.voltage_level,
                 self.orm['orm_re_generators'].columns.w_id,
-                func.ST_AsText(func.ST_Transform(
-                    self.orm['orm_re_generators'].columns.rea_geom_new, srid)).label('geom_new'),
-                func.ST_AsText(func.ST_Transform(
-                    self.orm['orm_re_generators'].columns.geom, srid)).label('geom')
+                geom_as_text(session,
+                    self.orm['orm_re_generators'].columns.rea_geom_new, srid).label('geom_new'),
+                geom_as_text(session,
+                    self.orm['orm_re_generators'].columns.geom, srid).label('geom')
             ). \
                 filter(
-                self.orm['orm_re_generators'].columns.subst_id.in_(list(mv_grid_districts_dict))). \
+                self.orm['orm_re_generators'].columns.subst_id.in_(mv_grid_districts_no)). \
                 filter(self.orm['orm_re_generators'].columns.voltage_level.in_([4, 5, 6, 7])). \
                 filter(self.orm['version_condition_re'])
 
@@ -945,53 +1199,120 @@ class NetworkDing0:
             generators = pd.read_sql_query(generators_sqla.statement,
                                            session.bind,
                                            index_col='id')
+
+            return generators
+
+        def import_conv_generators():
+            """
+            Imports conventional (conv) generators
+            """
+
+            # build query
+            generators_sqla = session.query(
+                self.orm['orm_conv_generators'].columns.id,
+                self.orm['orm_conv_generators'].columns.subst_id,
+                self.orm['orm_conv_generators'].columns.name,
+                self.orm['orm_conv_generators'].columns.capacity,
+                self.orm['orm_conv_generators'].columns.fuel,
+                self.orm['orm_conv_generators'].columns.voltage_level,
+                geom_as_text(session,
+                    self.orm['orm_conv_generators'].columns.geom, srid).label('geom')). \
+                filter(
+                self.orm['orm_conv_generators'].columns.subst_id.in_(mv_grid_districts_no)). \
+                filter(self.orm['orm_conv_generators'].columns.voltage_level.in_([4, 5, 6])). \
+                filter(self.orm['version_condition_conv'])
+
+            # read data from db
+            generators = pd.read_sql_query(generators_sqla.statement,
+                                           session.bind,
+                                           index_col='id')
+
+            return generators
+
+        # get ding0s' standard CRS (SRID)
+        srid = str(int(cfg_ding0.get('geo', 'srid')))
+
+        mv_grid_districts_no = [mv_grid_district.id_db for mv_grid_district
+                                in self.mv_grid_districts()]
+
+        # import renewable and conventional generators
+        self.build_generators(import_res_generators(),
+                              import_conv_generators())
+
+        logger.info('=====> Generators imported')
+
+    def build_generators(self, re_generators, conv_generators):
+        """
+        Instantiates renewable (res) and conventional (conv) generators and
+        adds them to the MV and LV grids
+
+        Parameters
+        ----------
+        re_generators: :pandas:`pandas.DataFrame<dataframe>`
+            Table of renewable generators indexed by id (see
+            :meth:`import_generators` for columns). Geometries may be given
+            as WKT or shapely objects.
+        conv_generators: :pandas:`pandas.DataFrame<dataframe>`
+            Table of conventional generators indexed by id (see
+            :meth:`import_generators` for columns)
+        """
+
+        def build_res_generators(generators):
+            """
+            Builds renewable (res) generators
+            """
+
             # define generators with unknown subtype as 'unknown'
             generators.loc[generators[
                                'generation_subtype'].isnull(),
                            'generation_subtype'] = 'unknown'
 
-            for id_db, row in generators.iterrows():
+            # parse geometries at once
+            geoms_new = geoms_from_wkt(generators['geom_new'])
+            geoms = geoms_from_wkt(generators['geom'])
+
+            for row, geom_new, geom in zip(generators.itertuples(),
+                                           geoms_new, geoms):
+                id_db = row.Index
 
                 # treat generators' geom:
                 # use geom_new (relocated genos from data processing)
                 # otherwise use original geom from EnergyMap
-                if row['geom_new']:
-                    geo_data = wkt_loads(row['geom_new'])
-                elif not row['geom_new']:
-                    geo_data = wkt_loads(row['geom'])
+                if geom_new is not None:
+                    geo_data = geom_new
+                elif geom is not None:
+                    geo_data = geom
                     logger.warning(
                         'Generator {} has no geom_new entry,'
                         'EnergyMap\'s geom entry will be used.'.format(
                         id_db))
                 # if no geom is available at all, skip generator
-                elif not row['geom']:
-                    #geo_data =
+                else:
                     logger.error('Generator {} has no geom entry either'
                                  'and will be skipped.'.format(id_db))
                     continue
 
                 # look up MV grid
-                mv_grid_district_id = row['subst_id']
-                mv_grid = mv_grid_districts_dict[mv_grid_district_id].mv_grid
+                mv_grid = mv_grid_districts_dict[row.subst_id].mv_grid
 
                 # create generator object
-                if row['generation_type'] in ['solar', 'wind']:
+                if row.generation_type in ['solar', 'wind']:
                     generator = GeneratorFluctuatingDing0(
                         id_db=id_db,
                         mv_grid=mv_grid,
-                        capacity=row['electrical_capacity'],
-                        type=row['generation_type'],
-                        subtype=row['generation_subtype'],
-                        v_level=int(row['voltage_level']),
-                        weather_cell_id=row['w_id'])
+                        capacity=row.electrical_capacity,
+                        type=row.generation_type,
+                        subtype=row.generation_subtype,
+                        v_level=int(row.voltage_level),
+                        weather_cell_id=row.w_id)
                 else:
                     generator = GeneratorDing0(
                         id_db=id_db,
                         mv_grid=mv_grid,
-                        capacity=row['electrical_capacity'],
-                        type=row['generation_type'],
-                        subtype=row['generation_subtype'],
-                        v_level=int(row['voltage_level']))
+                        capacity=row.electrical_capacity,
+                        type=row.generation_type,
+                        subtype=row.generation_subtype,
+                        v_level=int(row.voltage_level))
 
                 # MV generators
                 if generator.v_level in [4, 5]:
@@ -1002,7 +1323,7 @@ class NetworkDing0:
                 elif generator.v_level in [6, 7]:
 
                     # look up MV-LV substation id
-                    mvlv_subst_id = row['mvlv_subst_id']
+                    mvlv_subst_id = row.mvlv_subst_id
 
                     # if there's a LVGD id
                     if mvlv_subst_id and not isnan(mvlv_subst_id):
@@ -1019,7 +1340,7 @@ class NetworkDing0:
                         # if LA/LVGD does not exist, choose random LVGD and move generator to station of LVGD
                         # this occurs due to exclusion of LA with peak load < 1kW
                         except:
-                            lv_grid_district = random.choice(list(lv_grid_districts_dict.values()))
+                            lv_grid_district = random.choice(lv_grid_districts_list)
 
                             generator.lv_grid = lv_grid_district.lv_grid
                             generator.geo_data = lv_grid_district.lv_grid.station().geo_data
@@ -1031,7 +1352,7 @@ class NetworkDing0:
                             pass
 
                     else:
-                        lv_grid_district = random.choice(list(lv_grid_districts_dict.values()))
+                        lv_grid_district = random.choice(lv_grid_districts_list)
 
                         generator.lv_grid = lv_grid_district.lv_grid
                         generator.geo_data = lv_grid_district.lv_grid.station().geo_data
@@ -1043,46 +1364,26 @@ class NetworkDing0:
                     generator.lv_load_area = lv_grid_district.lv_load_area
                     lv_grid_district.lv_grid.add_generator(generator)
 
-        def import_conv_generators():
+        def build_conv_generators(generators):
             """
-            Imports conventional (conv) generators
+            Builds conventional (conv) generators
             """
 
-            # build query
-            generators_sqla = session.query(
-                self.orm['orm_conv_generators'].columns.id,
-                self.orm['orm_conv_generators'].columns.subst_id,
-                self.orm['orm_conv_generators'].columns.name,
-                self.orm['orm_conv_generators'].columns.capacity,
-                self.orm['orm_conv_generators'].columns.fuel,
-                self.orm['orm_conv_generators'].columns.voltage_level,
-                func.ST_AsText(func.ST_Transform(
-                    self.orm['orm_conv_generators'].columns.geom, srid)).label('geom')). \
-                filter(
-                self.orm['orm_conv_generators'].columns.subst_id.in_(list(mv_grid_districts_dict))). \
-                filter(self.orm['orm_conv_generators'].columns.voltage_level.in_([4, 5, 6])). \
-                filter(self.orm['version_condition_conv'])
-
-            # read data from db
-            generators = pd.read_sql_query(generators_sqla.statement,
-                                           session.bind,
-                                           index_col='id')
-
-            for id_db, row in generators.iterrows():
+            for row, geo_data in zip(generators.itertuples(),
+                                     geoms_from_wkt(generators['geom'])):
 
                 # look up MV grid
-                mv_grid_district_id = row['subst_id']
-                mv_grid = mv_grid_districts_dict[mv_grid_district_id].mv_grid
+                mv_grid = mv_grid_districts_dict[row.subst_id].mv_grid
 
                 # create generator object
-                generator = GeneratorDing0(id_db=id_db,
-                                           name=row['name'],
-                                           geo_data=wkt_loads(row['geom']),
+                generator = GeneratorDing0(id_db=row.Index,
+                                           name=row.name,
+                                           geo_data=geo_data,
                                            mv_grid=mv_grid,
-                                           capacity=row['capacity'],
-                                           type=row['fuel'],
+                                           capacity=row.capacity,
+                                           type=row.fuel,
                                            subtype='unknown',
-                                           v_level=int(row['voltage_level']))
+                                           v_level=int(row.voltage_level))
 
                 # add generators to graph
                 if generator.v_level in [4, 5]:
@@ -1092,9 +1393,6 @@ class NetworkDing0:
                     generator.v_level = 5
                     mv_grid.add_generator(generator)
 
-        # get ding0s' standard CRS (SRID)
-        srid = str(int(cfg_ding0.get('geo', 'srid')))
-
         # get predefined random seed and initialize random generator
         seed = int(cfg_ding0.get('random', 'seed'))
         random.seed(a=seed)
@@ -1104,14 +1402,10 @@ class NetworkDing0:
         lv_load_areas_dict,\
         lv_grid_districts_dict,\
         lv_stations_dict = self.get_mvgd_lvla_lvgd_obj_from_id()
+        lv_grid_districts_list = list(lv_grid_districts_dict.values())
 
-        # import renewable generators
-        import_res_generators()
-
-        # import conventional generators
-        import_conv_generators()
-
-        logger.info('=====> Generators imported')
+        build_res_generators(re_generators)
+        build_conv_generators(conv_generators)
 
     def import_config(self):
         """
@@ -1758,25 +2052,50 @@ class NetworkDing0:
         logger.info('=====> MV Routing (Routing, Connection of Satellites & '
                     'Stations) performed')
 
-    def build_lv_grids(self):
+    def build_lv_grids(self, processes=None, lazy=False):
         """
         Builds LV grids for every non-aggregated LA in every MV grid
         district using model grids.
+
+        Parameters
+        ----------
+        processes: :obj:`int`, defaults to None
+            Count of processes LV grids are built in. If None, value is
+            taken from config (parallel/lv_processes). If >1, LV grids are
+            built in parallel, see
+            :func:`~.ding0.grid.lv_grid.lv_parallel.process_lv_grid_districts`
+        lazy: :obj:`bool`, defaults to False
+            If True, LV grids are built lazily: only transformers are added
+            to LV stations now, everything else is done on first access of
+            the LV grid, see
+            :meth:`~.ding0.core.network.grids.LVGridDing0.materialize`
         """
 
+        if processes is None:
+            processes = int(cfg_ding0.get('parallel', 'lv_processes'))
+
+        lv_grid_districts = []
+
         for mv_grid_district in self.mv_grid_districts():
             for load_area in mv_grid_district.lv_load_areas():
                 if not load_area.is_aggregated:
                     for lv_grid_district in load_area.lv_grid_districts():
 
-                        lv_grid_district.lv_grid.build_grid()
+                        if lazy:
+                            lv_grid_district.lv_grid.build_grid(lazy=True)
+                        elif processes > 1:
+                            lv_grid_districts.append(lv_grid_district)
+                        else:
+                            lv_grid_district.lv_grid.build_grid()
                 else:
                     logger.info(
                         '{} is of type aggregated. No grid is created.'.format(repr(load_area)))
 
+        process_lv_grid_districts(lv_grid_districts, 'build', processes)
+
         logger.info('=====> LV model grids created')
 
-    def connect_generators(self, debug=False):
+    def connect_generators(self, debug=False, processes=None):
         """
         Connects generators (graph nodes) to grid (graph) for every MV and LV Grid District
 
@@ -1784,8 +2103,18 @@ class NetworkDing0:
         ----------
         debug: :obj:`bool`, defaults to False
             If True, information is printed during process.
+        processes: :obj:`int`, defaults to None
+            Count of processes LV generators are connected in. If None, value
+            is taken from config (parallel/lv_processes). If >1, LV grids are
+            processed in parallel, see
+            :func:`~.ding0.grid.lv_grid.lv_parallel.process_lv_grid_districts`
         """
 
+        if processes is None:
+            processes = int(cfg_ding0.get('parallel', 'lv_processes'))
+
+        lv_grid_districts = []
+
         for mv_grid_district in self.mv_grid_districts():
             mv_grid_district.mv_grid.connect_generators(debug=debug)
 
@@ -1797,6 +2126,10 @@ class NetworkDing0:
                 if not load_area.is_aggregated:
                     for lv_grid_district in load_area.lv_grid_districts():
 
+                        if processes > 1:
+                            lv_grid_districts.append(lv_grid_district)
+                            continue
+
                         lv_grid_district.lv_grid.connect_generators(debug=debug)
                         if debug:
                             lv_grid_district.lv_grid.graph_draw(mode='LV')
@@ -1804,8 +2137,30 @@ class NetworkDing0:
                     logger.info(
                         '{} is of type aggregated. LV generators are not connected to LV grids.'.format(repr(load_area)))
 
+        process_lv_grid_districts(lv_grid_districts, 'connect', processes)
+        if debug:
+            for lv_grid_district in lv_grid_districts:
+                lv_grid_district.lv_grid.graph_draw(mode='LV')
+
         logger.info('=====> Generators connected')
 
+    def materialize_lv_grids(self):
+        """
+        Performs all pending steps of lazily built LV grids in every MV grid
+        district.
+
+        See Also
+        --------
+        ding0.core.network.grids.LVGridDing0.materialize
+        """
+
+        for mv_grid_district in self.mv_grid_districts():
+            for load_area in mv_grid_district.lv_load_areas():
+                for lv_grid_district in load_area.lv_grid_districts():
+                    lv_grid_district.lv_grid.materialize()
+
+        logger.info('=====> LV grids materialized')
+
     def mv_parametrize_grid(self, debug=False):
         """
         Performs Parametrization of grid equipment of all MV grids.
@@ -1884,7 +2239,8 @@ class NetworkDing0:
         elif mode == 'close':
             logger.info('=====> MV Circuit Breakers closed')
 
-    def run_powerflow(self, session, method='onthefly', export_pypsa=False, debug=False):
+    def run_powerflow(self, session, method='onthefly', export_pypsa=False,
+                      debug=False, batch_size=None):
         """
         Performs power flow calculation for all MV grids
 
@@ -1904,8 +2260,17 @@ class NetworkDing0:
 
         debug: :obj:`bool`, defaults to False
             If True, information is printed during process
+
+        batch_size: :obj:`int`, defaults to None
+            Number of MV grids which are merged into one PyPSA network and
+            solved at once (only for method='onthefly'). If None, the value
+            is taken from config (section `powerflow`, key `batch_size`).
+            A value of 1 runs one power flow per MV grid.
         """
 
+        if batch_size is None:
+            batch_size = int(cfg_ding0.get('powerflow', 'batch_size'))
+
         if method == 'db':
             # Empty tables
             pypsa_io.delete_powerflow_tables(session)
@@ -1919,6 +2284,27 @@ class NetworkDing0:
                                                     export_pypsa_dir=export_pypsa_dir,
                                                     debug=debug)
 
+        elif method == 'onthefly' and batch_size > 1:
+            grid_districts = list(self.mv_grid_districts())
+            for idx in range(0, len(grid_districts), batch_size):
+                batch = grid_districts[idx:idx + batch_size]
+                grids_components = []
+                for grid_district in batch:
+                    components, components_data = \
+                        grid_district.mv_grid.export_to_pypsa(session, method)
+                    grids_components.append((components,
+                                             components_data,
+                                             grid_district.mv_grid))
+                if export_pypsa:
+                    export_pypsa_dir = '{0}-{1}'.format(
+                        repr(batch[0].mv_grid), repr(batch[-1].mv_grid))
+                else:
+                    export_pypsa_dir = None
+                pypsa_io.run_powerflow_onthefly_batch(
+                    grids_components,
+                    export_pypsa_dir=export_pypsa_dir,
+                    debug=debug)
+
         elif method == 'onthefly':
             for grid_district in self.mv_grid_districts():
                 if export_pypsa:
@@ -1930,6 +2316,49 @@ class NetworkDing0:
                                                     export_pypsa_dir=export_pypsa_dir,
                                                     debug=debug)
 
+    def run_powerflow_timeseries(self, session, load_profile=None,
+                                 generation_profile=None, chunk_size=None,
+                                 debug=False):
+        """
+        Performs time series power flow calculation for all MV grids
+
+        Scenarios and time ranges are taken from PF config
+        (:class:`~.ding0.core.powerflow.PFConfigDing0`).
+
+        Parameters
+        ----------
+        session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+            Database session
+        load_profile: :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+            Normalized load profile, see
+            :func:`~.tools.pypsa_io.run_powerflow_timeseries`
+        generation_profile: :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+            Normalized generation profile, see
+            :func:`~.tools.pypsa_io.run_powerflow_timeseries`
+        chunk_size: :obj:`int`
+            Number of snapshots solved at once
+        debug: :obj:`bool`, defaults to False
+            If True, information is printed during process
+
+        Returns
+        -------
+        :obj:`dict`
+            Results keyed by MV grid district id_db and scenario
+        """
+
+        results = {}
+        for grid_district in self.mv_grid_districts():
+            results[grid_district.id_db] = \
+                grid_district.mv_grid.run_powerflow_timeseries(
+                    session,
+                    load_profile=load_profile,
+                    generation_profile=generation_profile,
+                    pf_config=self._pf_config,
+                    chunk_size=chunk_size,
+                    debug=debug)
+
+        return results
+
     def reinforce_grid(self):
         """
         Performs grid reinforcement measures for all MV and LV grids
@@ -2006,6 +2435,10 @@ class NetworkDing0:
             run_id=self._run_id
         )
 
+        # Add metrics of profiled run
+        if self._metrics is not None:
+            metadata['metrics'] = self._metrics
+
         return metadata
 
 
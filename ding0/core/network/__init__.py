@@ -19,6 +19,62 @@ import networkx as nx
 from ding0.core.structure.regions import LVLoadAreaDing0, LVLoadAreaCentreDing0
 
 
+class SlottedDing0:
+    """ Base of classes with many instances (nodes and branches of grids)
+
+    Attributes are stored in `__slots__` instead of an instance `__dict__`
+    which saves memory (see
+    :mod:`~.ding0.examples.example_memory_benchmark`). Subclasses declare their
+    attributes in `__slots__`. Attributes that are set in some cases only
+    (e.g. `voltage_res` and `s_res` by power flow) stay unset otherwise,
+    hence they can be tested by :func:`hasattr` as before.
+
+    Pickled state is a dict of set attributes. Pickles of ding0 versions
+    whose objects had an instance `__dict__` can be loaded, attributes that
+    are no longer declared are dropped.
+    """
+
+    __slots__ = ()
+
+    # names of slots by class
+    _slot_names = {}
+
+    @classmethod
+    def slot_names(cls):
+        """Returns names of all slots of class (incl. base classes)
+
+        Returns
+        -------
+        :obj:`tuple` of :obj:`str`
+        """
+        try:
+            return SlottedDing0._slot_names[cls]
+        except KeyError:
+            names = []
+            for klass in reversed(cls.__mro__):
+                slots = klass.__dict__.get('__slots__', ())
+                if isinstance(slots, str):
+                    slots = (slots,)
+                names.extend(_ for _ in slots if _ not in names)
+            SlottedDing0._slot_names[cls] = names = tuple(names)
+            return names
+
+    def __getstate__(self):
+        state = {}
+        for name in self.slot_names():
+            try:
+                state[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        names = self.slot_names()
+        for name, value in state.items():
+            if name in names:
+                setattr(self, name, value)
+
+
 class GridDing0:
     """
     The fundamental abstract class used to encapsulated
@@ -530,6 +586,22 @@ class GridDing0:
         """
         return sorted(nx.isolates(self._graph), key=lambda x: repr(x))
 
+    def array_snapshot(self):
+        """
+        Returns an immutable array snapshot of grid for vectorized analyses
+
+        Node types, coordinates, loads, generation, adjacency (CSR), branch
+        parameters and power flow results are stored as NumPy arrays, see
+        :class:`~.ding0.core.network.arrays.GridArraysDing0`.
+
+        Returns
+        -------
+        :class:`~.ding0.core.network.arrays.GridArraysDing0`
+            Snapshot of grid
+        """
+        from ding0.core.network.arrays import GridArraysDing0
+        return GridArraysDing0.from_grid(self)
+
     def control_generators(self, capacity_factor):
         """ Sets capacity factor of all generators of a grid.
 
@@ -722,7 +794,7 @@ class RingDing0:
         return 'mv_ring_' + str(self._id_db)
 
 
-class BranchDing0:
+class BranchDing0(SlottedDing0):
     """
     When a network has a set of connections that don't form into rings but remain
     as open stubs, these are designated as branches. Typically Branches at the
@@ -758,6 +830,9 @@ class BranchDing0:
     :meth:`~.ding0.core.network.grids.MVGridDing0.set_branch_ids`
     """
 
+    __slots__ = ('id_db', 'ring', 'length', 'kind', 'type',
+                 'connects_aggregated', 'circuit_breaker', 'critical', 's_res')
+
     def __init__(self, **kwargs):
 
         self.id_db = kwargs.get('id_db', None)
@@ -793,7 +868,7 @@ class BranchDing0:
         return 'branch_' + str(self.id_db)
 
 
-class TransformerDing0:
+class TransformerDing0(SlottedDing0):
     """
     Transformers are essentially voltage converters, which
     enable to change between voltage levels based on the usage.
@@ -818,6 +893,9 @@ class TransformerDing0:
         off nominal turns ratio
     """
 
+    __slots__ = ('id_db', 'grid', 'v_level', 's_max_a', 's_max_b', 's_max_c',
+                 'phase_angle', 'tap_ratio', 'r_pu', 'x_pu')
+
     def __init__(self, **kwargs):
         self.id_db = kwargs.get('id_db', None)
         self.grid = kwargs.get('grid', None)
@@ -857,7 +935,7 @@ class TransformerDing0:
         return Z_tr
 
 
-class GeneratorDing0:
+class GeneratorDing0(SlottedDing0):
     """ Generators (power plants of any kind)
         
     Attributes
@@ -928,6 +1006,10 @@ class GeneratorDing0:
         
     """
 
+    __slots__ = ('id_db', 'name', 'geo_data', 'mv_grid', 'lv_load_area',
+                 'lv_grid', 'capacity', 'capacity_factor', 'type', 'subtype',
+                 'v_level', 'voltage_res')
+
     def __init__(self, **kwargs):
         self.id_db = kwargs.get('id_db', None)
         self.name = kwargs.get('name', None)
@@ -994,6 +1076,9 @@ class GeneratorFluctuatingDing0(GeneratorDing0):
         ID of the weather cell used to generate feed-in time series
 
     """
+
+    __slots__ = ('_weather_cell_id',)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -1022,7 +1107,7 @@ class GeneratorFluctuatingDing0(GeneratorDing0):
         self._weather_cell_id = weather_cell
 
 
-class CableDistributorDing0:
+class CableDistributorDing0(SlottedDing0):
     """ Cable distributor (connection point) 
      
     Attributes
@@ -1038,6 +1123,8 @@ class CableDistributorDing0:
     
     """
 
+    __slots__ = ('id_db', 'geo_data', 'grid', 'voltage_res')
+
     def __init__(self, **kwargs):
         self.id_db = kwargs.get('id_db', None)
         self.geo_data = kwargs.get('geo_data', None)
@@ -1056,7 +1143,7 @@ class CableDistributorDing0:
         return self.grid.network
 
 
-class LoadDing0:
+class LoadDing0(SlottedDing0):
     """ Class for modelling a load 
         
     Attributes
@@ -1074,6 +1161,9 @@ class LoadDing0:
 
     """
 
+    __slots__ = ('id_db', 'geo_data', 'grid', 'peak_load', 'consumption',
+                 'voltage_res')
+
     def __init__(self, **kwargs):
         self.id_db = kwargs.get('id', None)
         self.geo_data = kwargs.get('geo_data', None)
@@ -1096,7 +1186,7 @@ class LoadDing0:
         return self.grid.network
 
 
-class CircuitBreakerDing0:
+class CircuitBreakerDing0(SlottedDing0):
     """ Class for modelling a circuit breaker
 
     Attributes
@@ -1129,6 +1219,9 @@ class CircuitBreakerDing0:
 
     """
 
+    __slots__ = ('id_db', 'geo_data', 'grid', 'branch', 'branch_nodes',
+                 'status', 'voltage_res')
+
     def __init__(self, **kwargs):
         self.id_db = kwargs.get('id_db', None)
         self.geo_data = kwargs.get('geo_data', None)
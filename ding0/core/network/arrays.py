@@ -0,0 +1,458 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+from ding0.core.network import GeneratorDing0, LoadDing0, \
+    CableDistributorDing0, CircuitBreakerDing0
+from ding0.core.network.stations import MVStationDing0, LVStationDing0
+from ding0.core.structure.regions import LVLoadAreaCentreDing0
+from ding0.tools import config as cfg_ding0
+
+import math
+import mmap
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    # available in Python >= 3.8
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+cfg_ding0.load_config('config_calc.cfg')
+
+# node types in order of their codes (see GridArraysDing0.node_type)
+NODE_TYPES = ('mv_station', 'lv_station', 'generator', 'load',
+              'cable_distributor', 'circuit_breaker', 'lv_load_area_centre',
+              'other')
+
+# classes of node types (except 'other')
+NODE_CLASSES = (MVStationDing0, LVStationDing0, GeneratorDing0, LoadDing0,
+                CableDistributorDing0, CircuitBreakerDing0,
+                LVLoadAreaCentreDing0)
+
+# names, dtypes and count of columns (0 for 1-D) of arrays of a snapshot
+ARRAYS = (('node_type', np.int8, 0),
+          ('x', np.float64, 0),
+          ('y', np.float64, 0),
+          ('peak_load', np.float64, 0),
+          ('generation', np.float64, 0),
+          ('voltage_res', np.float64, 2),
+          ('indptr', np.int64, 0),
+          ('indices', np.int32, 0),
+          ('adjacency_branch', np.int32, 0),
+          ('branch_nodes', np.int32, 2),
+          ('length', np.float64, 0),
+          ('resistance', np.float64, 0),
+          ('reactance', np.float64, 0),
+          ('i_max_th', np.float64, 0),
+          ('u_n', np.float64, 0),
+          ('s_res', np.float64, 2))
+
+
+class _SharedMemoryFile:
+    """ Block of memory shared by a memory-mapped temporary file
+
+    Stand-in for :class:`multiprocessing.shared_memory.SharedMemory` on
+    Python < 3.8 with the same interface. The file is created in /dev/shm
+    (if available, i.e. in memory) or in the temporary directory, its path
+    is the name of the block.
+    """
+
+    def __init__(self, name=None, create=False, size=0):
+        if create:
+            directory = '/dev/shm' if os.path.isdir('/dev/shm') else None
+            fd, name = tempfile.mkstemp(prefix='ding0_', dir=directory)
+            os.ftruncate(fd, size)
+        else:
+            fd = os.open(name, os.O_RDWR)
+        try:
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.name = name
+        self.buf = memoryview(self._mmap)
+
+    def close(self):
+        self.buf.release()
+        self._mmap.close()
+
+    def unlink(self):
+        os.remove(self.name)
+
+
+def _shared_memory_block(name=None, create=False, size=0):
+    """Returns shared memory block (a memory-mapped file on Python < 3.8)"""
+    if shared_memory is None:
+        return _SharedMemoryFile(name=name, create=create, size=size)
+    return shared_memory.SharedMemory(name=name, create=create, size=size)
+
+
+def _node_type(node):
+    """Returns code of type of `node` (index in :data:`NODE_TYPES`)"""
+    for code, cls in enumerate(NODE_CLASSES):
+        if isinstance(node, cls):
+            return code
+    return len(NODE_TYPES) - 1
+
+
+def _type_value(branch_type, key):
+    """Returns parameter `key` of branch type as float (NaN if missing)
+
+    Parameters of some types are Series of length 1, cf.
+    :func:`~.ding0.tools.pypsa_io.add_lines`.
+    """
+    try:
+        return float(np.asarray(branch_type[key], dtype=float).reshape(-1)[0])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return np.nan
+
+
+def _results(obj, attribute):
+    """Returns results of power flow (load case, feed-in case) of `obj`"""
+    try:
+        values = [float(_) for _ in getattr(obj, attribute)[:2]]
+    except (AttributeError, TypeError, ValueError):
+        return [np.nan, np.nan]
+    return values + [np.nan] * (2 - len(values))
+
+
+class GridArraysDing0:
+    """ Immutable array snapshot of a grid
+
+    Nodes and branches of the grid's graph are numbered (nodes in order of
+    :meth:`~.ding0.core.network.GridDing0.graph_nodes_sorted`) and their
+    attributes are stored as NumPy arrays. Adjacency is stored in CSR format:
+    neighbors of node i are `indices[indptr[i]:indptr[i + 1]]` (sorted),
+    the branches connecting them are
+    `adjacency_branch[indptr[i]:indptr[i + 1]]`.
+    Arrays are read-only, changes of the grid after the snapshot was taken
+    are not reflected.
+
+    Attributes
+    ----------
+    nodes : :obj:`list`
+        Node objects by index (None if attached from shared memory)
+    branches : :obj:`list` of :class:`~.ding0.core.network.BranchDing0`
+        Branch objects by index (None if attached from shared memory)
+    node_type : :numpy:`numpy.ndarray`
+        Code of type of node, index in :data:`NODE_TYPES`
+    x, y : :numpy:`numpy.ndarray`
+        Coordinates of nodes (NaN if node has no geo data)
+    peak_load : :numpy:`numpy.ndarray`
+        Peak load in kW of loads, of load area centres (load area's peak
+        load) and of subordinate stations (grid district's peak load), 0 for
+        other nodes
+    generation : :numpy:`numpy.ndarray`
+        Capacity in kW of generators, of load area centres (load area's peak
+        generation) and of LV stations in MV grid (peak generation of LV
+        grid), 0 for other nodes
+    voltage_res : :numpy:`numpy.ndarray`
+        Voltages in p.u. of nodes of last power flow, shape (n, 2) for load
+        case and feed-in case (NaN if not available)
+    indptr, indices, adjacency_branch : :numpy:`numpy.ndarray`
+        Adjacency in CSR format (each branch is contained twice)
+    branch_nodes : :numpy:`numpy.ndarray`
+        Indices of nodes of branches, shape (m, 2)
+    length : :numpy:`numpy.ndarray`
+        Length of branches in m
+    resistance, reactance : :numpy:`numpy.ndarray`
+        Resistance and reactance of branches in Ohm
+    i_max_th : :numpy:`numpy.ndarray`
+        Thermal limit of branches' types in A
+    u_n : :numpy:`numpy.ndarray`
+        Nominal voltage of branches' types in kV
+    s_res : :numpy:`numpy.ndarray`
+        Apparent power of branches in MVA of last power flow, shape (m, 2)
+        for load case and feed-in case (NaN if not available)
+
+    See Also
+    --------
+    ding0.core.network.GridDing0.array_snapshot : creates snapshot of grid
+    """
+
+    def __init__(self, nodes, branches, arrays):
+        self.nodes = nodes
+        self.branches = branches
+        self._node_index = None
+        self._branch_index = None
+        self._shm = None
+        self._shm_owner = False
+        for name, _, _ in ARRAYS:
+            array = arrays[name]
+            array.flags.writeable = False
+            setattr(self, name, array)
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Creates snapshot of `grid`
+
+        Parameters
+        ----------
+        grid : :class:`~.ding0.core.network.GridDing0`
+            Grid
+
+        Returns
+        -------
+        :class:`GridArraysDing0`
+            Snapshot
+        """
+        omega = 2 * math.pi * cfg_ding0.get('assumptions', 'frequency')
+        root = getattr(grid, '_station', None)
+
+        nodes = grid.graph_nodes_sorted()
+        node_index = {node: idx for idx, node in enumerate(nodes)}
+        n = len(nodes)
+
+        node_type = np.empty(n, dtype=np.int8)
+        coordinates = np.full((n, 2), np.nan)
+        peak_load = np.zeros(n)
+        generation = np.zeros(n)
+        voltage_res = np.empty((n, 2))
+        for idx, node in enumerate(nodes):
+            code = _node_type(node)
+            node_type[idx] = code
+            geo_data = getattr(node, 'geo_data', None)
+            if geo_data is not None and not geo_data.is_empty:
+                coordinates[idx] = geo_data.x, geo_data.y
+            kind = NODE_TYPES[code]
+            if kind == 'load':
+                peak_load[idx] = node.peak_load or 0.
+            elif kind == 'generator':
+                generation[idx] = node.capacity or 0.
+            elif kind == 'lv_load_area_centre':
+                peak_load[idx] = node.lv_load_area.peak_load or 0.
+                generation[idx] = node.lv_load_area.peak_generation or 0.
+            elif kind == 'lv_station' and node is not root:
+                peak_load[idx] = node.peak_load or 0.
+                generation[idx] = node.peak_generation or 0.
+            voltage_res[idx] = _results(node, 'voltage_res')
+
+        branches = []
+        branch_nodes = []
+        # parameters of branch types by id of type
+        types = {}
+        parameters = []
+        s_res = []
+        for u, v, branch in grid._graph.edges(data='branch'):
+            branches.append(branch)
+            branch_nodes.append((node_index[u], node_index[v]))
+            try:
+                type_parameters = types[id(branch.type)]
+            except KeyError:
+                type_parameters = types[id(branch.type)] = tuple(
+                    _type_value(branch.type, key)
+                    for key in ('R_per_km', 'L_per_km', 'I_max_th', 'U_n'))
+            parameters.append(type_parameters)
+            s_res.append(_results(branch, 's_res'))
+
+        m = len(branches)
+        branch_nodes = np.array(branch_nodes, dtype=np.int32).reshape(m, 2)
+        length = np.array([_.length for _ in branches], dtype=np.float64)
+        parameters = np.array(parameters, dtype=np.float64).reshape(m, 4)
+
+        # CSR adjacency: both directions of branches sorted by (row, column)
+        rows = np.concatenate([branch_nodes[:, 0], branch_nodes[:, 1]])
+        columns = np.concatenate([branch_nodes[:, 1], branch_nodes[:, 0]])
+        order = np.lexsort((columns, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+        arrays = {
+            'node_type': node_type,
+            'x': coordinates[:, 0].copy(),
+            'y': coordinates[:, 1].copy(),
+            'peak_load': peak_load,
+            'generation': generation,
+            'voltage_res': voltage_res,
+            'indptr': indptr,
+            'indices': columns[order].astype(np.int32),
+            'adjacency_branch': np.tile(
+                np.arange(m, dtype=np.int32), 2)[order],
+            'branch_nodes': branch_nodes,
+            'length': length,
+            'resistance': parameters[:, 0] * length / 1e3,
+            'reactance': parameters[:, 1] / 1e3 * omega * length / 1e3,
+            'i_max_th': parameters[:, 2],
+            'u_n': parameters[:, 3],
+            's_res': np.array(s_res, dtype=np.float64).reshape(m, 2)}
+
+        snapshot = cls(nodes, branches, arrays)
+        snapshot._node_index = node_index
+        return snapshot
+
+    def __len__(self):
+        return len(self.node_type)
+
+    @property
+    def branch_count(self):
+        """:obj:`int`: Count of branches"""
+        return len(self.length)
+
+    def node_index(self, node):
+        """
+        Returns index of `node`
+
+        Parameters
+        ----------
+        node : ding0 node object
+            Node of grid
+
+        Returns
+        -------
+        :obj:`int`
+            Index
+        """
+        if self._node_index is None:
+            self._node_index = {node: idx
+                                for idx, node in enumerate(self.nodes)}
+        return self._node_index[node]
+
+    def branch_index(self, branch):
+        """
+        Returns index of `branch`
+
+        Parameters
+        ----------
+        branch : :class:`~.ding0.core.network.BranchDing0`
+            Branch of grid
+
+        Returns
+        -------
+        :obj:`int`
+            Index
+        """
+        if self._branch_index is None:
+            self._branch_index = {id(branch): idx
+                                  for idx, branch in enumerate(self.branches)}
+        return self._branch_index[id(branch)]
+
+    def neighbors(self, idx):
+        """
+        Returns indices of neighbors of node `idx`
+
+        Parameters
+        ----------
+        idx : :obj:`int`
+            Index of node
+
+        Returns
+        -------
+        :numpy:`numpy.ndarray`
+            Indices of neighbors (sorted)
+        """
+        return self.indices[self.indptr[idx]:self.indptr[idx + 1]]
+
+    def nodes_of_type(self, node_type):
+        """
+        Returns indices of nodes of a type
+
+        Parameters
+        ----------
+        node_type : :obj:`str`
+            Type, one of :data:`NODE_TYPES`
+
+        Returns
+        -------
+        :numpy:`numpy.ndarray`
+            Indices of nodes
+        """
+        return np.flatnonzero(self.node_type == NODE_TYPES.index(node_type))
+
+    def to_shared_memory(self):
+        """
+        Copies arrays to a block of shared memory
+
+        The block can be attached by other processes using
+        :meth:`from_shared_memory` (objects are not shared). It is released
+        by :meth:`close` of this snapshot (the creator), which unlinks it.
+        On Python < 3.8 (no :mod:`multiprocessing.shared_memory`) the block
+        is a memory-mapped temporary file.
+
+        Returns
+        -------
+        :obj:`str`
+            Name of shared memory block
+        :obj:`dict`
+            Layout of arrays in block, to be passed to
+            :meth:`from_shared_memory`
+        """
+        layout = {}
+        offset = 0
+        for name, dtype, _ in ARRAYS:
+            array = getattr(self, name)
+            # align arrays to 8 bytes
+            offset = -(-offset // 8) * 8
+            layout[name] = (offset, array.shape)
+            offset += array.nbytes
+
+        self._shm = _shared_memory_block(create=True, size=max(offset, 1))
+        for name, dtype, _ in ARRAYS:
+            array_offset, shape = layout[name]
+            np.ndarray(shape, dtype=dtype, buffer=self._shm.buf,
+                       offset=array_offset)[...] = getattr(self, name)
+        self._shm_owner = True
+
+        return self._shm.name, layout
+
+    @classmethod
+    def from_shared_memory(cls, name, layout):
+        """
+        Attaches snapshot from a block of shared memory
+
+        Parameters
+        ----------
+        name : :obj:`str`
+            Name of shared memory block
+        layout : :obj:`dict`
+            Layout of arrays in block
+
+        Returns
+        -------
+        :class:`GridArraysDing0`
+            Snapshot without node and branch objects, arrays are views of the
+            shared memory (valid until :meth:`close`)
+
+        See Also
+        --------
+        to_shared_memory : copies snapshot to shared memory
+        """
+        shm = _shared_memory_block(name=name)
+        arrays = {}
+        for array_name, dtype, _ in ARRAYS:
+            offset, shape = layout[array_name]
+            arrays[array_name] = np.ndarray(shape, dtype=dtype,
+                                            buffer=shm.buf, offset=offset)
+        snapshot = cls(None, None, arrays)
+        snapshot._shm = shm
+        return snapshot
+
+    def close(self):
+        """Releases shared memory of snapshot (if any)
+
+        Arrays of a snapshot attached from shared memory must not be used
+        after closing.
+        """
+        if self._shm is None:
+            return
+        if not self._shm_owner:
+            for name, _, _ in ARRAYS:
+                setattr(self, name, None)
+        self._shm.close()
+        if self._shm_owner:
+            self._shm.unlink()
+        self._shm = None
@@ -25,6 +25,8 @@ class MVCableDistributorDing0(CableDistributorDing0):
         Description #TODO
     """
 
+    __slots__ = ('lv_load_area_group',)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -58,6 +60,8 @@ class LVCableDistributorDing0(CableDistributorDing0):
     
     """
 
+    __slots__ = ('string_id', 'branch_no', 'load_no', 'in_building')
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
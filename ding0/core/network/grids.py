@@ -25,6 +25,7 @@ from ding0.tools import config as cfg_ding0, pypsa_io, tools
 from ding0.tools.geo import calc_geo_dist_vincenty
 from ding0.grid.mv_grid.tools import set_circuit_breakers
 from ding0.flexopt.reinforce_grid import *
+from ding0.flexopt.check_tech_constraints import get_mv_impedance
 from ding0.core.structure.regions import LVLoadAreaCentreDing0
 
 import os
@@ -348,10 +349,7 @@ class MVGridDing0(GridDing0):
         # LV grid:
         for lv_load_area in self.grid_district.lv_load_areas():
             for lv_grid_district in lv_load_area.lv_grid_districts():
-                ctr = 1
-                for branch in lv_grid_district.lv_grid.graph_edges():
-                    branch['branch'].id_db = lv_grid_district.id_db * 10**7 + ctr
-                    ctr += 1
+                lv_grid_district.lv_grid.set_branch_ids()
 
     def routing(self, debug=False, anim=None):
         """ Performs routing on Load Area centres to build MV grid with ring topology.
@@ -782,6 +780,57 @@ class MVGridDing0(GridDing0):
                                             export_pypsa_dir=export_pypsa_dir,
                                             debug=debug)
 
+    def run_powerflow_timeseries(self, session, load_profile=None,
+                                 generation_profile=None, pf_config=None,
+                                 chunk_size=None, debug=False):
+        """ Performs time series power flow calculation for MV grid
+
+        Args
+        ----
+        session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+            Database session
+        load_profile: :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+            Normalized load profile, see
+            :func:`~.tools.pypsa_io.run_powerflow_timeseries`
+        generation_profile: :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+            Normalized generation profile, see
+            :func:`~.tools.pypsa_io.run_powerflow_timeseries`
+        pf_config: :class:`~.ding0.core.powerflow.PFConfigDing0`
+            Scenarios and time ranges to be analyzed. Defaults to PF config
+            of network.
+        chunk_size: :obj:`int`
+            Number of snapshots solved at once
+        debug: bool, defaults to False
+            If True, information is printed during process
+
+        Returns
+        -------
+        :obj:`dict`
+            Results (:class:`~.ding0.core.powerflow.PFTimeseriesResultsDing0`)
+            keyed by scenario
+        """
+
+        if pf_config is None:
+            pf_config = self.network._pf_config
+
+        components, components_data = self.export_to_pypsa(session,
+                                                           'onthefly')
+
+        results = {}
+        for scenario, timerange in zip(pf_config.scenarios,
+                                       pf_config.timesteps):
+            results[scenario] = pypsa_io.run_powerflow_timeseries(
+                components,
+                components_data,
+                self,
+                timerange,
+                load_profile=load_profile,
+                generation_profile=generation_profile,
+                chunk_size=chunk_size,
+                debug=debug)
+
+        return results
+
     def import_powerflow_results(self, session):
         """Assign results from power flow analysis to edges and nodes
 
@@ -826,6 +875,27 @@ class MVGridDing0(GridDing0):
         return 'mv_grid_' + str(self.id_db)
 
 
+class _LVGridMaterializedAttribute:
+    """ Attribute of a LV grid that materializes a lazy LV grid on access
+
+    Value is stored in instance's `__dict__` under the attribute's own name,
+    hence pickles of LV grids are not affected.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, grid, owner=None):
+        if grid is None:
+            return self
+        if grid.__dict__.get('_pending_steps'):
+            grid.materialize()
+        return grid.__dict__[self.name]
+
+    def __set__(self, grid, value):
+        grid.__dict__[self.name] = value
+
+
 class LVGridDing0(GridDing0):
     """ DING0 low voltage grid
 
@@ -841,9 +911,21 @@ class LVGridDing0(GridDing0):
     Note
     -----
         It is assumed that LV grid have got cables only (attribute 'default_branch_kind')
+
+        A LV grid can be built lazily (see :meth:`build_grid`). In this case,
+        it only holds station, transformers and generators (sufficient for MV
+        grid studies) and all further steps (building branches, connecting
+        generators, setting branch ids, reinforcement) are recorded. They are
+        performed on first access of grid's graph, loads or cable
+        distributors (see :meth:`materialize`).
     """
 
+    _graph = _LVGridMaterializedAttribute()
+    _loads = _LVGridMaterializedAttribute()
+    _cable_distributors = _LVGridMaterializedAttribute()
+
     def __init__(self, **kwargs):
+        self._pending_steps = []
         super().__init__(**kwargs)
 
         self.default_branch_kind = kwargs.get('default_branch_kind', 'cable')
@@ -913,21 +995,67 @@ class LVGridDing0(GridDing0):
             self._cable_distributors.append(lv_cable_dist)
             self.graph_add_node(lv_cable_dist)
 
-    def build_grid(self):
+    @property
+    def materialized(self):
+        """:obj:`bool`: False if LV grid was built lazily and steps are
+        pending"""
+        return not self.__dict__.get('_pending_steps')
+
+    def materialize(self):
+        """Performs all steps pending on a lazily built LV grid
+
+        Steps are performed in order they were requested. Nothing is done if
+        grid is already materialized.
+        """
+        steps, self._pending_steps = self._pending_steps, []
+
+        for step, kwargs in steps:
+            getattr(self, step)(**kwargs)
+
+    def _defer(self, step, **kwargs):
+        """Records `step` if LV grid is not materialized yet
+
+        Returns
+        -------
+        :obj:`bool`
+            True if step was deferred
+        """
+        if self.materialized:
+            return False
+
+        self._pending_steps.append((step, kwargs))
+        return True
+
+    def build_grid(self, lazy=False):
         """Create LV grid graph
+
+        Args
+        ----
+        lazy: bool, defaults to False
+            If True, only transformers are added to the station. The branches
+            are built on first access of the grid, see :meth:`materialize`.
         """
 
         # add required transformers
         build_grid.transformer(self)
 
+        if lazy:
+            self._pending_steps = [('build_branches', {})]
+        else:
+            self.build_branches()
+
+        #self.graph_draw(mode='LV')
+
+    def build_branches(self):
+        """Create branches, cable distributors and loads of LV grid graph
+        """
+
         # add branches of sectors retail/industrial and agricultural
         build_grid.build_ret_ind_agr_branches(self.grid_district)
 
         # add branches of sector residential
         build_grid.build_residential_branches(self.grid_district)
 
-        #self.graph_draw(mode='LV')
-
     def connect_generators(self, debug=False):
         """ Connects LV generators (graph nodes) to grid (graph)
 
@@ -936,15 +1064,46 @@ class LVGridDing0(GridDing0):
         debug: bool, defaults to False
              If True, information is printed during process
         """
+        if self._defer('connect_generators', debug=debug):
+            return
 
         self._graph = lv_connect.lv_connect_generators(self.grid_district, self._graph, debug)
 
-    def reinforce_grid(self):
+    def set_branch_ids(self):
+        """ Generates and sets ids of branches of LV grid.
+        """
+        if self._defer('set_branch_ids'):
+            return
+
+        ctr = 1
+        for branch in self.graph_edges():
+            branch['branch'].id_db = self.grid_district.id_db * 10**7 + ctr
+            ctr += 1
+
+    def reinforce_grid(self, mv_impedance=None):
         """ Performs grid reinforcement measures for current LV grid.
+
+        Args
+        ----
+        mv_impedance: :obj:`list`, defaults to None
+            Resistance and reactance of MV grid between HV-MV and MV-LV
+            station. If None, it is determined from the current MV grid.
+            If the reinforcement of a lazily built grid is deferred, the MV
+            impedance is determined when reinforcement is requested as the
+            MV grid may change until the grid is materialized (e.g. circuit
+            breakers are closed).
         """
         # TODO: Finalize docstring
+        if not self.materialized:
+            self._defer('reinforce_grid',
+                        mv_impedance=get_mv_impedance(self))
+            return
 
-        reinforce_grid(self, mode='LV')
+        self._mv_impedance = mv_impedance
+        try:
+            reinforce_grid(self, mode='LV')
+        finally:
+            del self._mv_impedance
 
     def __repr__(self):
         return 'lv_grid_' + str(self.id_db)
@@ -26,6 +26,8 @@ class MVLoadDing0(LoadDing0):
     """
     # TODO: Currently not used, check later if still required
 
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -42,6 +44,8 @@ class LVLoadDing0(LoadDing0):
     Current attributes to fulfill requirements of typified model grids.
     """
 
+    __slots__ = ('string_id', 'branch_no', 'load_no')
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
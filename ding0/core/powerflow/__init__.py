@@ -14,7 +14,8 @@ __author__     = "nesnoj, gplssm"
 
 
 from datetime import datetime
-from pandas import DatetimeIndex
+from pandas import DatetimeIndex, DataFrame
+import numpy as np
 
 
 class PFConfigDing0:
@@ -105,6 +106,76 @@ class PFConfigDing0:
         return self._srid
 
 
+class PFTimeseriesResultsDing0:
+    """ Compact container for results of a time series power flow
+
+    Results are stored in two dense arrays (one row per snapshot) instead of
+    lists attached to each node and branch object.
+
+    Parameters
+    ----------
+    timerange: :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Snapshots of the power flow
+    bus_ids: :obj:`list` of :obj:`str`
+        PyPSA ids of buses, defines column order of `v_mag_pu`
+    line_ids: :obj:`list` of :obj:`str`
+        PyPSA ids of lines, defines column order of `s_res`
+    grid_id: :obj:`int`
+        Id of the grid the results belong to
+    dtype: :numpy:`numpy.dtype`
+        Data type of result arrays, defaults to float64
+
+    Attributes
+    ----------
+    v_mag_pu: :numpy:`numpy.ndarray`
+        Voltage magnitude in p.u. with shape (snapshots, buses)
+    s_res: :numpy:`numpy.ndarray`
+        Apparent power in MVA with shape (snapshots, lines)
+    """
+
+    def __init__(self, timerange, bus_ids, line_ids, grid_id=None,
+                 dtype=np.float64):
+        self.timerange = timerange
+        self.grid_id = grid_id
+        self.bus_ids = list(bus_ids)
+        self.line_ids = list(line_ids)
+        self._bus_idx = {bus_id: idx for idx, bus_id in enumerate(self.bus_ids)}
+        self._line_idx = {line_id: idx
+                          for idx, line_id in enumerate(self.line_ids)}
+
+        self.v_mag_pu = np.full((len(timerange), len(self.bus_ids)), np.nan,
+                                dtype=dtype)
+        self.s_res = np.full((len(timerange), len(self.line_ids)), np.nan,
+                             dtype=dtype)
+
+    def voltage(self, bus_id):
+        """ Returns voltage time series (p.u.) of bus `bus_id` """
+        return self.v_mag_pu[:, self._bus_idx[bus_id]]
+
+    def apparent_power(self, line_id):
+        """ Returns apparent power time series (MVA) of line `line_id` """
+        return self.s_res[:, self._line_idx[line_id]]
+
+    def node_voltage(self, node):
+        """ Returns voltage time series (p.u.) of a ding0 node """
+        return self.voltage(node.pypsa_id)
+
+    def branch_apparent_power(self, branch):
+        """ Returns apparent power time series (MVA) of a ding0 branch """
+        return self.apparent_power(
+            '_'.join(['MV', str(self.grid_id), 'lin', str(branch.id_db)]))
+
+    def v_mag_pu_to_dataframe(self):
+        """ Returns voltages as DataFrame (snapshots x buses) """
+        return DataFrame(self.v_mag_pu, index=self.timerange,
+                         columns=self.bus_ids)
+
+    def s_res_to_dataframe(self):
+        """ Returns apparent power as DataFrame (snapshots x lines) """
+        return DataFrame(self.s_res, index=self.timerange,
+                         columns=self.line_ids)
+
+
 def q_sign(reactive_power_mode_string, sign_convention):
     """
     Gets the correct sign for Q time series given 'inductive' and 'capacitive' and the 'generator'
@@ -188,10 +188,10 @@ class LVLoadAreaDing0(RegionDing0):
             for attribute in list(db_data.keys()):
                 setattr(self, attribute, db_data[attribute])
 
-        # convert geo attributes to to shapely objects
-        if hasattr(self, 'geo_area'):
+        # convert geo attributes to to shapely objects (if passed as WKT)
+        if isinstance(getattr(self, 'geo_area', None), str):
             self.geo_area = wkt_loads(self.geo_area)
-        if hasattr(self, 'geo_centre'):
+        if isinstance(getattr(self, 'geo_centre', None), str):
             self.geo_centre = wkt_loads(self.geo_centre)
 
         # convert load values (rounded floats) to int
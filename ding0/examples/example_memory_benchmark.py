@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io
+
+Note
+-----
+
+This example file measures the memory of nodes and branches of the grids of a
+synthetic MV grid district (see :mod:`ding0.tools.synthetic`) per instance:
+as they are stored (in `__slots__`, see
+:class:`~.ding0.core.network.SlottedDing0`) and as they were stored before
+(in an instance `__dict__`). No database connection is required.
+
+"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+import sys
+import tracemalloc
+from collections import defaultdict
+
+import pandas as pd
+
+from ding0.core import NetworkDing0
+from ding0.core.network import SlottedDing0
+from ding0.tools.logger import setup_logger
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+def grid_objects(mv_grid_district):
+    '''Collects slotted objects of MV grid and LV grids of a MV grid district
+
+    Parameters
+    ----------
+    mv_grid_district : :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid district
+
+    Returns
+    -------
+    :obj:`dict`
+        Lists of objects keyed by class
+    '''
+    grids = [mv_grid_district.mv_grid]
+    for lv_load_area in mv_grid_district.lv_load_areas():
+        for lv_grid_district in lv_load_area.lv_grid_districts():
+            grids.append(lv_grid_district.lv_grid)
+
+    objects = {}
+    for grid in grids:
+        candidates = list(grid._graph.nodes())
+        candidates.extend(branch for _, _, branch in
+                          grid._graph.edges(data='branch'))
+        if grid._station is not None:
+            candidates.extend(grid._station.transformers())
+        for obj in candidates:
+            if isinstance(obj, SlottedDing0):
+                objects[id(obj)] = obj
+
+    by_class = defaultdict(list)
+    for obj in objects.values():
+        by_class[type(obj)].append(obj)
+    return by_class
+
+
+def instance_memory(objects, slots=True):
+    '''Measures memory per instance of copies of `objects`
+
+    Only the instances are measured, not their attribute values (these are
+    shared with the original objects).
+
+    Parameters
+    ----------
+    objects : :obj:`list`
+        Objects of one slotted class
+    slots : :obj:`bool`
+        If False, instances of a class with an instance `__dict__` (as
+        before :class:`~.ding0.core.network.SlottedDing0`) are measured.
+        Their attributes are set one by one as in `__init__()`.
+
+    Returns
+    -------
+    :obj:`float`
+        Bytes per instance
+    '''
+    states = [obj.__getstate__() for obj in objects]
+    cls = type(objects[0])
+    if slots:
+        def create(state):
+            instance = cls.__new__(cls)
+            instance.__setstate__(state)
+            return instance
+    else:
+        cls_dict = type(cls.__name__, (), {})
+
+        def create(state):
+            instance = cls_dict()
+            for name, value in state.items():
+                setattr(instance, name, value)
+            return instance
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        copies = [create(state) for state in states]
+        size = (tracemalloc.get_traced_memory()[0] - start -
+                sys.getsizeof(copies))
+    finally:
+        tracemalloc.stop()
+
+    return size / len(copies)
+
+
+def memory_benchmark(n_load_areas, seed=None):
+    '''Measures memory of nodes and branches of a synthetic MV grid district
+
+    Parameters
+    ----------
+    n_load_areas: :obj:`int`
+        Count of load areas of MV grid district
+    seed: :obj:`int`
+        Seed of synthetic input data
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Count of instances, bytes per instance with instance `__dict__`
+        ('dict') and with `__slots__` ('slots') per class (index), the last
+        row holds the totals in MiB
+    '''
+    nd = NetworkDing0(name='synthetic_{}'.format(n_load_areas))
+    mv_grid_district, = build_synthetic_mv_grid_districts(
+        nd, [1], n_load_areas, seed=seed)
+    nd.mv_parametrize_grid()
+    nd.validate_grid_districts()
+    nd.build_lv_grids()
+    nd.mv_routing()
+    nd.connect_generators()
+    nd.set_branch_ids()
+    nd.set_circuit_breakers()
+
+    table = pd.DataFrame(
+        [{'class': cls.__name__,
+          'count': len(objects),
+          'dict': instance_memory(objects, slots=False),
+          'slots': instance_memory(objects, slots=True)}
+         for cls, objects in grid_objects(mv_grid_district).items()]
+    ).set_index('class').sort_index()
+
+    totals = table[['dict', 'slots']].mul(table['count'], axis=0).sum()
+    table.loc['total [MiB]'] = [table['count'].sum(),
+                                totals['dict'] / 1024 ** 2,
+                                totals['slots'] / 1024 ** 2]
+    table['saving'] = 1 - table['slots'] / table['dict']
+
+    return table
+
+
+if __name__ == '__main__':
+    logger = setup_logger()
+
+    with pd.option_context('display.width', 200,
+                           'display.max_columns', None):
+        print(memory_benchmark(50, seed=1).round(3))
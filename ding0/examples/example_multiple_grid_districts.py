@@ -22,6 +22,7 @@ from sqlalchemy.orm import sessionmaker
 
 from ding0.core import NetworkDing0
 from ding0.tools import config as cfg_ding0, results
+from ding0.tools.export import ExportWriterDing0
 from egoio.tools import db
 import json
 from datetime import datetime
@@ -58,7 +59,7 @@ def create_results_dirs(base_path):
 
 
 def run_multiple_grid_districts(mv_grid_districts, run_id, failsafe=False,
-                                base_path=None):
+                                base_path=None, export_formats=None):
     """
     Perform ding0 run on given grid districts
 
@@ -79,6 +80,12 @@ def run_multiple_grid_districts(mv_grid_districts, run_id, failsafe=False,
         windows systems).
         Specify your own but keep in mind that it a required a particular
         structure of subdirectories.
+    export_formats : :obj:`list` of :obj:`str`
+        If set, the tables of each MV grid district are exported to
+        datasets of these formats ('parquet' and/or 'csv') in
+        :code:`grids/Ding0_<run_id>_export` as soon as the district is
+        finished, see :class:`~.ding0.tools.export.ExportWriterDing0`.
+        Default is `None` (no export).
 
     Returns
     -------
@@ -105,6 +112,11 @@ def run_multiple_grid_districts(mv_grid_districts, run_id, failsafe=False,
 
     corrupt_grid_districts = pd.DataFrame(columns=['id', 'message'])
 
+    if export_formats:
+        writer = ExportWriterDing0(
+            os.path.join(base_path, "grids", 'Ding0_{}_export'.format(run_id)),
+            formats=export_formats)
+
     for mvgd in mv_grid_districts:
         # instantiate ding0  network object
         nd = NetworkDing0(name='network', run_id=run_id)
@@ -119,6 +131,8 @@ def run_multiple_grid_districts(mv_grid_districts, run_id, failsafe=False,
 
             # save results
             results.save_nd_to_pickle(nd, os.path.join(base_path, "grids"))
+            if export_formats:
+                writer.write(nd)
         else:
             # try to perform ding0 run on grid district
             try:
@@ -134,6 +148,8 @@ def run_multiple_grid_districts(mv_grid_districts, run_id, failsafe=False,
                 else:
                     results.save_nd_to_pickle(nd, os.path.join(base_path,
                                                                "grids"))
+                    if export_formats:
+                        writer.write(nd)
             except Exception as e:
                 corrupt_grid_districts = corrupt_grid_districts.append(
                     pd.Series({'id': mvgd,
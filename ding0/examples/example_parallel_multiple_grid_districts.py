@@ -25,13 +25,15 @@ __author__     = "nesnoj, gplssm"
 import time
 from datetime import datetime
 import os
-import itertools
 
 from ding0.core import NetworkDing0
 from ding0.tools import results
+from ding0.tools.export import ExportWriterDing0
+from ding0.tools.profiling import write_metrics, aggregate_metrics
+from ding0.tools.scheduler import run_tasks, load_area_counts
 from egoio.tools import db
 
-from math import floor
+from functools import partial
 import multiprocessing as mp
 import pandas as pd
 import json
@@ -44,12 +46,16 @@ BASEPATH = os.path.join(os.path.expanduser('~'), '.ding0')
 
 ########################################################
 def parallel_run(districts_list, n_of_processes, n_of_districts, run_id,
-                 base_path=None):
+                 base_path=None, timeout=None, max_tasks_per_worker=None,
+                 export_formats=None):
     '''Organize parallel runs of ding0.
 
-    The function take all districts in a list and divide them into
-    n_of_processes parallel processes. For each process, the assigned districts
-    are given to the function process_runs() with the argument n_of_districts
+    The function take all districts in a list and divide them into clusters
+    of n_of_districts each. Clusters are dispatched one by one to
+    n_of_processes worker processes (largest clusters by count of load areas
+    first) and are processed by process_run(). The result of each cluster is
+    streamed to `Ding0_<run_id>_runs.pkl` as soon as it is finished (see
+    :func:`~.ding0.tools.scheduler.read_results`).
 
     Parameters
     ----------
@@ -59,7 +65,7 @@ def parallel_run(districts_list, n_of_processes, n_of_districts, run_id,
         Number of processes to run in parallel
     n_of_districts: :obj:`int`
         Number of districts to be run in each cluster given as argument to
-        process_stats()
+        process_run()
     run_id: :obj:`str`
         Identifier for a run of Ding0. For example it is used to create a
         subdirectory of os.path.join(`base_path`, 'results')
@@ -69,10 +75,26 @@ def parallel_run(districts_list, n_of_processes, n_of_districts, run_id,
         windows systems).
         Specify your own but keep in mind that it a required a particular
         structure of subdirectories.
+    timeout : :obj:`float`
+        Time limit per cluster in seconds (None: no limit)
+    max_tasks_per_worker : :obj:`int`
+        Count of clusters after which a worker process is replaced
+    export_formats : :obj:`list` of :obj:`str`
+        If set, the tables of each cluster's districts are exported to
+        datasets of these formats ('parquet' and/or 'csv') in
+        :code:`<run_id>/Ding0_<run_id>_export` as soon as the cluster is
+        finished, see :class:`~.ding0.tools.export.ExportWriterDing0`.
+        Default is `None` (no export).
+
+    Returns
+    -------
+    :obj:`list` of :obj:`tuple`
+        Name of network, status, message and metadata for each cluster
 
     See Also
     --------
-    ding0_runs
+    process_run
+    ding0.tools.scheduler.run_tasks
 
     '''
 
@@ -85,66 +107,75 @@ def parallel_run(districts_list, n_of_processes, n_of_districts, run_id,
 
     start = time.time()
     #######################################################################
-    # Define an output queue
-    output_info = mp.Queue()
-    #######################################################################
-    # Setup a list of processes that we want to run
-    max_dist = len(districts_list)
-    threat_long = floor(max_dist / n_of_processes)
+    # Setup clusters of districts, large clusters are run first
+    clusters = [districts_list[x:x + n_of_districts]
+                for x in range(0, len(districts_list), n_of_districts)]
 
-    if threat_long == 0:
-        threat_long = 1
-
-    threats = [districts_list[x:x + threat_long] for x in range(0, len(districts_list), threat_long)]
+    engine = db.connection(readonly=True)
+    session = sessionmaker(bind=engine)()
+    load_areas = load_area_counts(session, NetworkDing0(name='').orm,
+                                  districts_list)
+    session.close()
+    weights = [sum(load_areas[_] for _ in cl) for cl in clusters]
 
-    processes = []
-    for th in threats:
-        mv_districts = th
-        processes.append(mp.Process(target=process_runs,
-                                    args=(mv_districts, n_of_districts,
-                                          output_info, run_id, base_path)))
     #######################################################################
-    # Run processes
-    for p in processes:
-        p.start()
-    # Resque output_info from processes
-    output = [output_info.get() for p in processes]
-    output = list(itertools.chain.from_iterable(output))
-    # Exit the completed processes
-    for p in processes:
-        p.join()
+    # Run clusters
+    records = run_tasks(partial(process_run, run_id=run_id,
+                                base_path=base_path,
+                                export_formats=export_formats),
+                        clusters,
+                        processes=n_of_processes,
+                        weights=weights,
+                        timeout=timeout,
+                        max_tasks_per_worker=max_tasks_per_worker,
+                        results_file=os.path.join(
+                            base_path, run_id,
+                            'Ding0_{}_runs.pkl'.format(run_id)))
+
+    output = [record['result'] if record['status'] == 'ok'
+              else (cluster_name(record['task']), record['status'],
+                    record['error'], None)
+              for record in records]
 
     #######################################################################
-    print('Elapsed time for', str(max_dist),
+    print('Elapsed time for', str(len(districts_list)),
           'MV grid districts (seconds): {}'.format(time.time() - start))
 
     return output
 
+
+def cluster_name(mv_districts):
+    '''Returns name of network of a cluster of districts'''
+    nw_name = 'ding0_grids_' + str(mv_districts[0])
+    if not mv_districts[0] == mv_districts[-1]:
+        nw_name = nw_name + '_to_' + str(mv_districts[-1])
+    return nw_name
+
+
 ########################################################
-def process_runs(mv_districts, n_of_districts, output_info, run_id, base_path):
-    '''Runs a process organized by parallel_run()
+def process_run(mv_districts, run_id, base_path, export_formats=None):
+    '''Runs a cluster of districts, organized by parallel_run()
 
-    The function take all districts mv_districts and divide them into clusters
-    of n_of_districts each. For each cluster, ding0 is run and the resulting
-    network is saved as a pickle
+    Ding0 is run for all districts mv_districts and the resulting network is
+    saved as a pickle
 
     Parameters
     ----------
     mv_districts: :obj:`list` of int
-        List with all districts to be run.
-    n_of_districts: :obj:`int`
-        Number of districts in a cluster
-    output_info:
-        Info about how the run went
+        List with districts of the cluster.
     run_id: :obj:`str`
         Identifier for a run of Ding0. For example it is used to create a
         subdirectory of os.path.join(`base_path`, 'results')
     base_path : :obj:`str`
         Base path for ding0 data (input, results and logs).
-        Default is `None` which sets it to :code:`~/.ding0` (may deviate on
-        windows systems).
-        Specify your own but keep in mind that it a required a particular
-        structure of subdirectories.
+    export_formats : :obj:`list` of :obj:`str`
+        Formats of datasets the tables of the districts are exported to,
+        see parallel_run(). Default is `None` (no export).
+
+    Returns
+    -------
+    :obj:`tuple`
+        Name of network, status, message and metadata
 
     See Also
     --------
@@ -156,36 +187,33 @@ def process_runs(mv_districts, n_of_districts, output_info, run_id, base_path):
     engine = db.connection(readonly=True)
     session = sessionmaker(bind=engine)()
 
-    #############################
-    clusters = [mv_districts[x:x + n_of_districts] for x in range(0, len(mv_districts), n_of_districts)]
-    output_clusters= []
-
-    for cl in clusters:
-        print('\n########################################')
-        print('  Running ding0 for district', cl)
-        print('########################################')
-
-        nw_name = 'ding0_grids_' + str(cl[0])
-        if not cl[0] == cl[-1]:
-            nw_name = nw_name+'_to_'+str(cl[-1])
-        nw = NetworkDing0(name=nw_name)
-        try:
-            msg = nw.run_ding0(session=session, mv_grid_districts_no=cl)
-            if msg:
-                status = 'run error'
-            else:
-                msg = ''
-                status = 'OK'
-                results.save_nd_to_pickle(nw, os.path.join(base_path, run_id))
-            output_clusters.append((nw_name,status,msg, nw.metadata))
-        except Exception as e:
-            output_clusters.append((nw_name,  'corrupt dist', e, nw.metadata))
-            continue
-
-    output_info.put(output_clusters)
-
+    print('\n########################################')
+    print('  Running ding0 for district', mv_districts)
+    print('########################################')
+
+    nw_name = cluster_name(mv_districts)
+    nw = NetworkDing0(name=nw_name)
+    try:
+        msg = nw.run_ding0(session=session, mv_grid_districts_no=mv_districts,
+                           profile=True)
+        if msg:
+            status = 'run error'
+        else:
+            msg = ''
+            status = 'OK'
+            results.save_nd_to_pickle(nw, os.path.join(base_path, run_id))
+            if export_formats:
+                ExportWriterDing0(
+                    os.path.join(base_path, run_id,
+                                 'Ding0_{}_export'.format(run_id)),
+                    formats=export_formats).write(nw)
+        output = (nw_name, status, msg, nw.metadata)
+    except Exception as e:
+        output = (nw_name, 'corrupt dist', e, nw.metadata)
+    finally:
+        session.close()
 
-    #######################################################################
+    return output
 
 
 def process_metadata(meta):
@@ -214,6 +242,13 @@ def process_metadata(meta):
 
     metadata['mv_grid_districts'] = mvgds
 
+    # metrics of the single runs are kept in a separate file, only the
+    # aggregate per step is kept in metadata
+    metrics = [mvgd['metrics'] for mvgd in meta if 'metrics' in mvgd]
+    if metrics:
+        metadata['metrics'] = aggregate_metrics(metrics).reset_index().to_dict(
+            orient='records')
+
     return metadata
 
 
@@ -245,8 +280,13 @@ if __name__ == '__main__':
         index=False,
         float_format='%.0f')
 
+    # save metrics of each run (one JSON record per line)
+    meta_dict_list = [_[3] for _ in out if _[3] is not None]
+    write_metrics([_['metrics'] for _ in meta_dict_list if 'metrics' in _],
+                  os.path.join(base_path, run_id,
+                               'Ding0_{}_metrics.jsonl'.format(run_id)))
+
     # save metadata
-    meta_dict_list = [_[3] for _ in out]
     metadata = process_metadata(meta_dict_list)
     with open(os.path.join(base_path, run_id, 'Ding0_{}.meta'.format(run_id)),
               'w') as f:
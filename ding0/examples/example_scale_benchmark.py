@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io
+
+Note
+-----
+
+This example file measures how the steps of a ding0 run scale with the size
+of a MV grid district. Synthetic MV grid districts (see
+:mod:`ding0.tools.synthetic`) of 10 to 500 load areas are built, hence no
+database connection is required.
+
+"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+import os
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from ding0.core import NetworkDing0
+from ding0.tools.logger import setup_logger
+from ding0.tools.profiling import ProfilerDing0, write_metrics
+from ding0.tools.scheduler import run_tasks
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+BASEPATH = os.path.join(os.path.expanduser('~'), '.ding0')
+
+
+def run_synthetic(n_load_areas, seed=None, powerflow=True,
+                  lazy_lv_grids=False):
+    '''Runs ding0 on a synthetic MV grid district and records metrics
+
+    Steps are the ones of :meth:`~.ding0.core.NetworkDing0.run_ding0`, the
+    import (steps 1 and 2) is replaced by building the synthetic MV grid
+    district.
+
+    Parameters
+    ----------
+    n_load_areas: :obj:`int`
+        Count of load areas of MV grid district
+    seed: :obj:`int`
+        Seed of synthetic input data
+    powerflow: :obj:`bool`
+        If False, power flow and reinforcement (steps 11 and 12) are skipped
+    lazy_lv_grids: :obj:`bool`
+        If True, LV grids are built lazily
+
+    Returns
+    -------
+    :obj:`dict`
+        Metrics record, see :meth:`~.ding0.tools.profiling.ProfilerDing0.record`
+    '''
+    nd = NetworkDing0(name='synthetic_{}'.format(n_load_areas))
+    profiler = ProfilerDing0(nd)
+
+    with profiler.step(1, 'build_synthetic_mv_grid_districts'):
+        build_synthetic_mv_grid_districts(nd, [1], n_load_areas, seed=seed)
+    with profiler.step(3, 'mv_parametrize_grid'):
+        nd.mv_parametrize_grid()
+    with profiler.step(4, 'validate_grid_districts'):
+        nd.validate_grid_districts()
+    with profiler.step(5, 'build_lv_grids'):
+        nd.build_lv_grids(lazy=lazy_lv_grids)
+    with profiler.step(6, 'mv_routing'):
+        nd.mv_routing()
+    with profiler.step(7, 'connect_generators'):
+        nd.connect_generators()
+    with profiler.step(8, 'set_branch_ids'):
+        nd.set_branch_ids()
+    with profiler.step(9, 'set_circuit_breakers'):
+        nd.set_circuit_breakers()
+    with profiler.step(10, 'open_circuit_breakers'):
+        nd.control_circuit_breakers(mode='open')
+    if powerflow:
+        with profiler.step(11, 'run_powerflow'):
+            nd.run_powerflow(None, method='onthefly')
+        with profiler.step(12, 'reinforce_grid'):
+            nd.reinforce_grid()
+    with profiler.step(13, 'close_circuit_breakers'):
+        nd.control_circuit_breakers(mode='close')
+
+    record = profiler.record()
+    record['n_load_areas'] = n_load_areas
+
+    return record
+
+
+def scale_benchmark(load_area_counts, seed=None, powerflow=True,
+                    lazy_lv_grids=False, timeout=None, metrics_file=None):
+    '''Runs ding0 on synthetic MV grid districts of increasing size
+
+    Each size is run in a fresh process (one after another), hence peak RSS
+    is recorded per size.
+
+    Parameters
+    ----------
+    load_area_counts: :obj:`list` of :obj:`int`
+        Counts of load areas of MV grid districts
+    seed: :obj:`int`
+        Seed of synthetic input data
+    powerflow: :obj:`bool`
+        If False, power flow and reinforcement are skipped
+    lazy_lv_grids: :obj:`bool`
+        If True, LV grids are built lazily
+    timeout: :obj:`float`
+        Time limit per size in seconds (None: no limit)
+    metrics_file: :obj:`str`
+        If set, metrics records are appended to this JSON lines file
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Wall time, CPU time, peak RSS, count of nodes and branches per step
+        (index) and count of load areas (columns)
+    '''
+    records = run_tasks(partial(run_synthetic,
+                                seed=seed,
+                                powerflow=powerflow,
+                                lazy_lv_grids=lazy_lv_grids),
+                        load_area_counts,
+                        processes=1,
+                        timeout=timeout,
+                        retries=0,
+                        max_tasks_per_worker=1)
+    records = [record['result'] for record in records
+               if record['status'] == 'ok']
+
+    if metrics_file is not None:
+        write_metrics(records, metrics_file)
+
+    steps = pd.DataFrame([dict(step, n_load_areas=record['n_load_areas'])
+                          for record in records
+                          for step in record['steps']])
+    return steps.pivot_table(index=['step', 'name'],
+                             columns='n_load_areas',
+                             values=['wall_time', 'cpu_time', 'peak_rss',
+                                     'nodes', 'branches'])
+
+
+def scaling_exponents(wall_times):
+    '''Estimates exponent k of wall time ~ (count of load areas)^k per step
+
+    Parameters
+    ----------
+    wall_times: :pandas:`pandas.DataFrame<dataframe>`
+        Wall times per step (index) and count of load areas (columns)
+
+    Returns
+    -------
+    :pandas:`pandas.Series<series>`
+        Exponent per step (least squares fit on log-log scale)
+    '''
+    counts = np.log(wall_times.columns.values.astype(float))
+
+    def exponent(times):
+        valid = times.values > 0
+        if valid.sum() < 2:
+            return np.nan
+        return np.polyfit(counts[valid], np.log(times.values[valid]), 1)[0]
+
+    return wall_times.apply(exponent, axis=1)
+
+
+if __name__ == '__main__':
+    logger = setup_logger()
+
+    load_area_counts = [10, 20, 50, 100, 200, 500]
+    seed = 1
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    if not os.path.exists(BASEPATH):
+        os.makedirs(BASEPATH)
+    base_name = os.path.join(BASEPATH,
+                             'Ding0_{}_scale_benchmark'.format(run_id))
+
+    table = scale_benchmark(load_area_counts,
+                            seed=seed,
+                            metrics_file=base_name + '_metrics.jsonl')
+    table['wall_time', 'exponent'] = scaling_exponents(table['wall_time'])
+    table.to_csv(base_name + '.csv')
+
+    with pd.option_context('display.width', 200,
+                           'display.max_columns', None):
+        print(table[['wall_time']].round(3))
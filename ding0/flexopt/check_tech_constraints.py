@@ -23,6 +23,7 @@ from ding0.core.network.cable_distributors import LVCableDistributorDing0
 from ding0.core.network.stations import LVStationDing0
 from ding0.core.powerflow import q_sign
 import networkx as nx
+import numpy as np
 import math
 
 
@@ -220,6 +221,129 @@ def check_voltage(grid, mode):
     return [_['node'] for _ in sorted(crit_nodes.values(), key=lambda _: _['v_diff'], reverse=True)]
 
 
+class MVVoltageSensitivityDing0:
+    """ Linearized estimation of MV voltages after branch reinforcement
+
+    Based on the results of the last power flow (voltages at nodes and
+    apparent power on branches) the effect of a changed branch impedance
+    on node voltages is estimated by the sensitivity
+
+    .. math::
+        \\Delta u = \\frac{S \\cdot (\\Delta R \\cdot cos(\\phi) + \\Delta X \\cdot sin(\\phi))}{U_{nom}^2}
+
+    where S is the apparent power on the branch of the respective case (load
+    case, feed-in case). The voltage difference to the HV-MV station of all
+    nodes downstream of the branch is reduced by :math:`\\Delta u`. As the
+    MV grid is operated radially (open circuit breakers), nodes are stored in
+    DFS pre-order so that each subtree is a contiguous range.
+
+    Parameters
+    ----------
+    grid : :class:`~.ding0.core.network.grids.MVGridDing0`
+        MV grid with results of power flow
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+        freq = cfg_ding0.get('assumptions', 'frequency')
+        self._omega = 2 * math.pi * freq
+        cos_phi_load = cfg_ding0.get('assumptions', 'cos_phi_load')
+        cos_phi_feedin = cfg_ding0.get('assumptions', 'cos_phi_gen')
+        x_sign_load = q_sign(
+            cfg_ding0.get('assumptions', 'cos_phi_load_mode'), 'load')
+        x_sign_gen = q_sign(
+            cfg_ding0.get('assumptions', 'cos_phi_gen_mode'), 'generator')
+        # factors for R and X per case (load case, feed-in case)
+        self._r_factor = np.array([cos_phi_load, cos_phi_feedin])
+        self._x_factor = np.array([
+            x_sign_load * math.sin(math.acos(cos_phi_load)),
+            x_sign_gen * math.sin(math.acos(cos_phi_feedin))])
+
+        self._v_diff_max = np.array([
+            float(cfg_ding0.get('mv_routing_tech_constraints',
+                                'mv_max_v_level_lc_diff_normal')),
+            float(cfg_ding0.get('mv_routing_tech_constraints',
+                                'mv_max_v_level_fc_diff_normal'))])
+
+        tree = nx.dfs_tree(grid._graph, grid._station)
+        self.nodes = list(nx.dfs_preorder_nodes(tree, grid._station))
+        self.node_idx = {node: idx for idx, node in enumerate(self.nodes)}
+        count = len(self.nodes)
+
+        parent = np.full(count, -1, dtype=int)
+        self._branch_idx = {}
+        for idx, node in enumerate(self.nodes[1:], 1):
+            predecessor = next(tree.predecessors(node))
+            parent[idx] = self.node_idx[predecessor]
+            self._branch_idx[grid._graph.adj[node][predecessor]['branch']] = idx
+
+        self._subtree_size = np.ones(count, dtype=int)
+        for idx in range(count - 1, 0, -1):
+            self._subtree_size[parent[idx]] += self._subtree_size[idx]
+
+        # voltage difference to HV-MV station from last power flow, nodes
+        # without results are never critical
+        voltage_station = grid._station.voltage_res
+        self.v_diff = np.full((count, 2), np.nan)
+        for idx, node in enumerate(self.nodes):
+            try:
+                self.v_diff[idx] = [abs(voltage_station[0] - node.voltage_res[0]),
+                                    abs(voltage_station[1] - node.voltage_res[1])]
+            except:
+                pass
+
+    def _impedance(self, branch_type, length):
+        """ Resistance and reactance in Ohm of a branch type and length """
+        r = float(branch_type['R_per_km']) * length / 1e3
+        x = float(branch_type['L_per_km']) / 1e3 * self._omega * length / 1e3
+        return r, x
+
+    def update_branches(self, branches_old_types):
+        """ Estimate voltages after type of branches has changed
+
+        Parameters
+        ----------
+        branches_old_types : :obj:`dict`
+            Types (:pandas:`pandas.Series<series>`) before the change keyed
+            by :class:`~.ding0.core.network.BranchDing0` objects
+        """
+        for branch, old_type in branches_old_types.items():
+            idx = self._branch_idx.get(branch)
+            if idx is None or not hasattr(branch, 's_res'):
+                continue
+
+            r_old, x_old = self._impedance(old_type, branch.length)
+            r_new, x_new = self._impedance(branch.type, branch.length)
+            u_n = float(branch.type['U_n'])
+
+            # apparent power in MVA, impedance in Ohm, voltage in kV -> p.u.
+            v_delta = (np.array(branch.s_res[:2]) *
+                       ((r_old - r_new) * self._r_factor +
+                        (x_old - x_new) * self._x_factor) / u_n ** 2)
+
+            stop = idx + self._subtree_size[idx]
+            self.v_diff[idx:stop] = np.maximum(self.v_diff[idx:stop] - v_delta,
+                                               0)
+
+    def critical_nodes(self):
+        """ Nodes with estimated voltage issues
+
+        Returns
+        -------
+        :obj:`list`
+            Critical nodes sorted descending by voltage difference (see
+            :func:`check_voltage`)
+        """
+        with np.errstate(invalid='ignore'):
+            crit = np.any(self.v_diff > self._v_diff_max, axis=1)
+        crit_idx = np.flatnonzero(crit)
+        v_diff_max = np.max(self.v_diff[crit_idx], axis=1)
+
+        return [self.nodes[idx]
+                for idx in crit_idx[np.argsort(-v_diff_max, kind='stable')]]
+
+
 def get_critical_line_loading(grid):
     """
     Assign line loading to each branch determined by peak load and peak
@@ -405,94 +529,292 @@ def get_critical_voltage_at_nodes(grid):
         Erzeugungsanlagen am Niederspannungsnetz, 2011
     """
 
-    v_delta_tolerable_fc = cfg_ding0.get('assumptions',
-                                      'lv_max_v_level_fc_diff_normal')
-    v_delta_tolerable_lc = cfg_ding0.get('assumptions',
-                                      'lv_max_v_level_lc_diff_normal')
-
-    crit_nodes = []
-
-    # get list of nodes of main branch in right order
-    tree = nx.dfs_tree(grid._graph, grid._station)
-
-    # list for nodes of main branch
-    main_branch = []
-
-    # list of stub cable distributors branching from main branch
-    grid_conn_points = []
-
-    # fill two above lists
-    for node in list(nx.descendants(tree, grid._station)):
-        successors = list(tree.successors(node))
-        if successors and all(isinstance(successor, LVCableDistributorDing0)
-               for successor in successors):
-            main_branch.append(node)
-        elif (isinstance(node, LVCableDistributorDing0) and
-            all(isinstance(successor, (GeneratorDing0, LVLoadDing0))
-               for successor in successors)):
-            grid_conn_points.append(node)
-
-    v_delta_load_case_bus_bar, v_delta_gen_case_bus_bar  = get_voltage_at_bus_bar(grid, tree)
-
-    if (abs(v_delta_gen_case_bus_bar) > v_delta_tolerable_fc
-        or abs(v_delta_load_case_bus_bar) > v_delta_tolerable_lc):
-        crit_nodes.append({'node': grid._station,
-                           'v_diff': [v_delta_load_case_bus_bar,
-                                      v_delta_gen_case_bus_bar]})
-
-
-
-    # voltage at main route nodes
-    for first_node in [b for b in tree.successors(grid._station)
-                   if b in main_branch]:
-
-        # initiate loop over feeder
-        successor = first_node
-        # cumulative voltage drop/increase at substation bus bar
-        v_delta_load_cum = v_delta_load_case_bus_bar
-        v_delta_gen_cum = v_delta_gen_case_bus_bar
-
-        # successively determine voltage levels for succeeding nodes
-        while successor:
-            # calculate voltage drop over preceding line
-            voltage_delta_load, voltage_delta_gen  = get_delta_voltage_preceding_line(grid, tree, successor)
-            # add voltage drop over preceding line
-            v_delta_load_cum += voltage_delta_load
-            v_delta_gen_cum += voltage_delta_gen
-
-            # roughly estimate transverse voltage drop
-            stub_node = [_ for _ in tree.successors(successor) if
-                         _ not in main_branch][0]
-            v_delta_load_stub, v_delta_gen_stub  = get_delta_voltage_preceding_line(grid, tree, stub_node)
-
-            # check if voltage drop at node exceeds tolerable voltage drop
-            if (abs(v_delta_gen_cum) > (v_delta_tolerable_fc)
-                or abs(v_delta_load_cum) > (
-                            v_delta_tolerable_lc)):
-                # add node and successing stub node to critical nodes
-                crit_nodes.append({'node': successor,
-                                   'v_diff': [v_delta_load_cum,
-                                              v_delta_gen_cum]})
-                crit_nodes.append({'node': stub_node,
-                                   'v_diff': [
-                                       v_delta_load_cum + v_delta_load_stub,
-                                       v_delta_gen_cum + v_delta_gen_stub]})
-            # check if voltage drop at stub node exceeds tolerable voltage drop
-            elif ((abs(v_delta_gen_cum + v_delta_gen_stub) > v_delta_tolerable_fc)
-                or (abs(v_delta_load_cum + v_delta_load_stub) > v_delta_tolerable_lc)):
-                # add stub node to critical nodes
-                crit_nodes.append({'node': stub_node,
-                                   'v_diff': [
-                                       v_delta_load_cum + v_delta_load_stub,
-                                       v_delta_gen_cum + v_delta_gen_stub]})
-
-
-            successor = [_ for _ in tree.successors(successor)
-                         if _ in main_branch]
-            if successor:
-                successor = successor[0]
-
-    return crit_nodes
+    return LVVoltageEstimationDing0(grid).critical_nodes()
+
+
+class LVVoltageEstimationDing0:
+    """ Estimation of voltage drop/increase at all nodes of a LV grid
+
+    The voltage delta at a node is the voltage delta at the bus bar of the
+    MV-LV substation plus the sum of voltage deltas over all lines on the path
+    from the substation to the node. Each line's voltage delta is estimated by
+    :func:`voltage_delta_vde` for the cumulated peak load/generation capacity
+    downstream of the line (see :func:`get_critical_voltage_at_nodes`).
+
+    Cumulated load and generation are determined in one post-order pass over
+    the DFS tree, voltage deltas of all lines are computed as array
+    operations. Nodes are stored in DFS pre-order, hence the subtree of each
+    node is a contiguous range of the arrays. This allows for updating the
+    estimation incrementally after branches have been reinforced: only the
+    subtrees downstream of changed branches are re-evaluated (see
+    :meth:`update_branches`).
+
+    Parameters
+    ----------
+    grid : :class:`~.ding0.core.network.grids.LVGridDing0`
+        Ding0 LV grid object
+
+    Attributes
+    ----------
+    tree : :networkx:`NetworkX Graph Obj< >`
+        DFS tree of grid topology rooted at LV station
+    nodes : :obj:`list`
+        Nodes of `tree` in DFS pre-order
+    node_idx : :obj:`dict`
+        Position of each node in `nodes` and in the arrays below
+    v_delta_load : :numpy:`numpy.ndarray`
+        Voltage delta at each node in load case
+    v_delta_gen : :numpy:`numpy.ndarray`
+        Voltage delta at each node in feed-in case
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+        freq = cfg_ding0.get('assumptions', 'frequency')
+        self._omega = 2 * math.pi * freq
+        self._cos_phi_load = cfg_ding0.get('assumptions', 'cos_phi_load')
+        self._cos_phi_feedin = cfg_ding0.get('assumptions', 'cos_phi_gen')
+        self._x_sign_load = q_sign(
+            cfg_ding0.get('assumptions', 'cos_phi_load_mode'), 'load')
+        self._x_sign_gen = q_sign(
+            cfg_ding0.get('assumptions', 'cos_phi_gen_mode'), 'load')
+        self._v_nom = cfg_ding0.get('assumptions', 'lv_nominal_voltage')
+        self._v_delta_tolerable_fc = cfg_ding0.get(
+            'assumptions', 'lv_max_v_level_fc_diff_normal')
+        self._v_delta_tolerable_lc = cfg_ding0.get(
+            'assumptions', 'lv_max_v_level_lc_diff_normal')
+
+        self.tree = nx.dfs_tree(grid._graph, grid._station)
+
+        # nodes in DFS pre-order: each parent precedes its children
+        self.nodes = list(nx.dfs_preorder_nodes(self.tree, grid._station))
+        self.node_idx = {node: idx for idx, node in enumerate(self.nodes)}
+        count = len(self.nodes)
+
+        self._parent = np.full(count, -1, dtype=int)
+        self._branches = [None] * count
+        self._branch_idx = {}
+        own_load = np.zeros(count)
+        own_gen = np.zeros(count)
+
+        for idx, node in enumerate(self.nodes):
+            if isinstance(node, LVLoadDing0):
+                own_load[idx] = node.peak_load
+            elif isinstance(node, GeneratorDing0):
+                own_gen[idx] = node.capacity
+
+            if idx > 0:
+                predecessor = next(self.tree.predecessors(node))
+                self._parent[idx] = self.node_idx[predecessor]
+                branch = grid._graph.adj[node][predecessor]['branch']
+                self._branches[idx] = branch
+                self._branch_idx[branch] = idx
+
+        # cumulated load/generation of all descending nodes and size of each
+        # node's subtree (post-order pass)
+        subtree_load = own_load.copy()
+        subtree_gen = own_gen.copy()
+        self._subtree_size = np.ones(count, dtype=int)
+        for idx in range(count - 1, 0, -1):
+            subtree_load[self._parent[idx]] += subtree_load[idx]
+            subtree_gen[self._parent[idx]] += subtree_gen[idx]
+            self._subtree_size[self._parent[idx]] += self._subtree_size[idx]
+        self._s_max_load = (subtree_load - own_load) / self._cos_phi_load
+        self._s_max_feedin = (subtree_gen - own_gen) / self._cos_phi_feedin
+
+        # voltage delta over preceding line of each node
+        self._v_delta_line_load = np.zeros(count)
+        self._v_delta_line_gen = np.zeros(count)
+        self._update_line_deltas(np.arange(1, count))
+
+        # main branch nodes and their stubs in order of feeders
+        main_branch = set()
+        for node in self.nodes[1:]:
+            successors = list(self.tree.successors(node))
+            if successors and all(isinstance(successor,
+                                             LVCableDistributorDing0)
+                                  for successor in successors):
+                main_branch.add(node)
+
+        self._feeder_nodes = []
+        for first_node in [b for b in self.tree.successors(grid._station)
+                           if b in main_branch]:
+            successor = first_node
+            while successor:
+                stub_node = [_ for _ in self.tree.successors(successor) if
+                             _ not in main_branch][0]
+                self._feeder_nodes.append((self.node_idx[successor],
+                                           self.node_idx[stub_node]))
+                successor = [_ for _ in self.tree.successors(successor)
+                             if _ in main_branch]
+                if successor:
+                    successor = successor[0]
+
+        self._crit_feeder_nodes = [None] * len(self._feeder_nodes)
+        self._dirty = np.ones(count, dtype=bool)
+
+        # cumulated voltage deltas of all nodes
+        self.v_delta_load = np.zeros(count)
+        self.v_delta_gen = np.zeros(count)
+        self.update_bus_bar()
+
+    def _update_line_deltas(self, indices):
+        """ Determine voltage delta over preceding line of nodes `indices` """
+        if len(indices) == 0:
+            return
+
+        r_line = np.array([
+            self._branches[idx].type['R_per_km'] *
+            self._branches[idx].length / 1e3
+            for idx in indices])
+        x_line = np.array([
+            self._branches[idx].type['L_per_km'] / 1e3 * self._omega *
+            self._branches[idx].length / 1e3
+            for idx in indices])
+
+        self._v_delta_line_load[indices] = (
+            self._s_max_load[indices] * 1e3 * (
+                r_line * self._cos_phi_load - self._x_sign_load * x_line *
+                math.sin(math.acos(self._cos_phi_load)))) / self._v_nom ** 2
+        self._v_delta_line_gen[indices] = (
+            self._s_max_feedin[indices] * 1e3 * (
+                r_line * self._cos_phi_feedin - self._x_sign_gen * x_line *
+                math.sin(math.acos(self._cos_phi_feedin)))) / self._v_nom ** 2
+
+    def _cumulate(self, start, stop):
+        """ Cumulate voltage deltas from bus bar for nodes in [start, stop)
+
+        Nodes are processed in pre-order, so the voltage delta of the parent
+        is always up to date.
+        """
+        for idx in range(max(start, 1), stop):
+            self.v_delta_load[idx] = (self.v_delta_load[self._parent[idx]] +
+                                      self._v_delta_line_load[idx])
+            self.v_delta_gen[idx] = (self.v_delta_gen[self._parent[idx]] +
+                                     self._v_delta_line_gen[idx])
+        self._dirty[start:stop] = True
+
+    def update_bus_bar(self):
+        """ Re-evaluate voltage at bus bar (e.g. after substation extension)
+
+        As the bus bar voltage affects all nodes, the whole grid is updated.
+        """
+        self.v_delta_load[0], self.v_delta_gen[0] = get_voltage_at_bus_bar(
+            self.grid, self.tree)
+        self._cumulate(0, len(self.nodes))
+
+    def update_branches(self, branches):
+        """ Re-evaluate voltage after type of `branches` has changed
+
+        Only the subtrees downstream of the changed branches are updated.
+
+        Parameters
+        ----------
+        branches : :obj:`list` of :class:`~.ding0.core.network.BranchDing0`
+            Branches whose type (impedance) has changed
+        """
+        indices = np.array(sorted(self._branch_idx[branch]
+                                  for branch in branches
+                                  if branch in self._branch_idx), dtype=int)
+        if len(indices) == 0:
+            return
+
+        self._update_line_deltas(indices)
+
+        # merge overlapping subtree ranges and update them in pre-order
+        stop_prev = 0
+        for idx in indices:
+            start = max(idx, stop_prev)
+            stop = idx + self._subtree_size[idx]
+            if stop > start:
+                self._cumulate(start, stop)
+                stop_prev = stop
+
+    def critical_nodes(self):
+        """ Nodes exceeding tolerable voltage drop/increase
+
+        Only nodes affected by updates since the last call are re-evaluated.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`dict`
+            Critical nodes, see :func:`get_critical_voltage_at_nodes`
+        """
+
+        crit_nodes = []
+
+        v_delta_load_case_bus_bar = self.v_delta_load[0]
+        v_delta_gen_case_bus_bar = self.v_delta_gen[0]
+
+        if (abs(v_delta_gen_case_bus_bar) > self._v_delta_tolerable_fc
+            or abs(v_delta_load_case_bus_bar) > self._v_delta_tolerable_lc):
+            crit_nodes.append({'node': self.grid._station,
+                               'v_diff': [v_delta_load_case_bus_bar,
+                                          v_delta_gen_case_bus_bar]})
+
+        for pos, (main_idx, stub_idx) in enumerate(self._feeder_nodes):
+            if self._dirty[main_idx] or self._dirty[stub_idx]:
+                self._crit_feeder_nodes[pos] = self._check_feeder_node(
+                    main_idx, stub_idx)
+            crit_nodes.extend(self._crit_feeder_nodes[pos])
+
+        self._dirty[:] = False
+
+        return crit_nodes
+
+    def _check_feeder_node(self, main_idx, stub_idx):
+        """ Check main branch node and its stub node for voltage issues """
+        v_delta_load_cum = self.v_delta_load[main_idx]
+        v_delta_gen_cum = self.v_delta_gen[main_idx]
+        v_delta_load_stub = self.v_delta_load[stub_idx]
+        v_delta_gen_stub = self.v_delta_gen[stub_idx]
+
+        # check if voltage drop at node exceeds tolerable voltage drop
+        if (abs(v_delta_gen_cum) > self._v_delta_tolerable_fc
+            or abs(v_delta_load_cum) > self._v_delta_tolerable_lc):
+            # add node and successing stub node to critical nodes
+            return [{'node': self.nodes[main_idx],
+                     'v_diff': [v_delta_load_cum, v_delta_gen_cum]},
+                    {'node': self.nodes[stub_idx],
+                     'v_diff': [v_delta_load_stub, v_delta_gen_stub]}]
+        # check if voltage drop at stub node exceeds tolerable voltage drop
+        elif (abs(v_delta_gen_stub) > self._v_delta_tolerable_fc
+              or abs(v_delta_load_stub) > self._v_delta_tolerable_lc):
+            # add stub node to critical nodes
+            return [{'node': self.nodes[stub_idx],
+                     'v_diff': [v_delta_load_stub, v_delta_gen_stub]}]
+        return []
+
+
+def get_voltage_delta_lv_grid(grid):
+    """
+    Estimate voltage drop/increase at all nodes of a LV grid at once
+
+    Parameters
+    ----------
+    grid : :class:`~.ding0.core.network.grids.LVGridDing0`
+        Ding0 LV grid object
+
+    Returns
+    -------
+    tree : :networkx:`NetworkX Graph Obj< >`
+        DFS tree of grid topology rooted at LV station
+    node_idx : :obj:`dict`
+        Position of each node of `tree` in the arrays below
+    v_delta_load : :numpy:`numpy.ndarray`
+        Voltage delta at each node in load case
+    v_delta_gen : :numpy:`numpy.ndarray`
+        Voltage delta at each node in feed-in case
+
+    See Also
+    --------
+    ding0.flexopt.check_tech_constraints.LVVoltageEstimationDing0 :
+    """
+    estimation = LVVoltageEstimationDing0(grid)
+
+    return (estimation.tree, estimation.node_idx, estimation.v_delta_load,
+            estimation.v_delta_gen)
 
 
 def get_voltage_at_bus_bar(grid, tree):
@@ -634,20 +956,19 @@ def get_cumulated_conn_gen_load(graph, node):
     return [peak_load, generation]
 
 
-def get_mv_impedance_at_voltage_level(grid, voltage_level):
+def get_mv_impedance(grid):
     """
-    Determine MV grid impedance (resistance and reactance separately)
+    Determine impedance of MV grid between HV-MV and MV-LV substation
 
     Parameters
     ----------
     grid : :class:`~.ding0.core.network.grids.LVGridDing0`
-    voltage_level: float
-        voltage level to which impedance is rescaled (normally 0.4 kV for LV)
 
     Returns
     -------
     :obj:`list`
-        List containing resistance and reactance of MV grid
+        List containing resistance and reactance of MV grid (at MV voltage
+        level)
     """
 
     freq = cfg_ding0.get('assumptions', 'frequency')
@@ -659,6 +980,34 @@ def get_mv_impedance_at_voltage_level(grid, voltage_level):
                      for e in edges])
     x_mv_grid = sum([e[2]['branch'].type['L_per_km'] / 1e3 * omega * e[2][
         'branch'].length / 1e3 for e in edges])
+    return [r_mv_grid, x_mv_grid]
+
+
+def get_mv_impedance_at_voltage_level(grid, voltage_level):
+    """
+    Determine MV grid impedance (resistance and reactance separately)
+
+    If the reinforcement of a lazily built LV grid was deferred, the MV
+    impedance at the time of the request is used (see
+    :meth:`~.ding0.core.network.grids.LVGridDing0.reinforce_grid`).
+
+    Parameters
+    ----------
+    grid : :class:`~.ding0.core.network.grids.LVGridDing0`
+    voltage_level: float
+        voltage level to which impedance is rescaled (normally 0.4 kV for LV)
+
+    Returns
+    -------
+    :obj:`list`
+        List containing resistance and reactance of MV grid
+    """
+
+    mv_grid = grid.grid_district.lv_load_area.mv_grid_district.mv_grid
+    mv_impedance = getattr(grid, '_mv_impedance', None)
+    if mv_impedance is None:
+        mv_impedance = get_mv_impedance(grid)
+    r_mv_grid, x_mv_grid = mv_impedance
     # rescale to voltage level
     r_mv_grid_vl = r_mv_grid * (voltage_level / mv_grid.v_level) ** 2
     x_mv_grid_vl = x_mv_grid * (voltage_level / mv_grid.v_level) ** 2
@@ -14,11 +14,13 @@ __author__     = "nesnoj, gplssm"
 
 
 from .check_tech_constraints import check_load, check_voltage, \
-    get_critical_line_loading, get_critical_voltage_at_nodes
+    get_critical_line_loading, LVVoltageEstimationDing0
 from .reinforce_measures import reinforce_branches_current, \
-    reinforce_branches_voltage, reinforce_lv_branches_overloading, \
-    extend_substation, extend_substation_voltage
+    reinforce_branches_voltage, reinforce_branches_voltage_screening, \
+    reinforce_lv_branches_overloading, extend_substation, \
+    extend_substation_voltage
 from ding0.core.network.stations import LVStationDing0
+from ding0.tools import config as cfg_ding0
 import logging
 
 
@@ -44,6 +46,11 @@ def reinforce_grid(grid, mode):
     Currently only MV branch reinforcement is implemented. HV-MV stations are not
     reinforced since not required for status-quo scenario.
 
+    If `mv_reinforcement_voltage_screening` is set in config, MV branches are
+    reinforced in several rounds based on voltage sensitivities and a
+    confirmatory power flow is run only once per batch of upgrades (see
+    :func:`~.ding0.flexopt.reinforce_measures.reinforce_branches_voltage_screening`).
+
     References
     ----------
     .. [DENA] Deutsche Energie-Agentur GmbH (dena), "dena-Verteilnetzstudie. Ausbau- und Innovationsbedarf der
@@ -66,23 +73,36 @@ def reinforce_grid(grid, mode):
 
         # if branches or stations have been reinforced: run PF again to check for voltage issues
         if crit_branches or crit_stations:
-            grid.network.run_powerflow(conn=None, method='onthefly')
+            grid.network.run_powerflow(session=None, method='onthefly')
 
         crit_nodes = check_voltage(grid, mode)
         crit_nodes_count_prev_step = len(crit_nodes)
 
+        voltage_screening = cfg_ding0.get('mv_routing_tech_constraints',
+                                          'mv_reinforcement_voltage_screening')
+
         # as long as there are voltage issues, do reinforcement
         while crit_nodes:
-            # determine all branches on the way from HV-MV substation to crit. nodes
-            crit_branches_v = grid.find_and_union_paths(grid.station(), crit_nodes)
-
-            # do reinforcement
-            reinforce_branches_voltage(grid, crit_branches_v)
-
-            # run PF
-            grid.network.run_powerflow(session=None, method='onthefly')
-
-            crit_nodes = check_voltage(grid, mode)
+            if voltage_screening:
+                # do reinforcement of several rounds, estimate voltages
+                # instead of running PF after each round
+                reinforced_branches = reinforce_branches_voltage_screening(
+                    grid, crit_nodes)
+            else:
+                # determine all branches on the way from HV-MV substation to crit. nodes
+                crit_branches_v = grid.find_and_union_paths(grid.station(),
+                                                            crit_nodes)
+
+                # do reinforcement
+                reinforced_branches = reinforce_branches_voltage(
+                    grid, crit_branches_v)
+
+            # run PF only if any branch has changed, otherwise the result
+            # of the voltage check remains the same
+            if reinforced_branches:
+                grid.network.run_powerflow(session=None, method='onthefly')
+
+                crit_nodes = check_voltage(grid, mode)
 
             # if there are critical nodes left but no larger cable available, stop reinforcement
             if len(crit_nodes) == crit_nodes_count_prev_step:
@@ -124,7 +144,10 @@ def reinforce_grid(grid, mode):
         extend_substation(grid, critical_stations, mode)
 
         # get node with over-voltage
-        crit_nodes = get_critical_voltage_at_nodes(grid) #over-voltage issues
+        # voltage estimation is kept during reinforcement and only updated
+        # downstream of changed branches
+        voltage_estimation = LVVoltageEstimationDing0(grid)
+        crit_nodes = voltage_estimation.critical_nodes() #over-voltage issues
         # reinforcement of LV stations on voltage issues
         crit_stations_voltage = [_ for _ in crit_nodes  # Is this ever reached?
                                  if isinstance(_['node'], LVStationDing0)]
@@ -132,6 +155,7 @@ def reinforce_grid(grid, mode):
             extend_substation_voltage(crit_stations_voltage, grid_level='LV')
             for station in crit_stations_voltage:
                 crit_nodes.remove(station)
+            voltage_estimation.update_bus_bar()
 
         crit_nodes_count_prev_step = len(crit_nodes)
 
@@ -147,10 +171,13 @@ def reinforce_grid(grid, mode):
                 [_['node'] for _ in crit_nodes])
 
             # do reinforcement
-            reinforce_branches_voltage(grid, crit_branches_v, mode)
+            reinforced_branches = reinforce_branches_voltage(grid,
+                                                             crit_branches_v,
+                                                             mode)
 
-            # get node with over-voltage
-            crit_nodes = get_critical_voltage_at_nodes(grid)
+            # get node with over-voltage (re-evaluate changed subtrees only)
+            voltage_estimation.update_branches(reinforced_branches)
+            crit_nodes = voltage_estimation.critical_nodes()
 
             # if there are critical nodes left but no larger cable available, stop reinforcement
             if len(crit_nodes) == crit_nodes_count_prev_step:
@@ -20,7 +20,8 @@ import pandas as pd
 from ding0.tools import config as cfg_ding0
 from ding0.grid.lv_grid.build_grid import select_transformers
 from ding0.core.network import TransformerDing0
-from ding0.flexopt.check_tech_constraints import get_voltage_at_bus_bar
+from ding0.flexopt.check_tech_constraints import get_voltage_at_bus_bar, \
+    MVVoltageSensitivityDing0
 import networkx as nx
 import logging
 
@@ -95,6 +96,11 @@ def reinforce_branches_voltage(grid, crit_branches, grid_level='MV'):
         Specifying either 'MV' for medium-voltage grid or 'LV' for
         low-voltage grid level.
         
+    Returns
+    -------
+    :obj:`list` of :class:`~.ding0.core.network.BranchDing0`
+        Branches whose type has been changed
+
     Note
     -----
     The branch type to be installed is determined per branch - the next larger cable available is used.
@@ -111,7 +117,7 @@ def reinforce_branches_voltage(grid, crit_branches, grid_level='MV'):
         gridlevel=grid_level)]
     branch_parameters = branch_parameters[branch_parameters['U_n'] == grid.v_level].sort_values('I_max_th')
 
-    branch_ctr = 0
+    reinforced_branches = []
 
     for branch in crit_branches:
         try:
@@ -123,7 +129,7 @@ def reinforce_branches_voltage(grid, crit_branches, grid_level='MV'):
                 ].idxmin(), :
             ]
             branch.type = type
-            branch_ctr += 1
+            reinforced_branches.append(branch)
         except:
             logger.warning('Branch {} could not be reinforced (voltage '
                            'issues) as there is no appropriate cable type '
@@ -132,8 +138,58 @@ def reinforce_branches_voltage(grid, crit_branches, grid_level='MV'):
             pass
 
 
-    if branch_ctr:
-        logger.info('==> {} branches were reinforced.'.format(str(branch_ctr)))
+    if reinforced_branches:
+        logger.info('==> {} branches were reinforced.'.format(
+            str(len(reinforced_branches))))
+
+    return reinforced_branches
+
+
+def reinforce_branches_voltage_screening(grid, crit_nodes):
+    """ Reinforce MV grid in several rounds without intermediate power flow
+
+    Branches on the paths to critical nodes are reinforced round by round
+    (see :func:`reinforce_branches_voltage`). Instead of running a power flow
+    after each round, voltages are estimated by sensitivities derived from
+    the last power flow (see
+    :class:`~.ding0.flexopt.check_tech_constraints.MVVoltageSensitivityDing0`).
+    Rounds are repeated until no voltage issues are estimated anymore or no
+    cable can be reinforced further. The result has to be confirmed by a
+    power flow afterwards.
+
+    Parameters
+    ----------
+    grid : :class:`~.ding0.core.network.grids.MVGridDing0`
+        MV grid with results of power flow
+    crit_nodes : :obj:`list`
+        Critical nodes as returned by
+        :func:`~.ding0.flexopt.check_tech_constraints.check_voltage`
+
+    Returns
+    -------
+    :obj:`list` of :class:`~.ding0.core.network.BranchDing0`
+        Branches whose type has been changed
+    """
+    sensitivity = MVVoltageSensitivityDing0(grid)
+    reinforced_branches = []
+
+    while crit_nodes:
+        crit_branches_v = grid.find_and_union_paths(grid.station(), crit_nodes)
+        old_types = {branch: branch.type for branch in crit_branches_v}
+
+        reinforced_branches_round = reinforce_branches_voltage(grid,
+                                                               crit_branches_v)
+        if not reinforced_branches_round:
+            break
+
+        sensitivity.update_branches({branch: old_types[branch]
+                                     for branch in reinforced_branches_round})
+        reinforced_branches.extend(_ for _ in reinforced_branches_round
+                                   if _ not in reinforced_branches)
+
+        crit_nodes = sensitivity.critical_nodes()
+
+    return reinforced_branches
 
 
 def extend_substation(grid, critical_stations, grid_level):
@@ -20,9 +20,14 @@ from ding0.core.network.cable_distributors import LVCableDistributorDing0
 from ding0.core.network.loads import LVLoadDing0
 import logging
 import math
+import weakref
 
 logger = logging.getLogger('ding0')
 
+# static data and templates of residential model grids (keyed by count of
+# apartments) per network, see model_grid_template_residential()
+_model_grid_templates_residential = weakref.WeakKeyDictionary()
+
 
 def select_transformers(grid, s_max=None):
     """Selects LV transformer according to peak load of LV grid district.
@@ -366,18 +371,6 @@ def build_lv_graph_ria(lvgd, grid_model_params):
         and line segments) to graph of `lv_grid`
         """
 
-        # determine maximum current occuring due to peak load
-        # of this load load_no
-        I_max_load = val['single_peak_load'] / (3 ** 0.5 * v_nom) / cos_phi_load
-
-        # determine suitable cable for this current
-        suitable_cables_stub = lvgd.lv_grid.network.static_data['LV_cables'][
-            (lvgd.lv_grid.network.static_data['LV_cables'][
-                'I_max_th'] * cable_lf) > I_max_load]
-        cable_type_stub = suitable_cables_stub.loc[
-            suitable_cables_stub['I_max_th'].idxmin(), :
-            ]
-
         # cable distributor to divert from main branch
         lv_cable_dist = LVCableDistributorDing0(
             grid=lvgd.lv_grid,
@@ -442,9 +435,7 @@ def build_lv_graph_ria(lvgd, grid_model_params):
             lv_cable_dist,
             lv_cable_dist_building,
             branch=BranchDing0(
-                length=cfg_ding0.get(
-                    'assumptions',
-                    'lv_ria_branch_connection_distance'),
+                length=stub_length,
                 kind='cable',
                 type=cable_type_stub,
                 id_db='stub_{sector}{branch}_{load}'.format(
@@ -471,6 +462,8 @@ def build_lv_graph_ria(lvgd, grid_model_params):
     cos_phi_load = cfg_ding0.get('assumptions',
                                  'cos_phi_load')
     v_nom = cfg_ding0.get('assumptions', 'lv_nominal_voltage') / 1e3  # v_nom in kV
+    stub_length = cfg_ding0.get('assumptions',
+                                'lv_ria_branch_connection_distance')
     # iterate over branches for sectors retail/industrial and agricultural
     for sector, val in grid_model_params.items():
         if sector == 'retail/industrial':
@@ -480,6 +473,19 @@ def build_lv_graph_ria(lvgd, grid_model_params):
         else:
             sector_short = ''
         if val is not None:
+            # determine maximum current occuring due to peak load of a single
+            # load (same for all loads of sector)
+            I_max_load = val['single_peak_load'] / (3 ** 0.5 * v_nom) / \
+                cos_phi_load
+
+            # determine suitable cable for this current
+            suitable_cables_stub = lvgd.lv_grid.network.static_data[
+                'LV_cables'][(lvgd.lv_grid.network.static_data['LV_cables'][
+                    'I_max_th'] * cable_lf) > I_max_load]
+            cable_type_stub = suitable_cables_stub.loc[
+                suitable_cables_stub['I_max_th'].idxmin(), :
+                ]
+
             for branch_no in list(range(1, val['full_branches'] + 1)):
 
                 # determine maximum current occuring due to peak load of branch
@@ -572,17 +578,8 @@ def select_grid_model_residential(lvgd):
     apartment_string = lvgd.lv_grid.network.static_data[
         'LV_model_grids_strings_per_grid']
 
-    # load assumtions
-    apartment_house_branch_ratio = cfg_ding0.get("assumptions",
-                                                 "apartment_house_branch_ratio")
-    population_per_apartment = cfg_ding0.get("assumptions",
-                                             "population_per_apartment")
-
     # calc count of apartments to select string types
-    apartments = round(lvgd.population / population_per_apartment)
-
-    if apartments > 196:
-        apartments = 196
+    apartments = count_apartments_residential(lvgd)
 
     # select set of strings that represent one type of model grid
     strings = apartment_string.loc[apartments]
@@ -598,49 +595,113 @@ def select_grid_model_residential(lvgd):
     return selected_strings_df
 
 
-def build_lv_graph_residential(lvgd, selected_string_df):
-    """Builds nxGraph based on the LV grid model
+def count_apartments_residential(lvgd):
+    """Determine count of apartments in LV grid district based on population
 
     Parameters
     ----------
     lvgd : LVGridDistrictDing0
         Low-voltage grid district object
-    selected_string_df: :pandas:`pandas.DataFrame<dataframe>`
-        Table of strings of the selected grid model
 
-    Note
-    -----
-    To understand what is happening in this method a few data table columns
-    are explained here
+    Returns
+    -------
+    :obj:`int`
+        Count of apartments (at maximum 196) that determines the typified
+        model grid
+    """
+    population_per_apartment = cfg_ding0.get("assumptions",
+                                             "population_per_apartment")
 
-    * `count house branch`: number of houses connected to a string
-    * `distance house branch`: distance on a string between two house branches
-    * `string length`: total length of a string
-    * `length house branch A|B`: cable from string to connection point of a house
+    apartments = round(lvgd.population / population_per_apartment)
 
-    A|B in general brings some variation in to the typified model grid and
-    refer to different length of house branches and different cable types
-    respectively different cable widths.
+    if apartments > 196:
+        apartments = 196
+
+    return apartments
+
+
+def model_grid_template_residential(lvgd):
+    """Get template of typified model grid for residential sector
+
+    The topology of the residential model grid only depends on the count of
+    apartments (196 variants at maximum) and the static data of the network
+    (model grids and cable types). Hence, each template is created once per
+    network by :func:`create_model_grid_template_residential` and reused for
+    all LV grid districts with the same count of apartments. Templates are
+    created anew if the static data of the network is replaced.
+
+    Parameters
+    ----------
+    lvgd : LVGridDistrictDing0
+        Low-voltage grid district object
+
+    Returns
+    -------
+    :obj:`dict`
+        Template of model grid, see
+        :func:`create_model_grid_template_residential`
+    """
+    network = lvgd.lv_grid.network
+    static_data, templates = _model_grid_templates_residential.get(
+        network, (None, None))
+    if static_data is not network.static_data:
+        templates = {}
+        _model_grid_templates_residential[network] = (network.static_data,
+                                                      templates)
+
+    apartments = count_apartments_residential(lvgd)
+
+    template = templates.get(apartments)
+    if template is None:
+        template = create_model_grid_template_residential(
+            network.static_data, select_grid_model_residential(lvgd))
+        templates[apartments] = template
+
+    return template
+
+
+def create_model_grid_template_residential(static_data, selected_string_df):
+    """Create template of residential model grid topology
+
+    The template is a compact list of house connections in order of creation.
+    It contains everything that does not depend on the particular LV grid
+    district: string id, branch number (relative to branches already
+    connected to the station), load number, branch id, lengths and cable
+    types (looked up once per string).
+
+    Parameters
+    ----------
+    static_data : :obj:`dict`
+        Static data of network containing the LV cable types
+    selected_string_df: :pandas:`pandas.DataFrame<dataframe>`
+        Table of strings of the selected grid model, see
+        :func:`select_grid_model_residential`
+
+    Returns
+    -------
+    :obj:`dict`
+        Template with keys `houses_connected` (count of houses) and `houses`
+        (list of tuples describing each house connection)
     """
 
     houses_connected = (
         selected_string_df['occurence'] * selected_string_df[
             'count house branch']).sum()
 
-    average_load = lvgd.peak_load_residential / \
-                   houses_connected
-
-    average_consumption = lvgd.sector_consumption_residential / \
-                   houses_connected
-
+    houses = []
     hh_branch = 0
+    # count of branches connected to station by previous strings
+    branch_count_sum = 0
 
     # iterate over each type of branch
     for i, row in selected_string_df.iterrows():
 
-        # get overall count of branches to set unique branch_no
-        branch_count_sum = len(list(
-            lvgd.lv_grid._graph.neighbors(lvgd.lv_grid.station())))
+        branch_count_sum_string = branch_count_sum
+
+        cable_name = row['cable type'] + \
+                     ' 4x1x{}'.format(row['cable width'])
+        cable_type = static_data['LV_cables'].loc[cable_name]
+        house_cable_types = {}
 
         # iterate over it's occurences
         for branch_no in range(1, int(row['occurence']) + 1):
@@ -653,103 +714,162 @@ def build_lv_graph_residential(lvgd, selected_string_df):
                 else:
                     variant = 'A'
 
-                # cable distributor to divert from main branch
-                lv_cable_dist = LVCableDistributorDing0(
-                    grid=lvgd.lv_grid,
-                    string_id=i,
-                    branch_no=branch_no + branch_count_sum,
-                    load_no=house_branch)
-                # add lv_cable_dist to graph
-                lvgd.lv_grid.add_cable_dist(lv_cable_dist)
-
-                # cable distributor within building (to connect load+geno)
-                lv_cable_dist_building = LVCableDistributorDing0(
-                    grid=lvgd.lv_grid,
-                    string_id=i,
-                    branch_no=branch_no + branch_count_sum,
-                    load_no=house_branch,
-                    in_building=True)
-                # add lv_cable_dist_building to graph
-                lvgd.lv_grid.add_cable_dist(lv_cable_dist_building)
-
-                lv_load = LVLoadDing0(grid=lvgd.lv_grid,
-                                      string_id=i,
-                                      branch_no=branch_no + branch_count_sum,
-                                      load_no=house_branch,
-                                      peak_load=average_load,
-                                      consumption={
-                                          'residential': average_consumption})
-
-                # add lv_load to graph
-                lvgd.lv_grid.add_load(lv_load)
-
-                cable_name = row['cable type'] + \
-                             ' 4x1x{}'.format(row['cable width'])
-                cable_type = lvgd.lv_grid.network.static_data[
-                    'LV_cables'].loc[cable_name]
-
-                # connect current lv_cable_dist to station
+                if variant not in house_cable_types:
+                    house_cable_name = row['cable type {}'.format(variant)] + \
+                                       ' 4x1x{}'.format(
+                                           row['cable width {}'.format(variant)])
+                    house_cable_types[variant] = static_data['LV_cables'].loc[
+                        house_cable_name]
+
+                houses.append((
+                    i,
+                    branch_no + branch_count_sum_string,
+                    house_branch,
+                    'branch_{sector}{branch}_{load}'.format(
+                        branch=hh_branch,
+                        load=house_branch,
+                        sector='HH'),
+                    row['distance house branch'],
+                    cable_type,
+                    row['length house branch {}'.format(variant)],
+                    house_cable_types[variant]))
+
+                # first house of a branch is connected to station
                 if house_branch == 1:
-                    # edge connect first house branch in branch with the station
-                    lvgd.lv_grid._graph.add_edge(
-                        lvgd.lv_grid.station(),
-                        lv_cable_dist,
-                        branch=BranchDing0(
-                            length=row['distance house branch'],
-                            kind='cable',
-                            type=cable_type,
-                            id_db='branch_{sector}{branch}_{load}'.format(
-                                branch=hh_branch,
-                                load=house_branch,
-                                sector='HH')
-                        ))
-                # connect current lv_cable_dist to last one
-                else:
-                    lvgd.lv_grid._graph.add_edge(
-                        lvgd.lv_grid._cable_distributors[-4],
-                        lv_cable_dist,
-                        branch=BranchDing0(
-                            length=row['distance house branch'],
-                            kind='cable',
-                            type=lvgd.lv_grid.network.static_data[
-                                'LV_cables'].loc[cable_name],
-                            id_db='branch_{sector}{branch}_{load}'.format(
-                                branch=hh_branch,
-                                load=house_branch,
-                                sector='HH')))
-
-                # connect house to cable distributor
-                house_cable_name = row['cable type {}'.format(variant)] + \
-                                   ' 4x1x{}'.format(
-                                       row['cable width {}'.format(variant)])
-                lvgd.lv_grid._graph.add_edge(
-                    lv_cable_dist,
-                    lv_cable_dist_building,
-                    branch=BranchDing0(
-                        length=row['length house branch {}'.format(
-                            variant)],
-                        kind='cable',
-                        type=lvgd.lv_grid.network.static_data['LV_cables']. \
-                            loc[house_cable_name],
-                        id_db='branch_{sector}{branch}_{load}'.format(
-                            branch=hh_branch,
-                            load=house_branch,
-                            sector='HH'))
-                )
-
-                lvgd.lv_grid._graph.add_edge(
-                    lv_cable_dist_building,
-                    lv_load,
-                    branch=BranchDing0(
-                        length=1,
-                        kind='cable',
-                        type=lvgd.lv_grid.network.static_data['LV_cables']. \
-                            loc[house_cable_name],
-                        id_db='branch_{sector}{branch}_{load}'.format(
-                            branch=hh_branch,
-                            load=house_branch,
-                            sector='HH'))
-                )
+                    branch_count_sum += 1
+
+    return {'houses_connected': houses_connected,
+            'houses': houses}
+
+
+def build_lv_graph_residential_from_template(lvgd, template):
+    """Builds nxGraph of residential sector based on model grid template
+
+    Creates cable distributors, loads and branches of all house connections
+    in `template` and attaches them to the LV grid's station. Peak load and
+    consumption of the LV grid district are uniformly distributed across
+    house connections.
+
+    Parameters
+    ----------
+    lvgd : LVGridDistrictDing0
+        Low-voltage grid district object
+    template : :obj:`dict`
+        Template of model grid, see
+        :func:`create_model_grid_template_residential`
+    """
+
+    average_load = lvgd.peak_load_residential / \
+                   template['houses_connected']
+
+    average_consumption = lvgd.sector_consumption_residential / \
+                   template['houses_connected']
+
+    lv_grid = lvgd.lv_grid
+    station = lv_grid.station()
+
+    # get overall count of branches to set unique branch_no
+    branch_count_sum = len(list(lv_grid._graph.neighbors(station)))
+
+    lv_cable_dist_prev = None
+
+    for (string_id, branch_no, load_no, branch_id, distance, cable_type,
+         house_length, house_cable_type) in template['houses']:
+
+        branch_no = branch_no + branch_count_sum
+
+        # cable distributor to divert from main branch
+        lv_cable_dist = LVCableDistributorDing0(
+            grid=lv_grid,
+            string_id=string_id,
+            branch_no=branch_no,
+            load_no=load_no)
+        # add lv_cable_dist to graph
+        lv_grid.add_cable_dist(lv_cable_dist)
+
+        # cable distributor within building (to connect load+geno)
+        lv_cable_dist_building = LVCableDistributorDing0(
+            grid=lv_grid,
+            string_id=string_id,
+            branch_no=branch_no,
+            load_no=load_no,
+            in_building=True)
+        # add lv_cable_dist_building to graph
+        lv_grid.add_cable_dist(lv_cable_dist_building)
+
+        lv_load = LVLoadDing0(grid=lv_grid,
+                              string_id=string_id,
+                              branch_no=branch_no,
+                              load_no=load_no,
+                              peak_load=average_load,
+                              consumption={
+                                  'residential': average_consumption})
+
+        # add lv_load to graph
+        lv_grid.add_load(lv_load)
+
+        # connect first house branch in branch with the station or current
+        # lv_cable_dist to last one
+        lv_grid._graph.add_edge(
+            station if load_no == 1 else lv_cable_dist_prev,
+            lv_cable_dist,
+            branch=BranchDing0(
+                length=distance,
+                kind='cable',
+                type=cable_type,
+                id_db=branch_id))
+
+        # connect house to cable distributor
+        lv_grid._graph.add_edge(
+            lv_cable_dist,
+            lv_cable_dist_building,
+            branch=BranchDing0(
+                length=house_length,
+                kind='cable',
+                type=house_cable_type,
+                id_db=branch_id))
+
+        lv_grid._graph.add_edge(
+            lv_cable_dist_building,
+            lv_load,
+            branch=BranchDing0(
+                length=1,
+                kind='cable',
+                type=house_cable_type,
+                id_db=branch_id))
+
+        lv_cable_dist_prev = lv_cable_dist
+
+
+def build_lv_graph_residential(lvgd, selected_string_df):
+    """Builds nxGraph based on the LV grid model
+
+    Parameters
+    ----------
+    lvgd : LVGridDistrictDing0
+        Low-voltage grid district object
+    selected_string_df: :pandas:`pandas.DataFrame<dataframe>`
+        Table of strings of the selected grid model
+
+    Note
+    -----
+    To understand what is happening in this method a few data table columns
+    are explained here
+
+    * `count house branch`: number of houses connected to a string
+    * `distance house branch`: distance on a string between two house branches
+    * `string length`: total length of a string
+    * `length house branch A|B`: cable from string to connection point of a house
+
+    A|B in general brings some variation in to the typified model grid and
+    refer to different length of house branches and different cable types
+    respectively different cable widths.
+    """
+
+    template = create_model_grid_template_residential(
+        lvgd.lv_grid.network.static_data, selected_string_df)
+
+    build_lv_graph_residential_from_template(lvgd, template)
 
 
 def build_residential_branches(lvgd):
@@ -767,9 +887,9 @@ def build_residential_branches(lvgd):
     # load is represented by lv station's peak load
     if lvgd.population > 0 \
             and lvgd.peak_load_residential > 0:
-        model_grid = select_grid_model_residential(lvgd)
+        model_grid_template = model_grid_template_residential(lvgd)
 
-        build_lv_graph_residential(lvgd, model_grid)
+        build_lv_graph_residential_from_template(lvgd, model_grid_template)
 
     # no residential load but population
     elif lvgd.population > 0 \
@@ -0,0 +1,223 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+from ding0.core.network import SlottedDing0
+from ding0.tools import config as cfg_ding0
+
+import io
+import logging
+import multiprocessing as mp
+import pickle
+import random
+
+import networkx as nx
+from pandas import DataFrame, Series
+
+logger = logging.getLogger('ding0')
+
+# state of the current LV stage, set in parent before the worker processes
+# are forked (workers inherit it, it is never pickled)
+_lv_stage = {}
+
+
+def shared_objects(networks):
+    """Collect objects of `networks` that exist before the LV stage
+
+    All DING0 objects (grids, districts, stations, generators, branches, ...)
+    and pandas objects (static data, cable types) that are reachable from
+    `networks` are collected. Since workers are forked from the parent
+    process, these objects have the same id in parent and workers. Results of
+    workers refer to them by id instead of pickling them.
+
+    Parameters
+    ----------
+    networks : :obj:`list` of :class:`~.ding0.core.NetworkDing0`
+        Networks the LV stage is performed for
+
+    Returns
+    -------
+    :obj:`dict`
+        Objects keyed by their id
+    """
+    objects = {}
+    visited = set()
+    stack = list(networks)
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in visited:
+            continue
+        visited.add(id(obj))
+
+        if isinstance(obj, (DataFrame, Series)):
+            objects[id(obj)] = obj
+        elif isinstance(obj, nx.Graph):
+            stack.extend(obj.nodes())
+            stack.extend(data for _, _, data in obj.edges(data=True))
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, SlottedDing0):
+            objects[id(obj)] = obj
+            stack.extend(obj.__getstate__().values())
+        elif type(obj).__module__.startswith('ding0.'):
+            objects[id(obj)] = obj
+            stack.extend(getattr(obj, '__dict__', {}).values())
+
+    return objects
+
+
+class _LVStatePickler(pickle.Pickler):
+    """Pickler that refers to shared objects by id"""
+
+    def __init__(self, file, objects):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._objects = objects
+
+    def persistent_id(self, obj):
+        if id(obj) in self._objects and self._objects[id(obj)] is obj:
+            return id(obj)
+        return None
+
+
+class _LVStateUnpickler(pickle.Unpickler):
+    """Unpickler that resolves references to shared objects"""
+
+    def __init__(self, file, objects):
+        super().__init__(file)
+        self._objects = objects
+
+    def persistent_load(self, pid):
+        return self._objects[pid]
+
+
+def _lv_grid_state(lv_grid):
+    """Returns the parts of `lv_grid` that are changed in the LV stage"""
+    station = lv_grid.station()
+    return {'graph': lv_grid._graph,
+            'cable_distributors': lv_grid._cable_distributors,
+            'loads': lv_grid._loads,
+            'transformers': (station._transformers
+                             if station is not None else None)}
+
+
+def _set_lv_grid_state(lv_grid, state):
+    """Applies `state` (see :func:`_lv_grid_state`) to `lv_grid`"""
+    lv_grid._graph = state['graph']
+    lv_grid._cable_distributors[:] = state['cable_distributors']
+    lv_grid._loads[:] = state['loads']
+    if state['transformers'] is not None:
+        lv_grid.station()._transformers[:] = state['transformers']
+
+
+def _process_lv_grid_district(idx):
+    """Worker: builds or connects one LV grid and returns its pickled state"""
+    lv_grid = _lv_stage['lv_grid_districts'][idx].lv_grid
+
+    if _lv_stage['mode'] == 'build':
+        lv_grid.build_grid()
+    else:
+        # same seed as in serial execution to get identical results
+        random.seed(a=_lv_stage['seed'])
+        lv_grid.connect_generators()
+
+    buffer = io.BytesIO()
+    _LVStatePickler(buffer, _lv_stage['objects']).dump(_lv_grid_state(lv_grid))
+
+    return buffer.getvalue()
+
+
+def process_lv_grid_districts(lv_grid_districts, mode, processes):
+    """Build or connect LV grids of several LV grid districts in parallel
+
+    Each LV grid is processed in a worker process forked from the current
+    process. As building and connecting an LV grid only touches the LV grid
+    itself, the resulting graph, cable distributors, loads and transformers
+    are transferred back and set to the LV grid objects of the current
+    process. Results are identical to serial execution.
+
+    Parameters
+    ----------
+    lv_grid_districts : :obj:`list` of :class:`~.ding0.core.structure.regions.LVGridDistrictDing0`
+        LV grid districts to process
+    mode : :obj:`str`
+        'build' to build LV grids (see
+        :meth:`~.ding0.core.network.grids.LVGridDing0.build_grid`) or
+        'connect' to connect LV generators (see
+        :meth:`~.ding0.core.network.grids.LVGridDing0.connect_generators`)
+    processes : :obj:`int`
+        Count of worker processes
+
+    Note
+    -----
+    Requires the 'fork' start method of :mod:`multiprocessing` (not available
+    on Windows). If it is not available, LV grids are processed serially.
+    """
+    if mode not in ['build', 'connect']:
+        raise ValueError('Unknown mode {} for LV stage.'.format(mode))
+
+    # lazily built LV grids only record the step (see
+    # LVGridDing0.materialize()), hence they are not sent to workers
+    if mode == 'connect':
+        for lv_grid_district in lv_grid_districts:
+            if not lv_grid_district.lv_grid.materialized:
+                lv_grid_district.lv_grid.connect_generators()
+        lv_grid_districts = [lv_grid_district
+                             for lv_grid_district in lv_grid_districts
+                             if lv_grid_district.lv_grid.materialized]
+
+    if not lv_grid_districts:
+        return
+
+    try:
+        context = mp.get_context('fork')
+    except ValueError:
+        logger.warning('Start method fork is not available, LV grids are '
+                       'processed serially.')
+        context = None
+
+    if context is None or processes <= 1:
+        for lv_grid_district in lv_grid_districts:
+            if mode == 'build':
+                lv_grid_district.lv_grid.build_grid()
+            else:
+                lv_grid_district.lv_grid.connect_generators()
+        return
+
+    networks = {id(lv_grid_district.lv_grid.network):
+                    lv_grid_district.lv_grid.network
+                for lv_grid_district in lv_grid_districts}
+    objects = shared_objects(networks.values())
+
+    _lv_stage.update({'lv_grid_districts': lv_grid_districts,
+                      'mode': mode,
+                      'seed': int(cfg_ding0.get('random', 'seed')),
+                      'objects': objects})
+
+    chunksize = max(1, len(lv_grid_districts) // (4 * processes))
+
+    try:
+        with context.Pool(processes) as pool:
+            states = pool.imap(_process_lv_grid_district,
+                               range(len(lv_grid_districts)),
+                               chunksize)
+            for lv_grid_district, state in zip(lv_grid_districts, states):
+                _set_lv_grid_state(
+                    lv_grid_district.lv_grid,
+                    _LVStateUnpickler(io.BytesIO(state), objects).load())
+    finally:
+        _lv_stage.clear()
@@ -0,0 +1,236 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+from ding0.tools import config as cfg_ding0
+
+import logging
+import os
+import pickle
+import random
+
+logger = logging.getLogger('ding0')
+
+# attributes of NetworkDing0 that are not part of a checkpoint: they are
+# created from config on instantiation of NetworkDing0 and are referred to
+# by name
+NETWORK_ATTRIBUTES = ['_orm', '_config', '_pf_config', '_static_data']
+
+CHECKPOINT_FILENAME = 'checkpoint.pkl'
+
+
+def checkpoint_steps():
+    """Returns steps of :meth:`~.ding0.core.NetworkDing0.run_ding0` after
+    which a checkpoint is saved by default (see config_misc.cfg)"""
+    steps = str(cfg_ding0.get('checkpoint', 'steps'))
+    return sorted(int(float(_)) for _ in steps.split(',') if _.strip())
+
+
+# values that are pickled by value even if they are items of config, static
+# data or ORM mapping: they may be singletons or interned (e.g. a version
+# condition `1 == 1` is `True`) and references to them are ambiguous
+_PRIMITIVE_TYPES = (type(None), bool, int, float, complex, str, bytes, tuple,
+                    frozenset)
+
+
+def shared_objects(network):
+    """Returns objects a checkpoint of `network` refers to by name
+
+    Only ORM classes/tables, config sections, static data frames and other
+    mutable objects are shared, primitive values (see `_PRIMITIVE_TYPES`)
+    are not.
+
+    Parameters
+    ----------
+    network : :class:`~.ding0.core.NetworkDing0`
+        Network
+
+    Returns
+    -------
+    :obj:`dict`
+        Shared objects keyed by name, to be passed to
+        :class:`CheckpointPickler` and :class:`CheckpointUnpickler`
+    """
+    objects = {'network': network}
+    for attribute in NETWORK_ATTRIBUTES:
+        value = getattr(network, attribute, None)
+        if value is None:
+            continue
+        objects[attribute] = value
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if not isinstance(item, _PRIMITIVE_TYPES):
+                    objects[(attribute, key)] = item
+    return objects
+
+
+class CheckpointPickler(pickle.Pickler):
+    """Pickler that refers to network and its config/static data by name
+
+    Used for checkpoints and the grid store (:mod:`~.ding0.tools.store`),
+    objects pickled by it are read by :class:`CheckpointUnpickler`.
+
+    Parameters
+    ----------
+    file : file object
+        File opened for writing in binary mode
+    objects : :obj:`dict`
+        Objects referred to by name, see :func:`shared_objects`
+    """
+
+    def __init__(self, file, objects):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._names = {id(obj): name for name, obj in objects.items()}
+        self._objects = objects
+
+    def persistent_id(self, obj):
+        name = self._names.get(id(obj))
+        if name is not None and self._objects[name] is obj:
+            return name
+        return None
+
+
+class CheckpointUnpickler(pickle.Unpickler):
+    """Unpickler that resolves names to network and its config/static data
+
+    Parameters
+    ----------
+    file : file object
+        File opened for reading in binary mode
+    objects : :obj:`dict`
+        Objects of the network the pickle is loaded into, see
+        :func:`shared_objects`
+    """
+
+    def __init__(self, file, objects):
+        super().__init__(file)
+        self._objects = objects
+
+    def persistent_load(self, pid):
+        return self._objects[pid]
+
+
+class CheckpointDing0:
+    """ Checkpoints of a ding0 run
+
+    A checkpoint holds the state of a :class:`~.ding0.core.NetworkDing0`
+    after a step of :meth:`~.ding0.core.NetworkDing0.run_ding0`. Only the
+    latest checkpoint of a run is kept, it is stored in a directory keyed by
+    run id and MV grid districts::
+
+        <path>/<run_id>/mvgd_<first MVGD>[-<last MVGD>]/checkpoint.pkl
+
+    Config, static data and ORM mapping of the network are not saved, they
+    are taken from the network the checkpoint is loaded into (hence, the
+    checkpoint can only be resumed with the same config).
+
+    Parameters
+    ----------
+    network : :class:`~.ding0.core.NetworkDing0`
+        Network of the run
+    path : :obj:`str`
+        Base directory of checkpoints
+    mv_grid_districts_no : :obj:`list` of :obj:`int`
+        MV grid districts of the run
+    steps : :obj:`list` of :obj:`int`
+        Steps after which a checkpoint is saved. If None, steps are taken
+        from config (section `checkpoint`, key `steps`).
+    """
+
+    def __init__(self, network, path, mv_grid_districts_no, steps=None):
+        if network._run_id is None:
+            raise ValueError('Checkpoints require a run_id of the network.')
+
+        self.network = network
+        self.steps = checkpoint_steps() if steps is None else list(steps)
+
+        if len(mv_grid_districts_no) > 1:
+            name_extension = '{}-{}'.format(mv_grid_districts_no[0],
+                                            mv_grid_districts_no[-1])
+        else:
+            name_extension = '{}'.format(mv_grid_districts_no[0])
+        self.mv_grid_districts_no = list(mv_grid_districts_no)
+        self.path = os.path.join(os.path.abspath(path), network._run_id,
+                                 'mvgd_' + name_extension)
+
+    @property
+    def filename(self):
+        return os.path.join(self.path, CHECKPOINT_FILENAME)
+
+    def save(self, step, msg=None):
+        """Saves checkpoint after `step` (if `step` is a checkpoint step)
+
+        The checkpoint file is replaced atomically, i.e. a crash while saving
+        keeps the previous checkpoint.
+
+        Parameters
+        ----------
+        step : :obj:`int`
+            Completed step
+        msg : :obj:`list`
+            Message of invalidity of grid districts (result of step 4)
+        """
+        if step not in self.steps:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+
+        state = {key: value for key, value in self.network.__dict__.items()
+                 if key not in NETWORK_ATTRIBUTES}
+        checkpoint = {'step': step,
+                      'mv_grid_districts_no': self.mv_grid_districts_no,
+                      'msg': msg,
+                      'random_state': random.getstate(),
+                      'state': state}
+
+        filename_tmp = self.filename + '.tmp'
+        with open(filename_tmp, 'wb') as f:
+            CheckpointPickler(f, shared_objects(self.network)).dump(
+                checkpoint)
+        os.replace(filename_tmp, self.filename)
+
+        logger.info('Checkpoint saved after step {} to {}.'.format(
+            step, self.filename))
+
+    def load(self):
+        """Loads latest checkpoint into network
+
+        Returns
+        -------
+        :obj:`int`
+            Step completed at the checkpoint (0 if there is no checkpoint)
+        :obj:`list`
+            Message of invalidity of grid districts (result of step 4)
+        """
+        if not os.path.exists(self.filename):
+            logger.info('No checkpoint found in {}, run is started from '
+                        'scratch.'.format(self.path))
+            return 0, None
+
+        with open(self.filename, 'rb') as f:
+            checkpoint = CheckpointUnpickler(
+                f, shared_objects(self.network)).load()
+
+        if checkpoint['mv_grid_districts_no'] != self.mv_grid_districts_no:
+            raise ValueError('Checkpoint {} was saved for MV grid districts '
+                             '{}.'.format(self.filename,
+                                          checkpoint['mv_grid_districts_no']))
+
+        self.network.__dict__.update(checkpoint['state'])
+        random.setstate(checkpoint['random_state'])
+
+        logger.info('Run is resumed after step {} from {}.'.format(
+            checkpoint['step'], self.filename))
+
+        return checkpoint['step'], checkpoint['msg']
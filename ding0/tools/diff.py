@@ -0,0 +1,351 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+import hashlib
+import math
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from ding0.core.network import CircuitBreakerDing0, StationDing0
+from ding0.tools.tools import district_grids, branch_type_name
+
+# count of decimal places floats are rounded to before they are compared
+DECIMALS = 4
+
+# compared attributes of nodes (if a node has them)
+NODE_ATTRIBUTES = ('peak_load', 'capacity', 'type', 'subtype', 'v_level',
+                   'consumption', 'voltage_res')
+
+# compared attributes of branches (type is compared by its name)
+BRANCH_ATTRIBUTES = ('length', 'kind', 's_res', 'connects_aggregated')
+
+# part of a grid holding all nodes and branches which are not part of a
+# single MV ring (e.g. the station), LV grids consist of this part only
+GRID_PART = 'grid'
+
+# columns of differences, see diff_hashes()
+DIFF_COLUMNS = ['mv_grid_district', 'grid', 'part', 'element', 'name',
+                'change', 'attribute', 'value_one', 'value_two']
+
+
+def _hash(value):
+    """Returns hash (hex) of canonical `value`"""
+    return hashlib.md5(repr(value).encode()).hexdigest()
+
+
+def _canonical(value, decimals):
+    """
+    Returns `value` as comparable and deterministically printable value
+
+    Floats are rounded to `decimals` (NaN is None), containers are converted
+    to tuples, other objects to their representation.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else round(float(value), decimals)
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _canonical(item, decimals))
+                            for key, item in value.items()))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_canonical(item, decimals) for item in value)
+    return repr(value)
+
+
+def _node_record(node, decimals):
+    """Returns compared attributes of `node`"""
+    record = {'class': type(node).__name__}
+    geo_data = getattr(node, 'geo_data', None)
+    if geo_data is not None and not geo_data.is_empty:
+        record['geo_data'] = _canonical((geo_data.x, geo_data.y), decimals)
+    for attribute in NODE_ATTRIBUTES:
+        value = getattr(node, attribute, None)
+        if value is not None:
+            record[attribute] = _canonical(value, decimals)
+    if isinstance(node, StationDing0):
+        record['transformers'] = tuple(sorted(
+            _canonical((transformer.s_max_a, transformer.r_pu,
+                        transformer.x_pu), decimals)
+            for transformer in node.transformers()))
+    return record
+
+
+def _branch_record(branch, decimals, circuit_breaker=None):
+    """Returns compared attributes of `branch`"""
+    record = {attribute: _canonical(getattr(branch, attribute, None),
+                                    decimals)
+              for attribute in BRANCH_ATTRIBUTES}
+    record['type'] = branch_type_name(branch)
+    if circuit_breaker is not None:
+        record['circuit_breaker'] = circuit_breaker.status
+    return record
+
+
+def _branch_name(node_one, node_two):
+    """Returns name of branch between two nodes (independent of order)"""
+    return ' - '.join(sorted((repr(node_one), repr(node_two))))
+
+
+def _part(branch):
+    """Returns name of part of grid of `branch` (its MV ring)"""
+    ring = getattr(branch, 'ring', None)
+    return GRID_PART if ring is None else repr(ring)
+
+
+def _leaf(nodes, branches):
+    """Returns hash tree leaf of nodes and branches (keyed by name)"""
+    return {'hash': _hash((sorted(nodes.items()), sorted(branches.items()))),
+            'nodes': nodes,
+            'branches': branches}
+
+
+def _node(children):
+    """Returns hash tree node of children (keyed by name)"""
+    return {'hash': _hash(sorted((key, child['hash'])
+                                 for key, child in children.items())),
+            'children': children}
+
+
+def grid_hashes(grid, decimals=DECIMALS):
+    """
+    Returns hash tree of a grid
+
+    The grid is split into parts: a part per MV ring holding the branches
+    of the ring and nodes which are only connected to branches of this ring,
+    and the part `GRID_PART` holding all other nodes and branches. Nodes are
+    keyed by their representation, branches by the names of their nodes.
+    Circuit breakers are no nodes of the tree but compared as attribute of
+    their branch (their numbering may differ between runs), branches of
+    open circuit breakers are part of the tree although they are not part of
+    the graph.
+
+    Parameters
+    ----------
+    grid : :class:`~.ding0.core.network.GridDing0`
+        Grid
+    decimals : :obj:`int`
+        Count of decimal places floats are rounded to
+
+    Returns
+    -------
+    :obj:`dict`
+        Hash tree: 'hash' of the grid and 'children' (parts keyed by name),
+        a part holds its 'hash', 'nodes' and 'branches' (compared attributes
+        keyed by name)
+    """
+    circuit_breakers = {}
+    if hasattr(grid, 'circuit_breakers'):
+        circuit_breakers = {id(circuit_breaker.branch): circuit_breaker
+                            for circuit_breaker in grid.circuit_breakers()}
+
+    edges = list(grid._graph.edges(data='branch'))
+    for circuit_breaker in circuit_breakers.values():
+        if circuit_breaker.status == 'open':
+            edges.append(tuple(circuit_breaker.branch_nodes) +
+                         (circuit_breaker.branch,))
+
+    node_parts = defaultdict(set)
+    parts = defaultdict(lambda: ({}, {}))
+    for node_one, node_two, branch in edges:
+        part = _part(branch)
+        node_parts[node_one].add(part)
+        node_parts[node_two].add(part)
+        parts[part][1][_branch_name(node_one, node_two)] = _branch_record(
+            branch, decimals, circuit_breakers.get(id(branch)))
+
+    for node in grid._graph.nodes():
+        if isinstance(node, CircuitBreakerDing0):
+            continue
+        part = node_parts.get(node, ())
+        part = next(iter(part)) if len(part) == 1 else GRID_PART
+        parts[part][0][repr(node)] = _node_record(node, decimals)
+
+    return _node({part: _leaf(nodes, branches)
+                  for part, (nodes, branches) in parts.items()})
+
+
+def district_hashes(mv_grid_district, decimals=DECIMALS):
+    """
+    Returns hash tree of the MV grid and LV grids of a MV grid district
+
+    Parameters
+    ----------
+    mv_grid_district : :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid district
+    decimals : :obj:`int`
+        Count of decimal places floats are rounded to
+
+    Returns
+    -------
+    :obj:`dict`
+        Hash tree: 'hash' of the MV grid district and 'children' (hash trees
+        of grids keyed by representation, see :func:`grid_hashes`)
+    """
+    return _node({repr(grid): grid_hashes(grid, decimals)
+                  for grid in district_grids(mv_grid_district)})
+
+
+def network_hashes(nw, mv_grid_districts=None, decimals=DECIMALS):
+    """
+    Returns hash trees of MV grid districts of a network
+
+    Hash trees are plain dicts and can be pickled, e.g. to keep the hashes
+    of a reference run and compare later runs to them by
+    :func:`diff_hashes`.
+
+    Parameters
+    ----------
+    nw : :class:`~.ding0.core.NetworkDing0`
+        Network
+    mv_grid_districts : :obj:`list` of :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid districts of `nw`. Default is None which hashes all MV grid
+        districts.
+    decimals : :obj:`int`
+        Count of decimal places floats are rounded to
+
+    Returns
+    -------
+    :obj:`dict`
+        Hash trees (see :func:`district_hashes`) keyed by id of MV grid
+        district
+    """
+    if mv_grid_districts is None:
+        mv_grid_districts = nw.mv_grid_districts()
+    return {mv_grid_district.id_db: district_hashes(mv_grid_district,
+                                                    decimals)
+            for mv_grid_district in mv_grid_districts}
+
+
+def _diff_records(records_one, records_two, element, path):
+    """Yields differences of records of nodes or branches of a part"""
+    for name in sorted(set(records_one) | set(records_two)):
+        record_one = records_one.get(name)
+        record_two = records_two.get(name)
+        if record_one == record_two:
+            continue
+        if record_two is None:
+            yield path + (element, name, 'removed', None, None, None)
+        elif record_one is None:
+            yield path + (element, name, 'added', None, None, None)
+        else:
+            for attribute in sorted(set(record_one) | set(record_two)):
+                value_one = record_one.get(attribute)
+                value_two = record_two.get(attribute)
+                if value_one != value_two:
+                    yield path + (element, name, 'changed', attribute,
+                                  value_one, value_two)
+
+
+def _diff_grids(grid_one, grid_two, path):
+    """Yields differences of parts of two hash trees of a grid"""
+    empty = _leaf({}, {})
+    children_one = grid_one['children']
+    children_two = grid_two['children']
+    for part in sorted(set(children_one) | set(children_two)):
+        part_one = children_one.get(part, empty)
+        part_two = children_two.get(part, empty)
+        if part_one['hash'] == part_two['hash']:
+            continue
+        for records, element in (('nodes', 'node'), ('branches', 'branch')):
+            yield from _diff_records(part_one[records], part_two[records],
+                                     element, path + (part,))
+
+
+def diff_hashes(hashes_one, hashes_two):
+    """
+    Returns differences of two networks given by their hash trees
+
+    Only subtrees with different hashes are compared, hence the effort
+    depends on the size of changed parts of grids, not of the networks.
+    MV grid districts and grids which exist in one network only are
+    reported as a whole, nodes and branches of other grids are compared per
+    part (see :func:`grid_hashes`).
+
+    Parameters
+    ----------
+    hashes_one : :obj:`dict`
+        Hash trees of first network, see :func:`network_hashes`
+    hashes_two : :obj:`dict`
+        Hash trees of second network
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Differences, one row per added or removed element ('mv_grid_district',
+        'grid', 'node' or 'branch') and per changed attribute of a node or
+        branch. Columns are:
+
+        * 'mv_grid_district', 'grid', 'part': location of the element (None
+          if the element is a MV grid district or grid)
+        * 'element', 'name': kind and name of the element
+        * 'change': 'added', 'removed' or 'changed'
+        * 'attribute', 'value_one', 'value_two': changed attribute and its
+          values in both networks (None if the element is added or removed)
+    """
+    differences = []
+    for district in sorted(set(hashes_one) | set(hashes_two)):
+        district_one = hashes_one.get(district)
+        district_two = hashes_two.get(district)
+        if district_one is None or district_two is None:
+            differences.append(
+                (None, None, None, 'mv_grid_district', str(district),
+                 'added' if district_one is None else 'removed',
+                 None, None, None))
+            continue
+        if district_one['hash'] == district_two['hash']:
+            continue
+
+        grids_one = district_one['children']
+        grids_two = district_two['children']
+        for grid in sorted(set(grids_one) | set(grids_two)):
+            grid_one = grids_one.get(grid)
+            grid_two = grids_two.get(grid)
+            if grid_one is None or grid_two is None:
+                differences.append(
+                    (district, None, None, 'grid', grid,
+                     'added' if grid_one is None else 'removed',
+                     None, None, None))
+            elif grid_one['hash'] != grid_two['hash']:
+                differences.extend(_diff_grids(grid_one, grid_two,
+                                               (district, grid)))
+
+    return pd.DataFrame(differences, columns=DIFF_COLUMNS)
+
+
+def diff_networks(nw_one, nw_two, decimals=DECIMALS):
+    """
+    Returns differences of MV and LV grids of two networks
+
+    Parameters
+    ----------
+    nw_one : :class:`~.ding0.core.NetworkDing0`
+        First network
+    nw_two : :class:`~.ding0.core.NetworkDing0`
+        Second network
+    decimals : :obj:`int`
+        Count of decimal places floats are rounded to
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Differences, see :func:`diff_hashes`. The networks are identical if
+        it is empty.
+    """
+    return diff_hashes(network_hashes(nw_one, decimals=decimals),
+                       network_hashes(nw_two, decimals=decimals))
@@ -0,0 +1,407 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+import logging
+import os
+import re
+
+import pandas as pd
+
+from ding0.tools.results import export_network
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # Parquet datasets require pyarrow, CSV datasets are available without
+    pa = pq = None
+
+logger = logging.getLogger('ding0')
+
+# exported tables (names of files of export_data_tocsv()) with their columns
+# and column types, in order of the tables returned by export_network()
+EXPORT_TABLES = [
+    ('lv_grid', [('LV_grid_id', 'int64'),
+                 ('id_db', 'string'),
+                 ('geom', 'string'),
+                 ('population', 'float64'),
+                 ('voltage_nom', 'float64'),
+                 ('run_id', 'string')]),
+    ('lv_generator', [('id_db', 'string'),
+                      ('LV_grid_id_db', 'string'),
+                      ('geom', 'string'),
+                      ('type', 'string'),
+                      ('subtype', 'string'),
+                      ('v_level', 'int64'),
+                      ('nominal_capacity', 'float64'),
+                      ('run_id', 'string')]),
+    ('lv_branchtee', [('id_db', 'string'),
+                      ('LV_grid_id_db', 'string'),
+                      ('geom', 'string'),
+                      ('run_id', 'string')]),
+    ('lvmv_station', [('id_db', 'string'),
+                      ('LV_grid_id_db', 'string'),
+                      ('geom', 'string'),
+                      ('run_id', 'string')]),
+    ('lv_transformer', [('id_db', 'string'),
+                        ('geom', 'string'),
+                        ('LV_grid_id_db', 'string'),
+                        ('voltage_op', 'float64'),
+                        ('S_nom', 'float64'),
+                        ('x_pu', 'float64'),
+                        ('r_pu', 'float64'),
+                        ('run_id', 'string')]),
+    ('lv_load', [('id_db', 'string'),
+                 ('LV_grid_id_db', 'string'),
+                 ('geom', 'string'),
+                 ('consumption_residential', 'float64'),
+                 ('consumption_retail', 'float64'),
+                 ('consumption_agricultural', 'float64'),
+                 ('consumption_industrial', 'float64'),
+                 ('run_id', 'string')]),
+    ('mv_grid', [('MV_grid_id', 'int64'),
+                 ('id_db', 'string'),
+                 ('geom', 'string'),
+                 ('population', 'float64'),
+                 ('voltage_nom', 'float64'),
+                 ('run_id', 'string')]),
+    ('mv_generator', [('id_db', 'string'),
+                      ('MV_grid_id_db', 'string'),
+                      ('geom', 'string'),
+                      ('type', 'string'),
+                      ('subtype', 'string'),
+                      ('v_level', 'int64'),
+                      ('nominal_capacity', 'float64'),
+                      ('run_id', 'string'),
+                      ('is_aggregated', 'bool')]),
+    ('mv_branchtee', [('id_db', 'string'),
+                      ('MV_grid_id_db', 'string'),
+                      ('geom', 'string'),
+                      ('run_id', 'string')]),
+    ('mvhv_station', [('id_db', 'string'),
+                      ('MV_grid_id_db', 'string'),
+                      ('geom', 'string'),
+                      ('run_id', 'string')]),
+    ('mv_transformer', [('id_db', 'string'),
+                        ('geom', 'string'),
+                        ('MV_grid_id_db', 'string'),
+                        ('voltage_op', 'float64'),
+                        ('S_nom', 'float64'),
+                        ('x_pu', 'float64'),
+                        ('r_pu', 'float64'),
+                        ('run_id', 'string')]),
+    ('mv_load', [('id_db', 'string'),
+                 ('MV_grid_id_db', 'string'),
+                 ('geom', 'string'),
+                 ('consumption_retail', 'float64'),
+                 ('consumption_industrial', 'float64'),
+                 ('consumption_agricultural', 'float64'),
+                 ('consumption_residential', 'float64'),
+                 ('is_aggregated', 'bool'),
+                 ('run_id', 'string')]),
+    ('line', [('C_per_km', 'float64'),
+              ('I_max_th', 'float64'),
+              ('L_per_km', 'float64'),
+              ('R_per_km', 'float64'),
+              ('U_n', 'float64'),
+              ('edge_name', 'string'),
+              ('grid_id_db', 'string'),
+              ('length', 'float64'),
+              ('node1', 'string'),
+              ('node2', 'string'),
+              ('run_id', 'string'),
+              ('type_kind', 'string'),
+              ('type_name', 'string')]),
+    ('mvlv_mapping', [('MV_grid_id', 'int64'),
+                      ('MV_grid_id_db', 'string'),
+                      ('LV_grid_id', 'int64'),
+                      ('LV_grid_id_db', 'string'),
+                      ('run_id', 'string')])]
+
+# formats of datasets and extensions of their files
+EXPORT_FORMATS = {'parquet': 'parquet',
+                  'csv': 'csv'}
+
+# max. count of rows per row group of Parquet files
+ROW_GROUP_SIZE = 100000
+
+# column of MV grid district (partitioning key of datasets)
+PARTITION_COLUMN = 'mv_grid_district'
+
+
+def _partition_path(path, table, mv_grid_district_no):
+    """Returns directory of partition of `table` for one MV grid district"""
+    return os.path.join(path, table, '{}={}'.format(PARTITION_COLUMN,
+                                                    mv_grid_district_no))
+
+
+def _conform_table(table, columns):
+    """
+    Returns `table` with columns `columns` (in this order) of their types
+
+    Missing columns are added (null), values of string columns are converted
+    to :obj:`str` (nulls are kept).
+    """
+    table = table.reindex(columns=[column for column, _ in columns])
+    for column, dtype in columns:
+        values = table[column]
+        if dtype == 'string':
+            table[column] = values.astype(str).where(values.notnull(), None)
+        else:
+            table[column] = values.astype(dtype)
+    return table
+
+
+def _schema(columns):
+    """Returns Arrow schema of table with columns `columns`"""
+    types = {'string': pa.string(),
+             'int64': pa.int64(),
+             'float64': pa.float64(),
+             'bool': pa.bool_()}
+    return pa.schema([pa.field(column, types[dtype])
+                      for column, dtype in columns])
+
+
+def _check_formats(formats):
+    """Raises an error if one of `formats` is unknown or unavailable"""
+    unknown = [_ for _ in formats if _ not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError('Unknown export format(s) {}, valid formats are '
+                         '{}.'.format(unknown, list(EXPORT_FORMATS)))
+    if 'parquet' in formats and pq is None:
+        raise ImportError('Parquet datasets require pyarrow, please install '
+                          'it or use CSV.')
+
+
+class ExportWriterDing0:
+    """
+    Streams exported tables of MV grid districts to partitioned datasets
+
+    Each table of :func:`~.ding0.tools.results.export_network` is written to
+    a dataset (directory) of `path` which is partitioned by MV grid district
+    (hive-style, e.g. `line/mv_grid_district=42/part.parquet`). A MV grid
+    district is written as soon as it is passed to :meth:`write`, hence
+    runs may export each finished district right away and parallel runs
+    may write to the same `path`. Files are written to a temporary file
+    first and renamed, a partition is never left half-written.
+
+    Columns of tables have fixed types (see `EXPORT_TABLES`), e.g. a column
+    of consumption is float even if all values of a district are null.
+
+    All MV grid districts of `path` should be written with the same `mode`
+    as a district's files of tables without rows are removed (e.g. MV
+    tables if `mode` is 'LV').
+
+    Parameters
+    ----------
+    path: :obj:`str`
+        Directory of datasets
+    formats: :obj:`list` of :obj:`str`
+        Formats of datasets: 'parquet' (requires pyarrow) and/or 'csv'
+        (semicolon-separated as in
+        :func:`~.ding0.tools.results.export_data_tocsv`)
+    row_group_size: :obj:`int`
+        Max. count of rows per row group of Parquet files
+    mode: :obj:`str`
+        Voltage levels to be exported, see
+        :func:`~.ding0.tools.results.export_network`
+
+    See Also
+    --------
+    read_export : reads tables of selected MV grid districts
+    """
+
+    def __init__(self, path, formats=('parquet',),
+                 row_group_size=ROW_GROUP_SIZE, mode=''):
+        _check_formats(formats)
+
+        self.path = path
+        self.formats = list(formats)
+        self.row_group_size = row_group_size
+        self.mode = mode
+
+    def write(self, nw, mv_grid_districts=None):
+        """
+        Exports MV grid districts of `nw` and writes their tables
+
+        Parameters
+        ----------
+        nw: :class:`~.ding0.core.NetworkDing0`
+            Network
+        mv_grid_districts: :obj:`list` of :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+            MV grid districts of `nw` to be written. Default is None which
+            writes all MV grid districts.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`int`
+            Ids of written MV grid districts
+        """
+        if mv_grid_districts is None:
+            mv_grid_districts = list(nw.mv_grid_districts())
+
+        for mv_grid_district in mv_grid_districts:
+            tables = export_network(nw, mode=self.mode,
+                                    mv_grid_districts=[mv_grid_district])[1:]
+            self.write_tables(mv_grid_district.id_db, tables)
+            logger.info('Exported tables of {} to {}.'.format(
+                mv_grid_district, self.path))
+
+        return [_.id_db for _ in mv_grid_districts]
+
+    def write_tables(self, mv_grid_district_no, tables):
+        """
+        Writes tables of one MV grid district
+
+        Existing files of the MV grid district are replaced, files of tables
+        without rows are removed.
+
+        Parameters
+        ----------
+        mv_grid_district_no: :obj:`int`
+            Id of MV grid district
+        tables: :obj:`list` of :pandas:`pandas.DataFrame<dataframe>`
+            Tables in order of `EXPORT_TABLES` (as returned by
+            :func:`~.ding0.tools.results.export_network` without run id)
+        """
+        for (name, columns), table in zip(EXPORT_TABLES, tables):
+            directory = _partition_path(self.path, name, mv_grid_district_no)
+            files = {format: os.path.join(
+                         directory, 'part.' + EXPORT_FORMATS[format])
+                     for format in self.formats}
+
+            if table.empty:
+                for file in files.values():
+                    if os.path.exists(file):
+                        os.remove(file)
+                if os.path.isdir(directory) and not os.listdir(directory):
+                    os.rmdir(directory)
+                continue
+
+            table = _conform_table(table, columns)
+            os.makedirs(directory, exist_ok=True)
+
+            for format, file in files.items():
+                tmp_file = file + '.tmp'
+                if format == 'parquet':
+                    pq.write_table(
+                        pa.Table.from_pandas(table, schema=_schema(columns),
+                                             preserve_index=False),
+                        tmp_file,
+                        row_group_size=self.row_group_size)
+                else:
+                    table.to_csv(tmp_file, sep=';', index=False)
+                os.replace(tmp_file, file)
+
+
+def exported_mv_grid_districts(path, tables=None):
+    """
+    Returns ids of MV grid districts in datasets of `path`
+
+    Parameters
+    ----------
+    path: :obj:`str`
+        Directory of datasets, see :class:`ExportWriterDing0`
+    tables: :obj:`list` of :obj:`str`
+        Datasets to be searched. Default is None which searches all.
+
+    Returns
+    -------
+    :obj:`list` of :obj:`int`
+        Sorted ids of MV grid districts
+    """
+    if tables is None:
+        tables = [name for name, _ in EXPORT_TABLES]
+
+    pattern = re.compile(r'^{}=(\d+)$'.format(PARTITION_COLUMN))
+    mv_grid_districts_no = set()
+    for table in tables:
+        if not os.path.isdir(os.path.join(path, table)):
+            continue
+        for directory in os.listdir(os.path.join(path, table)):
+            match = pattern.match(directory)
+            if match:
+                mv_grid_districts_no.add(int(match.group(1)))
+
+    return sorted(mv_grid_districts_no)
+
+
+def read_export(path, tables=None, mv_grid_districts_no=None,
+                format='parquet'):
+    """
+    Reads tables of MV grid districts written by :class:`ExportWriterDing0`
+
+    Only the files of the requested tables and MV grid districts are read.
+
+    Parameters
+    ----------
+    path: :obj:`str`
+        Directory of datasets
+    tables: :obj:`list` of :obj:`str`
+        Tables to be read, e.g. ['mv_grid', 'line']. Default is None which
+        reads all tables (see `EXPORT_TABLES`).
+    mv_grid_districts_no: :obj:`list` of :obj:`int`
+        Ids of MV grid districts to be read. Default is None which reads all
+        exported MV grid districts.
+    format: :obj:`str`
+        Format of datasets, 'parquet' or 'csv'
+
+    Returns
+    -------
+    :obj:`dict`
+        Table (:pandas:`pandas.DataFrame<dataframe>`) keyed by name. Rows
+        are in order of `mv_grid_districts_no`, column 'mv_grid_district'
+        holds the id of the MV grid district of a row.
+    """
+    _check_formats([format])
+
+    table_columns = dict(EXPORT_TABLES)
+    if tables is None:
+        tables = [name for name, _ in EXPORT_TABLES]
+    unknown = [_ for _ in tables if _ not in table_columns]
+    if unknown:
+        raise ValueError('Unknown table(s) {}.'.format(unknown))
+
+    if mv_grid_districts_no is None:
+        mv_grid_districts_no = exported_mv_grid_districts(path, tables)
+
+    data = {}
+    for table in tables:
+        columns = table_columns[table]
+        frames = []
+        for mv_grid_district_no in mv_grid_districts_no:
+            file = os.path.join(
+                _partition_path(path, table, mv_grid_district_no),
+                'part.' + EXPORT_FORMATS[format])
+            if not os.path.exists(file):
+                continue
+            if format == 'parquet':
+                frame = pq.read_table(file).to_pandas()
+            else:
+                frame = _conform_table(
+                    pd.read_csv(file, sep=';',
+                                dtype={column: str for column, dtype in columns
+                                       if dtype == 'string'}),
+                    columns)
+            frame[PARTITION_COLUMN] = mv_grid_district_no
+            frames.append(frame)
+
+        if frames:
+            data[table] = pd.concat(frames, ignore_index=True)
+        else:
+            data[table] = _conform_table(pd.DataFrame(), columns)
+            data[table][PARTITION_COLUMN] = pd.Series(dtype='int64')
+
+    return data
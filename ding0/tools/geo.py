@@ -23,11 +23,67 @@ import logging
 
 if not 'READTHEDOCS' in os.environ:
     from shapely.geometry import LineString
+    from shapely.geometry.base import BaseGeometry
     from shapely.ops import transform
+    from shapely.wkt import loads as wkt_loads
+    from shapely.wkb import loads as wkb_loads
+    try:
+        # vectorized parsers, available in shapely >= 2.0
+        from shapely import from_wkt, from_wkb
+    except ImportError:
+        from_wkt = None
+        from_wkb = None
 
 logger = logging.getLogger('ding0')
 
 
+def geoms_from_wkt(values):
+    """ Parse WKT (or WKB) geometries of a column at once.
+
+    With shapely >= 2.0 all geometries are parsed in a single vectorized call,
+    otherwise they are parsed one by one. Values given as bytes are read as
+    WKB (e.g. from an input snapshot, see :mod:`~.ding0.tools.snapshot`).
+    Values that are shapely geometries already are passed through, missing
+    values (None, NaN, empty strings) result in None.
+
+    Parameters
+    ----------
+    values : :obj:`list` or :pandas:`pandas.Series<series>`
+        WKT strings, WKB bytes (or geometries)
+
+    Returns
+    -------
+    :obj:`list`
+        Shapely geometries in order of `values`
+    """
+    values = list(values)
+    wkts = [value if isinstance(value, str) and value else None
+            for value in values]
+    wkbs = [bytes(value) if isinstance(value, (bytes, memoryview)) and value
+            else None
+            for value in values]
+
+    if from_wkt is not None:
+        geoms = from_wkt(wkts)
+    else:
+        geoms = [wkt_loads(wkt) if wkt is not None else None for wkt in wkts]
+
+    if any(wkb is not None for wkb in wkbs):
+        if from_wkb is not None:
+            geoms_wkb = from_wkb(wkbs)
+        else:
+            geoms_wkb = [wkb_loads(wkb) if wkb is not None else None
+                         for wkb in wkbs]
+    else:
+        geoms_wkb = wkbs
+
+    return [geom if isinstance(value, str)
+            else geom_wkb if isinstance(value, (bytes, memoryview))
+            else value if isinstance(value, BaseGeometry)
+            else None
+            for value, geom, geom_wkb in zip(values, geoms, geoms_wkb)]
+
+
 def calc_geo_branches_in_polygon(mv_grid, polygon, mode, proj):
     """ Calculate geographical branches in polygon.
 
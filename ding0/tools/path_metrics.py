@@ -0,0 +1,138 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+from collections import deque
+from math import nan
+
+
+def path_metrics(graph, root, omega, impedance=0j):
+    """
+    Computes metrics of the paths from `root` to all nodes of `graph`
+
+    All paths are determined in a single breadth-first traversal, i.e. as
+    in :meth:`~.ding0.core.network.GridDing0.find_path` the path with the
+    min. count of hops is chosen (if there are several paths in a closed
+    ring, the one found first is taken). Metrics are accumulated along the
+    tree of these paths:
+
+    * impedance: complex impedance of path (R + jX) in Ohm, R and X of a
+      branch are calculated as in :func:`~.ding0.tools.results.calculate_mvgd_stats`
+    * length: length of path in m
+    * I_max_th: thermal limit (type's `I_max_th`) of first segment of path
+
+    Parameters
+    ----------
+    graph : :networkx:`NetworkX Graph Obj< >`
+        Graph of grid with branches as edge attribute `branch`
+    root : ding0 node object
+        Root of paths, e.g. HV-MV or MV-LV station
+    omega : :obj:`float`
+        Angular frequency in 1/s
+    impedance : :obj:`complex`
+        Impedance upstream of `root` (e.g. of transformers in root station)
+        that is added to the impedance of each path
+
+    Returns
+    -------
+    :obj:`dict`
+        Tuple (impedance, length, I_max_th) keyed by node. Nodes not
+        connected to `root` are omitted. I_max_th of `root` is NaN.
+
+    See Also
+    --------
+    compose_path_metrics : composes metrics of paths across voltage levels
+    """
+    metrics = {root: (impedance, 0., nan)}
+
+    # parameters of branch types (pandas Series) by id of type
+    types = {}
+
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        node_impedance, node_length, node_i_max_th = metrics[node]
+        for neighbor, edge in graph.adj[node].items():
+            if neighbor in metrics:
+                continue
+
+            branch = edge['branch']
+            try:
+                r_per_km, l_per_km, i_max_th = types[id(branch.type)]
+            except KeyError:
+                r_per_km, l_per_km, i_max_th = types[id(branch.type)] = (
+                    branch.type['R_per_km'],
+                    branch.type['L_per_km'],
+                    branch.type['I_max_th'])
+
+            metrics[neighbor] = (
+                node_impedance +
+                ((l_per_km * 1e-3 * omega * branch.length) * 1j +
+                 (r_per_km * branch.length)),
+                node_length + branch.length,
+                i_max_th if node is root else node_i_max_th)
+            queue.append(neighbor)
+
+    return metrics
+
+
+def compose_path_metrics(upstream, metrics):
+    """
+    Composes metrics of paths of a subordinate grid with the metrics of the
+    path to its root in the superior grid
+
+    E.g. metrics of paths from HV-MV station to all nodes of a LV grid are
+    composed of the metrics of the path to the MV-LV station (`upstream`)
+    and of the LV grid's paths (`metrics`). I_max_th is the one of the first
+    segment of the upstream path.
+
+    Parameters
+    ----------
+    upstream : :obj:`tuple`
+        Metrics (impedance, length, I_max_th) of path to root of `metrics`
+    metrics : :obj:`dict`
+        Metrics of paths in subordinate grid, see :func:`path_metrics`
+
+    Returns
+    -------
+    :obj:`dict`
+        Tuple (impedance, length, I_max_th) keyed by node
+    """
+    upstream_impedance, upstream_length, upstream_i_max_th = upstream
+    return {node: (upstream_impedance + impedance,
+                   upstream_length + length,
+                   upstream_i_max_th)
+            for node, (impedance, length, _) in metrics.items()}
+
+
+def station_impedance(station):
+    """
+    Returns impedance of transformers of `station` (operated in parallel)
+
+    Parameters
+    ----------
+    station : :class:`~.ding0.core.network.StationDing0`
+        Station
+
+    Returns
+    -------
+    :obj:`complex`
+        Impedance in Ohm (0 if station has no transformers)
+    """
+    admittance = 0.
+    for trafo in station.transformers():
+        admittance += 1. / trafo.z()
+    if admittance != 0.:
+        return 1. / admittance
+    return 0.
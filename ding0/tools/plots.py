@@ -1,8 +1,9 @@
 import os
 import math
+from functools import lru_cache
 import numpy as np
 import matplotlib.pyplot as plt
-import networkx as nx
+from matplotlib.collections import LineCollection
 from pyproj import Proj, transform
 import logging
 
@@ -27,11 +28,130 @@ if 'READTHEDOCS' not in os.environ:
         use_ctx = False
 
 
+# TODO: MOVE settings to config
+# node types (name of classes)
+NODE_TYPES = ['MVStationDing0',
+              'LVStationDing0',
+              'LVLoadAreaCentreDing0',
+              'MVCableDistributorDing0',
+              'GeneratorDing0',
+              'GeneratorFluctuatingDing0',
+              'CircuitBreakerDing0',
+              'n/a']
+
+# node styles
+# TODO: Add additional symbols (markers) per node type here
+NODE_COLORS = {'MVStationDing0': '#f2ae00',
+               'LVStationDing0': 'grey',
+               'LVLoadAreaCentreDing0': '#fffc3d',
+               'MVCableDistributorDing0': '#000000',
+               'GeneratorDing0': '#00b023',
+               'GeneratorFluctuatingDing0': '#0078b0',
+               'CircuitBreakerDing0': '#c20000',
+               'n/a': 'orange'}
+NODE_SIZES = {'MVStationDing0': 120,
+              'LVStationDing0': 7,
+              'LVLoadAreaCentreDing0': 30,
+              'MVCableDistributorDing0': 5,
+              'GeneratorDing0': 50,
+              'GeneratorFluctuatingDing0': 50,
+              'CircuitBreakerDing0': 50,
+              'n/a': 5}
+NODE_ZORDERS = {'MVStationDing0': 16,
+                'LVStationDing0': 12,
+                'LVLoadAreaCentreDing0': 11,
+                'MVCableDistributorDing0': 13,
+                'GeneratorDing0': 14,
+                'GeneratorFluctuatingDing0': 14,
+                'CircuitBreakerDing0': 15,
+                'n/a': 10}
+
+# count of background maps (extents) kept in memory
+BACKGROUND_MAP_CACHE_SIZE = 32
+
+
+def mv_topology_geometry(grid):
+    """ Returns projected geometry of MV grid for plotting
+
+    The geometry can be passed to several calls of :func:`plot_mv_topology`
+    as long as the topology of the grid does not change, e.g. to plot the
+    load and the feed-in case of a power flow.
+
+    Parameters
+    ----------
+    grid : :obj:`MVGridDing0`
+        MV grid to plot.
+
+    Returns
+    -------
+    :obj:`dict`
+        Geometry of grid in WGS84 pseudo mercator (epsg:3857)
+
+        * 'nodes': nodes of graph
+        * 'node_types': name of type of each node (see `NODE_TYPES`)
+        * 'positions': coordinates of each node, shape (n, 2)
+        * 'branches': branches of graph
+        * 'segments': coordinates of nodes of each branch, shape (m, 2, 2)
+        * 'extent': (xmin, xmax, ymin, ymax) of MV grid district and nodes
+    """
+    g = grid._graph
+    model_proj = grid.network.config['geo']['srid']
+    in_proj = Proj(init='epsg:{srid}'.format(srid=model_proj))
+    out_proj = Proj(init='epsg:3857')
+
+    nodes = list(g.nodes())
+    node_index = {node: idx for idx, node in enumerate(nodes)}
+    node_types = np.array([type(n).__name__ if type(n).__name__ in NODE_TYPES
+                           else 'n/a' for n in nodes], dtype=object)
+
+    # reproject to WGS84 pseudo mercator (all nodes at once)
+    coordinates = np.array([(n.geo_data.x, n.geo_data.y) for n in nodes],
+                           dtype=float).reshape(-1, 2)
+    x, y = transform(in_proj, out_proj, coordinates[:, 0], coordinates[:, 1])
+    positions = np.column_stack((x, y))
+
+    branches = []
+    edges = []
+    for n1, n2, branch in g.edges(data='branch'):
+        branches.append(branch)
+        edges.append((node_index[n1], node_index[n2]))
+    segments = positions[np.array(edges, dtype=int).reshape(-1, 2)]
+
+    # extent of MV grid district (if available) which is the same for all
+    # plots of a grid, hence its background map is loaded once
+    x, y = positions[:, 0], positions[:, 1]
+    district = getattr(grid.grid_district, 'geo_data', None)
+    if district is not None and not district.is_empty:
+        xmin, ymin, xmax, ymax = district.bounds
+        x_district, y_district = transform(in_proj, out_proj,
+                                           np.array([xmin, xmax]),
+                                           np.array([ymin, ymax]))
+        x = np.concatenate((x, x_district))
+        y = np.concatenate((y, y_district))
+    margin = max(x.max() - x.min(), y.max() - y.min(), 1e3) * 0.05
+    extent = (float(x.min() - margin), float(x.max() + margin),
+              float(y.min() - margin), float(y.max() + margin))
+
+    return {'nodes': nodes,
+            'node_types': node_types,
+            'positions': positions,
+            'branches': branches,
+            'segments': segments,
+            'extent': extent}
+
+
+@lru_cache(maxsize=BACKGROUND_MAP_CACHE_SIZE)
+def _background_map(xmin, xmax, ymin, ymax, zoom=12):
+    """Returns tiles of background map of extent (cached)"""
+    return ctx.bounds2img(xmin, ymin, xmax, ymax, zoom=zoom,
+                          url=ctx.sources.ST_TONER_LITE)
+
+
 def plot_mv_topology(grid, subtitle='', filename=None, testcase='load',
                      line_color=None, node_color='type',
                      limits_cb_lines=None, limits_cb_nodes=None,
-                     background_map=True):
-    """ Draws MV grid graph using networkx
+                     background_map=True, geometry=None):
+    """ Draws MV grid graph using matplotlib collections
 
     Parameters
     ----------
@@ -82,7 +202,12 @@ def plot_mv_topology(grid, subtitle='', filename=None, testcase='load',
     background_map : bool, optional
         If True, a background map is plotted (default: stamen toner light).
         The additional package `contextily` is needed for this functionality.
+        Maps are cached per extent of MV grid district.
         Default: True
+    geometry : :obj:`dict`, optional
+        Geometry of `grid` as returned by :func:`mv_topology_geometry`. Pass
+        it to plot several cases of the same topology without projecting the
+        grid again. Default: None (geometry is created)
 
     Note
     -----
@@ -91,105 +216,31 @@ def plot_mv_topology(grid, subtitle='', filename=None, testcase='load',
 
     """
 
-    def set_nodes_style_and_position(nodes):
-
-        # TODO: MOVE settings to config
-        # node types (name of classes)
-        node_types = ['MVStationDing0',
-                      'LVStationDing0',
-                      'LVLoadAreaCentreDing0',
-                      'MVCableDistributorDing0',
-                      'GeneratorDing0',
-                      'GeneratorFluctuatingDing0',
-                      'CircuitBreakerDing0',
-                      'n/a']
-        
-        # node styles
-        colors_dict = {'MVStationDing0': '#f2ae00',
-                       'LVStationDing0': 'grey',
-                       'LVLoadAreaCentreDing0': '#fffc3d',
-                       'MVCableDistributorDing0': '#000000',
-                       'GeneratorDing0': '#00b023',
-                       'GeneratorFluctuatingDing0': '#0078b0',
-                       'CircuitBreakerDing0': '#c20000',
-                       'n/a': 'orange'}
-        sizes_dict = {'MVStationDing0': 120,
-                      'LVStationDing0': 7,
-                      'LVLoadAreaCentreDing0': 30,
-                      'MVCableDistributorDing0': 5,
-                      'GeneratorDing0': 50,
-                      'GeneratorFluctuatingDing0': 50,
-                      'CircuitBreakerDing0': 50,
-                      'n/a': 5}
-        zindex_by_type = {'MVStationDing0': 16,
-                          'LVStationDing0': 12,
-                          'LVLoadAreaCentreDing0': 11,
-                          'MVCableDistributorDing0': 13,
-                          'GeneratorDing0': 14,
-                          'GeneratorFluctuatingDing0': 14,
-                          'CircuitBreakerDing0': 15,
-                          'n/a': 10}
-
-        # dict of node class names: list of nodes
-        nodes_by_type = {_: [] for _ in node_types}
-        # dict of node class names: list of node-individual color
-        node_colors_by_type = {_: [] for _ in node_types}
-        # dict of node class names: list of node-individual size
-        node_sizes_by_type = {_: [] for _ in node_types}
-        node_sizes_by_type['all'] = []
-        # dict of nodes:node-individual positions
-        nodes_pos = {}
-
-        for n in nodes:
-            if type(n).__name__ in node_types:
-                nodes_by_type[type(n).__name__].append(n)
-                node_colors_by_type[type(n).__name__].append(colors_dict[type(n).__name__])
-                node_sizes_by_type[type(n).__name__].append(sizes_dict[type(n).__name__])
-                node_sizes_by_type['all'].append(sizes_dict[type(n).__name__])
-            else:
-                nodes_by_type['n/a'].append(n)
-                node_colors_by_type['n/a'].append(colors_dict['n/a'])
-                node_sizes_by_type['n/a'].append(sizes_dict['n/a'])
-                node_sizes_by_type['all'].append(sizes_dict['n/a'])
-            nodes_pos[n] = (n.geo_data.x, n.geo_data.y)
-
-        return node_types, nodes_by_type, node_colors_by_type,\
-               node_sizes_by_type, zindex_by_type, nodes_pos
-
-    def reproject_nodes(nodes_pos, model_proj='4326'):
-        inProj = Proj(init='epsg:{srid}'.format(srid=model_proj))
-        outProj = Proj(init='epsg:3857')
-        nodes_pos2 = {}
-        for k, v in nodes_pos.items():
-            x2, y2 = transform(inProj, outProj,
-                               v[0],
-                               v[1])
-            nodes_pos2[k] = (x2, y2)
-        return nodes_pos2
-
     def plot_background_map(ax):
-        url = ctx.sources.ST_TONER_LITE
-        xmin, xmax, ymin, ymax = ax.axis()
-        basemap, extent = ctx.bounds2img(xmin, ymin, xmax, ymax,
-                                         zoom=12, url=url)
+        xmin, xmax, ymin, ymax = geometry['extent']
+        basemap, extent = _background_map(xmin, xmax, ymin, ymax)
         ax.imshow(basemap, extent=extent, interpolation='bilinear', zorder=0)
         ax.axis((xmin, xmax, ymin, ymax))
 
     def plot_region_data(ax):
         # get geoms of MV grid district, load areas and LV grid districts
-        mv_grid_district = gpd.GeoDataFrame({'geometry': grid.grid_district.geo_data},
-                                            crs={'init': 'epsg:{srid}'.format(srid=model_proj)})
-        load_areas = gpd.GeoDataFrame({'geometry': [la.geo_area for la in grid.grid_district.lv_load_areas()]},
-                                      crs={'init': 'epsg:{srid}'.format(srid=model_proj)})
-        lv_grid_districts = gpd.GeoDataFrame({'geometry': [lvgd.geo_data
-                                                           for la in grid.grid_district.lv_load_areas()
-                                                           for lvgd in la.lv_grid_districts()]},
-                                             crs={'init': 'epsg:{srid}'.format(srid=model_proj)})
-
-        # reproject to WGS84 pseudo mercator
-        mv_grid_district = mv_grid_district.to_crs(epsg=3857)
-        load_areas = load_areas.to_crs(epsg=3857)
-        lv_grid_districts = lv_grid_districts.to_crs(epsg=3857)
+        # (reprojected once per geometry)
+        if 'regions' not in geometry:
+            crs = {'init': 'epsg:{srid}'.format(srid=model_proj)}
+            mv_grid_district = gpd.GeoDataFrame({'geometry': grid.grid_district.geo_data},
+                                                crs=crs)
+            load_areas = gpd.GeoDataFrame({'geometry': [la.geo_area for la in grid.grid_district.lv_load_areas()]},
+                                          crs=crs)
+            lv_grid_districts = gpd.GeoDataFrame({'geometry': [lvgd.geo_data
+                                                               for la in grid.grid_district.lv_load_areas()
+                                                               for lvgd in la.lv_grid_districts()]},
+                                                 crs=crs)
+
+            # reproject to WGS84 pseudo mercator
+            geometry['regions'] = (mv_grid_district.to_crs(epsg=3857),
+                                   load_areas.to_crs(epsg=3857),
+                                   lv_grid_districts.to_crs(epsg=3857))
+        mv_grid_district, load_areas, lv_grid_districts = geometry['regions']
 
         # plot
         mv_grid_district.plot(ax=ax, color='#ffffff', alpha=0.2, edgecolor='k', linewidth=2, zorder=2)
@@ -201,47 +252,44 @@ def plot_mv_topology(grid, subtitle='', filename=None, testcase='load',
                        'instance of MVGridDing0. Plotting is skipped.')
         return
 
-    g = grid._graph
     model_proj = grid.network.config['geo']['srid']
+    if geometry is None:
+        geometry = mv_topology_geometry(grid)
+    positions = geometry['positions']
+    node_types = geometry['node_types']
+    node_sizes = np.array([NODE_SIZES[_] for _ in node_types])
 
     if testcase == 'feedin':
         case_idx = 1
     else:
         case_idx = 0
 
-    nodes_types, nodes_by_type, node_colors_by_type, node_sizes_by_type, zindex_by_type, nodes_pos =\
-        set_nodes_style_and_position(g.nodes())
-
-    # reproject to WGS84 pseudo mercator
-    nodes_pos = reproject_nodes(nodes_pos, model_proj=model_proj)
-
     plt.figure(figsize=(9, 6))
     ax = plt.gca()
 
+    edges = LineCollection(geometry['segments'], linewidths=1., zorder=5)
     if line_color == 'loading':
-        edges_color = []
-        for n1, n2 in g.edges():
-            edge = g.adj[n1][n2]
-            if hasattr(edge['branch'], 's_res'):
-                edges_color.append(edge['branch'].s_res[case_idx] * 1e3 /
-                                   (3 ** 0.5 * edge['branch'].type['U_n'] * edge['branch'].type['I_max_th']))
-            else:
-                edges_color.append(0)
-        edges_cmap = plt.get_cmap('jet')
+        edges_color = np.zeros(len(geometry['branches']))
+        for idx, branch in enumerate(geometry['branches']):
+            s_res = getattr(branch, 's_res', None)
+            if s_res is not None:
+                edges_color[idx] = (s_res[case_idx] * 1e3 /
+                                    (3 ** 0.5 * branch.type['U_n'] * branch.type['I_max_th']))
+        edges.set_array(edges_color)
+        edges.set_cmap(plt.get_cmap('jet'))
         #edges_cmap.set_over('#952eff')
+        edges.set_clim(0, 1)
     else:
-        edges_color = ['black'] * len(list(grid.graph_edges()))
-        edges_cmap = None
+        edges.set_color('black')
+    ax.add_collection(edges)
 
     # plot nodes by voltage
     if node_color == 'voltage':
         voltage_station = grid._station.voltage_res[case_idx]
-        nodes_color = []
-        for n in g.nodes():
-            if hasattr(n, 'voltage_res'):
-                nodes_color.append(n.voltage_res[case_idx])
-            else:
-                nodes_color.append(voltage_station)
+        nodes_color = np.array(
+            [voltage_station if getattr(n, 'voltage_res', None) is None
+             else n.voltage_res[case_idx] for n in geometry['nodes']],
+            dtype=float)
 
         if testcase == 'feedin':
             nodes_cmap = plt.get_cmap('Reds')
@@ -256,23 +304,20 @@ def plot_mv_topology(grid, subtitle='', filename=None, testcase='load',
                                                  ['mv_max_v_level_lc_diff_normal'])
             nodes_vmax = voltage_station
 
-        nodes = nx.draw_networkx_nodes(g,
-                                       pos=nodes_pos,
-                                       node_color=nodes_color,
-                                       # node_shape='o', # TODO: Add additional symbols here
-                                       cmap=nodes_cmap,
-                                       vmin=nodes_vmin,
-                                       vmax=nodes_vmax,
-                                       node_size=node_sizes_by_type['all'],
-                                       linewidths=0.25,
-                                       ax=ax)
-        nodes.set_zorder(10)
-        nodes.set_edgecolor('k')
+        nodes = ax.scatter(positions[:, 0], positions[:, 1],
+                           c=nodes_color,
+                           cmap=nodes_cmap,
+                           vmin=nodes_vmin,
+                           vmax=nodes_vmax,
+                           s=node_sizes,
+                           linewidths=0.25,
+                           edgecolors='k',
+                           zorder=10)
 
         # colorbar nodes
         if limits_cb_nodes is None:
-            limits_cb_nodes = (math.floor(min(nodes_color)*100)/100,
-                               math.ceil(max(nodes_color)*100)/100)
+            limits_cb_nodes = (math.floor(nodes_color.min()*100)/100,
+                               math.ceil(nodes_color.max()*100)/100)
         v_range = np.linspace(limits_cb_nodes[0], limits_cb_nodes[1], 101)
         cb_voltage = plt.colorbar(nodes, boundaries=v_range,
                                   ticks=v_range[0:101:10],
@@ -284,38 +329,22 @@ def plot_mv_topology(grid, subtitle='', filename=None, testcase='load',
 
     # plot nodes by type
     else:
-        for node_type in nodes_types:
-            if len(nodes_by_type[node_type]) != 0:
-                nodes = nx.draw_networkx_nodes(g,
-                                               nodelist=nodes_by_type[node_type],
-                                               pos=nodes_pos,
-                                               # node_shape='o', # TODO: Add additional symbols here
-                                               node_color=node_colors_by_type[node_type],
-                                               cmap=None,
-                                               vmin=None,
-                                               vmax=None,
-                                               node_size=node_sizes_by_type[node_type],
-                                               linewidths=0.25,
-                                               label=node_type,
-                                               ax=ax)
-                nodes.set_zorder(zindex_by_type[node_type])
-                nodes.set_edgecolor('k')
-
-    edges = nx.draw_networkx_edges(g,
-                                   pos=nodes_pos,
-                                   edge_color=edges_color,
-                                   edge_cmap=edges_cmap,
-                                   edge_vmin=0,
-                                   edge_vmax=1,
-                                   #width=1,
-                                   ax=ax)
-    edges.set_zorder(5)
+        for node_type in NODE_TYPES:
+            mask = node_types == node_type
+            if mask.any():
+                ax.scatter(positions[mask, 0], positions[mask, 1],
+                           c=NODE_COLORS[node_type],
+                           s=node_sizes[mask],
+                           linewidths=0.25,
+                           edgecolors='k',
+                           label=node_type,
+                           zorder=NODE_ZORDERS[node_type])
 
     if line_color == 'loading':
         # colorbar edges
         if limits_cb_lines is None:
-            limits_cb_lines = (math.floor(min(edges_color)*100)/100,
-                               math.ceil(max(edges_color)*100)/100)
+            limits_cb_lines = (math.floor(edges_color.min()*100)/100,
+                               math.ceil(edges_color.max()*100)/100)
         loading_range = np.linspace(limits_cb_lines[0], limits_cb_lines[1], 101)
         cb_loading = plt.colorbar(edges, boundaries=loading_range,
                                   ticks=loading_range[0:101:10],
@@ -329,6 +358,7 @@ def plot_mv_topology(grid, subtitle='', filename=None, testcase='load',
         plot_background_map(ax=ax)
     if use_gpd:
         plot_region_data(ax=ax)
+    ax.axis(geometry['extent'])
 
     plt.legend(fontsize=7)
     plt.title('MV Grid District {id} - {st}'.format(id=grid.id_db,
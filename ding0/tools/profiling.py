@@ -0,0 +1,302 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from math import nan
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, peak RSS is not recorded there
+    resource = None
+
+logger = logging.getLogger('ding0')
+
+# count of power flow calculations per grid (keyed by repr of grid),
+# incremented by the power flow functions of ding0.tools.pypsa_io
+_pf_calls = Counter()
+
+
+def count_pf_calls(*grids):
+    """Counts a power flow calculation for each grid of `grids`
+
+    Parameters
+    ----------
+    grids : :class:`~.ding0.core.GridDing0`
+        Grids a power flow was calculated for
+    """
+    for grid in grids:
+        _pf_calls[repr(grid)] += 1
+
+
+def cpu_time():
+    """Returns CPU time (user + system) of this process and its terminated
+    child processes (e.g. LV worker processes) in seconds"""
+    times = os.times()
+    return (times.user + times.system +
+            times.children_user + times.children_system)
+
+
+def peak_rss():
+    """Returns peak resident set size of this process in MiB (None if not
+    available)"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is given in bytes on macOS and in KiB on Linux
+    if sys.platform == 'darwin':
+        return max_rss / 1024 ** 2
+    return max_rss / 1024
+
+
+def count_grid_objects(mv_grid_district):
+    """Counts nodes and branches of MV grid and LV grids of a MV grid district
+
+    LV grids that are built lazily and not materialized yet are not counted
+    (counting them would materialize them).
+
+    Parameters
+    ----------
+    mv_grid_district : :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid district
+
+    Returns
+    -------
+    :obj:`int`
+        Count of nodes
+    :obj:`int`
+        Count of branches
+    """
+    graphs = [mv_grid_district.mv_grid._graph]
+    for lv_load_area in mv_grid_district.lv_load_areas():
+        for lv_grid_district in lv_load_area.lv_grid_districts():
+            lv_grid = lv_grid_district.lv_grid
+            if lv_grid is not None and lv_grid.materialized:
+                graphs.append(lv_grid._graph)
+
+    return (sum(graph.number_of_nodes() for graph in graphs),
+            sum(graph.number_of_edges() for graph in graphs))
+
+
+class ProfilerDing0:
+    """ Records metrics of the steps of a ding0 run
+
+    For each step, wall time, CPU time, peak RSS, count of nodes and branches
+    (after the step) and count of power flow calculations (during the step)
+    are recorded. Object and power flow counts are also recorded per MV grid
+    district.
+
+    Parameters
+    ----------
+    network : :class:`~.ding0.core.NetworkDing0`
+        Network the run is performed for
+    enabled : :obj:`bool`, defaults to True
+        If False, nothing is recorded
+
+    Note
+    -----
+    Peak RSS is the high-water mark of the process, i.e. the peak reached
+    until the end of the step.
+    """
+
+    def __init__(self, network, enabled=True):
+        self.network = network
+        self.enabled = enabled
+        self.steps = []
+
+    @contextmanager
+    def step(self, no, name):
+        """Context manager that records metrics of the enclosed step
+
+        Parameters
+        ----------
+        no : :obj:`int`
+            Number of step
+        name : :obj:`str`
+            Name of step
+        """
+        if not self.enabled:
+            yield
+            return
+
+        pf_calls = Counter(_pf_calls)
+        cpu_start = cpu_time()
+        wall_start = time.perf_counter()
+
+        yield
+
+        wall = time.perf_counter() - wall_start
+        cpu = cpu_time() - cpu_start
+
+        mv_grid_districts = {}
+        for mv_grid_district in self.network.mv_grid_districts():
+            nodes, branches = count_grid_objects(mv_grid_district)
+            grid = repr(mv_grid_district.mv_grid)
+            mv_grid_districts[int(mv_grid_district.id_db)] = {
+                'nodes': nodes,
+                'branches': branches,
+                'pf_calls': _pf_calls[grid] - pf_calls[grid]}
+
+        self.steps.append({
+            'step': no,
+            'name': name,
+            'wall_time': wall,
+            'cpu_time': cpu,
+            'peak_rss': peak_rss(),
+            'nodes': sum(_['nodes'] for _ in mv_grid_districts.values()),
+            'branches': sum(_['branches']
+                            for _ in mv_grid_districts.values()),
+            'pf_calls': sum((_pf_calls - pf_calls).values()),
+            'mv_grid_districts': mv_grid_districts})
+
+        logger.info('Step {} ({}) took {:.2f} s (CPU {:.2f} s).'.format(
+            no, name, wall, cpu))
+
+    def record(self):
+        """Returns metrics record of the run
+
+        Returns
+        -------
+        :obj:`dict`
+            Record with keys `network`, `mv_grid_districts`, `wall_time`,
+            `cpu_time`, `peak_rss` and `steps` (:obj:`list` of metrics per
+            step). The record is JSON serializable.
+        """
+        peak_rss_steps = [_['peak_rss'] for _ in self.steps
+                          if _['peak_rss'] is not None]
+
+        return {'network': self.network.name,
+                'mv_grid_districts': [int(_.id_db) for _ in
+                                      self.network.mv_grid_districts()],
+                'wall_time': sum(_['wall_time'] for _ in self.steps),
+                'cpu_time': sum(_['cpu_time'] for _ in self.steps),
+                'peak_rss': max(peak_rss_steps) if peak_rss_steps else None,
+                'steps': self.steps}
+
+
+def write_metrics(records, path):
+    """Appends metrics records to a JSON lines file (one record per line)
+
+    Parameters
+    ----------
+    records : :obj:`list` of :obj:`dict`
+        Metrics records, see :meth:`ProfilerDing0.record`
+    path : :obj:`str`
+        Path of JSON lines file
+    """
+    with open(path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def read_metrics(path):
+    """Reads metrics records from a JSON lines file
+
+    Parameters
+    ----------
+    path : :obj:`str`
+        Path of JSON lines file
+
+    Returns
+    -------
+    :obj:`list` of :obj:`dict`
+        Metrics records
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def aggregate_metrics(records):
+    """Aggregates metrics records of several runs per step
+
+    Times, object counts and power flow calculations are summed up, peak RSS
+    is the maximum of all runs.
+
+    Parameters
+    ----------
+    records : :obj:`list` of :obj:`dict`
+        Metrics records, see :meth:`ProfilerDing0.record`
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Metrics indexed by step and name of step
+    """
+    steps = pd.DataFrame([{key: value for key, value in step.items()
+                           if key != 'mv_grid_districts'}
+                          for record in records
+                          for step in record['steps']],
+                         columns=['step', 'name', 'wall_time', 'cpu_time',
+                                  'peak_rss', 'nodes', 'branches',
+                                  'pf_calls'])
+
+    metrics = steps.groupby(['step', 'name']).agg(
+        {'wall_time': ['size', 'sum'],
+         'cpu_time': 'sum',
+         'peak_rss': 'max',
+         'nodes': 'sum',
+         'branches': 'sum',
+         'pf_calls': 'sum'})
+    metrics.columns = ['runs', 'wall_time', 'cpu_time', 'peak_rss', 'nodes',
+                       'branches', 'pf_calls']
+
+    return metrics
+
+
+def metrics_per_mv_grid_district(records):
+    """Returns metrics of records per MV grid district and step
+
+    Times are only given for runs of a single MV grid district (as done by
+    the parallel drivers), otherwise they are NaN.
+
+    Parameters
+    ----------
+    records : :obj:`list` of :obj:`dict`
+        Metrics records, see :meth:`ProfilerDing0.record`
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Metrics indexed by MV grid district, step and name of step
+    """
+    rows = []
+    for record in records:
+        single = len(record['mv_grid_districts']) == 1
+        for step in record['steps']:
+            for mv_grid_district, metrics in \
+                    step['mv_grid_districts'].items():
+                rows.append({
+                    'mv_grid_district': int(mv_grid_district),
+                    'step': step['step'],
+                    'name': step['name'],
+                    'wall_time': step['wall_time'] if single else nan,
+                    'cpu_time': step['cpu_time'] if single else nan,
+                    'nodes': metrics['nodes'],
+                    'branches': metrics['branches'],
+                    'pf_calls': metrics['pf_calls']})
+
+    return pd.DataFrame(rows,
+                        columns=['mv_grid_district', 'step', 'name',
+                                 'wall_time', 'cpu_time', 'nodes',
+                                 'branches', 'pf_calls']).set_index(
+        ['mv_grid_district', 'step', 'name'])
@@ -20,15 +20,17 @@ from ding0.core.network.stations import LVStationDing0, MVStationDing0
 from ding0.core.network import BranchDing0, CircuitBreakerDing0, GeneratorDing0
 from ding0.core import MVCableDistributorDing0
 from ding0.core.structure.regions import LVLoadAreaCentreDing0
-from ding0.core.powerflow import q_sign
+from ding0.core.powerflow import q_sign, PFTimeseriesResultsDing0
+from ding0.tools.profiling import count_pf_calls
 
 from geoalchemy2.shape import from_shape
 from math import tan, acos, pi, sqrt
-from pandas import Series, DataFrame, DatetimeIndex
+from pandas import Series, DataFrame, DatetimeIndex, concat
 from pypsa.io import import_series_from_dataframe
 from pypsa import Network
 
 from datetime import datetime
+import numpy as np
 import sys
 import os
 import logging
@@ -412,33 +414,14 @@ def run_powerflow_onthefly(components, components_data, grid, export_pypsa_dir=N
     network, snapshots = create_powerflow_problem(timerange, components)
 
     # import pq-sets
-    for key in ['Load', 'Generator']:
-        for attr in ['p_set', 'q_set']:
-            # catch MV grid districts without generators
-            if not components_data[key].empty:
-                series = transform_timeseries4pypsa(components_data[key][
-                                                        attr].to_frame(),
-                                                    timerange,
-                                                    column=attr)
-                import_series_from_dataframe(network,
-                                             series,
-                                             key,
-                                             attr)
-    series = transform_timeseries4pypsa(components_data['Bus']
-                                        ['v_mag_pu_set'].to_frame(),
-                                        timerange,
-                                        column='v_mag_pu_set')
-
-    import_series_from_dataframe(network,
-                                 series,
-                                 'Bus',
-                                 'v_mag_pu_set')
+    import_pq_sets(network, components_data, timerange)
 
     # add coordinates to network nodes and make ready for map plotting
     # network = add_coordinates(network)
 
     # start powerflow calculations
     network.pf(snapshots)
+    count_pf_calls(grid)
 
     # # make a line loading plot
     # # TODO: make this optional
@@ -459,6 +442,282 @@ def run_powerflow_onthefly(components, components_data, grid, export_pypsa_dir=N
         export_to_dir(network, export_dir=export_pypsa_dir)
 
 
+def run_powerflow_onthefly_batch(grids_components, export_pypsa_dir=None,
+                                 debug=False):
+    """
+    Run powerflow for several MV grids at once
+
+    The components of all grids are merged into one PyPSA network. As the
+    grids are not connected to each other, each of them forms a disjoint
+    sub-network with its own slack bus. All grids are thereby solved by a
+    single call of :meth:`pypsa.Network.pf` and results are assigned back to
+    each grid afterwards. This avoids the overhead of network creation and
+    time series import for every single (small) grid.
+
+    Parameters
+    ----------
+    grids_components: :obj:`list` of :obj:`tuple`
+        Tuples of (components, components_data, grid) as returned by
+        :meth:`~.core.network.grids.MVGridDing0.export_to_pypsa` plus the
+        grid itself
+    export_pypsa_dir: :obj:`str`
+        Sub-directory in output/debug/grid/ where csv Files of the merged
+        PyPSA network are exported to. Export is omitted if argument is empty.
+    debug: bool, defaults to False
+        If True, grid data is checked for integrity
+    """
+
+    components, components_data = merge_components(
+        [(comps, comps_data) for comps, comps_data, _ in grids_components])
+
+    # two cases are analyzed: load case and feed-in case
+    timesteps = 2
+    start_time = datetime(1970, 1, 1, 00, 00, 0)
+    resolution = 'H'
+
+    # inspect grid data for integrity
+    if debug:
+        data_integrity(components, components_data)
+
+    # define investigated time range
+    timerange = DatetimeIndex(freq=resolution,
+                              periods=timesteps,
+                              start=start_time)
+
+    # create PyPSA powerflow problem containing all grids
+    network, snapshots = create_powerflow_problem(timerange, components)
+    import_pq_sets(network, components_data, timerange)
+
+    # start powerflow calculations (one call for all sub-networks)
+    network.pf(snapshots)
+    count_pf_calls(*[grid for _, _, grid in grids_components])
+
+    # process results and split them by grid. Bus and line ids are prefixed
+    # by the grid id, hence the results can be assigned by lookup.
+    bus_data, line_data = process_pf_results(network)
+    for _, _, grid in grids_components:
+        assign_bus_results(grid, bus_data)
+        assign_line_results(grid, line_data)
+
+    # export network if directory is specified
+    if export_pypsa_dir:
+        export_to_dir(network, export_dir=export_pypsa_dir)
+
+
+def run_powerflow_timeseries(components, components_data, grid, timerange,
+                             load_profile=None, generation_profile=None,
+                             chunk_size=None, debug=False):
+    """
+    Run time series power flow for a grid
+
+    Set points of loads and generators are obtained by scaling the peak
+    values (load case for loads, feed-in case for generators) contained in
+    `components_data` by normalized profiles. Snapshots are passed through
+    the solver in chunks of `chunk_size`: the PyPSA network (topology,
+    admittance matrix and bus controls) is created once and reused for all
+    chunks, only the set points are replaced. Results are stored in compact
+    arrays instead of being assigned to the grid's nodes and branches.
+
+    Parameters
+    ----------
+    components: dict of :pandas:`pandas.DataFrame<dataframe>`
+    components_data: dict of :pandas:`pandas.DataFrame<dataframe>`
+    grid: ding0.network
+    timerange: :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Snapshots to be analyzed
+    load_profile: :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        Normalized load profile indexed by `timerange`. A Series is applied
+        to all loads, a DataFrame has to contain one column per load id.
+        If None, peak load is used for all snapshots.
+    generation_profile: :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        Normalized generation profile, see `load_profile`. If None, nominal
+        feed-in is used for all snapshots.
+    chunk_size: :obj:`int`
+        Number of snapshots solved at once. If None, the value is taken from
+        config (section `powerflow`, key `timeseries_chunk_size`).
+    debug: bool, defaults to False
+        If True, grid data is checked for integrity
+
+    Returns
+    -------
+    :class:`~.ding0.core.powerflow.PFTimeseriesResultsDing0`
+        Voltages at buses and apparent power on lines
+    """
+
+    if chunk_size is None:
+        chunk_size = int(cfg_ding0.get('powerflow', 'timeseries_chunk_size'))
+
+    if debug:
+        data_integrity(components, components_data)
+
+    # peak values to be scaled by profiles: load case for loads (index 0),
+    # feed-in case for generators (index 1)
+    peaks = {}
+    for key, case, profile in [('Load', 0, load_profile),
+                               ('Generator', 1, generation_profile)]:
+        if not components_data[key].empty:
+            for attr in ['p_set', 'q_set']:
+                peaks[(key, attr)] = (
+                    Series([_[case] for _ in components_data[key][attr]],
+                           index=[str(_) for _ in components_data[key].index]),
+                    profile)
+    peaks[('Bus', 'v_mag_pu_set')] = (
+        Series([_[0] for _ in components_data['Bus']['v_mag_pu_set']],
+               index=[str(_) for _ in components_data['Bus'].index]),
+        None)
+
+    network = None
+    results = None
+
+    for start in range(0, len(timerange), chunk_size):
+        chunk = timerange[start:start + chunk_size]
+
+        if network is None:
+            network, snapshots = create_powerflow_problem(chunk, components)
+            skip_pre = False
+        else:
+            # reuse network: topology and admittance matrix are kept
+            network.set_snapshots(chunk)
+            snapshots = network.snapshots
+            skip_pre = True
+
+        for (key, attr), (peak, profile) in peaks.items():
+            series = _scale_profile(peak, profile, chunk)
+            import_series_from_dataframe(network, series, key, attr)
+
+        network.pf(snapshots, skip_pre=skip_pre)
+        count_pf_calls(grid)
+
+        if results is None:
+            results = PFTimeseriesResultsDing0(
+                timerange=timerange,
+                bus_ids=network.buses_t.v_mag_pu.columns,
+                line_ids=network.lines_t.p0.columns,
+                grid_id=grid.id_db)
+
+        stop = start + len(chunk)
+        results.v_mag_pu[start:stop] = network.buses_t.v_mag_pu.loc[
+            snapshots, results.bus_ids].values
+        results.s_res[start:stop] = np.sqrt(
+            np.maximum(
+                np.abs(network.lines_t.p0.loc[snapshots, results.line_ids].values),
+                np.abs(network.lines_t.p1.loc[snapshots, results.line_ids].values)) ** 2 +
+            np.maximum(
+                np.abs(network.lines_t.q0.loc[snapshots, results.line_ids].values),
+                np.abs(network.lines_t.q1.loc[snapshots, results.line_ids].values)) ** 2)
+
+    return results
+
+
+def _scale_profile(peak, profile, timerange):
+    """
+    Scale peak values by normalized profile for given time range
+
+    Parameters
+    ----------
+    peak: :pandas:`pandas.Series<series>`
+        Peak values indexed by component id
+    profile: :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        Normalized profile, see :func:`run_powerflow_timeseries`
+    timerange: :pandas:`pandas.DatetimeIndex<datetimeindex>`
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Time series in PyPSA format (snapshots x components)
+    """
+
+    if profile is None:
+        factors = np.ones((len(timerange), len(peak)))
+    elif isinstance(profile, Series):
+        factors = np.outer(profile.reindex(timerange).values,
+                           np.ones(len(peak)))
+    else:
+        missing = peak.index.difference(profile.columns)
+        if len(missing) > 0:
+            raise ValueError('Profile does not contain components {}'.format(
+                list(missing)))
+        factors = profile.reindex(index=timerange, columns=peak.index).values
+
+    if np.isnan(factors).any():
+        raise ValueError('Profile does not cover the time range {0} - '
+                         '{1}'.format(timerange[0], timerange[-1]))
+
+    return DataFrame(factors * peak.values,
+                     index=timerange,
+                     columns=peak.index)
+
+
+def merge_components(components_list):
+    """
+    Merge components of several grids into one set of components
+
+    Parameters
+    ----------
+    components_list: :obj:`list` of :obj:`tuple`
+        Tuples of (components, components_data) of single grids
+
+    Returns
+    -------
+    components: dict of :pandas:`pandas.DataFrame<dataframe>`
+        Concatenated components keyed by components type
+    components_data: dict of :pandas:`pandas.DataFrame<dataframe>`
+        Concatenated time-varying data keyed by components type
+    """
+
+    components = {}
+    components_data = {}
+
+    for comps, comps_data in components_list:
+        for key, df in comps.items():
+            components.setdefault(key, []).append(df)
+        for key, df in comps_data.items():
+            components_data.setdefault(key, []).append(df)
+
+    components = {key: concat(dfs) for key, dfs in components.items()}
+    components_data = {key: concat(dfs)
+                       for key, dfs in components_data.items()}
+
+    return components, components_data
+
+
+def import_pq_sets(network, components_data, timerange):
+    """
+    Import p, q and v set points into PyPSA network
+
+    Parameters
+    ----------
+    network: pypsa.Network
+        PyPSA network the set points are imported to
+    components_data: dict of :pandas:`pandas.DataFrame<dataframe>`
+        DataFrame containing components time-varying data
+    timerange: :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time range to be analyzed by PF
+    """
+
+    for key in ['Load', 'Generator']:
+        for attr in ['p_set', 'q_set']:
+            # catch MV grid districts without generators
+            if not components_data[key].empty:
+                series = transform_timeseries4pypsa(components_data[key][
+                                                        attr].to_frame(),
+                                                    timerange,
+                                                    column=attr)
+                import_series_from_dataframe(network,
+                                             series,
+                                             key,
+                                             attr)
+    series = transform_timeseries4pypsa(components_data['Bus']
+                                        ['v_mag_pu_set'].to_frame(),
+                                        timerange,
+                                        column='v_mag_pu_set')
+
+    import_series_from_dataframe(network,
+                                 series,
+                                 'Bus',
+                                 'v_mag_pu_set')
+
+
 def data_integrity(components, components_data):
     """
     Check grid data for integrity
@@ -13,7 +13,10 @@ __url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
 __author__     = "nesnoj, gplssm"
 
 
+import io
+import logging
 import pickle
+import queue
 import numpy as np
 import pandas as pd
 import time
@@ -34,22 +37,25 @@ from ding0.core import LVLoadAreaCentreDing0
 
 import pyproj
 from functools import partial
+from itertools import chain, count
 
-from geoalchemy2.shape import from_shape
 from sqlalchemy.orm import sessionmaker
 import multiprocessing as mp
 
-from math import floor, pi
+from math import pi
 
 from ding0.flexopt.check_tech_constraints import get_critical_line_loading, \
     get_critical_voltage_at_nodes
 from ding0.tools import config as cfg_ding0
+from ding0.tools.path_metrics import path_metrics, compose_path_metrics, \
+    station_impedance
+from ding0.tools.scheduler import run_tasks
+
+logger = logging.getLogger('ding0')
 
-import networkx as nx
 
 if not 'READTHEDOCS' in os.environ:
     from shapely.ops import transform
-    from shapely.geometry import LineString
     from shapely.wkt import dumps as wkt_dumps
 
 #############################################
@@ -120,11 +126,9 @@ def save_nd_to_pickle(nd, path='', filename=None):
         filename = "ding0_grids_{ext}.pkl".format(
             ext=name_extension)
 
-    # delete attributes of `nd` in order to make pickling work
-    # del nd._config
-    del nd._orm
-
-    pickle.dump(nd, open(os.path.join(abs_path, filename), "wb"))
+    # note: ORM mapping of `nd` is not pickled, see NetworkDing0.__getstate__
+    with open(os.path.join(abs_path, filename), "wb") as f:
+        pickle.dump(nd, f)
 
 
 def load_nd_from_pickle(filename=None, path=''):
@@ -534,71 +538,54 @@ def calculate_mvgd_stats(nw):
 
         G = district.mv_grid._graph
 
+        # metrics of paths from MV station to all MV nodes (one traversal)
+        # and of paths from each LV station to all nodes of its LV grid
+        mv_path_metrics = path_metrics(G, root, omega)
+        lv_path_metrics = {}
+
         for node in G.nodes():
             if isinstance(node, MVStationDing0):
                 n_outgoing_MV += len(list(G.neighbors(node)))
                 continue
-            mv_impedance = 0
-            mv_path_length = 0
             if not isinstance(node, MVCableDistributorDing0) and not isinstance(node, CircuitBreakerDing0):
-                if not nx.has_path(G, root, node):
+                if node not in mv_path_metrics:
                     continue
                     #print(node, node.lv_load_area.is_aggregated) # only debug
                 else:
-                    path = nx.shortest_path(G, root, node)
-                    for i in range(len(path) - 1):
-                        mv_impedance += (G.adj[path[i]][path[i + 1]]['branch'].type[
-                                             'L_per_km'] * 1e-3 * omega * \
-                                         G.adj[path[i]][path[i + 1]][
-                                             'branch'].length) *1j  + \
-                                        (G.adj[path[i]][path[i + 1]]['branch'].type[
-                                             'R_per_km'] * \
-                                         G.adj[path[i]][path[i + 1]][
-                                             'branch'].length)
-                        mv_path_length += G.adj[path[i]][path[i + 1]][
-                            'branch'].length
+                    mv_impedance, mv_path_length, mv_thermal_limit = \
+                        mv_path_metrics[node]
 
                     mv_impedances[node] = abs(mv_impedance)
                     mv_path_lengths[node] = mv_path_length
-                    mv_thermal_limit = G.adj[path[0]][path[1]]['branch'].type['I_max_th']
                     mv_thermal_limits[node] = mv_thermal_limit
 
                     if isinstance(node, LVStationDing0):
-                        # add impedance of transformers in LV station
-                        lvstation_impedance = 0.
-                        for trafo in node.transformers():
-                            lvstation_impedance += 1. / trafo.z()  # transformers operating in parallel
-                        if lvstation_impedance > 0.:  # avoid dividing by zero
-                            lvstation_impedance = 1. / lvstation_impedance
-                        else:
-                            lvstation_impedance = 0.
-                        # identify LV nodes belonging to LV station
-                        for lv_LA in district.lv_load_areas():
-                            for lv_dist in lv_LA.lv_grid_districts():
-                                if lv_dist.lv_grid._station == node:
-                                    G_lv = lv_dist.lv_grid._graph
-                                    # loop over all LV terminal nodes belonging to LV station
-                                    for lv_node in G_lv.nodes():
-                                        if isinstance(lv_node, GeneratorDing0) or isinstance(lv_node, LVLoadDing0):
-                                            path = nx.shortest_path(G_lv, node, lv_node)
-                                            lv_impedance = lvstation_impedance
-                                            lv_path_length = 0.
-                                            for i in range(len(path)-1):
-                                                lv_impedance += (G_lv.adj[path[i]][path[i+1]]['branch'].type['L_per_km'] * 1e-3 * omega * \
-                                                                 G_lv.adj[path[i]][path[i+1]]['branch'].length) *1j + \
-                                                                (G_lv.adj[path[i]][path[i+1]]['branch'].type['R_per_km'] * \
-                                                                 G_lv.adj[path[i]][path[i+1]]['branch'].length)
-                                                lv_path_length += G_lv.adj[path[i]][path[i+1]]['branch'].length
-                                            lv_thermal_limit = G_lv.adj[path[0]][path[1]]['branch'].type['I_max_th']
-
-                                            mvlv_impedances[lv_node] = abs( mv_impedance + lv_impedance )
-                                            mvlv_path_lengths[lv_node] = mv_path_length + lv_path_length
-                                            lv_thermal_limits[lv_node] = lv_thermal_limit
-                                            mvlv_thermal_limits[lv_node] = mv_thermal_limit
-
-                                        elif isinstance(lv_node, LVStationDing0):
-                                            n_outgoing_LV += len(list(G_lv.neighbors(lv_node)))
-                                            n_stations_LV += 1
+                        # paths within LV grid start with impedance of
+                        # transformers in LV station
+                        G_lv = node.grid._graph
+                        lv_path_metrics[node] = path_metrics(
+                            G_lv, node, omega,
+                            impedance=station_impedance(node))
+                        mvlv_path_metrics = compose_path_metrics(
+                            mv_path_metrics[node], lv_path_metrics[node])
+
+                        # loop over all LV terminal nodes belonging to LV station
+                        for lv_node in G_lv.nodes():
+                            if isinstance(lv_node, GeneratorDing0) or isinstance(lv_node, LVLoadDing0):
+                                if lv_node not in mvlv_path_metrics:
+                                    continue
+                                mvlv_impedance, mvlv_path_length, _ = \
+                                    mvlv_path_metrics[lv_node]
+
+                                mvlv_impedances[lv_node] = abs(mvlv_impedance)
+                                mvlv_path_lengths[lv_node] = mvlv_path_length
+                                lv_thermal_limits[lv_node] = \
+                                    lv_path_metrics[node][lv_node][2]
+                                mvlv_thermal_limits[lv_node] = mv_thermal_limit
+
+                            elif isinstance(lv_node, LVStationDing0):
+                                n_outgoing_LV += len(list(G_lv.neighbors(lv_node)))
+                                n_stations_LV += 1
 
         # compute mean values by looping over terminal nodes
         sum_impedances = 0.
@@ -702,9 +689,8 @@ def calculate_mvgd_stats(nw):
                     'v_level': node.v_level,
                     'isolation': isolation,
                 }
-                mv_path_length = district.mv_grid.graph_path_length(
-                    node_source=root,
-                    node_target=node)
+                if node in mv_path_metrics:
+                    mv_path_length = mv_path_metrics[node][1]
 
             elif isinstance(node, MVCableDistributorDing0):
                 cd_count += 1
@@ -713,19 +699,12 @@ def calculate_mvgd_stats(nw):
                 lv_trafo_count += len([trafo for trafo in node.transformers()])
                 lv_trafo_cap += np.sum([trafo.s_max_a for trafo in node.transformers()])
 
-                if not node.lv_load_area.is_aggregated:
-                    mv_path_length = district.mv_grid.graph_path_length(
-                        node_source=root,
-                        node_target=node)
-                    max_lv_path = 0
-                    for lv_LA in district.lv_load_areas():
-                        for lv_dist in lv_LA.lv_grid_districts():
-                            if lv_dist.lv_grid._station == node:
-                                for lv_node in lv_dist.lv_grid._graph.nodes():
-                                    lv_path_length = lv_dist.lv_grid.graph_path_length(
-                                        node_source=node,
-                                        node_target=lv_node)
-                                    max_lv_path = max(max_lv_path, lv_path_length)
+                if not node.lv_load_area.is_aggregated and \
+                        node in lv_path_metrics:
+                    mv_path_length = mv_path_metrics[node][1]
+                    max_lv_path = max(
+                        lv_path_length for _, lv_path_length, _ in
+                        lv_path_metrics[node].values())
                     mvlv_path_length = mv_path_length + max_lv_path
 
             elif isinstance(node, CircuitBreakerDing0):
@@ -1380,6 +1359,30 @@ def process_stats(mv_districts,
     output.put(salida)
 
 
+def process_stats_cluster(mv_districts, source, mode, critical, filename):
+    '''Generates stats of a single cluster of districts
+
+    Wrapper of process_stats() used as task of
+    :func:`~.ding0.tools.scheduler.run_tasks`.
+
+    Parameters
+    ----------
+    mv_districts: :obj:`list` of int
+        Districts of the cluster
+    source, mode, critical, filename:
+        See process_stats()
+
+    Returns
+    -------
+    :obj:`tuple`
+        Tuple of 6 lists of stats DataFrames, see process_stats()
+    '''
+    output = queue.Queue()
+    process_stats(mv_districts, len(mv_districts), source, mode, critical,
+                  filename, output)
+    return output.get()
+
+
 def parallel_running_stats(districts_list,
                            n_of_processes,
                            n_of_districts=1,
@@ -1387,13 +1390,16 @@ def parallel_running_stats(districts_list,
                            mode='',
                            critical=False,
                            save_csv=False,
-                           save_path=''):
+                           save_path='',
+                           timeout=None,
+                           max_tasks_per_worker=None):
     '''Organize parallel runs of ding0 to calculate stats
 
-    The function take all districts in a list and divide them into
-    n_of_processes parallel processes. For each process, the assigned districts
-    are given to the function process_runs() with arguments n_of_districts,
-    source, mode, and critical
+    The function take all districts in a list and divide them into clusters
+    of n_of_districts each. Clusters are dispatched one by one to
+    n_of_processes worker processes (see
+    :func:`~.ding0.tools.scheduler.run_tasks`) and are given to the function
+    process_stats() with arguments source, mode, and critical
 
     Parameters
     ----------
@@ -1414,6 +1420,10 @@ def parallel_running_stats(districts_list,
         If True, critical nodes and branches are returned
     path: :obj:`str`
         path to save the pkl and csv files
+    timeout: :obj:`float`
+        Time limit per cluster in seconds (None: no limit)
+    max_tasks_per_worker: :obj:`int`
+        Number of clusters after which a worker process is replaced
 
     Returns
     -------
@@ -1449,32 +1459,19 @@ def parallel_running_stats(districts_list,
     nw_name = os.path.join(save_path, 'ding0_grids__')  # name of files prefix
 
     #######################################################################
-    # Define an output queue
-    output_stats = mp.Queue()
-    #######################################################################
-    # Setup a list of processes that we want to run
-    max_dist = len(districts_list)
-    threat_long = floor(max_dist / n_of_processes)
-
-    if threat_long == 0:
-        threat_long = 1
-
-    threats = [districts_list[x:x + threat_long] for x in
-               range(0, len(districts_list), threat_long)]
-
-    processes = []
-    for districts in threats:
-        args = (districts, n_of_districts, source, mode, critical, nw_name, output_stats)
-        processes.append(mp.Process(target=process_stats, args=args))
-    #######################################################################
-    # Run processes
-    for p in processes:
-        p.start()
-    # Resque output_stats from processes
-    output = [output_stats.get() for p in processes]
-    # Exit the completed processes
-    for p in processes:
-        p.join()
+    # Dispatch clusters of districts one by one to the worker processes
+    clusters = [districts_list[x:x + n_of_districts]
+                for x in range(0, len(districts_list), n_of_districts)]
+
+    records = run_tasks(partial(process_stats_cluster,
+                                source=source, mode=mode, critical=critical,
+                                filename=nw_name),
+                        clusters,
+                        processes=n_of_processes,
+                        timeout=timeout,
+                        max_tasks_per_worker=max_tasks_per_worker)
+    output = [record['result'] for record in records
+              if record['status'] == 'ok']
     #######################################################################
     # create outputs
     # Name of files
@@ -1486,37 +1483,37 @@ def parallel_running_stats(districts_list,
     # concatenate all dataframes
     try:
         mv_stats = pd.concat(
-            [df for p in range(0, len(processes)) for df in output[p][0]],
+            [df for salida in output for df in salida[0]],
             axis=0)
     except:
         mv_stats = pd.DataFrame.from_dict({})
     try:
         lv_stats = pd.concat(
-            [df for p in range(0, len(processes)) for df in output[p][1]],
+            [df for salida in output for df in salida[1]],
             axis=0)
     except:
         lv_stats = pd.DataFrame.from_dict({})
     try:
         mv_crit_nodes = pd.concat(
-            [df for p in range(0, len(processes)) for df in output[p][2]],
+            [df for salida in output for df in salida[2]],
             axis=0)
     except:
         mv_crit_nodes = pd.DataFrame.from_dict({})
     try:
         mv_crit_edges = pd.concat(
-            [df for p in range(0, len(processes)) for df in output[p][3]],
+            [df for salida in output for df in salida[3]],
             axis=0)
     except:
         mv_crit_edges = pd.DataFrame.from_dict({})
     try:
         lv_crit_nodes = pd.concat(
-            [df for p in range(0, len(processes)) for df in output[p][4]],
+            [df for salida in output for df in salida[4]],
             axis=0)
     except:
         lv_crit_nodes = pd.DataFrame.from_dict({})
     try:
         lv_crit_edges = pd.concat(
-            [df for p in range(0, len(processes)) for df in output[p][5]],
+            [df for salida in output for df in salida[5]],
             axis=0)
     except:
         lv_crit_edges = pd.DataFrame.from_dict({})
@@ -1574,77 +1571,97 @@ def parallel_running_stats(districts_list,
 
 
 ########################################################
-def export_network(nw, mode=''):
+def _columns_to_frame(chunks):
     """
-    Export all nodes and lines of the network nw as DataFrames
+    Concatenates chunks of columns to a DataFrame
 
     Parameters
     ----------
-    nw: :obj:`list` of NetworkDing0
-        The MV grid(s) to be studied
-    mode: :obj:`str`
-        If 'MV' export only medium voltage nodes and lines
-        If 'LV' export only low voltage nodes and lines
-        else, exports MV and LV nodes and lines
+    chunks: :obj:`list` of :obj:`dict`
+        Chunks of rows, each chunk maps column names to lists of values of
+        equal length. Columns missing in a chunk are filled with NaN.
 
     Returns
     -------
     :pandas:`pandas.DataFrame<dataframe>`
-        nodes_df : Dataframe containing nodes and its attributes
-    :pandas:`pandas.DataFrame<dataframe>`
-        lines_df : Dataframe containing lines and its attributes
+        Rows of all chunks in order of `chunks`, index starts at 1
     """
+    lengths = [len(next(iter(chunk.values()))) for chunk in chunks]
+    if not sum(lengths):
+        return pd.DataFrame()
 
-    # close circuit breakers
-    nw.control_circuit_breakers(mode='close')
-    # srid
-    srid = str(int(nw.config['geo']['srid']))
-    ##############################
-    # check what to do
-    lv_info = True
-    mv_info = True
-    if mode == 'LV':
-        mv_info = False
-    if mode == 'MV':
-        lv_info = False
-    ##############################
-    # from datetime import datetime
-    run_id = nw.metadata['run_id']  # datetime.now().strftime("%Y%m%d%H%M%S")
-    ##############################
-    #############################
-    # go through the grid collecting info
-    lvgrid_idx = 0
-    lv_grid_dict = {}
-    lvloads_idx = 0
-    lv_loads_dict = {}
-    mvgrid_idx = 0
-    mv_grid_dict = {}
-    mvloads_idx = 0
-    mv_loads_dict = {}
-    mvgen_idx = 0
-    mv_gen_dict = {}
-    mvcb_idx = 0
-    mvcb_dict = {}
-    mvcd_idx = 0
-    mv_cd_dict = {}
-    mvstations_idx = 0
-    hvmv_stations_dict = {}
-    mvtrafos_idx = 0
-    hvmv_trafos_dict = {}
-    lvgen_idx = 0
-    lv_gen_dict = {}
-    lvcd_idx = 0
-    lv_cd_dict = {}
-    lvstations_idx = 0
-    mvlv_stations_dict = {}
-    lvtrafos_idx = 0
-    mvlv_trafos_dict = {}
-    areacenter_idx = 0
-    areacenter_dict = {}
-    lines_idx = 0
-    lines_dict = {}
-    LVMVmapping_idx = 0
-    mvlv_mapping_dict = {}
+    columns = list(dict.fromkeys(column
+                                 for chunk, length in zip(chunks, lengths)
+                                 if length
+                                 for column in chunk))
+    data = {column: list(chain.from_iterable(
+                chunk.get(column, [np.nan] * length)
+                for chunk, length in zip(chunks, lengths)))
+            for column in columns}
+
+    return pd.DataFrame(data, columns=columns,
+                        index=pd.RangeIndex(1, sum(lengths) + 1))
+
+
+def _branch_type_columns(branches, parameters):
+    """
+    Returns parameters of types of `branches` as columns
+
+    Parameters of each type (pandas Series) are looked up once.
+
+    Parameters
+    ----------
+    branches: :obj:`list` of :class:`~.ding0.core.network.BranchDing0`
+        Branches
+    parameters: :obj:`list` of :obj:`str`
+        Parameters of types, e.g. 'R_per_km'
+
+    Returns
+    -------
+    :obj:`dict`
+        List of values of branches keyed by parameter
+    """
+    types = {}
+    values = []
+    for branch in branches:
+        try:
+            values.append(types[id(branch.type)])
+        except KeyError:
+            values.append(types.setdefault(
+                id(branch.type),
+                tuple(branch.type[parameter] for parameter in parameters)))
+
+    if not values:
+        return {parameter: [] for parameter in parameters}
+    return {parameter: list(column)
+            for parameter, column in zip(parameters, zip(*values))}
+
+
+def _mv_grid_columns(mv_district, run_id, mv_cables, mv_load_ids):
+    """
+    Collects rows of MV grid of `mv_district` for :func:`export_network`
+
+    Rows are collected as columns (one list of values per column) per table,
+    aggregated load areas are exported as aggregated generators and loads
+    connected to the MV station.
+
+    Parameters
+    ----------
+    mv_district: :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid district
+    run_id: :obj:`str`
+        Run id
+    mv_cables: :pandas:`pandas.DataFrame<dataframe>`
+        MV cable types, the one of max. thermal limit is used for lines to
+        aggregated generators and loads
+    mv_load_ids: :obj:`itertools.count`
+        Counter of aggregated loads, shared by all MV grids
+
+    Yields
+    ------
+    :obj:`tuple` of :obj:`str` and :obj:`dict`
+        Name of table and its columns (lists of values keyed by column name)
+    """
 
     def aggregate_generators(gen, aggr):
         """Aggregate generation capacity per voltage level
@@ -1720,442 +1737,420 @@ def export_network(nw, mode=''):
 
         return aggr
 
-    for mv_district in nw.mv_grid_districts():
-
-        mv_grid_id = mv_district.mv_grid.id_db
-        mv_grid_id_db = '_'.join(
-            [str(mv_district.mv_grid.__class__.__name__), 'MV', str(mv_grid_id), str(mv_district.mv_grid.id_db)])
+    mv_grid = mv_district.mv_grid
+    mv_grid_id = mv_grid.id_db
+    mv_grid_id_db = '_'.join(
+        [str(mv_grid.__class__.__name__), 'MV', str(mv_grid_id), str(mv_grid.id_db)])
+
+    # id_db: Classname_MV/LV_mvgridid/lvgridid_id
+    # excemptions: class LVStations: LVStationDing0_MV_mvgridid_id(=lvgridid)
+    def ids_db(nodes):
+        return ['_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)])
+                for node in nodes]
+
+    def transformer_columns(stations, geoms, voltage_level, grid_key, grids_id_db):
+        trafos = [(trafo, station, geom, grid_id_db)
+                  for station, geom, grid_id_db in zip(stations, geoms, grids_id_db)
+                  for trafo in station.transformers()]
+        return {
+            'id_db': ['_'.join([str(trafo.__class__.__name__), voltage_level, str(mv_grid_id), str(station.id_db)])
+                      for trafo, station, _, _ in trafos],
+            'geom': [geom for _, _, geom, _ in trafos],
+            grid_key: [grid_id_db for _, _, _, grid_id_db in trafos],
+            'voltage_op': [trafo.v_level for trafo, _, _, _ in trafos],
+            'S_nom': [trafo.s_max_a for trafo, _, _, _ in trafos],
+            'x_pu': [trafo.x_pu for trafo, _, _, _ in trafos],
+            'r_pu': [trafo.r_pu for trafo, _, _, _ in trafos],
+            'run_id': [run_id] * len(trafos),
+        }
 
-        if mv_info:
-            lv_grid_id = 0
-
-            # MV-grid
-            # ToDo: geom <- Polygon
-            mvgrid_idx += 1
-            mv_grid_dict[mvgrid_idx] = {
-                'MV_grid_id': mv_district.mv_grid.id_db,
-                'id_db': '_'.join([str(mv_district.mv_grid.__class__.__name__), 'MV', str(mv_grid_id),
-                                   str(mv_district.mv_grid.id_db)]),
-                # 'network': mv_district.mv_grid.network,
-                'geom': wkt_dumps(mv_district.geo_data),
-                'population':  # None,
-                    sum([_.zensus_sum
-                         for _ in
-                         mv_district._lv_load_areas  # ding0_grid.grid_district._lv_load_areas
-                         if not np.isnan(_.zensus_sum)]),
-                'voltage_nom': mv_district.mv_grid.v_level,  # in kV
-                'run_id': run_id
+    # MV-grid
+    # ToDo: geom <- Polygon
+    yield 'mv_grid', {
+        'MV_grid_id': [mv_grid_id],
+        'id_db': [mv_grid_id_db],
+        'geom': [wkt_dumps(mv_district.geo_data)],
+        'population': [sum([_.zensus_sum
+                            for _ in mv_district._lv_load_areas
+                            if not np.isnan(_.zensus_sum)])],
+        'voltage_nom': [mv_grid.v_level],  # in kV
+        'run_id': [run_id],
+    }
+
+    # MV nodes by kind (in sorted order)
+    lv_stations = []
+    mv_stations = []
+    generators = []
+    cable_distributors = []
+    la_centres = []
+    for node in mv_grid.graph_nodes_sorted():
+        if isinstance(node, LVStationDing0):
+            if not node.lv_load_area.is_aggregated:
+                lv_stations.append(node)
+        elif isinstance(node, MVStationDing0):
+            mv_stations.append(node)
+        elif isinstance(node, GeneratorDing0):
+            generators.append(node)
+        elif isinstance(node, MVCableDistributorDing0):
+            cable_distributors.append(node)
+        elif isinstance(node, LVLoadAreaCentreDing0):
+            la_centres.append(node)
+
+    # LVStation, LV-MV mapping and trafos LV
+    lv_grids_id_db = ['_'.join(['LVGridDing0', 'LV', str(_.id_db), str(_.id_db)])
+                      for _ in lv_stations]
+    geoms = [wkt_dumps(_.geo_data) for _ in lv_stations]
+    yield 'mvlv_stations', {
+        'id_db': ids_db(lv_stations),
+        'LV_grid_id_db': lv_grids_id_db,
+        'geom': geoms,
+        'run_id': [run_id] * len(lv_stations),
+    }
+    yield 'mvlv_mapping', {
+        'MV_grid_id': [mv_grid_id] * len(lv_stations),
+        'MV_grid_id_db': [mv_grid_id_db] * len(lv_stations),
+        'LV_grid_id': [_.id_db for _ in lv_stations],
+        'LV_grid_id_db': lv_grids_id_db,
+        'run_id': [run_id] * len(lv_stations),
+    }
+    yield 'mvlv_trafos', transformer_columns(
+        lv_stations, geoms, 'LV', 'LV_grid_id_db', lv_grids_id_db)
+
+    # MVStation and trafos MV
+    geoms = [wkt_dumps(_.geo_data) for _ in mv_stations]
+    yield 'hvmv_stations', {
+        'id_db': ids_db(mv_stations),
+        'MV_grid_id_db': [mv_grid_id_db] * len(mv_stations),
+        'geom': geoms,
+        'run_id': [run_id] * len(mv_stations),
+    }
+    yield 'hvmv_trafos', transformer_columns(
+        mv_stations, geoms, 'MV', 'MV_grid_id_db',
+        [mv_grid_id_db] * len(mv_stations))
+
+    # MVGenerator
+    yield 'mv_gen', {
+        'id_db': ids_db(generators),
+        'MV_grid_id_db': [mv_grid_id_db] * len(generators),
+        'geom': [wkt_dumps(_.geo_data) for _ in generators],
+        'type': [_.type for _ in generators],
+        'subtype': [_.subtype if _.subtype is not None else 'other'
+                    for _ in generators],
+        'v_level': [_.v_level for _ in generators],
+        'nominal_capacity': [_.capacity for _ in generators],
+        'run_id': [run_id] * len(generators),
+        'is_aggregated': [False] * len(generators),
+    }
+
+    # MVBranchTees
+    yield 'mv_cd', {
+        'id_db': ids_db(cable_distributors),
+        'MV_grid_id_db': [mv_grid_id_db] * len(cable_distributors),
+        'geom': [wkt_dumps(_.geo_data) for _ in cable_distributors],
+        'run_id': [run_id] * len(cable_distributors),
+    }
+
+    # LoadAreaCentre: aggregated generation and load of aggregated load area
+    # (few per grid, hence collected row by row)
+    if la_centres:
+        aggr_line_type = mv_cables.iloc[mv_cables['I_max_th'].idxmax()]
+        mv_station_id_db = '_'.join(
+            ['MVStationDing0', 'MV', str(mv_grid_id), str(mv_grid_id)])
+
+        def aggr_line(node, aggr_lines, node1, length):
+            return {
+                # ToDo: Rename edge_name
+                'edge_name': ['_'.join(
+                    [str(mv_grid_id), 'aggr', str(node.lv_load_area.id_db), str(aggr_lines)])],
+                'grid_id_db': [mv_grid_id_db],
+                # ToDo: read type_name from aggr_line_type
+                'type_name': ['NA2XS2Y 3x1x500 RM/35'],  # aggr_line_type.name,
+                'type_kind': ['cable'],
+                'length': [length],
+                'U_n': [aggr_line_type.U_n],
+                'I_max_th': [aggr_line_type.I_max_th],
+                'R_per_km': [aggr_line_type.R_per_km],
+                'L_per_km': [aggr_line_type.L_per_km],
+                'C_per_km': [aggr_line_type.C_per_km],
+                'node1': [node1],
+                'node2': [mv_station_id_db],
+                'run_id': [run_id],
             }
 
-            # id_db: Classname_MV/LV_mvgridid/lvgridid_id
-            # excemptions: class LVStations: LVStationDing0_MV_mvgridid_id(=lvgridid)
-
-            # MVGrid
-            for node in mv_district.mv_grid.graph_nodes_sorted():
-                geom = wkt_dumps(node.geo_data)
-                # geom = from_shape(Point(node.geo_data), srid=srid)
-                db_id = node.id_db
-
-                # LVStation
-                if isinstance(node, LVStationDing0):
-                    if not node.lv_load_area.is_aggregated:
-                        lvstations_idx += 1
-                        mvlv_stations_dict[lvstations_idx] = {
-                            'id_db': '_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)]),
-                            'LV_grid_id_db': '_'.join(['LVGridDing0', 'LV', str(node.id_db), str(node.id_db)]),
-                            'geom': geom,
-                            'run_id': run_id,
-                        }
+    for node in la_centres:
+        aggr_lines = 0
+        aggr = {'generation': {}, 'load': {}}
+
+        # Determine aggregated generation in LV grid
+        for lvgd in node.lv_load_area._lv_grid_districts:
+            for aggr_gen in lvgd.lv_grid.generators():
+                aggr = aggregate_generators(aggr_gen, aggr)
+
+        # Determine aggregated load in MV grid
+        # -> Implement once loads in Ding0 MV grids exist
+
+        # Determine aggregated load in LV grid
+        aggr = aggregate_loads(node, aggr)
+
+        geom = wkt_dumps(node.lv_load_area.geo_area)
+
+        mvgenaggr_idx = 0
+        for v_level in aggr['generation']:
+            for type in aggr['generation'][v_level]:
+                for subtype in aggr['generation'][v_level][type]:
+                    mvgenaggr_idx += 1
+                    aggr_lines += 1
+                    gen_id_db = '_'.join(
+                        [str(aggr_gen.__class__.__name__), 'MV', str(mv_grid_id),
+                         str(aggr_gen.id_db), str(mvgenaggr_idx)])
+                    yield 'mv_gen', {
+                        'id_db': [gen_id_db],
+                        'MV_grid_id_db': [mv_grid_id_db],
+                        'geom': [geom],
+                        'type': [type],
+                        'subtype': [subtype],
+                        'v_level': [v_level],
+                        'nominal_capacity': [aggr['generation'][v_level][type][subtype]['capacity']],
+                        'is_aggregated': [True],
+                        'run_id': [run_id],
+                    }
+                    yield 'lines', aggr_line(node, aggr_lines, gen_id_db, 1)
+
+        for type in aggr['load']:
+            load_id_db = '_'.join(
+                ['AggregatedLoad', 'MV', str(mv_grid_id), str(next(mv_load_ids))])
+            aggr_lines += 1
+            yield 'mv_loads', {
+                'id_db': [load_id_db],
+                'MV_grid_id_db': [mv_grid_id_db],
+                'geom': [geom],
+                'consumption_{}'.format(type): [aggr['load'][type]['nominal']],
+                'is_aggregated': [True],
+                'run_id': [run_id],
+            }
+            yield 'lines', aggr_line(node, aggr_lines, load_id_db, 1e-3)  # in km
+
+    # MVedges
+    edges = [edge for edge in mv_grid.graph_edges()
+             if not any([isinstance(edge['adj_nodes'][0], LVLoadAreaCentreDing0),
+                         isinstance(edge['adj_nodes'][1], LVLoadAreaCentreDing0)])]
+    branches = [edge['branch'] for edge in edges]
+    type_columns = _branch_type_columns(
+        branches, ['name', 'U_n', 'I_max_th', 'R_per_km', 'L_per_km', 'C_per_km'])
+    yield 'lines', {
+        'edge_name': [_.id_db for _ in branches],
+        'grid_id_db': [mv_grid_id_db] * len(branches),
+        'type_name': type_columns['name'],
+        'type_kind': [_.kind for _ in branches],
+        'length': [_.length / 1e3 for _ in branches],
+        'U_n': type_columns['U_n'],
+        'I_max_th': type_columns['I_max_th'],
+        'R_per_km': type_columns['R_per_km'],
+        'L_per_km': type_columns['L_per_km'],
+        'C_per_km': type_columns['C_per_km'],
+        'node1': ids_db(edge['adj_nodes'][0] for edge in edges),
+        'node2': ids_db(edge['adj_nodes'][1] for edge in edges),
+        'run_id': [run_id] * len(branches),
+    }
+
+
+def _lv_grid_columns(lv_district, mv_grid_id, run_id):
+    """
+    Collects rows of LV grid of `lv_district` for :func:`export_network`
 
-                        # LV-MV mapping
-                        LVMVmapping_idx += 1
-                        mvlv_mapping_dict[LVMVmapping_idx] = {
-                            'MV_grid_id': mv_grid_id,
-                            'MV_grid_id_db': mv_grid_id_db,
-                            'LV_grid_id': node.id_db,
-                            'LV_grid_id_db': '_'.join(['LVGridDing0', 'LV', str(node.id_db), str(node.id_db)]),
-                            'run_id': run_id,
-                        }
+    Parameters
+    ----------
+    lv_district: :class:`~.ding0.core.structure.regions.LVGridDistrictDing0`
+        LV grid district
+    mv_grid_id: :obj:`int`
+        Id of MV grid the LV grid is connected to
+    run_id: :obj:`str`
+        Run id
+
+    Yields
+    ------
+    :obj:`tuple` of :obj:`str` and :obj:`dict`
+        Name of table and its columns (lists of values keyed by column name)
+    """
+    lv_grid = lv_district.lv_grid
+    lv_grid_id = lv_grid.id_db
+    lv_grid_id_db = '_'.join(
+        [str(lv_grid.__class__.__name__), 'LV', str(lv_grid.id_db), str(lv_grid.id_db)])
+
+    # LV stations are exported as MV nodes
+    def ids_db(nodes):
+        return ['_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)])
+                if isinstance(node, LVStationDing0) else
+                '_'.join([str(node.__class__.__name__), 'LV', str(lv_grid_id), str(node.id_db)])
+                for node in nodes]
+
+    # LV-grid
+    # ToDo: geom <- Polygon
+    yield 'lv_grid', {
+        'LV_grid_id': [lv_grid_id],
+        'id_db': [lv_grid_id_db],
+        'geom': [wkt_dumps(lv_district.geo_data)],
+        'population': [lv_district.population],
+        'voltage_nom': [lv_grid.v_level / 1e3],
+        'run_id': [run_id],
+    }
+
+    # LV nodes by kind (in sorted order)
+    generators = []
+    cable_distributors = []
+    loads = []
+    for node in lv_grid.graph_nodes_sorted():
+        if isinstance(node, GeneratorDing0):
+            generators.append(node)
+        elif isinstance(node, LVCableDistributorDing0):
+            cable_distributors.append(node)
+        elif isinstance(node, LVLoadDing0):
+            loads.append(node)
+
+    # LVGenerator
+    yield 'lv_gen', {
+        'id_db': ids_db(generators),
+        'LV_grid_id_db': [lv_grid_id_db] * len(generators),
+        'geom': [wkt_dumps(_.geo_data) for _ in generators],
+        'type': [_.type for _ in generators],
+        'subtype': [_.subtype if _.subtype is not None else 'other'
+                    for _ in generators],
+        'v_level': [_.v_level for _ in generators],
+        'nominal_capacity': [_.capacity for _ in generators],
+        'run_id': [run_id] * len(generators),
+    }
+
+    # LVcd
+    yield 'lv_cd', {
+        'id_db': ids_db(cable_distributors),
+        'LV_grid_id_db': [lv_grid_id_db] * len(cable_distributors),
+        'geom': [None] * len(cable_distributors),  # Todo: why no geo_data?
+        'run_id': [run_id] * len(cable_distributors),
+    }
+
+    # LVload
+    yield 'lv_loads', {
+        'id_db': ids_db(loads),
+        'LV_grid_id_db': [lv_grid_id_db] * len(loads),
+        'geom': [None] * len(loads),  # Todo: why no geo_data?
+        'consumption_residential': [_.consumption.get('residential') for _ in loads],
+        'consumption_retail': [_.consumption.get('retail') for _ in loads],
+        'consumption_agricultural': [_.consumption.get('agricultural') for _ in loads],
+        'consumption_industrial': [_.consumption.get('industrial') for _ in loads],
+        'run_id': [run_id] * len(loads),
+    }
+
+    # LVedges
+    edges = [edge for edge in lv_grid.graph_edges()
+             if not any([isinstance(edge['adj_nodes'][0], LVLoadAreaCentreDing0),
+                         isinstance(edge['adj_nodes'][1], LVLoadAreaCentreDing0)])]
+    branches = [edge['branch'] for edge in edges]
+    type_columns = _branch_type_columns(
+        branches, ['U_n', 'I_max_th', 'R_per_km', 'L_per_km'])
+    yield 'lines', {
+        'edge_name': [_.id_db for _ in branches],
+        'grid_id_db': [lv_grid_id_db] * len(branches),
+        'type_name': [_.type.name for _ in branches],
+        'type_kind': [_.kind for _ in branches],
+        'length': [_.length / 1e3 for _ in branches],  # length in km
+        'U_n': [_ / 1e3 for _ in type_columns['U_n']],  # U_n in kV
+        'I_max_th': type_columns['I_max_th'],
+        'R_per_km': type_columns['R_per_km'],
+        'L_per_km': type_columns['L_per_km'],
+        'node1': ids_db(edge['adj_nodes'][0] for edge in edges),
+        'node2': ids_db(edge['adj_nodes'][1] for edge in edges),
+        'run_id': [run_id] * len(branches),
+    }
+
+
+def export_network(nw, mode='', mv_grid_districts=None):
+    """
+    Export all nodes and lines of the network nw as DataFrames
 
-                        # Trafos LV
-                        for t in node.transformers():
-                            lvtrafos_idx += 1
-                            mvlv_trafos_dict[lvtrafos_idx] = {
-                                'id_db': '_'.join([str(t.__class__.__name__), 'LV', str(mv_grid_id), str(node.id_db)]),
-                                'geom': geom,
-                                'LV_grid_id_db': '_'.join(['LVGridDing0', 'LV', str(node.id_db), str(node.id_db)]),
-                                'voltage_op': t.v_level,
-                                'S_nom': t.s_max_a,
-                                'x_pu': t.x_pu,
-                                'r_pu': t.r_pu,
-                                'run_id': run_id,
-                            }
-
-                # MVStation
-                elif isinstance(node, MVStationDing0):
-                    mvstations_idx += 1
-                    hvmv_stations_dict[mvstations_idx] = {
-                        'id_db': '_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)]),
-                        'MV_grid_id_db': mv_grid_id_db,
-                        'geom': geom,
-                        'run_id': run_id,
-                    }
+    Parameters
+    ----------
+    nw: :obj:`list` of NetworkDing0
+        The MV grid(s) to be studied
+    mode: :obj:`str`
+        If 'MV' export only medium voltage nodes and lines
+        If 'LV' export only low voltage nodes and lines
+        else, exports MV and LV nodes and lines
+    mv_grid_districts: :obj:`list` of :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid districts of `nw` to be exported. Default is None which
+        exports all MV grid districts. Only circuit breakers of exported
+        MV grid districts are closed, hence exporting a network district
+        by district takes linear time.
 
-                    # Trafos MV
-                    for t in node.transformers():
-                        mvtrafos_idx += 1
-                        hvmv_trafos_dict[mvtrafos_idx] = {
-                            'id_db': '_'.join([str(t.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)]),
-                            'geom': geom,
-                            'MV_grid_id_db': mv_grid_id_db,
-                            'voltage_op': t.v_level,
-                            'S_nom': t.s_max_a,
-                            'x_pu': t.x_pu,
-                            'r_pu': t.r_pu,
-                            'run_id': run_id,
-                        }
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        nodes_df : Dataframe containing nodes and its attributes
+    :pandas:`pandas.DataFrame<dataframe>`
+        lines_df : Dataframe containing lines and its attributes
+    """
 
-                # MVGenerator
-                elif isinstance(node, GeneratorDing0):
-                    if node.subtype == None:
-                        subtype = 'other'
-                    else:
-                        subtype = node.subtype
-                    type = node.type
-                    mvgen_idx += 1
-                    mv_gen_dict[mvgen_idx] = {
-                        'id_db': '_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)]),
-                        'MV_grid_id_db': mv_grid_id_db,
-                        'geom': geom,
-                        'type': type,
-                        'subtype': subtype,
-                        'v_level': node.v_level,
-                        'nominal_capacity': node.capacity,
-                        'run_id': run_id,
-                        'is_aggregated': False,
-                    }
+    # close circuit breakers
+    if mv_grid_districts is None:
+        nw.control_circuit_breakers(mode='close')
+        mv_grid_districts = list(nw.mv_grid_districts())
+    else:
+        for mv_district in mv_grid_districts:
+            mv_district.mv_grid.close_circuit_breakers()
+    # srid
+    srid = str(int(nw.config['geo']['srid']))
+    ##############################
+    # check what to do
+    lv_info = True
+    mv_info = True
+    if mode == 'LV':
+        mv_info = False
+    if mode == 'MV':
+        lv_info = False
+    ##############################
+    # from datetime import datetime
+    run_id = nw.metadata['run_id']  # datetime.now().strftime("%Y%m%d%H%M%S")
+    ##############################
+    #############################
+    # go through the grid collecting info: rows are collected per grid as
+    # columns (lists of values) and concatenated once per table
+    tables = {table: [] for table in [
+        'lv_grid', 'lv_gen', 'lv_cd', 'mvlv_stations', 'mvlv_trafos',
+        'lv_loads', 'mv_grid', 'mv_gen', 'mv_cd', 'hvmv_stations',
+        'hvmv_trafos', 'mv_loads', 'lines', 'mvlv_mapping']}
+    mv_load_ids = count(1)
 
-                # MVBranchTees
-                elif isinstance(node, MVCableDistributorDing0):
-                    mvcd_idx += 1
-                    mv_cd_dict[mvcd_idx] = {
-                        'id_db': '_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)]),
-                        'MV_grid_id_db': mv_grid_id_db,
-                        'geom': geom,
-                        'run_id': run_id,
-                    }
+    for mv_district in mv_grid_districts:
 
-                # LoadAreaCentre
-                elif isinstance(node, LVLoadAreaCentreDing0):
-
-                    # type = 'Load area center of aggregated load area'
-
-                    areacenter_idx += 1
-                    aggr_lines = 0
-
-                    aggr = {'generation': {}, 'load': {}, 'aggregates': []}
-
-                    # Determine aggregated generation in LV grid
-                    for lvgd in node.lv_load_area._lv_grid_districts:
-
-                        for aggr_gen in lvgd.lv_grid.generators():
-                            aggr = aggregate_generators(aggr_gen, aggr)
-
-                            if aggr_gen.subtype == None:
-                                subtype = 'other'
-                            else:
-                                subtype = aggr_gen.subtype
-                            type = aggr_gen.type
-
-                    # Determine aggregated load in MV grid
-                    # -> Implement once loads in Ding0 MV grids exist
-
-                    # Determine aggregated load in LV grid
-                    aggr = aggregate_loads(node, aggr)
-
-                    # Collect metadata of aggregated load areas
-                    aggr['aggregates'] = {
-                        'population': node.lv_load_area.zensus_sum,
-                        'geom': node.lv_load_area.geo_area}
-                    aggr_line_type = nw._static_data['MV_cables'].iloc[
-                        nw._static_data['MV_cables']['I_max_th'].idxmax()]
-                    geom = wkt_dumps(node.lv_load_area.geo_area)
-
-                    for aggr_node in aggr:
-                        if aggr_node == 'generation':
-                            mvgenaggr_idx = 0
-
-                            for v_level in aggr['generation']:
-                                for type in aggr['generation'][v_level]:
-                                    for subtype in aggr['generation'][v_level][type]:
-                                        mvgen_idx += 1
-                                        mvgenaggr_idx += 1
-                                        mv_gen_dict[mvgen_idx] = {
-                                            'id_db': '_'.join(
-                                                [str(aggr_gen.__class__.__name__), 'MV', str(mv_grid_id),
-                                                 str(aggr_gen.id_db), str(mvgenaggr_idx)]),  # , str(mvgen_idx)
-                                            'MV_grid_id_db': mv_grid_id_db,
-                                            'geom': geom,#from_shape(Point(mv_district.mv_grid.station().geo_data), srid=srid),#lv_load_area.geo_area,#geom, #?? Polygon # hvmv_stations_dict[mvstations_idx]['geom'], #
-                                            'type': type,
-                                            'subtype': subtype,
-                                            'v_level': v_level,
-                                            'nominal_capacity': aggr['generation'][v_level][type][subtype]['capacity'],
-                                            'is_aggregated': True,
-                                            'run_id': run_id,
-                                        }
-
-                                        lines_idx += 1
-                                        aggr_lines += 1
-                                        lines_dict[lines_idx] = {
-                                            # ToDo: Rename edge_name
-                                            'edge_name': '_'.join(
-                                                [str(mv_grid_id), 'aggr', str(node.lv_load_area.id_db),
-                                                 str(aggr_lines)]),
-                                            # , 'vlevel', str(v_level), 'subtype', str(subtype)]),#}'.format(v_level=v_level, subtype=subtype),
-                                            'grid_id_db': mv_grid_id_db,
-                                            # ToDo: read type_name from aggr_line_type
-                                            'type_name': 'NA2XS2Y 3x1x500 RM/35',  # aggr_line_type.name,
-                                            'type_kind': 'cable',  # branch['branch'].kind,
-                                            'length': 1,
-                                            'U_n': aggr_line_type.U_n,
-                                            'I_max_th': aggr_line_type.I_max_th,
-                                            'R_per_km': aggr_line_type.R_per_km,
-                                            'L_per_km': aggr_line_type.L_per_km,
-                                            'C_per_km': aggr_line_type.C_per_km,
-                                            'node1': '_'.join(
-                                                [str(aggr_gen.__class__.__name__), 'MV', str(mv_grid_id),
-                                                 str(aggr_gen.id_db), str(mvgenaggr_idx)]),
-                                            'node2': '_'.join([
-                                                'MVStationDing0', 'MV', str(mv_grid_id), str(mv_grid_id)]),
-                                            'run_id': run_id,
-                                        }
-
-                        elif aggr_node == 'load':
-                            for type in aggr['load']:
-                                mvloads_idx += 1
-                                mv_loads_dict[mvloads_idx] = {
-                                    'id_db': '_'.join(
-                                        ['AggregatedLoad', 'MV', str(mv_grid_id), str(mvloads_idx)]),
-                                    'MV_grid_id_db': mv_grid_id_db,
-                                    'geom': geom,
-                                    # from_shape(Point(mv_district.mv_grid.station().geo_data), srid=srid),
-                                    'consumption_{}'.format(type): aggr['load'][type]['nominal'],
-                                    'is_aggregated': True,
-                                    'run_id': run_id,
-                                }
-
-                                lines_idx += 1
-                                aggr_lines += 1
-                                lines_dict[lines_idx] = {
-                                    # ToDo: Rename edge_name
-                                    'edge_name': '_'.join(
-                                        [str(mv_grid_id), 'aggr', str(node.lv_load_area.id_db), str(aggr_lines)]),
-                                    # 'edge_name': '_'.join(
-                                    #    ['line_aggr_load', str(node.lv_load_area), 'vlevel', str(v_level),
-                                    #     'subtype', str(subtype)]),  # }'.format(v_level=v_level, subtype=subtype),
-                                    'grid_id_db': mv_grid_id_db,
-                                    # ToDo: read type_name from aggr_line_type
-                                    'type_name': 'NA2XS2Y 3x1x500 RM/35',  # aggr_line_type.name,
-                                    'type_kind': 'cable',  # branch['branch'].kind,
-                                    # 'type': aggr_line_type,
-                                    'length': 1e-3,  # in km
-                                    'U_n': aggr_line_type.U_n,
-                                    'I_max_th': aggr_line_type.I_max_th,
-                                    'R_per_km': aggr_line_type.R_per_km,
-                                    'L_per_km': aggr_line_type.L_per_km,
-                                    'C_per_km': aggr_line_type.C_per_km,
-                                    'node1': '_'.join(
-                                        ['AggregatedLoad', 'MV', str(mv_grid_id), str(mvloads_idx)]),
-                                    'node2': '_'.join([
-                                        'MVStationDing0', 'MV', str(mv_grid_id), str(mv_grid_id)]),
-                                    'run_id': run_id,
-                                }
-
-                    # areacenter_dict[areacenter_idx] = {
-                    #    'id_db': '_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)]),#node.id_db,
-                    #    'MV_grid_id':node.grid,
-                    #    'geom':node.geo_data,
-                    #    'lv_load_area': node.lv_load_area,
-                    #    'run_id': run_id,#
-
-                    # }
-
-                # DisconnectingPoints
-                elif isinstance(node, CircuitBreakerDing0):
-                    mvcb_idx += 1
-                    mvcb_dict[mvcb_idx] = {
-                        'id_db': '_'.join([str(node.__class__.__name__), 'MV', str(mv_grid_id), str(node.id_db)]),
-                        'MV_grid_id': mv_grid_id,
-                        'MV_grid_id_db': mv_grid_id_db,
-                        'geom': geom,
-                        'status': node.status,
-                        'run_id': run_id,
-                    }
-                else:
-                    type = 'Unknown'
-
-            # MVedges
-            for branch in mv_district.mv_grid.graph_edges():
-                # geom = wkt_dumps(node.geo_data)
-                geom = from_shape(LineString([branch['adj_nodes'][0].geo_data, branch['adj_nodes'][1].geo_data]),
-                                  srid=srid)
-                if not any([isinstance(branch['adj_nodes'][0], LVLoadAreaCentreDing0),
-                            isinstance(branch['adj_nodes'][1], LVLoadAreaCentreDing0)]):
-                    lines_idx += 1
-                    lines_dict[lines_idx] = {
-                        'edge_name': branch['branch'].id_db,
-                        'grid_id_db': mv_grid_id_db,
-                        'type_name': branch['branch'].type['name'],
-                        'type_kind': branch['branch'].kind,
-                        'length': branch['branch'].length / 1e3,
-                        'U_n': branch['branch'].type['U_n'],
-                        'I_max_th': branch['branch'].type['I_max_th'],
-                        'R_per_km': branch['branch'].type['R_per_km'],
-                        'L_per_km': branch['branch'].type['L_per_km'],
-                        'C_per_km': branch['branch'].type['C_per_km'],
-                        'node1': '_'.join([str(branch['adj_nodes'][0].__class__.__name__), 'MV', str(mv_grid_id),
-                                           str(branch['adj_nodes'][0].id_db)]),
-                        'node2': '_'.join([str(branch['adj_nodes'][1].__class__.__name__), 'MV', str(mv_grid_id),
-                                           str(branch['adj_nodes'][1].id_db)]),
-                        'run_id': run_id,
-                    }
+        if mv_info:
+            for table, columns in _mv_grid_columns(
+                    mv_district, run_id, nw._static_data['MV_cables'],
+                    mv_load_ids):
+                tables[table].append(columns)
 
         if lv_info:
+            mv_grid_id = mv_district.mv_grid.id_db
             for LA in mv_district.lv_load_areas():
                 for lv_district in LA.lv_grid_districts():
                     if not lv_district.lv_grid.grid_district.lv_load_area.is_aggregated:
-
-                        # ding0_grid.grid_district._lv_load_areas._lv_grid_districts    _.lv_grid
-                        # LV-grid
-                        # ToDo: geom <- Polygon
-                        lvgrid_idx += 1
-                        lv_grid_dict[lvgrid_idx] = {
-                            'LV_grid_id': lv_district.lv_grid.id_db,
-                            'id_db': '_'.join(
-                                [str(lv_district.lv_grid.__class__.__name__), 'LV', str(lv_district.lv_grid.id_db),
-                                 str(lv_district.lv_grid.id_db)]),
-                            'geom': wkt_dumps(lv_district.geo_data),
-                            'population': lv_district.population,
-                            'voltage_nom': lv_district.lv_grid.v_level / 1e3,
-                            'run_id': run_id
-                        }
-
-                        lv_grid_id = lv_district.lv_grid.id_db
-                        lv_grid_id_db = '_'.join(
-                            [str(lv_district.lv_grid.__class__.__name__), 'LV', str(lv_district.lv_grid.id_db),
-                             str(lv_district.lv_grid.id_db)])
-
-                        # geom = from_shape(Point(lv_district.lv_grid.station().geo_data), srid=srid)
-                        # geom = wkt_dumps(lv_district.geo_data)# lv_grid.station() #ding0_lv_grid.grid_district.geo_data
-                        for node in lv_district.lv_grid.graph_nodes_sorted():
-                            # geom = wkt_dumps(node.geo_data)
-
-                            # LVGenerator
-                            if isinstance(node, GeneratorDing0):
-                                if node.subtype == None:
-                                    subtype = 'other'
-                                else:
-                                    subtype = node.subtype
-                                type = node.type
-                                lvgen_idx += 1
-                                lv_gen_dict[lvgen_idx] = {
-                                    'id_db': '_'.join(
-                                        [str(node.__class__.__name__), 'LV', str(lv_grid_id), str(node.id_db)]),
-                                    'LV_grid_id_db': lv_grid_id_db,
-                                    'geom': wkt_dumps(node.geo_data),
-                                    'type': type,
-                                    'subtype': subtype,
-                                    'v_level': node.v_level,
-                                    'nominal_capacity': node.capacity,
-                                    'run_id': run_id,
-                                }
-
-                            # LVcd
-                            elif isinstance(node, LVCableDistributorDing0):
-                                lvcd_idx += 1
-                                lv_cd_dict[lvcd_idx] = {
-                                    'id_db': '_'.join(
-                                        [str(node.__class__.__name__), 'LV', str(lv_grid_id), str(node.id_db)]),
-                                    'LV_grid_id_db': lv_grid_id_db,
-                                    'geom': None,
-                                    # wkt_dumps(lv_district.geo_data),#wkt_dumps(node.geo_data), Todo: why no geo_data?
-                                    'run_id': run_id,
-                                }
-
-                            # LVload
-                            elif isinstance(node, LVLoadDing0):
-                                consumption_dict = {}
-                                for k in ['residential', 'retail', 'agricultural', 'industrial']:
-                                    if k in node.consumption.keys():
-                                        consumption_dict[k] = node.consumption[k]
-                                    else:
-                                        consumption_dict[k] = None
-                                lvloads_idx += 1
-                                lv_loads_dict[lvloads_idx] = {
-                                    'id_db': '_'.join(
-                                        [str(node.__class__.__name__), 'LV', str(lv_grid_id), str(node.id_db)]),
-                                    'LV_grid_id_db': lv_grid_id_db,
-                                    'geom': None,#wkt_dumps(lv_district.geo_data),#wkt_dumps(node.geo_data), Todo: why no geo_data?
-                                    # 'consumption': json.dumps(node.consumption),
-                                    'consumption_residential': consumption_dict['residential'],
-                                    'consumption_retail': consumption_dict['retail'],
-                                    'consumption_agricultural': consumption_dict['agricultural'],
-                                    'consumption_industrial': consumption_dict['industrial'],
-                                    'run_id': run_id,
-                                }
-                                del consumption_dict
-
-                            else:
-                                type = 'Unknown'
-
-                        # LVedges
-                        for branch in lv_district.lv_grid.graph_edges():
-    #                        geom = from_shape(
-    #                            LineString([branch['adj_nodes'][0].geo_data, branch['adj_nodes'][1].geo_data]), srid=srid)
-                            if not any([isinstance(branch['adj_nodes'][0], LVLoadAreaCentreDing0),
-                                        isinstance(branch['adj_nodes'][1], LVLoadAreaCentreDing0)]):
-                                lines_idx += 1
-                                lines_dict[lines_idx] = {
-                                    'edge_name': branch['branch'].id_db,
-                                    'grid_id_db': lv_grid_id_db,
-                                    'type_name': branch['branch'].type.to_frame().columns[0],
-                                    'type_kind': branch['branch'].kind,
-                                    'length': branch['branch'].length / 1e3,  # length in km
-                                    'U_n': branch['branch'].type['U_n'] / 1e3,  # U_n in kV
-                                    'I_max_th': branch['branch'].type['I_max_th'],
-                                    'R_per_km': branch['branch'].type['R_per_km'],
-                                    'L_per_km': branch['branch'].type['L_per_km'],
-                                    'node1': '_'.join(
-                                        [str(branch['adj_nodes'][0].__class__.__name__), 'LV', str(lv_grid_id),
-                                         str(branch['adj_nodes'][0].id_db)])
-                                    if not isinstance(branch['adj_nodes'][0], LVStationDing0) else '_'.join(
-                                        [str(branch['adj_nodes'][0].__class__.__name__), 'MV', str(mv_grid_id),
-                                         str(branch['adj_nodes'][0].id_db)]),
-                                    'node2': '_'.join(
-                                        [str(branch['adj_nodes'][1].__class__.__name__), 'LV', str(lv_grid_id),
-                                         str(branch['adj_nodes'][1].id_db)])
-                                    if not isinstance(branch['adj_nodes'][1], LVStationDing0) else '_'.join(
-                                        [str(branch['adj_nodes'][1].__class__.__name__), 'MV', str(mv_grid_id),
-                                         str(branch['adj_nodes'][1].id_db)]),
-                                    'run_id': run_id,
-                                }
-
-    lv_grid       = pd.DataFrame.from_dict(lv_grid_dict, orient='index')
-    lv_gen        = pd.DataFrame.from_dict(lv_gen_dict, orient='index')
-    lv_cd         = pd.DataFrame.from_dict(lv_cd_dict, orient='index')
-    mvlv_stations = pd.DataFrame.from_dict(mvlv_stations_dict, orient='index')
-    mvlv_trafos   = pd.DataFrame.from_dict(mvlv_trafos_dict, orient='index')
-    lv_loads      = pd.DataFrame.from_dict(lv_loads_dict, orient='index')
-    mv_grid       = pd.DataFrame.from_dict(mv_grid_dict, orient='index')
-    mv_gen        = pd.DataFrame.from_dict(mv_gen_dict, orient='index')
-    # mv_cb         = pd.DataFrame.from_dict(mvcb_dict, orient='index')
-    mv_cd         = pd.DataFrame.from_dict(mv_cd_dict, orient='index')
-    hvmv_stations = pd.DataFrame.from_dict(hvmv_stations_dict, orient='index')
-    # mv_areacenter= pd.DataFrame.from_dict(areacenter_dict, orient='index')
-    hvmv_trafos   = pd.DataFrame.from_dict(hvmv_trafos_dict, orient='index')
-    mv_loads      = pd.DataFrame.from_dict(mv_loads_dict, orient='index')
-    lines         = pd.DataFrame.from_dict(lines_dict, orient='index')
-    mvlv_mapping  = pd.DataFrame.from_dict(mvlv_mapping_dict, orient='index')
+                        for table, columns in _lv_grid_columns(
+                                lv_district, mv_grid_id, run_id):
+                            tables[table].append(columns)
+
+    lv_grid       = _columns_to_frame(tables['lv_grid'])
+    lv_gen        = _columns_to_frame(tables['lv_gen'])
+    lv_cd         = _columns_to_frame(tables['lv_cd'])
+    mvlv_stations = _columns_to_frame(tables['mvlv_stations'])
+    mvlv_trafos   = _columns_to_frame(tables['mvlv_trafos'])
+    lv_loads      = _columns_to_frame(tables['lv_loads'])
+    mv_grid       = _columns_to_frame(tables['mv_grid'])
+    mv_gen        = _columns_to_frame(tables['mv_gen'])
+    mv_cd         = _columns_to_frame(tables['mv_cd'])
+    hvmv_stations = _columns_to_frame(tables['hvmv_stations'])
+    hvmv_trafos   = _columns_to_frame(tables['hvmv_trafos'])
+    mv_loads      = _columns_to_frame(tables['mv_loads'])
+    lines         = _columns_to_frame(tables['lines'])
+    mvlv_mapping  = _columns_to_frame(tables['mvlv_mapping'])
+    del tables
 
     lines = lines[sorted(lines.columns.tolist())]
 
@@ -2191,217 +2186,318 @@ def export_data_tocsv(path, run_id, lv_grid, lv_gen, lv_cd, lv_stations, mvlv_tr
 
 ########################################################
 
-from sqlalchemy import create_engine
+from sqlalchemy import inspect
 from egoio.db_tables import model_draft as md
 
 
-def export_network_to_oedb(session, table, tabletype, srid):
-    dataset = []
-    engine = create_engine("sqlite:///myexample.db")
+# ORM classes (of egoio's model_draft) of tables written by
+# export_network_to_oedb() and their attributes with the columns of the
+# exported tables (see export_network()) they are taken from
+OEDB_EXPORT_TABLES = {
+    'lines': ('EgoGridDing0Line', [
+        ('run_id', 'run_id'),
+        ('edge_name', 'edge_name'),
+        ('grid_id_db', 'grid_id_db'),
+        ('node1', 'node1'),
+        ('node2', 'node2'),
+        ('type_kind', 'type_kind'),
+        ('type_name', 'type_name'),
+        ('length', 'length'),
+        ('U_n', 'U_n'),
+        ('C_per_km', 'C_per_km'),
+        ('L_per_km', 'L_per_km'),
+        ('R_per_km', 'R_per_km'),
+        ('I_max_th', 'I_max_th')]),
+    'lv_cd': ('EgoGridDing0LvBranchtee', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('lv_grid_id_db', 'LV_grid_id_db'),
+        ('geom', 'geom')]),
+    'lv_gen': ('EgoGridDing0LvGenerator', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('lv_grid_id_db', 'LV_grid_id_db'),
+        ('geom', 'geom'),
+        ('type', 'type'),
+        ('subtype', 'subtype'),
+        ('v_level', 'v_level'),
+        ('nominal_capacity', 'nominal_capacity')]),
+    'lv_loads': ('EgoGridDing0LvLoad', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('lv_grid_id_db', 'LV_grid_id_db'),
+        ('geom', 'geom'),
+        ('consumption_residential', 'consumption_residential'),
+        ('consumption_retail', 'consumption_retail'),
+        ('consumption_agricultural', 'consumption_agricultural'),
+        ('consumption_industrial', 'consumption_industrial')]),
+    'lv_grid': ('EgoGridDing0LvGrid', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('lv_grid_id', 'LV_grid_id'),
+        ('geom', 'geom'),
+        ('population', 'population'),
+        ('voltage_nom', 'voltage_nom')]),
+    'mvlv_stations': ('EgoGridDing0MvlvStation', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('lv_grid_id_db', 'LV_grid_id_db'),
+        ('geom', 'geom')]),
+    'mvlv_trafos': ('EgoGridDing0MvlvTransformer', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('lv_grid_id_db', 'LV_grid_id_db'),
+        ('geom', 'geom'),
+        ('voltage_op', 'voltage_op'),
+        ('S_nom', 'S_nom'),
+        ('X', 'x_pu'),
+        ('R', 'r_pu')]),
+    'mvlv_mapping': ('EgoGridDing0MvlvMapping', [
+        ('run_id', 'run_id'),
+        ('lv_grid_id', 'LV_grid_id'),
+        ('lv_grid_id_db', 'LV_grid_id_db'),
+        ('mv_grid_id', 'MV_grid_id'),
+        ('mv_grid_id_db', 'MV_grid_id_db')]),
+    'mv_cd': ('EgoGridDing0MvBranchtee', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('mv_grid_id_db', 'MV_grid_id_db'),
+        ('geom', 'geom')]),
+    'mv_gen': ('EgoGridDing0MvGenerator', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('mv_grid_id_db', 'MV_grid_id_db'),
+        ('geom', 'geom'),
+        ('type', 'type'),
+        ('subtype', 'subtype'),
+        ('v_level', 'v_level'),
+        ('nominal_capacity', 'nominal_capacity'),
+        ('is_aggregated', 'is_aggregated')]),
+    'mv_loads': ('EgoGridDing0MvLoad', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('mv_grid_id_db', 'MV_grid_id_db'),
+        ('geom', 'geom'),
+        ('is_aggregated', 'is_aggregated'),
+        ('consumption_residential', 'consumption_residential'),
+        ('consumption_retail', 'consumption_retail'),
+        ('consumption_agricultural', 'consumption_agricultural'),
+        ('consumption_industrial', 'consumption_industrial')]),
+    'mv_grid': ('EgoGridDing0MvGrid', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('mv_grid_id', 'MV_grid_id'),
+        ('geom', 'geom'),
+        ('population', 'population'),
+        ('voltage_nom', 'voltage_nom')]),
+    'hvmv_stations': ('EgoGridDing0HvmvStation', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('mv_grid_id_db', 'MV_grid_id_db'),
+        ('geom', 'geom')]),
+    'hvmv_trafos': ('EgoGridDing0HvmvTransformer', [
+        ('run_id', 'run_id'),
+        ('id_db', 'id_db'),
+        ('mv_grid_id_db', 'MV_grid_id_db'),
+        ('geom', 'geom'),
+        ('voltage_op', 'voltage_op'),
+        ('S_nom', 'S_nom'),
+        ('X', 'x_pu'),
+        ('R', 'r_pu')])}
+
+# count of rows written to the database at once
+OEDB_BATCH_SIZE = 10000
+
+
+def _column_values(values):
+    """Returns values of a column as list of Python objects, nulls as None"""
+    return [None if value is None or value != value else value
+            for value in values.tolist()]
+
+
+def _geom_values(values, srid):
+    """Returns WKT geometries of a column as EWKT of SRID `srid`"""
+    values = values.astype(object)
+    valid = values.notnull() & (values != '')
+    return _column_values(
+        ('SRID={};'.format(srid) + values[valid].astype(str)).reindex(
+            values.index))
+
+
+def _copy_value(value):
+    """Returns `value` as field of PostgreSQL's COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace(
+            '\n', '\\n').replace('\r', '\\r')
+    return str(value)
+
+
+def _copy_rows(session, db_table, names, rows):
+    """
+    Writes `rows` to columns `names` of `db_table` using PostgreSQL's COPY
+
+    Rows are passed in COPY's text format (tab-separated, nulls as \\N).
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    preparer = session.get_bind().dialect.identifier_preparer
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            'COPY {} ({}) FROM STDIN'.format(
+                preparer.format_table(db_table),
+                ', '.join(preparer.quote(name) for name in names)),
+            buffer)
+    finally:
+        cursor.close()
+
+
+def write_table_bulk(session, db_table, data, batch_size=OEDB_BATCH_SIZE,
+                     method='auto', name=None):
+    """
+    Writes rows of `data` to database table `db_table` in batches
+
+    Each batch is written by one multi-row statement: a Core INSERT executed
+    with all rows of the batch (executemany) or, if the database is
+    PostgreSQL, COPY. Progress and throughput are logged per batch. The
+    transaction of `session` is not committed.
+
+    Parameters
+    ----------
+    session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+        Database session
+    db_table : :class:`sqlalchemy.Table`
+        Table to be written to
+    data : :obj:`dict`
+        Values (:obj:`list`, nulls as None) of columns of `db_table` keyed
+        by key of column (which is its name unless set otherwise). All
+        lists are of equal length.
+    batch_size : :obj:`int`
+        Count of rows per batch
+    method : :obj:`str`
+        'insert', 'copy' (PostgreSQL only) or 'auto' which uses COPY if
+        available
+    name : :obj:`str`
+        Name of table in progress report, default is name of `db_table`
+
+    Returns
+    -------
+    :obj:`int`
+        Count of written rows
+    """
+    dialect = session.get_bind().dialect.name
+    if method == 'auto':
+        method = 'copy' if dialect == 'postgresql' else 'insert'
+    if method not in ['insert', 'copy']:
+        raise ValueError("Unknown method '{}', valid methods are 'insert', "
+                         "'copy' and 'auto'.".format(method))
+    if method == 'copy' and dialect != 'postgresql':
+        raise ValueError('COPY requires PostgreSQL, database is {}.'.format(
+            dialect))
+
+    if name is None:
+        name = db_table.name
+    keys = list(data)
+    names = [db_table.c[key].name for key in keys]
+    rows = list(zip(*data.values()))
+    insert = db_table.insert()
+
+    start = time.time()
+    for batch_start in range(0, len(rows), batch_size):
+        batch = rows[batch_start:batch_start + batch_size]
+        if method == 'copy':
+            _copy_rows(session, db_table, names, batch)
+        else:
+            session.execute(insert, [dict(zip(keys, row)) for row in batch])
+
+        written = batch_start + len(batch)
+        elapsed = time.time() - start
+        logger.info('{}: {}/{} rows ({:.0f} rows/s)'.format(
+            name, written, len(rows),
+            written / elapsed if elapsed > 0 else float('inf')))
+
+    return len(rows)
+
+
+def export_network_to_oedb(session, table, tabletype, srid,
+                           batch_size=OEDB_BATCH_SIZE, method='auto'):
+    """
+    Writes exported table `table` to its ding0 table of the OEDB
+
+    Columns of `table` are converted once each (e.g. WKT geometries to
+    EWKT), rows are written in batches by :func:`write_table_bulk`. The
+    transaction of `session` is committed afterwards.
+
+    Parameters
+    ----------
+    session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+        Database session
+    table : :pandas:`pandas.DataFrame<dataframe>`
+        Table as exported by :func:`export_network`
+    tabletype : :obj:`str`
+        Type of table, one of the keys of `OEDB_EXPORT_TABLES`
+    srid : :obj:`int`
+        SRID of geometries
+    batch_size : :obj:`int`
+        Count of rows per batch
+    method : :obj:`str`
+        Method of writing, see :func:`write_table_bulk`
+
+    Returns
+    -------
+    :obj:`int`
+        Count of written rows
+    """
     print("Exporting table type : {}".format(tabletype))
-    if tabletype == 'lines':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0Line(
-                        run_id=row['run_id'],
-                        edge_name=row['edge_name'],
-                        grid_id_db=row['grid_id_db'],
-                        node1=row['node1'],
-                        node2=row['node2'],
-                        type_kind=row['type_kind'],
-                        type_name=row['type_name'],
-                        length=row['length'],
-                        U_n=row['U_n'],
-                        C_per_km=row['C_per_km'],
-                        L_per_km=row['L_per_km'],
-                        R_per_km=row['R_per_km'],
-                        I_max_th=row['I_max_th'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'lv_cd':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0LvBranchtee(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        lv_grid_id_db=row['LV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'lv_gen':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0LvGenerator(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        lv_grid_id_db=str(row['LV_grid_id_db']),
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        type=row['type'],
-                        subtype=row['subtype'],
-                        v_level=row['v_level'],
-                        nominal_capacity=row['nominal_capacity'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'lv_loads':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0LvLoad(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        lv_grid_id_db=row['LV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        consumption_residential=row['consumption_residential'],
-                        consumption_retail=row['consumption_retail'],
-                        consumption_agricultural=row['consumption_agricultural'],
-                        consumption_industrial=row['consumption_industrial'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'lv_grid':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0LvGrid(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        lv_grid_id=row['LV_grid_id'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        population=row['population'],
-                        voltage_nom=row['voltage_nom'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'mvlv_stations':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0MvlvStation(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        lv_grid_id_db=row['LV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'mvlv_trafos':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0MvlvTransformer(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        lv_grid_id_db=row['LV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        voltage_op=row['voltage_op'],
-                        S_nom=row['S_nom'],
-                        X=row['X'],
-                        R=row['R'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'mvlv_mapping':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0MvlvMapping(
-                        run_id=row['run_id'],
-                        lv_grid_id=row['LV_grid_id'],
-                        lv_grid_id_db=row['LV_grid_id_db'],
-                        mv_grid_id=row['MV_grid_id'],
-                        mv_grid_id_db=row['MV_grid_id_db'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'mv_cd':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0MvBranchtee(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        mv_grid_id_db=row['MV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'mv_gen':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0MvGenerator(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        mv_grid_id_db=row['MV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        type=row['type'],
-                        subtype=row['subtype'],
-                        v_level=row['v_level'],
-                        nominal_capacity=row['nominal_capacity'],
-                        is_aggregated=row['is_aggregated'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'mv_loads':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0MvLoad(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        mv_grid_id_db=row['MV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        is_aggregated=row['is_aggregated'],
-                        consumption_residential=row['consumption_residential'],
-                        consumption_retail=row['consumption_retail'],
-                        consumption_agricultural=row['consumption_agricultural'],
-                        consumption_industrial=row['consumption_industrial'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'mv_grid':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0MvGrid(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        mv_grid_id=row['MV_grid_id'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        population=row['population'],
-                        voltage_nom=row['voltage_nom'],
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'hvmv_stations':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0HvmvStation(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        mv_grid_id_db=row['MV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                    ))
-                    , axis=1)
-
-    elif tabletype == 'hvmv_trafos':
-        table.apply(lambda row:
-                    session.add(md.EgoGridDing0HvmvTransformer(
-                        run_id=row['run_id'],
-                        id_db=row['id_db'],
-                        mv_grid_id_db=row['MV_grid_id_db'],
-                        geom="SRID={};{}".format(srid, row['geom']) if row['geom'] else None,
-                        voltage_op=row['voltage_op'],
-                        S_nom=row['S_nom'],
-                        X=row['X'],
-                        R=row['R'],
-                    ))
-                    , axis=1)
-        # if not engine.dialect.has_table(engine, 'ego_grid_mv_transformer'):
-        #     print('helloworld')
+    model_name, attributes = OEDB_EXPORT_TABLES[tabletype]
+    model = getattr(md, model_name)
+    columns = inspect(model).columns
+
+    data = {}
+    for attribute, column in attributes:
+        if column not in table.columns:
+            values = [None] * len(table)
+        elif attribute == 'geom':
+            values = _geom_values(table[column], srid)
+        else:
+            values = _column_values(table[column])
+        data[columns[attribute].key] = values
 
+    count = write_table_bulk(session, model.__table__, data,
+                             batch_size=batch_size, method=method,
+                             name=tabletype)
     session.commit()
 
+    return count
+
 
 def export_data_to_oedb(session, srid, lv_grid, lv_gen, lv_cd, mvlv_stations, mvlv_trafos, lv_loads, mv_grid, mv_gen,
-                        mv_cd, hvmv_stations, hvmv_trafos, mv_loads, lines, mvlv_mapping):
+                        mv_cd, hvmv_stations, hvmv_trafos, mv_loads, lines, mvlv_mapping,
+                        batch_size=OEDB_BATCH_SIZE, method='auto'):
     # only for testing
     # engine = create_engine('sqlite:///:memory:')
-    export_network_to_oedb(session, lv_grid, 'lv_grid', srid)
-    export_network_to_oedb(session, lv_gen, 'lv_gen', srid)
-    export_network_to_oedb(session, lv_cd, 'lv_cd', srid)
-    export_network_to_oedb(session, mvlv_stations, 'mvlv_stations', srid)
-    export_network_to_oedb(session, mvlv_trafos, 'mvlv_trafos', srid)
-    export_network_to_oedb(session, lv_loads, 'lv_loads', srid)
-    export_network_to_oedb(session, mv_grid, 'mv_grid', srid)
-    export_network_to_oedb(session, mv_gen, 'mv_gen', srid)
-    export_network_to_oedb(session, mv_cd, 'mv_cd', srid)
-    export_network_to_oedb(session, hvmv_stations, 'hvmv_stations', srid)
-    export_network_to_oedb(session, hvmv_trafos, 'hvmv_trafos', srid)
-    export_network_to_oedb(session, mv_loads, 'mv_loads', srid)
-    export_network_to_oedb(session, lines, 'lines', srid)
-    export_network_to_oedb(session, mvlv_mapping, 'mvlv_mapping', srid)
+    for table, tabletype in [(lv_grid, 'lv_grid'),
+                             (lv_gen, 'lv_gen'),
+                             (lv_cd, 'lv_cd'),
+                             (mvlv_stations, 'mvlv_stations'),
+                             (mvlv_trafos, 'mvlv_trafos'),
+                             (lv_loads, 'lv_loads'),
+                             (mv_grid, 'mv_grid'),
+                             (mv_gen, 'mv_gen'),
+                             (mv_cd, 'mv_cd'),
+                             (hvmv_stations, 'hvmv_stations'),
+                             (hvmv_trafos, 'hvmv_trafos'),
+                             (mv_loads, 'mv_loads'),
+                             (lines, 'lines'),
+                             (mvlv_mapping, 'mvlv_mapping')]:
+        export_network_to_oedb(session, table, tabletype, srid,
+                               batch_size=batch_size, method=method)
 
 
 def create_ding0_db_tables(engine):
@@ -0,0 +1,330 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+import logging
+import multiprocessing as mp
+import pickle
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+
+from sqlalchemy import func
+
+logger = logging.getLogger('ding0')
+
+
+def load_area_counts(session, orm, mv_grid_districts_no):
+    """Returns count of load areas per MV grid district
+
+    Can be used as weights of :func:`run_tasks` to process large MV grid
+    districts first.
+
+    Parameters
+    ----------
+    session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+        Database session
+    orm : :obj:`dict`
+        ORM mapping, see :meth:`~.ding0.core.NetworkDing0.import_orm`
+    mv_grid_districts_no : :obj:`list` of :obj:`int`
+        MV grid districts
+
+    Returns
+    -------
+    :obj:`dict`
+        Count of load areas keyed by MV grid district
+    """
+    lv_load_areas = orm['orm_lv_load_areas']
+    counts = session.query(lv_load_areas.subst_id,
+                           func.count(lv_load_areas.id)). \
+        filter(lv_load_areas.subst_id.in_(mv_grid_districts_no)). \
+        filter(orm['version_condition_la']). \
+        group_by(lv_load_areas.subst_id)
+
+    load_area_count = {mv_grid_district: 0
+                       for mv_grid_district in mv_grid_districts_no}
+    load_area_count.update({subst_id: count for subst_id, count in counts})
+
+    return load_area_count
+
+
+def read_results(path):
+    """Reads result records streamed to `path` by :func:`run_tasks`
+
+    Parameters
+    ----------
+    path : :obj:`str`
+        Path of results file
+
+    Returns
+    -------
+    :obj:`list` of :obj:`dict`
+        Result records in order of completion
+    """
+    records = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                records.append(pickle.load(f))
+            except EOFError:
+                return records
+
+
+def _worker(conn, task_function, max_tasks):
+    """Worker process: runs tasks received via `conn` and sends back results
+
+    The worker exits after `max_tasks` tasks (if not None) or if None is
+    received.
+    """
+    n_tasks = 0
+    while max_tasks is None or n_tasks < max_tasks:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        task_no, task = message
+        try:
+            result = task_function(task)
+            conn.send((task_no, 'ok', result, None))
+        except Exception:
+            conn.send((task_no, 'error', None, traceback.format_exc()))
+        n_tasks += 1
+
+    conn.close()
+
+
+class _WorkerDing0:
+    """Worker process of :func:`run_tasks` and the task it runs"""
+
+    def __init__(self, context, task_function, max_tasks):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker, args=(child_conn, task_function, max_tasks),
+            daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.max_tasks = max_tasks
+        self.n_tasks = 0
+        self.task_no = None
+        self.started = None
+
+    @property
+    def busy(self):
+        return self.task_no is not None
+
+    @property
+    def exhausted(self):
+        return self.max_tasks is not None and self.n_tasks >= self.max_tasks
+
+    def submit(self, task_no, task):
+        self.conn.send((task_no, task))
+        self.task_no = task_no
+        self.started = time.perf_counter()
+
+    def finish(self):
+        """Marks the current task as finished, returns its duration"""
+        self.task_no = None
+        self.n_tasks += 1
+        return time.perf_counter() - self.started
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join()
+        self.conn.close()
+
+
+def run_tasks(task_function, tasks, processes=None, weights=None,
+              timeout=None, retries=1, max_tasks_per_worker=None,
+              results_file=None, context=None):
+    """Runs tasks in parallel worker processes with dynamic dispatch
+
+    Tasks are sent one by one to the next idle worker, hence a single slow
+    task does not block others. Tasks with large weights (e.g. count of load
+    areas of a MV grid district) are dispatched first.
+
+    A task that raises an exception, exceeds `timeout` or crashes its worker
+    is retried (up to `retries` times) in a fresh worker, i.e. a worker that
+    has not run any task before; the worker that ran it is terminated. If no
+    fresh worker is idle, an idle worker is replaced by a fresh one. Workers
+    are replaced after `max_tasks_per_worker` tasks to bound their memory
+    usage.
+
+    Parameters
+    ----------
+    task_function : callable
+        Function called with a single task in a worker, its result has to be
+        picklable. Has to be defined at module level if processes are not
+        forked.
+    tasks : :obj:`list`
+        Tasks (picklable), e.g. MV grid districts or lists of them
+    processes : :obj:`int`
+        Count of worker processes, defaults to count of CPUs
+    weights : :obj:`list` of :obj:`float`
+        Weight of each task, tasks are dispatched in descending order of
+        weight. If None, tasks are dispatched in given order.
+    timeout : :obj:`float`
+        Time limit per task in seconds (None: no limit)
+    retries : :obj:`int`, defaults to 1
+        Count of retries of failed tasks
+    max_tasks_per_worker : :obj:`int`
+        Count of tasks after which a worker is replaced (None: never)
+    results_file : :obj:`str`
+        If set, each result record is appended to this file (as pickle) as
+        soon as the task is finished, see :func:`read_results`
+    context : :obj:`multiprocessing.context.BaseContext`
+        Multiprocessing context, defaults to the default context
+
+    Returns
+    -------
+    :obj:`list` of :obj:`dict`
+        Result records in order of `tasks` with keys `task`, `status`
+        ('ok', 'error', 'timeout' or 'crashed'), `result` (None if task
+        failed), `error`, `attempts` and `duration` (seconds of last attempt)
+    """
+    if context is None:
+        context = mp.get_context()
+    if processes is None:
+        processes = mp.cpu_count()
+    processes = max(1, min(processes, len(tasks)))
+
+    order = list(range(len(tasks)))
+    if weights is not None:
+        order.sort(key=lambda task_no: weights[task_no], reverse=True)
+
+    queue = deque(order)
+    # tasks to be retried, they are dispatched to fresh workers only
+    retried = set()
+    attempts = [0] * len(tasks)
+    records = [None] * len(tasks)
+    workers = []
+
+    def finish(task_no, status, result, error, duration):
+        attempts[task_no] += 1
+        if status != 'ok' and attempts[task_no] <= retries:
+            logger.warning('Task {} failed ({}), it is retried.'.format(
+                tasks[task_no], status))
+            queue.appendleft(task_no)
+            retried.add(task_no)
+            return
+
+        record = {'task': tasks[task_no], 'status': status, 'result': result,
+                  'error': error, 'attempts': attempts[task_no],
+                  'duration': duration}
+        records[task_no] = record
+        if status != 'ok':
+            logger.error('Task {} failed ({}):\n{}'.format(
+                tasks[task_no], status, error))
+        if results_file is not None:
+            with open(results_file, 'ab') as f:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    try:
+        while queue or any(worker.busy for worker in workers):
+
+            # dispatch tasks to idle workers, start workers if required
+            for worker in [_ for _ in workers if not _.busy and _.exhausted]:
+                worker.stop()
+                workers.remove(worker)
+            while queue and len(workers) < processes:
+                workers.append(_WorkerDing0(context, task_function,
+                                            max_tasks_per_worker))
+            # replace idle workers which have run tasks before if there are
+            # not enough fresh ones for the queued retries
+            idle = [worker for worker in workers if not worker.busy]
+            n_missing = max(0, sum(1 for task_no in queue
+                                   if task_no in retried) -
+                            sum(1 for worker in idle if worker.n_tasks == 0))
+            for worker in [_ for _ in idle if _.n_tasks > 0][:n_missing]:
+                worker.stop()
+                workers.remove(worker)
+                workers.append(_WorkerDing0(context, task_function,
+                                            max_tasks_per_worker))
+            for worker in list(workers):
+                if worker.busy:
+                    continue
+                task_no = next((_ for _ in queue
+                                if worker.n_tasks == 0 or _ not in retried),
+                               None)
+                if task_no is not None:
+                    queue.remove(task_no)
+                    try:
+                        worker.submit(task_no, tasks[task_no])
+                    except (BrokenPipeError, OSError):
+                        # worker died while idle, task is dispatched again
+                        queue.appendleft(task_no)
+                        worker.task_no = None
+                        worker.stop(kill=True)
+                        workers.remove(worker)
+            if not any(worker.busy for worker in workers):
+                continue
+
+            busy = [worker for worker in workers if worker.busy]
+            wait_timeout = None
+            if timeout is not None:
+                wait_timeout = max(0., min(worker.started + timeout
+                                           for worker in busy)
+                                   - time.perf_counter())
+            ready = wait([worker.conn for worker in busy] +
+                         [worker.process.sentinel for worker in busy],
+                         timeout=wait_timeout)
+
+            for worker in busy:
+                if worker.conn in ready:
+                    try:
+                        task_no, status, result, error = worker.conn.recv()
+                    except EOFError:
+                        # worker died while sending
+                        ready.append(worker.process.sentinel)
+                    else:
+                        finish(task_no, status, result, error,
+                               worker.finish())
+                        if status != 'ok':
+                            # task may have left the worker in a bad state
+                            worker.stop(kill=True)
+                            workers.remove(worker)
+                        continue
+
+                if worker.process.sentinel in ready:
+                    task_no = worker.task_no
+                    duration = worker.finish()
+                    # exit code is known after the process has been joined
+                    worker.stop(kill=True)
+                    workers.remove(worker)
+                    finish(task_no, 'crashed', None,
+                           'Worker exited with code {}.'.format(
+                               worker.process.exitcode),
+                           duration)
+                elif (timeout is not None and
+                      time.perf_counter() - worker.started >= timeout):
+                    task_no = worker.task_no
+                    finish(task_no, 'timeout', None,
+                           'Task exceeded timeout of {} s.'.format(timeout),
+                           worker.finish())
+                    worker.stop(kill=True)
+                    workers.remove(worker)
+    finally:
+        for worker in workers:
+            worker.stop(kill=any(_.busy for _ in workers))
+
+    return records
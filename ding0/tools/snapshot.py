@@ -0,0 +1,264 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+from ding0.core import geom_as_text
+from ding0.tools import config as cfg_ding0
+from ding0.tools.geo import geoms_from_wkt
+
+import json
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+from geoalchemy2.types import Geometry, Geography
+from sqlalchemy import create_engine, select, MetaData, Table, Column, \
+    Boolean, Date, DateTime, Float, Integer, LargeBinary, Numeric, String, \
+    Text
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger('ding0')
+
+# input tables (keys of NetworkDing0.orm) and their version conditions
+SNAPSHOT_TABLES = {
+    'orm_mv_grid_districts': 'version_condition_mvgd',
+    'orm_mv_stations': 'version_condition_mv_stations',
+    'orm_lv_load_areas': 'version_condition_la',
+    'orm_lv_grid_district': 'version_condition_lvgd',
+    'orm_lv_stations': 'version_condition_mvlvst',
+    'orm_re_generators': 'version_condition_re',
+    'orm_conv_generators': 'version_condition_conv'}
+
+# name of table holding snapshot's metadata
+SNAPSHOT_METADATA_TABLE = 'ding0_snapshot'
+
+# snapshot column types of input column types, types of the input database
+# (e.g. PostgreSQL's DOUBLE PRECISION) are matched by their generic base type
+SNAPSHOT_COLUMN_TYPES = {
+    Boolean: Boolean,
+    Integer: Integer,
+    Float: Float,
+    Numeric: Float,
+    String: Text,
+    DateTime: DateTime,
+    Date: Date}
+
+
+def _table(orm_obj):
+    """Returns table of ORM class or `orm_obj` itself if it is a table"""
+    return getattr(orm_obj, '__table__', orm_obj)
+
+
+def _is_geometry(column):
+    """Returns True if `column` is a geometry column"""
+    return isinstance(column.type, (Geometry, Geography))
+
+
+def _snapshot_column(column):
+    """Returns column of snapshot table for column `column` of input table
+
+    Geometries are stored as WKB, other types are mapped to their generic
+    SQLAlchemy type (e.g. PostgreSQL's DOUBLE PRECISION to Float), see
+    :data:`SNAPSHOT_COLUMN_TYPES`. Types without generic type are stored as
+    text.
+    """
+    if _is_geometry(column):
+        column_type = LargeBinary()
+    else:
+        column_type = next(
+            (SNAPSHOT_COLUMN_TYPES[type_class]()
+             for type_class in type(column.type).__mro__
+             if type_class in SNAPSHOT_COLUMN_TYPES),
+            Text())
+
+    return Column(column.name, column_type, primary_key=column.primary_key)
+
+
+def export_snapshot(session, orm, mv_grid_districts_no, path):
+    """
+    Exports input data of MV grid districts to a snapshot
+
+    For each input table, all rows belonging to the MV grid districts
+    `mv_grid_districts_no` (and the configured data version) are copied to a
+    SQLite database at `path`. Geometries are transformed to the configured
+    SRID and stored as WKB, hence neither spatial database functions nor WKT
+    parsing are required to read the snapshot.
+
+    Parameters
+    ----------
+    session : :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+        Session of input database
+    orm : :obj:`dict`
+        ORM mapping of input tables, see
+        :meth:`~.ding0.core.NetworkDing0.import_orm`
+    mv_grid_districts_no : :obj:`list` of :obj:`int`
+        MV grid districts to export input data of
+    path : :obj:`str`
+        Path of SQLite file the snapshot is written to. Must not exist.
+
+    See Also
+    --------
+    open_snapshot : reader for snapshots
+    """
+
+    if os.path.exists(path):
+        raise FileExistsError('Snapshot {} already exists.'.format(path))
+
+    srid = str(int(cfg_ding0.get('geo', 'srid')))
+
+    engine = create_engine('sqlite:///' + path)
+    metadata = MetaData()
+    tables = {}
+
+    # LV grid districts are selected by their LV stations
+    lv_stations = _table(orm['orm_lv_stations'])
+    lv_stations_sqla = select([lv_stations.c.mvlv_subst_id]). \
+        where(lv_stations.c.subst_id.in_(mv_grid_districts_no)). \
+        where(orm['version_condition_mvlvst'])
+
+    for key, version_condition in SNAPSHOT_TABLES.items():
+        source = _table(orm[key])
+
+        if key == 'orm_lv_grid_district':
+            selection = source.c.mvlv_subst_id.in_(lv_stations_sqla)
+        else:
+            selection = source.c.subst_id.in_(mv_grid_districts_no)
+
+        data_sqla = session.query(
+            *[geom_as_text(session, column, srid).label(column.name)
+              if _is_geometry(column) else column
+              for column in source.columns]). \
+            filter(selection). \
+            filter(orm[version_condition])
+
+        data = pd.read_sql_query(data_sqla.statement, session.bind)
+        for column in source.columns:
+            if _is_geometry(column):
+                data[column.name] = [
+                    geom.wkb if geom is not None else None
+                    for geom in geoms_from_wkt(data[column.name])]
+
+        Table(source.name, metadata,
+              *[_snapshot_column(column) for column in source.columns])
+        tables[key] = (source.name, data)
+
+        logger.info('Snapshot: {} rows of table {} exported.'.format(
+            len(data), source.name))
+
+    metadata.create_all(engine)
+    for table_name, data in tables.values():
+        data.to_sql(table_name, engine, if_exists='append', index=False)
+
+    snapshot_metadata = pd.DataFrame(
+        {'key': ['srid', 'mv_grid_districts', 'created', 'tables', 'mapped'],
+         'value': [srid,
+                   json.dumps(sorted(mv_grid_districts_no)),
+                   datetime.now().strftime("%Y%m%d%H%M%S"),
+                   json.dumps({key: table_name
+                               for key, (table_name, _) in tables.items()}),
+                   json.dumps([key for key in SNAPSHOT_TABLES
+                               if hasattr(orm[key], '__table__')])]})
+    snapshot_metadata.to_sql(SNAPSHOT_METADATA_TABLE, engine, index=False)
+
+    engine.dispose()
+
+
+def read_snapshot_metadata(path):
+    """
+    Reads metadata of snapshot
+
+    Parameters
+    ----------
+    path : :obj:`str`
+        Path of snapshot's SQLite file
+
+    Returns
+    -------
+    :obj:`dict`
+        Metadata with keys `srid` (:obj:`str`), `mv_grid_districts`
+        (:obj:`list`), `created` (:obj:`str`), `tables` (:obj:`dict` of ORM
+        key and table name) and `mapped` (:obj:`list` of ORM keys that are
+        mapped classes instead of tables)
+    """
+
+    if not os.path.exists(path):
+        raise FileNotFoundError('Snapshot {} does not exist.'.format(path))
+
+    engine = create_engine('sqlite:///' + path)
+    snapshot_metadata = pd.read_sql_table(SNAPSHOT_METADATA_TABLE, engine). \
+        set_index('key')['value'].to_dict()
+    engine.dispose()
+
+    for key in ['mv_grid_districts', 'tables', 'mapped']:
+        snapshot_metadata[key] = json.loads(snapshot_metadata[key])
+
+    return snapshot_metadata
+
+
+def open_snapshot(path):
+    """
+    Opens snapshot for reading
+
+    Returns a session and an ORM mapping with the same structure as the one
+    of the input database (see
+    :meth:`~.ding0.core.NetworkDing0.import_orm`), hence ding0 can be run
+    on the snapshot without any database connection::
+
+        session, orm = open_snapshot('snapshot.sqlite')
+        nd = NetworkDing0(name='network', orm=orm)
+        nd.run_ding0(session=session, mv_grid_districts_no=[3545])
+
+    Parameters
+    ----------
+    path : :obj:`str`
+        Path of snapshot's SQLite file
+
+    Returns
+    -------
+    :sqlalchemy:`SQLAlchemy session object<orm/session_basics.html>`
+        Session of snapshot
+    :obj:`dict`
+        ORM mapping of snapshot's tables
+    """
+
+    snapshot_metadata = read_snapshot_metadata(path)
+
+    srid = str(int(cfg_ding0.get('geo', 'srid')))
+    if snapshot_metadata['srid'] != srid:
+        raise ValueError('Snapshot {} was created with SRID {}, config uses '
+                         'SRID {}.'.format(path, snapshot_metadata['srid'],
+                                           srid))
+
+    engine = create_engine('sqlite:///' + path)
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    base = declarative_base(metadata=metadata)
+
+    orm = {}
+    for key, table_name in snapshot_metadata['tables'].items():
+        table = metadata.tables[table_name]
+        if key in snapshot_metadata['mapped']:
+            orm[key] = type(table_name, (base,), {'__table__': table})
+        else:
+            orm[key] = table
+
+    # rows were filtered by data version on export
+    for version_condition in SNAPSHOT_TABLES.values():
+        orm[version_condition] = 1 == 1
+
+    session = sessionmaker(bind=engine)()
+
+    return session, orm
@@ -0,0 +1,441 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from functools import partial
+
+import pandas as pd
+from egoio.tools import db
+from sqlalchemy.orm import sessionmaker
+
+from ding0.core import NetworkDing0
+from ding0.tools.results import calculate_mvgd_stats, calculate_lvgd_stats, \
+    calculate_mvgd_voltage_current_stats, \
+    calculate_lvgd_voltage_current_stats, load_nd_from_pickle, \
+    save_nd_to_pickle
+from ding0.tools.scheduler import run_tasks
+
+logger = logging.getLogger('ding0')
+
+# stats tables in order of the outputs of
+# :func:`~.ding0.tools.results.parallel_running_stats`
+STATS_TABLES = ('mv_stats', 'lv_stats', 'mv_crit_nodes', 'mv_crit_edges',
+                'lv_crit_nodes', 'lv_crit_edges')
+
+# prefix of directories of MV grid districts
+PARTITION_COLUMN = 'mv_grid_district'
+
+# file listing the stats tables of a MV grid district's directory
+TABLES_FILENAME = 'tables.json'
+
+
+def _district_path(path, mv_grid_district_no):
+    """Returns directory of stats tables of one MV grid district"""
+    return os.path.join(path, '{}={}'.format(PARTITION_COLUMN,
+                                             mv_grid_district_no))
+
+
+def stats_tables(mode='', critical=False):
+    """
+    Returns names of stats tables calculated by :func:`network_stats`
+
+    Parameters
+    ----------
+    mode, critical:
+        See :func:`network_stats`
+
+    Returns
+    -------
+    :obj:`list` of :obj:`str`
+        Names of tables (see `STATS_TABLES`)
+    """
+    calc_mv = mode != 'LV'
+    calc_lv = mode != 'MV'
+
+    tables = []
+    if calc_mv:
+        tables.append('mv_stats')
+    if calc_lv:
+        tables.append('lv_stats')
+    if critical and calc_mv:
+        tables.extend(['mv_crit_nodes', 'mv_crit_edges'])
+    if critical and calc_lv:
+        tables.extend(['lv_crit_nodes', 'lv_crit_edges'])
+
+    return tables
+
+
+def network_stats(nw, mode='', critical=False):
+    """
+    Calculates stats tables of a network
+
+    Parameters
+    ----------
+    nw: :class:`~.ding0.core.NetworkDing0`
+        Network
+    mode: :obj:`str`
+        If 'MV', medium voltage stats are calculated.
+        If 'LV', low voltage stats are calculated.
+        If empty, medium and low voltage stats are calculated.
+    critical: bool
+        If True, critical nodes and branches are calculated
+
+    Returns
+    -------
+    :obj:`dict`
+        Tables (:pandas:`pandas.DataFrame<dataframe>`) keyed by name (see
+        `STATS_TABLES`), tables which are not calculated are missing
+    """
+    calc_mv = mode != 'LV'
+    calc_lv = mode != 'MV'
+
+    tables = {}
+    if calc_mv:
+        tables['mv_stats'] = calculate_mvgd_stats(nw)
+    if calc_lv:
+        tables['lv_stats'] = calculate_lvgd_stats(nw)
+    if critical and calc_mv:
+        tables['mv_crit_nodes'], tables['mv_crit_edges'] = \
+            calculate_mvgd_voltage_current_stats(nw)
+    if critical and calc_lv:
+        tables['lv_crit_nodes'], tables['lv_crit_edges'] = \
+            calculate_lvgd_voltage_current_stats(nw)
+
+    return tables
+
+
+def write_district_stats(path, mv_grid_district_no, tables):
+    """
+    Writes stats tables of one MV grid district
+
+    Tables are written to a temporary directory which is renamed when all
+    tables are written, hence the directory of a MV grid district exists
+    only if its stats are complete. The names of the tables are written to
+    the file `TABLES_FILENAME` of the directory. Existing stats of the MV
+    grid district are replaced.
+
+    Parameters
+    ----------
+    path: :obj:`str`
+        Directory of stats
+    mv_grid_district_no: :obj:`int`
+        Id of MV grid district
+    tables: :obj:`dict`
+        Tables (:pandas:`pandas.DataFrame<dataframe>`) keyed by name, see
+        :func:`network_stats`
+    """
+    directory = _district_path(path, mv_grid_district_no)
+    tmp_directory = directory + '.tmp'
+    if os.path.isdir(tmp_directory):
+        # left by an interrupted run
+        shutil.rmtree(tmp_directory)
+    os.makedirs(tmp_directory)
+
+    for name, table in tables.items():
+        if name not in STATS_TABLES:
+            raise ValueError('Unknown stats table {}.'.format(name))
+        table.to_pickle(os.path.join(tmp_directory, name + '.pkl'))
+    with open(os.path.join(tmp_directory, TABLES_FILENAME), 'w') as f:
+        json.dump(sorted(tables), f)
+
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.replace(tmp_directory, directory)
+
+
+def _district_tables_written(path, mv_grid_district_no):
+    """Returns names of stats tables written for a MV grid district"""
+    file = os.path.join(_district_path(path, mv_grid_district_no),
+                        TABLES_FILENAME)
+    if not os.path.exists(file):
+        return []
+    with open(file) as f:
+        return json.load(f)
+
+
+def stats_mv_grid_districts(path, tables=None):
+    """
+    Returns ids of MV grid districts with complete stats in `path`
+
+    Parameters
+    ----------
+    path: :obj:`str`
+        Directory of stats, see :func:`write_district_stats`
+    tables: :obj:`list` of :obj:`str`
+        If set, only MV grid districts whose stats include all of these
+        tables are returned (see :func:`stats_tables`)
+
+    Returns
+    -------
+    :obj:`list` of :obj:`int`
+        Sorted ids of MV grid districts
+    """
+    if not os.path.isdir(path):
+        return []
+
+    pattern = re.compile(r'^{}=(\d+)$'.format(PARTITION_COLUMN))
+    mv_grid_districts_no = sorted(
+        int(match.group(1))
+        for match in map(pattern.match, os.listdir(path))
+        if match)
+
+    if tables is None:
+        return mv_grid_districts_no
+    return [mv_grid_district_no
+            for mv_grid_district_no in mv_grid_districts_no
+            if set(tables) <= set(_district_tables_written(
+                path, mv_grid_district_no))]
+
+
+def process_stats_district(mv_grid_district_no, path, source='pkl', mode='',
+                           critical=False, pickle_path=''):
+    """
+    Calculates and writes stats tables of a single MV grid district
+
+    Task of :func:`run_stats`. The network is read from the pickle
+    `ding0_grids__<mv_grid_district_no>.pkl` in `pickle_path` or, if
+    `source` is 'ding0', ding0 is run over the MV grid district and the
+    network is saved to this pickle.
+
+    Parameters
+    ----------
+    mv_grid_district_no: :obj:`int`
+        Id of MV grid district
+    path: :obj:`str`
+        Directory of stats
+    source, mode, critical:
+        See :func:`~.ding0.tools.results.process_stats`
+    pickle_path: :obj:`str`
+        Directory of pickles of networks
+
+    Returns
+    -------
+    :obj:`dict`
+        Count of rows keyed by name of table
+    """
+    filename = os.path.join(pickle_path,
+                            'ding0_grids__{}.pkl'.format(mv_grid_district_no))
+
+    if source == 'pkl':
+        nw = load_nd_from_pickle(filename)
+    else:
+        engine = db.connection(readonly=True)
+        session = sessionmaker(bind=engine)()
+        try:
+            nw = NetworkDing0(name=os.path.splitext(
+                os.path.basename(filename))[0])
+            nw.run_ding0(session=session,
+                         mv_grid_districts_no=[mv_grid_district_no])
+        finally:
+            session.close()
+        save_nd_to_pickle(nw, filename=filename)
+
+    tables = network_stats(nw, mode=mode, critical=critical)
+    write_district_stats(path, mv_grid_district_no, tables)
+
+    return {name: len(table) for name, table in tables.items()}
+
+
+def run_stats(districts_list, path, n_of_processes=None, source='pkl',
+              mode='', critical=False, pickle_path='', overwrite=False,
+              timeout=None, max_tasks_per_worker=None):
+    """
+    Calculates stats of MV grid districts in parallel and writes them to disk
+
+    Each MV grid district is a task of
+    :func:`~.ding0.tools.scheduler.run_tasks` (see
+    :func:`process_stats_district`), its stats tables are written to `path`
+    as soon as they are calculated. The stats tables are not sent back to
+    this process, hence its memory usage does not grow with the count of MV
+    grid districts. Use :func:`aggregate_stats` or :func:`read_stats` to
+    combine the stats of all MV grid districts.
+
+    MV grid districts with complete stats in `path` are skipped (unless
+    `overwrite` is True), hence an interrupted run is resumed by running it
+    again. Stats are complete if they include all tables of `mode` and
+    `critical` (see :func:`stats_tables`), e.g. stats calculated with
+    `mode` 'MV' are calculated again if `mode` is empty.
+
+    Parameters
+    ----------
+    districts_list: :obj:`list` of int
+        MV grid districts
+    path: :obj:`str`
+        Directory of stats
+    n_of_processes: :obj:`int`
+        Count of worker processes, defaults to count of CPUs
+    source, mode, critical:
+        See :func:`~.ding0.tools.results.process_stats`
+    pickle_path: :obj:`str`
+        Directory of pickles of networks
+    overwrite: bool
+        If True, stats of all MV grid districts are calculated again
+    timeout: :obj:`float`
+        Time limit per MV grid district in seconds (None: no limit)
+    max_tasks_per_worker: :obj:`int`
+        Count of MV grid districts after which a worker process is replaced
+
+    Returns
+    -------
+    :obj:`list` of :obj:`dict`
+        Result records of processed MV grid districts, see
+        :func:`~.ding0.tools.scheduler.run_tasks`. The result of a MV grid
+        district is the count of rows per table.
+    """
+    start = time.time()
+    os.makedirs(path, exist_ok=True)
+
+    done = set() if overwrite else set(stats_mv_grid_districts(
+        path, tables=stats_tables(mode=mode, critical=critical)))
+    tasks = [_ for _ in districts_list if _ not in done]
+    if len(tasks) < len(districts_list):
+        logger.info('Skipping {} MV grid districts with stats in {}.'.format(
+            len(districts_list) - len(tasks), path))
+
+    records = run_tasks(partial(process_stats_district, path=path,
+                                source=source, mode=mode, critical=critical,
+                                pickle_path=pickle_path),
+                        tasks,
+                        processes=n_of_processes,
+                        timeout=timeout,
+                        max_tasks_per_worker=max_tasks_per_worker)
+
+    failed = [record['task'] for record in records
+              if record['status'] != 'ok']
+    logger.info('Stats of {} MV grid districts calculated in {:.1f} s, {} '
+                'failed: {}'.format(len(tasks) - len(failed),
+                                    time.time() - start, len(failed),
+                                    failed))
+
+    return records
+
+
+def _district_tables(path, table, mv_grid_districts_no):
+    """Yields stats table `table` of each MV grid district which has it"""
+    for mv_grid_district_no in mv_grid_districts_no:
+        file = os.path.join(_district_path(path, mv_grid_district_no),
+                            table + '.pkl')
+        if os.path.exists(file):
+            yield pd.read_pickle(file)
+
+
+def read_stats(path, tables=None, mv_grid_districts_no=None):
+    """
+    Reads stats tables of MV grid districts written by :func:`run_stats`
+
+    Tables are formatted as the outputs of
+    :func:`~.ding0.tools.results.parallel_running_stats`: missing values
+    are 0, columns and rows are sorted.
+
+    Parameters
+    ----------
+    path: :obj:`str`
+        Directory of stats
+    tables: :obj:`list` of :obj:`str`
+        Tables to be read (see `STATS_TABLES`). Default is None which reads
+        all tables.
+    mv_grid_districts_no: :obj:`list` of :obj:`int`
+        Ids of MV grid districts to be read. Default is None which reads all
+        MV grid districts with stats in `path`.
+
+    Returns
+    -------
+    :obj:`dict`
+        Table (:pandas:`pandas.DataFrame<dataframe>`) keyed by name, tables
+        without stats are empty
+    """
+    tables = _check_tables(tables)
+    if mv_grid_districts_no is None:
+        mv_grid_districts_no = stats_mv_grid_districts(path)
+
+    data = {}
+    for table in tables:
+        frames = list(_district_tables(path, table, mv_grid_districts_no))
+        if not frames:
+            data[table] = pd.DataFrame()
+            continue
+        frame = pd.concat(frames, axis=0).fillna(0)
+        data[table] = frame[sorted(frame.columns.tolist())].sort_index()
+
+    return data
+
+
+def aggregate_stats(path, filename, tables=None, mv_grid_districts_no=None):
+    """
+    Writes stats tables of all MV grid districts to CSV files
+
+    MV grid districts are read one by one and appended to the files, hence
+    memory usage does not grow with the count of MV grid districts. Tables
+    are formatted as by :func:`read_stats` except that rows are ordered by
+    MV grid district first.
+
+    Parameters
+    ----------
+    path: :obj:`str`
+        Directory of stats
+    filename: :obj:`str`
+        Prefix of files, e.g. 'stats/ding0_grids__1_to_100' which writes
+        'stats/ding0_grids__1_to_100_mv_stats.csv' etc.
+    tables, mv_grid_districts_no:
+        See :func:`read_stats`
+
+    Returns
+    -------
+    :obj:`dict`
+        Count of rows keyed by name of written table
+    """
+    tables = _check_tables(tables)
+    if mv_grid_districts_no is None:
+        mv_grid_districts_no = stats_mv_grid_districts(path)
+
+    counts = {}
+    for table in tables:
+        # columns of all MV grid districts are required for the header
+        columns = set()
+        for frame in _district_tables(path, table, mv_grid_districts_no):
+            columns.update(frame.columns)
+        if not columns:
+            continue
+        columns = sorted(columns)
+
+        file = '{}_{}.csv'.format(filename, table)
+        tmp_file = file + '.tmp'
+        counts[table] = 0
+        with open(tmp_file, 'w') as f:
+            header = True
+            for frame in _district_tables(path, table, mv_grid_districts_no):
+                frame = frame.reindex(columns=columns).fillna(0).sort_index()
+                frame.to_csv(f, header=header)
+                header = False
+                counts[table] += len(frame)
+        os.replace(tmp_file, file)
+
+    return counts
+
+
+def _check_tables(tables):
+    """Returns `tables` (all if None), raises an error if one is unknown"""
+    if tables is None:
+        return list(STATS_TABLES)
+    unknown = [_ for _ in tables if _ not in STATS_TABLES]
+    if unknown:
+        raise ValueError('Unknown stats table(s) {}, valid tables are '
+                         '{}.'.format(unknown, list(STATS_TABLES)))
+    return list(tables)
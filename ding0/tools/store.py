@@ -0,0 +1,407 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+from ding0.tools.checkpoint import CheckpointPickler, CheckpointUnpickler, \
+    shared_objects
+from ding0.tools.tools import district_grids, branch_type_name
+
+import gc
+import io
+import logging
+import os
+import pickle
+import struct
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger('ding0')
+
+# first and last bytes of a grid store file
+STORE_MAGIC = b'DING0GS1'
+
+# trailer of a grid store file: offset of index and magic
+_TRAILER = struct.Struct('<Q8s')
+
+
+def _dumps(obj):
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@contextmanager
+def _gc_paused():
+    """Pauses garbage collection
+
+    (Un)pickling a grid creates or visits many objects that are all alive,
+    collections triggered meanwhile would only slow it down.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _network_state(network):
+    """Returns copy of `network` without MV grid districts"""
+    state = network.__getstate__()
+    state['_mv_grid_districts'] = []
+    shell = network.__class__.__new__(network.__class__)
+    shell.__setstate__(state)
+    return shell
+
+
+def district_topology(mv_grid_district):
+    """
+    Returns topology of MV and LV grids of `mv_grid_district` as arrays
+
+    Nodes are numbered in order of grids (MV grid first) and of
+    :meth:`~.ding0.core.network.GridDing0.graph_nodes_sorted`, nodes that
+    are part of several grids (MV-LV stations) are numbered once.
+
+    Parameters
+    ----------
+    mv_grid_district : :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid district
+
+    Returns
+    -------
+    :obj:`dict`
+        Arrays
+
+        * 'grids': names (repr) of grids
+        * 'nodes': names (repr) of nodes
+        * 'node_grid': index of grid of each node
+        * 'branches': indices of nodes of each branch, shape (n, 2)
+        * 'branch_grid': index of grid of each branch
+        * 'branch_length': length of each branch in m
+        * 'branch_type': name of type of each branch ('' if unknown)
+    """
+    grids = []
+    nodes = []
+    node_grid = []
+    node_ids = {}
+    branches = []
+    branch_grid = []
+    branch_length = []
+    branch_type = []
+
+    for grid_idx, grid in enumerate(district_grids(mv_grid_district)):
+        grids.append(repr(grid))
+        for node in grid.graph_nodes_sorted():
+            if id(node) not in node_ids:
+                node_ids[id(node)] = len(nodes)
+                nodes.append(repr(node))
+                node_grid.append(grid_idx)
+        for u, v, branch in grid._graph.edges(data='branch'):
+            branches.append((node_ids[id(u)], node_ids[id(v)]))
+            branch_grid.append(grid_idx)
+            branch_length.append(getattr(branch, 'length', np.nan))
+            branch_type.append(branch_type_name(branch))
+
+    return {'grids': np.array(grids, dtype=object),
+            'nodes': np.array(nodes, dtype=object),
+            'node_grid': np.array(node_grid, dtype=np.int32),
+            'branches': np.array(branches, dtype=np.int32).reshape(-1, 2),
+            'branch_grid': np.array(branch_grid, dtype=np.int32),
+            'branch_length': np.array(branch_length, dtype=np.float64),
+            'branch_type': np.array(branch_type, dtype=object)}
+
+
+def _write_store(filename, network_chunk, chunks):
+    """
+    Writes grid store file
+
+    Parameters
+    ----------
+    filename : :obj:`str`
+        Path of file, it is replaced atomically
+    network_chunk : :obj:`bytes`
+        Pickled network (without MV grid districts)
+    chunks : iterable
+        Tuples (entry, {section: bytes}) of MV grid districts with `entry`
+        being the district's index entry (without offsets)
+    """
+    filename_tmp = filename + '.tmp'
+    try:
+        with open(filename_tmp, 'wb') as f:
+            f.write(STORE_MAGIC)
+            index = {'network': (f.tell(), len(network_chunk)),
+                     'mv_grid_districts': {}}
+            f.write(network_chunk)
+
+            for entry, sections in chunks:
+                if entry['mv_grid_district'] in index['mv_grid_districts']:
+                    raise ValueError(
+                        'MV grid district {} is stored twice.'.format(
+                            entry['mv_grid_district']))
+                entry = dict(entry)
+                for section, data in sections.items():
+                    entry[section] = (f.tell(), len(data))
+                    f.write(data)
+                index['mv_grid_districts'][entry['mv_grid_district']] = entry
+
+            index_offset = f.tell()
+            f.write(_dumps(index))
+            f.write(_TRAILER.pack(index_offset, STORE_MAGIC))
+    except BaseException:
+        if os.path.exists(filename_tmp):
+            os.remove(filename_tmp)
+        raise
+    os.replace(filename_tmp, filename)
+
+
+def save_nd_to_store(nd, filename, mv_grid_districts=None):
+    """
+    Saves MV grid districts of `nd` to a grid store
+
+    In contrast to :func:`~.ding0.tools.results.save_nd_to_pickle`, each
+    MV grid district is stored as separate chunk of the file, next to the
+    district's topology as arrays (see :func:`district_topology`). An index
+    at the end of the file holds the position of each chunk, hence a single
+    MV grid district can be loaded without reading the others, see
+    :class:`GridStoreDing0`.
+
+    The network itself (name, run id, config and static data) is stored once,
+    its ORM mapping is not stored.
+
+    Parameters
+    ----------
+    nd : :class:`~.ding0.core.NetworkDing0`
+        Ding0 grid container object
+    filename : :obj:`str`
+        Path of grid store file (e.g. 'ding0_grids.store'), an existing file
+        is replaced
+    mv_grid_districts : :obj:`list` of :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid districts to save. Default is None which saves all MV grid
+        districts of `nd`.
+
+    See Also
+    --------
+    merge_grid_stores : merges grid stores without loading grids
+    """
+    if mv_grid_districts is None:
+        mv_grid_districts = list(nd.mv_grid_districts())
+    objects = shared_objects(nd)
+
+    def chunks():
+        for mv_grid_district in mv_grid_districts:
+            buffer = io.BytesIO()
+            with _gc_paused():
+                CheckpointPickler(buffer, objects).dump(mv_grid_district)
+            topology = district_topology(mv_grid_district)
+            entry = {'mv_grid_district': mv_grid_district.id_db,
+                     'mv_grid': repr(mv_grid_district.mv_grid),
+                     'nodes': len(topology['nodes']),
+                     'branches': len(topology['branches']),
+                     'peak_load': mv_grid_district.peak_load}
+            yield entry, {'objects': buffer.getvalue(),
+                          'topology': _dumps(topology)}
+
+    _write_store(os.path.abspath(filename), _dumps(_network_state(nd)),
+                 chunks())
+
+
+class GridStoreDing0:
+    """ Grid store of MV grid districts
+
+    Reads grid stores written by :func:`save_nd_to_store`. Only the index
+    is read on instantiation, MV grid districts are loaded on demand and
+    kept once loaded::
+
+        store = GridStoreDing0('ding0_grids.store')
+        mv_grid_district = store.mv_grid_district(1729)
+
+    Loaded MV grid districts belong to the network of the store
+    (:attr:`network`) unless another network is passed to
+    :meth:`mv_grid_district`.
+
+    Parameters
+    ----------
+    filename : :obj:`str`
+        Path of grid store file
+    """
+
+    def __init__(self, filename):
+        self.filename = os.path.abspath(filename)
+        self._network = None
+        self._mv_grid_districts = {}
+
+        with open(self.filename, 'rb') as f:
+            magic = f.read(len(STORE_MAGIC))
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            index_offset, magic_end = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != STORE_MAGIC or magic_end != STORE_MAGIC:
+                raise ValueError('{} is no ding0 grid store.'.format(
+                    self.filename))
+            f.seek(index_offset)
+            self.index = pickle.loads(
+                f.read(os.fstat(f.fileno()).st_size - _TRAILER.size -
+                       index_offset))
+
+    def __repr__(self):
+        return 'GridStoreDing0({!r})'.format(self.filename)
+
+    def __len__(self):
+        return len(self.index['mv_grid_districts'])
+
+    def __contains__(self, mv_grid_district_no):
+        return mv_grid_district_no in self.index['mv_grid_districts']
+
+    @property
+    def mv_grid_districts_no(self):
+        """:obj:`list` of :obj:`int`: MV grid districts in store (sorted)"""
+        return sorted(self.index['mv_grid_districts'])
+
+    def _read(self, position):
+        offset, size = position
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def _entry(self, mv_grid_district_no):
+        try:
+            return self.index['mv_grid_districts'][mv_grid_district_no]
+        except KeyError:
+            raise KeyError('MV grid district {} is not in {}.'.format(
+                mv_grid_district_no, self.filename)) from None
+
+    @property
+    def network(self):
+        """:class:`~.ding0.core.NetworkDing0`: Network of the store
+
+        It holds the MV grid districts loaded so far (without network).
+        """
+        if self._network is None:
+            with _gc_paused():
+                self._network = pickle.loads(
+                    self._read(self.index['network']))
+        return self._network
+
+    def topology(self, mv_grid_district_no):
+        """
+        Returns topology of MV grid district without loading its grids
+
+        Parameters
+        ----------
+        mv_grid_district_no : :obj:`int`
+            MV grid district
+
+        Returns
+        -------
+        :obj:`dict`
+            Arrays of nodes and branches, see :func:`district_topology`
+        """
+        return pickle.loads(self._read(
+            self._entry(mv_grid_district_no)['topology']))
+
+    def mv_grid_district(self, mv_grid_district_no, network=None):
+        """
+        Loads MV grid district
+
+        Parameters
+        ----------
+        mv_grid_district_no : :obj:`int`
+            MV grid district
+        network : :class:`~.ding0.core.NetworkDing0`
+            Network the MV grid district is added to. It has to use the same
+            config as the network the store was saved from. Default is None
+            which adds it to :attr:`network`.
+
+        Returns
+        -------
+        :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+            MV grid district
+        """
+        if network is None:
+            network = self.network
+            if mv_grid_district_no in self._mv_grid_districts:
+                return self._mv_grid_districts[mv_grid_district_no]
+
+        chunk = self._read(self._entry(mv_grid_district_no)['objects'])
+        with _gc_paused():
+            mv_grid_district = CheckpointUnpickler(
+                io.BytesIO(chunk), shared_objects(network)).load()
+        network.add_mv_grid_district(mv_grid_district)
+
+        if network is self._network:
+            self._mv_grid_districts[mv_grid_district_no] = mv_grid_district
+        return mv_grid_district
+
+    def load_network(self, mv_grid_districts_no=None, network=None):
+        """
+        Loads network with MV grid districts
+
+        Parameters
+        ----------
+        mv_grid_districts_no : :obj:`list` of :obj:`int`
+            MV grid districts to load. Default is None which loads all.
+        network : :class:`~.ding0.core.NetworkDing0`
+            Network the MV grid districts are added to, see
+            :meth:`mv_grid_district`
+
+        Returns
+        -------
+        :class:`~.ding0.core.NetworkDing0`
+            Network
+        """
+        if mv_grid_districts_no is None:
+            mv_grid_districts_no = self.mv_grid_districts_no
+        for mv_grid_district_no in mv_grid_districts_no:
+            self.mv_grid_district(mv_grid_district_no, network=network)
+        return self.network if network is None else network
+
+
+def merge_grid_stores(filenames, filename):
+    """
+    Merges grid stores into one
+
+    Chunks of MV grid districts are copied as they are, i.e. no grids are
+    loaded. The network (config and static data) is taken from the first
+    store.
+
+    Parameters
+    ----------
+    filenames : :obj:`list` of :obj:`str`
+        Paths of grid stores to merge
+    filename : :obj:`str`
+        Path of merged grid store
+
+    Raises
+    ------
+    ValueError
+        If a MV grid district is part of several stores
+    """
+    stores = [GridStoreDing0(_) for _ in filenames]
+    if not stores:
+        raise ValueError('No grid stores to merge.')
+
+    def chunks():
+        for store in stores:
+            with open(store.filename, 'rb') as f:
+                for entry in store.index['mv_grid_districts'].values():
+                    sections = {}
+                    for section in ('objects', 'topology'):
+                        offset, size = entry[section]
+                        f.seek(offset)
+                        sections[section] = f.read(size)
+                    yield entry, sections
+
+    _write_store(os.path.abspath(filename),
+                 stores[0]._read(stores[0].index['network']), chunks())
+
+    logger.info('{} grid stores merged to {}.'.format(len(stores), filename))
@@ -0,0 +1,396 @@
+"""This file is part of DING0, the DIstribution Network GeneratOr.
+DING0 is a tool to generate synthetic medium and low voltage power
+distribution grids based on open data.
+
+It is developed in the project open_eGo: https://openegoproject.wordpress.com
+
+DING0 lives at github: https://github.com/openego/ding0/
+The documentation is available on RTD: http://ding0.readthedocs.io"""
+
+__copyright__  = "Reiner Lemoine Institut gGmbH"
+__license__    = "GNU Affero General Public License Version 3 (AGPL-3.0)"
+__url__        = "https://github.com/openego/ding0/blob/master/LICENSE"
+__author__     = "nesnoj, gplssm"
+
+
+from ding0.core import partition_frame
+
+import logging
+from math import ceil, cos, radians, sqrt
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point, box
+from shapely.ops import transform
+
+logger = logging.getLogger('ding0')
+
+# densities and unit values of synthetic input data. Loads are given in kW,
+# consumptions in kWh/a, densities per km2 of MV grid district area
+SYNTHETIC_DENSITIES = {
+    # load areas per km2 (ca. 58 load areas on 100 km2 per MV grid district
+    # in Germany)
+    'load_area_density': 0.6,
+    # mean count of LV grid districts per load area
+    'lv_grid_districts_per_load_area': 2.5,
+    # median population of LV grid district
+    'population_per_lv_grid_district': 150,
+    # residential peak load and consumption per inhabitant
+    'peak_load_per_inhabitant': 0.45,
+    'consumption_per_inhabitant': 1500,
+    # probability of sector's loads in a LV grid district, max. count of
+    # loads, range of peak load per load and full load hours
+    'retail': (0.4, 4, (10, 50), 2500),
+    'industrial': (0.08, 2, (50, 200), 4000),
+    'agricultural': (0.25, 3, (10, 40), 2000),
+    # rooftop PV (voltage level 7) per inhabitant, range of capacity
+    'pv_rooftop_per_inhabitant': 0.025,
+    'pv_rooftop_capacity': (3, 30),
+    # probability of a PV plant at voltage level 6 per LV grid district
+    'pv_lv6_probability': 0.05,
+    'pv_lv6_capacity': (30, 100),
+    # MV generators per km2 and range of capacity
+    'wind': (0.08, (2000, 3000)),
+    'solar_ground_mounted': (0.01, (500, 5000)),
+    'biomass': (0.02, (200, 1000)),
+    'conventional': (0.005, (500, 5000))}
+
+# peak load sectors of load areas and LV grid districts
+SECTORS = ['residential', 'retail', 'industrial', 'agricultural']
+
+# first id of conventional generators (per MV grid district)
+CONV_GENERATOR_ID_OFFSET = 500000
+
+
+def _lonlat(geom, origin):
+    """Transforms `geom` given in metres relative to `origin` (lon, lat) to
+    WGS84 (equirectangular approximation, sufficient for synthetic data)"""
+    lon_0, lat_0 = origin
+    m_per_deg_lat = 110540.
+    m_per_deg_lon = 111320. * cos(radians(lat_0))
+    return transform(lambda x, y: (lon_0 + np.asarray(x) / m_per_deg_lon,
+                                   lat_0 + np.asarray(y) / m_per_deg_lat),
+                     geom)
+
+
+def synthetic_mv_grid_district_data(mv_grid_district_no, n_load_areas,
+                                    origin=(10., 51.), seed=None,
+                                    densities=None):
+    """
+    Generates input data of a synthetic MV grid district
+
+    The MV grid district is a square whose size is given by `n_load_areas`
+    and the load area density, the HV-MV station is located in its centre.
+    Load areas are scattered on a grid of cells (one load area per cell at
+    most), each is divided into stripes which are the LV grid districts.
+    Population, peak loads, consumption and generators are drawn at
+    realistic densities (see :data:`SYNTHETIC_DENSITIES`).
+
+    The returned tables have the same columns as the tables imported from
+    the database, hence they can be passed to the same build methods (see
+    :func:`build_synthetic_mv_grid_districts`).
+
+    Parameters
+    ----------
+    mv_grid_district_no : :obj:`int`
+        Id of MV grid district (and HV-MV station). Ids of all other objects
+        are derived from it (`mv_grid_district_no` * 10**6 + counter).
+    n_load_areas : :obj:`int`
+        Count of load areas
+    origin : :obj:`tuple` of :obj:`float`
+        Lower left corner of MV grid district (lon, lat)
+    seed : :obj:`int`
+        Seed of random numbers, data is reproducible for a given seed
+    densities : :obj:`dict`
+        Values replacing the defaults of :data:`SYNTHETIC_DENSITIES`
+
+    Returns
+    -------
+    :obj:`dict`
+        Input data with keys
+
+        * `geo_data`: polygon of MV grid district
+        * `station_geo_data`: point of HV-MV station
+        * `lv_load_areas`, `lv_grid_districts`, `lv_stations`,
+          `re_generators` and `conv_generators`:
+          :pandas:`pandas.DataFrame<dataframe>` (geometries as shapely
+          objects)
+    """
+    params = dict(SYNTHETIC_DENSITIES)
+    if densities is not None:
+        params.update(densities)
+    random_state = np.random.RandomState(seed)
+    id_base = mv_grid_district_no * 10 ** 6
+
+    # MV grid district and cells of load areas (metres)
+    area_km2 = n_load_areas / params['load_area_density']
+    side = sqrt(area_km2) * 1e3
+    cells_per_side = max(2, ceil(sqrt(2 * n_load_areas + 1)))
+    cell = side / cells_per_side
+    centre_cell = (cells_per_side // 2) * cells_per_side + cells_per_side // 2
+    cells = [_ for _ in range(cells_per_side ** 2) if _ != centre_cell]
+    cells = random_state.choice(cells, size=n_load_areas, replace=False)
+
+    geo_data = _lonlat(box(0, 0, side, side), origin)
+    station_geo_data = _lonlat(Point(side / 2, side / 2), origin)
+
+    lv_load_areas = []
+    lv_grid_districts = []
+    lv_stations = []
+    re_generators = []
+    re_generator_id = id_base
+
+    def generator(lv_grid_district_id, la_id, capacity, generation_type,
+                  generation_subtype, voltage_level, geom):
+        return {'id': re_generator_id,
+                'subst_id': mv_grid_district_no,
+                'la_id': la_id,
+                'mvlv_subst_id': lv_grid_district_id,
+                'electrical_capacity': capacity,
+                'generation_type': generation_type,
+                'generation_subtype': generation_subtype,
+                'voltage_level': voltage_level,
+                'w_id': 1,
+                'geom_new': geom,
+                'geom': geom}
+
+    lv_grid_district_id = id_base
+    for la_no, cell_no in enumerate(sorted(cells)):
+        la_id = id_base + la_no
+
+        # load area: square of random size and position within its cell
+        la_side = cell * random_state.uniform(0.3, 0.8)
+        x_0 = (cell_no % cells_per_side) * cell + \
+            random_state.uniform(0, cell - la_side)
+        y_0 = (cell_no // cells_per_side) * cell + \
+            random_state.uniform(0, cell - la_side)
+
+        # LV grid districts: stripes of load area
+        n_lv_grid_districts = 1 + random_state.poisson(
+            params['lv_grid_districts_per_load_area'] - 1)
+        stripe = la_side / n_lv_grid_districts
+
+        la_lv_grid_districts = []
+        for stripe_no in range(n_lv_grid_districts):
+            lv_grid_district_id += 1
+            geom = box(x_0 + stripe_no * stripe, y_0,
+                       x_0 + (stripe_no + 1) * stripe, y_0 + la_side)
+
+            population = int(np.clip(round(random_state.lognormal(
+                np.log(params['population_per_lv_grid_district']), 0.8)),
+                10, 3000))
+            lv_grid_district = {
+                'mvlv_subst_id': lv_grid_district_id,
+                'la_id': la_id,
+                'population': population,
+                'geom': _lonlat(geom, origin),
+                'peak_load_residential':
+                    population * params['peak_load_per_inhabitant'],
+                'sector_count_residential': ceil(
+                    population / 2.3),
+                'sector_consumption_residential':
+                    population * params['consumption_per_inhabitant']}
+            for sector in SECTORS[1:]:
+                probability, max_count, peak_load_range, full_load_hours = \
+                    params[sector]
+                count = 0
+                peak_load = 0.
+                if random_state.uniform() < probability:
+                    count = random_state.randint(1, max_count + 1)
+                    peak_load = random_state.uniform(*peak_load_range,
+                                                     size=count).sum()
+                lv_grid_district['sector_count_' + sector] = count
+                lv_grid_district['peak_load_' + sector] = peak_load
+                lv_grid_district['sector_consumption_' + sector] = \
+                    peak_load * full_load_hours
+            lv_grid_district['peak_load'] = sum(
+                lv_grid_district['peak_load_' + sector]
+                for sector in SECTORS)
+            la_lv_grid_districts.append(lv_grid_district)
+
+            lv_stations.append({
+                'mvlv_subst_id': lv_grid_district_id,
+                'subst_id': mv_grid_district_no,
+                'la_id': la_id,
+                'geom': _lonlat(geom.centroid, origin)})
+
+            # LV generators, located randomly within LV grid district
+            n_pv = random_state.poisson(
+                population * params['pv_rooftop_per_inhabitant'])
+            capacities = random_state.uniform(*params['pv_rooftop_capacity'],
+                                              size=n_pv)
+            if random_state.uniform() < params['pv_lv6_probability']:
+                capacities = np.append(capacities, random_state.uniform(
+                    *params['pv_lv6_capacity']))
+            for pv_no, capacity in enumerate(capacities):
+                re_generator_id += 1
+                point = _lonlat(Point(
+                    random_state.uniform(geom.bounds[0], geom.bounds[2]),
+                    random_state.uniform(geom.bounds[1], geom.bounds[3])),
+                    origin)
+                if pv_no < n_pv:
+                    re_generators.append(generator(
+                        float(lv_grid_district_id), la_id, capacity, 'solar',
+                        'solar_roof_mounted', 7, point))
+                else:
+                    re_generators.append(generator(
+                        float(lv_grid_district_id), la_id, capacity, 'solar',
+                        'solar_ground_mounted', 6, point))
+
+        lv_grid_districts.extend(la_lv_grid_districts)
+
+        # load area: sum of its LV grid districts
+        la_geom = box(x_0, y_0, x_0 + la_side, y_0 + la_side)
+        area_ha = la_geom.area / 1e4
+        population = sum(_['population'] for _ in la_lv_grid_districts)
+        lv_load_area = {
+            'id_db': la_id,
+            'subst_id': mv_grid_district_no,
+            'zensus_sum': population,
+            'zensus_cnt': ceil(population / 20),
+            'ioer_sum': 0.3 * area_ha,
+            'ioer_cnt': ceil(area_ha),
+            'area': area_ha,
+            'nuts_code': 'DE000',
+            'geo_area': _lonlat(la_geom, origin),
+            'geo_centre': _lonlat(la_geom.centroid, origin)}
+        for sector in SECTORS:
+            lv_load_area['peak_load_' + sector] = sum(
+                _['peak_load_' + sector] for _ in la_lv_grid_districts)
+            lv_load_area['sector_count_' + sector] = sum(
+                _['sector_count_' + sector] for _ in la_lv_grid_districts)
+        lv_load_area['peak_load'] = sum(
+            lv_load_area['peak_load_' + sector] for sector in SECTORS)
+        for sector in SECTORS:
+            share = lv_load_area['peak_load_' + sector] / \
+                lv_load_area['peak_load']
+            lv_load_area['sector_share_' + sector] = share
+            lv_load_area['sector_area_' + sector] = share * area_ha
+        lv_load_areas.append(lv_load_area)
+
+    # MV generators, located randomly within MV grid district
+    for generation_subtype, generation_type in [
+            ('wind', 'wind'),
+            ('solar_ground_mounted', 'solar'),
+            ('biomass', 'biomass')]:
+        density, capacity_range = params[generation_subtype]
+        for _ in range(random_state.poisson(density * area_km2)):
+            re_generator_id += 1
+            point = _lonlat(Point(*random_state.uniform(0, side, size=2)),
+                            origin)
+            re_generators.append(generator(
+                np.nan, np.nan, random_state.uniform(*capacity_range),
+                generation_type, generation_subtype, 5, point))
+
+    conv_generators = []
+    density, capacity_range = params['conventional']
+    for conv_no in range(random_state.poisson(density * area_km2)):
+        conv_generators.append({
+            'id': id_base + CONV_GENERATOR_ID_OFFSET + conv_no,
+            'subst_id': mv_grid_district_no,
+            'name': 'chp_{}'.format(conv_no),
+            'capacity': random_state.uniform(*capacity_range),
+            'fuel': 'gas',
+            'voltage_level': 5,
+            'geom': _lonlat(Point(*random_state.uniform(0, side, size=2)),
+                            origin)})
+
+    return {
+        'geo_data': geo_data,
+        'station_geo_data': station_geo_data,
+        'lv_load_areas': pd.DataFrame(lv_load_areas).set_index('id_db'),
+        'lv_grid_districts': pd.DataFrame(lv_grid_districts).set_index(
+            'mvlv_subst_id'),
+        'lv_stations': pd.DataFrame(lv_stations).set_index('mvlv_subst_id'),
+        're_generators': pd.DataFrame(
+            re_generators,
+            columns=['id', 'subst_id', 'la_id', 'mvlv_subst_id',
+                     'electrical_capacity', 'generation_type',
+                     'generation_subtype', 'voltage_level', 'w_id',
+                     'geom_new', 'geom']).set_index('id'),
+        'conv_generators': pd.DataFrame(
+            conv_generators,
+            columns=['id', 'subst_id', 'name', 'capacity', 'fuel',
+                     'voltage_level', 'geom']).set_index('id')}
+
+
+def build_synthetic_mv_grid_districts(network, mv_grid_districts_no,
+                                      n_load_areas, seed=None,
+                                      densities=None):
+    """
+    Builds synthetic MV grid districts incl. load areas, LV grid districts,
+    stations and generators
+
+    This replaces steps 1 and 2 of
+    :meth:`~.ding0.core.NetworkDing0.run_ding0` (import from database),
+    the remaining steps can be performed without database connection::
+
+        nd = NetworkDing0(name='synthetic')
+        build_synthetic_mv_grid_districts(nd, [1, 2], n_load_areas=50)
+        nd.mv_parametrize_grid()
+        ...
+
+    MV grid districts are located side by side from west to east.
+
+    Parameters
+    ----------
+    network : :class:`~.ding0.core.NetworkDing0`
+        Network the MV grid districts are added to
+    mv_grid_districts_no : :obj:`list` of :obj:`int`
+        Ids of MV grid districts
+    n_load_areas : :obj:`int` or :obj:`list` of :obj:`int`
+        Count of load areas (per MV grid district if list)
+    seed : :obj:`int`
+        Seed of random numbers, the MV grid district with index i uses
+        `seed` + i
+    densities : :obj:`dict`
+        Values replacing the defaults of :data:`SYNTHETIC_DENSITIES`
+
+    Returns
+    -------
+    :obj:`list` of :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid districts built
+
+    See Also
+    --------
+    synthetic_mv_grid_district_data : generator of input data
+    """
+    if isinstance(n_load_areas, int):
+        n_load_areas = [n_load_areas] * len(mv_grid_districts_no)
+
+    mv_grid_districts = []
+    re_generators = []
+    conv_generators = []
+    origin = (10., 51.)
+
+    for idx, (mv_grid_district_no, count) in enumerate(
+            zip(mv_grid_districts_no, n_load_areas)):
+        data = synthetic_mv_grid_district_data(
+            mv_grid_district_no, count, origin=origin,
+            seed=None if seed is None else seed + idx,
+            densities=densities)
+
+        mv_grid_district = network.build_mv_grid_district(
+            mv_grid_district_no, mv_grid_district_no,
+            data['geo_data'], data['station_geo_data'])
+        network.build_lv_load_areas(
+            mv_grid_district,
+            data['lv_load_areas'],
+            partition_frame(data['lv_grid_districts'], 'la_id'),
+            partition_frame(data['lv_stations'], 'la_id'))
+        mv_grid_district.add_peak_demand()
+
+        mv_grid_districts.append(mv_grid_district)
+        re_generators.append(data['re_generators'])
+        conv_generators.append(data['conv_generators'])
+
+        # next MV grid district is located east of this one (ca. 1 km gap)
+        origin = (data['geo_data'].bounds[2] + 0.015, origin[1])
+
+    network.build_generators(pd.concat(re_generators),
+                             pd.concat(conv_generators))
+
+    logger.info('=====> {} synthetic MV Grid Districts built'.format(
+        len(mv_grid_districts)))
+
+    return mv_grid_districts
@@ -43,6 +43,50 @@ def merge_two_dicts(x, y):
     return z
 
 
+def district_grids(mv_grid_district):
+    """Yields MV grid and LV grids of a MV grid district
+
+    Parameters
+    ----------
+    mv_grid_district : :class:`~.ding0.core.structure.regions.MVGridDistrictDing0`
+        MV grid district
+
+    Yields
+    ------
+    :class:`~.ding0.core.network.GridDing0`
+        MV grid first, then LV grids in order of load areas and LV grid
+        districts (LV grid districts without LV grid are skipped)
+    """
+    yield mv_grid_district.mv_grid
+    for lv_load_area in mv_grid_district.lv_load_areas():
+        for lv_grid_district in lv_load_area.lv_grid_districts():
+            if lv_grid_district.lv_grid is not None:
+                yield lv_grid_district.lv_grid
+
+
+def branch_type_name(branch):
+    """Returns name of type of a branch ('' if unknown)
+
+    The name of MV branch types is an item of the type, the one of LV branch
+    types is the name of the type (Series).
+
+    Parameters
+    ----------
+    branch : :class:`~.ding0.core.network.BranchDing0`
+        Branch
+
+    Returns
+    -------
+    :obj:`str`
+        Name of branch type
+    """
+    branch_type = getattr(branch, 'type', None)
+    if branch_type is None:
+        return ''
+    name = branch_type.get('name', branch_type.name)
+    return '' if name is None else str(name)
+
+
 def get_dest_point(source_point, distance_m, bearing_deg):
     """
     Get the WGS84 point in the coordinate reference system
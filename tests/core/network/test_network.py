@@ -1,3 +1,7 @@
+import pickle
+
+import numpy as np
+import pandas as pd
 import pytest
 from shapely.geometry import Point, LineString, LinearRing, Polygon
 from ding0.core import NetworkDing0
@@ -6,7 +10,10 @@ from ding0.core.network import (GridDing0,
                                 RingDing0, BranchDing0,
                                 CableDistributorDing0, CircuitBreakerDing0,
                                 GeneratorDing0, GeneratorFluctuatingDing0,
-                                LoadDing0)
+                                LoadDing0, SlottedDing0)
+from ding0.core.network import arrays
+from ding0.core.network.arrays import NODE_TYPES, ARRAYS, GridArraysDing0
+from ding0.core.network.cable_distributors import LVCableDistributorDing0
 from ding0.core.structure.regions import LVLoadAreaCentreDing0
 
 
@@ -296,6 +303,68 @@ class TestGridDing0(object):
         isolates = grid.graph_isolated_nodes()
         assert isolates == []
 
+    def test_array_snapshot(self, simple_graph_grid):
+        grid, station, generator, branch = simple_graph_grid
+        generator.capacity = 100.
+        generator.voltage_res = [1.01, 1.03]
+        branch.type = pd.Series({'R_per_km': 0.2, 'L_per_km': 0.4,
+                                 'I_max_th': 300., 'U_n': 20.})
+        snapshot = grid.array_snapshot()
+
+        assert snapshot.nodes == grid.graph_nodes_sorted()
+        assert snapshot.branches == [branch]
+        generator_idx = snapshot.node_index(generator)
+        station_idx = snapshot.node_index(station)
+        assert snapshot.neighbors(station_idx).tolist() == [generator_idx]
+        assert snapshot.adjacency_branch.tolist() == [0, 0]
+        assert NODE_TYPES[snapshot.node_type[generator_idx]] == 'generator'
+        assert (snapshot.x[generator_idx], snapshot.y[generator_idx]) == \
+            (0, 1)
+        assert snapshot.generation.tolist()[generator_idx] == 100.
+        assert snapshot.voltage_res[generator_idx].tolist() == [1.01, 1.03]
+        assert np.isnan(snapshot.voltage_res[station_idx]).all()
+        assert snapshot.resistance[0] == pytest.approx(0.2 * 2. / 1e3)
+        assert snapshot.reactance[0] == pytest.approx(
+            0.4e-3 * 2 * np.pi * 50 * 2. / 1e3)
+        assert snapshot.i_max_th.tolist() == [300.]
+        assert np.isnan(snapshot.s_res).all()
+        with pytest.raises(ValueError):
+            snapshot.length[0] = 1.
+
+    @pytest.mark.parametrize('python_38', [True, False])
+    def test_array_snapshot_shared_memory(self, simple_graph_grid,
+                                          monkeypatch, python_38):
+        if not python_38:
+            # memory-mapped file as on Python < 3.8
+            monkeypatch.setattr(arrays, 'shared_memory', None)
+        elif arrays.shared_memory is None:
+            pytest.skip('multiprocessing.shared_memory not available')
+        grid, station, generator, branch = simple_graph_grid
+        generator.voltage_res = [1.01, 1.03]
+        branch.type = pd.Series({'R_per_km': 0.2, 'L_per_km': 0.4,
+                                 'I_max_th': 300., 'U_n': 20.})
+        snapshot = grid.array_snapshot()
+
+        name, layout = snapshot.to_shared_memory()
+        attached = GridArraysDing0.from_shared_memory(name, layout)
+        assert attached.nodes is None
+        for array_name, dtype, _ in ARRAYS:
+            array = getattr(attached, array_name)
+            assert array.dtype == dtype
+            np.testing.assert_array_equal(array,
+                                          getattr(snapshot, array_name))
+        assert attached.neighbors(0).tolist() == \
+            snapshot.neighbors(0).tolist()
+
+        attached.close()
+        assert attached.x is None
+        snapshot.close()
+        # block is unlinked by its creator
+        with pytest.raises(OSError):
+            GridArraysDing0.from_shared_memory(name, layout)
+        # arrays of creator remain valid
+        assert snapshot.i_max_th.tolist() == [300.]
+
 
 class TestStationDing0(object):
 
@@ -361,5 +430,40 @@ class TestStationDing0(object):
         assert transformer2_in_empty_stationding0.x_pu == 0.001
 
 
+class TestSlottedDing0(object):
+
+    def test_no_instance_dict(self):
+        for cls in [BranchDing0, TransformerDing0, GeneratorDing0,
+                    GeneratorFluctuatingDing0, CircuitBreakerDing0,
+                    LVCableDistributorDing0]:
+            assert issubclass(cls, SlottedDing0)
+            assert not hasattr(cls.__new__(cls), '__dict__')
+
+    def test_pickle(self):
+        branch = BranchDing0(length=100., kind='cable')
+        assert not hasattr(branch, 's_res')
+
+        branch_copy = pickle.loads(pickle.dumps(branch))
+        assert branch_copy.length == 100.
+        assert branch_copy.kind == 'cable'
+        assert branch_copy.critical is False
+        assert not hasattr(branch_copy, 's_res')
+
+        generator = GeneratorFluctuatingDing0(id_db=1, weather_cell_id=5)
+        generator.voltage_res = [1., 1.02]
+        generator_copy = pickle.loads(pickle.dumps(generator))
+        assert generator_copy.weather_cell_id == 5
+        assert generator_copy.voltage_res == [1., 1.02]
+
+    def test_setstate_of_instance_dict(self):
+        """State of pickles of instances with `__dict__`"""
+        branch = BranchDing0.__new__(BranchDing0)
+        branch.__setstate__({'length': 100., 'kind': 'line',
+                             'obsolete': True})
+        assert branch.length == 100.
+        assert branch.kind == 'line'
+        assert not hasattr(branch, 'obsolete')
+
+
 if __name__ == "__main__":
     pass
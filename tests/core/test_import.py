@@ -0,0 +1,309 @@
+import pytest
+
+from geoalchemy2.types import Geometry
+from sqlalchemy import create_engine, Column, Integer, Float, String, Table
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from shapely.geometry import Point, box
+from shapely.wkb import loads as wkb_loads
+
+from ding0.core import NetworkDing0
+
+
+Base = declarative_base()
+
+
+class MVGridDistricts(Base):
+    __tablename__ = 'mv_grid_districts'
+    subst_id = Column(Integer, primary_key=True)
+    geom = Column(String)
+
+
+class MVStations(Base):
+    __tablename__ = 'mv_stations'
+    subst_id = Column(Integer, primary_key=True)
+    point = Column(String)
+
+
+class LVLoadAreas(Base):
+    __tablename__ = 'lv_load_areas'
+    id = Column(Integer, primary_key=True)
+    subst_id = Column(Integer)
+    zensus_sum = Column(Integer)
+    zensus_count = Column(Integer)
+    ioer_sum = Column(Float)
+    ioer_count = Column(Integer)
+    area_ha = Column(Float)
+    sector_area_residential = Column(Float)
+    sector_area_retail = Column(Float)
+    sector_area_industrial = Column(Float)
+    sector_area_agricultural = Column(Float)
+    sector_share_residential = Column(Float)
+    sector_share_retail = Column(Float)
+    sector_share_industrial = Column(Float)
+    sector_share_agricultural = Column(Float)
+    sector_count_residential = Column(Integer)
+    sector_count_retail = Column(Integer)
+    sector_count_industrial = Column(Integer)
+    sector_count_agricultural = Column(Integer)
+    nuts = Column(String)
+    geom = Column(String)
+    geom_centre = Column(String)
+    sector_peakload_residential = Column(Float)
+    sector_peakload_retail = Column(Float)
+    sector_peakload_industrial = Column(Float)
+    sector_peakload_agricultural = Column(Float)
+
+
+class WKTGeometry(Geometry):
+    """
+    Geometry stored as WKT as it is, SQLite lacks the spatial functions and
+    column types geometries are converted with on PostGIS
+    """
+
+    def get_col_spec(self):
+        return 'TEXT'
+
+    def column_expression(self, col):
+        return col
+
+    def result_processor(self, dialect, coltype):
+        return None
+
+    def bind_expression(self, bindvalue):
+        return bindvalue
+
+
+GeometryBase = declarative_base()
+
+
+class MVStationsGeometry(GeometryBase):
+    __tablename__ = 'mv_stations_geometry'
+    subst_id = Column(Integer, primary_key=True)
+    point = Column(WKTGeometry('POINT', srid=4326, spatial_index=False))
+
+
+class LVGridDistricts(Base):
+    __tablename__ = 'lv_grid_district'
+    id = Column(Integer, primary_key=True)
+    mvlv_subst_id = Column(Integer)
+    la_id = Column(Integer)
+    zensus_sum = Column(Integer)
+    geom = Column(String)
+    sector_peakload_residential = Column(Float)
+    sector_peakload_retail = Column(Float)
+    sector_peakload_industrial = Column(Float)
+    sector_peakload_agricultural = Column(Float)
+    sector_count_residential = Column(Integer)
+    sector_count_retail = Column(Integer)
+    sector_count_industrial = Column(Integer)
+    sector_count_agricultural = Column(Integer)
+    sector_consumption_residential = Column(Float)
+    sector_consumption_retail = Column(Float)
+    sector_consumption_industrial = Column(Float)
+    sector_consumption_agricultural = Column(Float)
+
+
+class LVStations(Base):
+    __tablename__ = 'lv_stations'
+    mvlv_subst_id = Column(Integer, primary_key=True)
+    subst_id = Column(Integer)
+    la_id = Column(Integer)
+    geom = Column(String)
+
+
+class REGenerators(Base):
+    __tablename__ = 're_generators'
+    id = Column(Integer, primary_key=True)
+    subst_id = Column(Integer)
+    electrical_capacity = Column(Float)
+
+
+class ConvGenerators(Base):
+    __tablename__ = 'conv_generators'
+    id = Column(Integer, primary_key=True)
+    subst_id = Column(Integer)
+    capacity = Column(Float)
+
+
+class TestBulkImport(object):
+
+    @pytest.fixture
+    def sqlite_session(self):
+        """
+        Returns a session of a SQLite database with two MV grid districts
+        (two load areas with two LV grid districts each) and the according
+        ORM mapping
+        """
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        la_id = 1
+        lvgd_id = 1
+        for subst_id in [1, 2]:
+            x = 8. + subst_id
+            session.add(MVGridDistricts(subst_id=subst_id,
+                                        geom=box(x, 50., x + .5, 50.5).wkt))
+            session.add(MVStations(subst_id=subst_id,
+                                   point=Point(x + .25, 50.25).wkt))
+            for la in range(2):
+                x_la = x + .1 + .2 * la
+                session.add(LVLoadAreas(
+                    id=la_id, subst_id=subst_id, zensus_sum=100,
+                    zensus_count=10, ioer_sum=1., ioer_count=1, area_ha=10.,
+                    sector_area_residential=1., sector_area_retail=0.,
+                    sector_area_industrial=0., sector_area_agricultural=0.,
+                    sector_share_residential=1., sector_share_retail=0.,
+                    sector_share_industrial=0., sector_share_agricultural=0.,
+                    sector_count_residential=2, sector_count_retail=0,
+                    sector_count_industrial=0, sector_count_agricultural=0,
+                    nuts='DE', geom=box(x_la - .05, 50.1, x_la + .05, 50.2).wkt,
+                    geom_centre=Point(x_la, 50.15).wkt,
+                    sector_peakload_residential=2e-4,
+                    sector_peakload_retail=0.,
+                    sector_peakload_industrial=0.,
+                    sector_peakload_agricultural=0.))
+                for lvgd in range(2):
+                    x_lvgd = x_la - .02 + .04 * lvgd
+                    session.add(LVStations(mvlv_subst_id=lvgd_id,
+                                           subst_id=subst_id, la_id=la_id,
+                                           geom=Point(x_lvgd, 50.15).wkt))
+                    session.add(LVGridDistricts(
+                        id=lvgd_id, mvlv_subst_id=lvgd_id, la_id=la_id,
+                        zensus_sum=50,
+                        geom=box(x_lvgd - .01, 50.14,
+                                 x_lvgd + .01, 50.16).wkt,
+                        sector_peakload_residential=1e-4,
+                        sector_peakload_retail=0.,
+                        sector_peakload_industrial=0.,
+                        sector_peakload_agricultural=0.,
+                        sector_count_residential=1,
+                        sector_count_retail=None,
+                        sector_count_industrial=0,
+                        sector_count_agricultural=0,
+                        sector_consumption_residential=1e-3,
+                        sector_consumption_retail=0.,
+                        sector_consumption_industrial=0.,
+                        sector_consumption_agricultural=0.))
+                    lvgd_id += 1
+                la_id += 1
+        session.commit()
+
+        orm = {'orm_mv_grid_districts': MVGridDistricts,
+               'orm_mv_stations': MVStations,
+               'orm_lv_load_areas': LVLoadAreas,
+               'orm_lv_grid_district': LVGridDistricts,
+               'orm_lv_stations': LVStations}
+        for table in ['mvgd', 'mv_stations', 'la', 'lvgd', 'mvlvst']:
+            orm['version_condition_{}'.format(table)] = 1 == 1
+
+        yield session, orm
+        session.close()
+
+    def test_import_mv_grid_districts(self, sqlite_session):
+        session, orm = sqlite_session
+        nd = NetworkDing0(name='network')
+        nd._orm = orm
+
+        nd.import_mv_grid_districts(session, mv_grid_districts_no=[1, 2])
+
+        mv_grid_districts = list(nd.mv_grid_districts())
+        assert [_.id_db for _ in mv_grid_districts] == [1, 2]
+
+        for mv_grid_district in mv_grid_districts:
+            lv_load_areas = list(mv_grid_district.lv_load_areas())
+            assert len(lv_load_areas) == 2
+            for lv_load_area in lv_load_areas:
+                lv_grid_districts = list(lv_load_area.lv_grid_districts())
+                assert len(lv_grid_districts) == 2
+                for lv_grid_district in lv_grid_districts:
+                    station = lv_grid_district.lv_grid.station()
+                    assert station.id_db == lv_grid_district.id_db
+                    assert station.geo_data.within(
+                        mv_grid_district.geo_data)
+                    assert lv_grid_district.population == 50
+                    assert lv_grid_district.sector_count_retail == 0
+            assert mv_grid_district.peak_load == pytest.approx(400.)
+
+    def test_snapshot(self, sqlite_session, tmpdir):
+        from ding0.tools.snapshot import export_snapshot, open_snapshot, \
+            read_snapshot_metadata
+
+        session, orm = sqlite_session
+        orm['orm_re_generators'] = REGenerators.__table__
+        orm['orm_conv_generators'] = ConvGenerators.__table__
+        orm['version_condition_re'] = orm['version_condition_conv'] = 1 == 1
+
+        path = str(tmpdir.join('snapshot.sqlite'))
+        export_snapshot(session, orm, [2], path)
+        with pytest.raises(FileExistsError):
+            export_snapshot(session, orm, [2], path)
+        assert read_snapshot_metadata(path)['mv_grid_districts'] == [2]
+
+        snapshot_session, snapshot_orm = open_snapshot(path)
+        nd = NetworkDing0(name='network', orm=snapshot_orm)
+        nd.import_mv_grid_districts(snapshot_session, mv_grid_districts_no=[2])
+
+        mv_grid_district = list(nd.mv_grid_districts())[0]
+        assert mv_grid_district.id_db == 2
+        assert [lvgd.id_db
+                for la in mv_grid_district.lv_load_areas()
+                for lvgd in la.lv_grid_districts()] == [5, 6, 7, 8]
+        snapshot_session.close()
+
+    def test_snapshot_geometry(self, sqlite_session, tmpdir):
+        from ding0.tools.snapshot import export_snapshot, open_snapshot
+
+        session, orm = sqlite_session
+        GeometryBase.metadata.create_all(session.get_bind())
+        for mv_station in session.query(MVStations):
+            session.add(MVStationsGeometry(subst_id=mv_station.subst_id,
+                                           point=mv_station.point))
+        session.commit()
+        orm['orm_mv_stations'] = MVStationsGeometry
+        orm['orm_re_generators'] = REGenerators.__table__
+        orm['orm_conv_generators'] = ConvGenerators.__table__
+        orm['version_condition_re'] = orm['version_condition_conv'] = 1 == 1
+
+        path = str(tmpdir.join('snapshot.sqlite'))
+        export_snapshot(session, orm, [2], path)
+
+        # geometries are stored as WKB
+        snapshot_session, snapshot_orm = open_snapshot(path)
+        point, = [row.point for row in
+                  snapshot_session.query(snapshot_orm['orm_mv_stations'])]
+        assert isinstance(point, bytes)
+        assert wkb_loads(point).equals(Point(10.25, 50.25))
+
+        nd = NetworkDing0(name='network', orm=snapshot_orm)
+        nd.import_mv_grid_districts(snapshot_session, mv_grid_districts_no=[2])
+
+        mv_grid_district = list(nd.mv_grid_districts())[0]
+        assert mv_grid_district.mv_grid.station().geo_data.equals(
+            Point(10.25, 50.25))
+        assert [lvgd.id_db
+                for la in mv_grid_district.lv_load_areas()
+                for lvgd in la.lv_grid_districts()] == [5, 6, 7, 8]
+        snapshot_session.close()
+
+    def test_snapshot_column(self):
+        from sqlalchemy import BigInteger, Boolean, LargeBinary, Text
+        from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, VARCHAR
+        from ding0.tools.snapshot import _snapshot_column
+
+        assert isinstance(
+            _snapshot_column(Column('geom', Geometry('POINT'))).type,
+            LargeBinary)
+        assert isinstance(
+            _snapshot_column(Column('id', BigInteger, primary_key=True)).type,
+            Integer)
+        assert _snapshot_column(
+            Column('id', BigInteger, primary_key=True)).primary_key
+        assert isinstance(
+            _snapshot_column(Column('value', DOUBLE_PRECISION)).type, Float)
+        assert isinstance(
+            _snapshot_column(Column('name', VARCHAR)).type, Text)
+        assert isinstance(
+            _snapshot_column(Column('flag', Boolean)).type, Boolean)
+
@@ -0,0 +1,67 @@
+from ding0.core import NetworkDing0
+from ding0.tools.diff import diff_networks
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+class TestLazyLVGrids(object):
+
+    def network(self, lazy):
+        """
+        Synthetic network with LV grids reinforced while circuit breakers
+        are open (as in :meth:`NetworkDing0.run_ding0`)
+        """
+        nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+        build_synthetic_mv_grid_districts(nd, [1], [40], seed=3)
+        nd.mv_parametrize_grid()
+        nd.validate_grid_districts()
+        nd.build_lv_grids(lazy=lazy)
+        nd.mv_routing()
+        nd.connect_generators()
+        nd.set_branch_ids()
+        nd.set_circuit_breakers()
+        nd.control_circuit_breakers(mode='open')
+        for mv_grid_district in nd.mv_grid_districts():
+            for lv_load_area in mv_grid_district.lv_load_areas():
+                if not lv_load_area.is_aggregated:
+                    for lv_grid_district in lv_load_area.lv_grid_districts():
+                        lv_grid_district.lv_grid.reinforce_grid()
+        nd.control_circuit_breakers(mode='close')
+        nd.materialize_lv_grids()
+        return nd
+
+    def routed_network(self, lazy):
+        """
+        Synthetic network with MV grid routed
+        """
+        nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+        build_synthetic_mv_grid_districts(nd, [1], [40], seed=3)
+        nd.mv_parametrize_grid()
+        nd.validate_grid_districts()
+        nd.build_lv_grids(lazy=lazy)
+        nd.mv_routing()
+        return nd
+
+    def lv_grids(self, nd):
+        return [lv_grid_district.lv_grid
+                for mv_grid_district in nd.mv_grid_districts()
+                for lv_load_area in mv_grid_district.lv_load_areas()
+                if not lv_load_area.is_aggregated
+                for lv_grid_district in lv_load_area.lv_grid_districts()]
+
+    def test_materialize_on_access(self):
+        lazy_lv_grids = self.lv_grids(self.routed_network(lazy=True))
+        lv_grids = self.lv_grids(self.routed_network(lazy=False))
+        assert len(lazy_lv_grids) == len(lv_grids) > 0
+
+        # MV routing does not materialize LV grids
+        assert not any(lv_grid.materialized for lv_grid in lazy_lv_grids)
+
+        for lazy_lv_grid, lv_grid in zip(lazy_lv_grids, lv_grids):
+            nodes = sorted(repr(_) for _ in lazy_lv_grid._graph.nodes())
+            assert lazy_lv_grid.materialized
+            assert nodes == sorted(repr(_) for _ in lv_grid._graph.nodes())
+
+    def test_reinforce_deferred(self):
+        # deferred reinforcement uses MV impedance of open circuit breakers
+        assert diff_networks(self.network(lazy=False),
+                             self.network(lazy=True)).empty
@@ -1,6 +1,8 @@
+import numpy as np
+import pandas as pd
 import pytest
 
-from ding0.core.powerflow import q_sign
+from ding0.core.powerflow import q_sign, PFTimeseriesResultsDing0
 
 
 def test_q_sign():
@@ -15,3 +17,49 @@ def test_q_sign():
     assert q_sign('capacitive', 'generator') == 1
     assert q_sign('inductive', 'load') == 1
     assert q_sign('capacitive', 'load') == -1
+
+
+class TestPFTimeseriesResultsDing0(object):
+
+    @pytest.fixture
+    def results(self):
+        timerange = pd.date_range('2011-01-01', periods=3, freq='h')
+        results = PFTimeseriesResultsDing0(
+            timerange, bus_ids=['Bus_1', 'Bus_2'],
+            line_ids=['MV_5_lin_7', 'MV_5_lin_8', 'MV_5_lin_9'], grid_id=5)
+        return results
+
+    def test_results(self, results):
+        assert results.v_mag_pu.shape == (3, 2)
+        assert results.s_res.shape == (3, 3)
+        assert np.isnan(results.v_mag_pu).all()
+        assert np.isnan(results.s_res).all()
+
+        results.v_mag_pu[:] = [[1., 0.98], [1., 0.99], [1., 1.01]]
+        results.s_res[1:] = [[0.5, 0.2, 0.1], [0.4, 0.3, 0.]]
+        assert results.voltage('Bus_2').tolist() == [0.98, 0.99, 1.01]
+        assert np.isnan(results.apparent_power('MV_5_lin_8')[0])
+        assert results.apparent_power('MV_5_lin_8')[1:].tolist() == [0.2, 0.3]
+
+        class Node(object):
+            pypsa_id = 'Bus_1'
+
+        class Branch(object):
+            id_db = 9
+
+        assert results.node_voltage(Node()).tolist() == [1., 1., 1.]
+        assert results.branch_apparent_power(Branch())[1:].tolist() == \
+            [0.1, 0.]
+
+    def test_to_dataframe(self, results):
+        results.v_mag_pu[:] = 1.
+        v_mag_pu = results.v_mag_pu_to_dataframe()
+        assert v_mag_pu.index.equals(results.timerange)
+        assert v_mag_pu.columns.tolist() == ['Bus_1', 'Bus_2']
+        assert (v_mag_pu.values == 1.).all()
+        s_res = results.s_res_to_dataframe()
+        assert s_res.shape == (3, 3)
+        assert s_res.columns.tolist() == results.line_ids
+
+        with pytest.raises(KeyError):
+            results.voltage('Bus_3')
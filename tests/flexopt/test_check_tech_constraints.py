@@ -1,9 +1,22 @@
+import math
+
+import networkx as nx
 import pytest
 
 from numpy import sqrt
+from ding0.core import NetworkDing0
+from ding0.core.network import GeneratorDing0
+from ding0.core.network.cable_distributors import LVCableDistributorDing0
+from ding0.core.network.loads import LVLoadDing0
+from ding0.core.powerflow import q_sign
 from ding0.flexopt.check_tech_constraints import (
-    voltage_delta_vde
+    voltage_delta_vde, get_critical_voltage_at_nodes,
+    get_delta_voltage_preceding_line, get_voltage_at_bus_bar,
+    LVVoltageEstimationDing0, check_voltage, MVVoltageSensitivityDing0
 )
+from ding0.flexopt.reinforce_measures import reinforce_branches_voltage
+from ding0.tools import config as cfg_ding0
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
 
 
 def test_voltage_delta_vde():
@@ -63,3 +76,266 @@ def test_voltage_delta_vde():
                                                     abs=0.000001)
     assert voltage_delta_capacitive == pytest.approx(voltage_delta_capacitive_expected,
                                                      abs=0.000001)
+
+
+def lv_voltage_deltas_per_node(grid):
+    """
+    Voltage deltas at all nodes of a LV grid determined node by node by
+    :func:`get_delta_voltage_preceding_line` (and critical nodes as
+    determined by :func:`get_critical_voltage_at_nodes` before
+    :class:`LVVoltageEstimationDing0`)
+    """
+    v_delta_tolerable_fc = cfg_ding0.get('assumptions',
+                                         'lv_max_v_level_fc_diff_normal')
+    v_delta_tolerable_lc = cfg_ding0.get('assumptions',
+                                         'lv_max_v_level_lc_diff_normal')
+
+    tree = nx.dfs_tree(grid._graph, grid._station)
+    v_delta = {grid._station: list(get_voltage_at_bus_bar(grid, tree))}
+    for parent, node in nx.dfs_edges(tree, grid._station):
+        v_delta_load, v_delta_gen = get_delta_voltage_preceding_line(
+            grid, tree, node)
+        v_delta[node] = [v_delta[parent][0] + v_delta_load,
+                         v_delta[parent][1] + v_delta_gen]
+
+    def critical(node):
+        return (abs(v_delta[node][1]) > v_delta_tolerable_fc or
+                abs(v_delta[node][0]) > v_delta_tolerable_lc)
+
+    main_branch = [node for node in nx.descendants(tree, grid._station)
+                   if list(tree.successors(node)) and
+                   all(isinstance(successor, LVCableDistributorDing0)
+                       for successor in tree.successors(node))]
+
+    crit_nodes = []
+    if critical(grid._station):
+        crit_nodes.append(grid._station)
+    for first_node in [_ for _ in tree.successors(grid._station)
+                       if _ in main_branch]:
+        successor = first_node
+        while successor:
+            stub_node = [_ for _ in tree.successors(successor)
+                         if _ not in main_branch][0]
+            if critical(successor):
+                crit_nodes.extend([successor, stub_node])
+            elif critical(stub_node):
+                crit_nodes.append(stub_node)
+            successor = [_ for _ in tree.successors(successor)
+                         if _ in main_branch]
+            successor = successor[0] if successor else None
+
+    return v_delta, crit_nodes
+
+
+class TestLVVoltageEstimationDing0(object):
+
+    @pytest.fixture
+    def lv_grids(self):
+        """
+        LV grids of a routed synthetic network with loads and generators,
+        load and generation of every second LV grid is increased to get
+        critical nodes
+        """
+        nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+        build_synthetic_mv_grid_districts(nd, [1], [6], seed=1)
+        nd.mv_parametrize_grid()
+        nd.validate_grid_districts()
+        nd.build_lv_grids()
+        nd.mv_routing()
+        nd.connect_generators()
+
+        lv_grids = [lv_grid_district.lv_grid
+                    for mv_grid_district in nd.mv_grid_districts()
+                    for lv_load_area in mv_grid_district.lv_load_areas()
+                    if not lv_load_area.is_aggregated
+                    for lv_grid_district in lv_load_area.lv_grid_districts()
+                    if len(lv_grid_district.lv_grid._graph) > 1]
+        for lv_grid in lv_grids[::2]:
+            for node in lv_grid._graph.nodes():
+                if isinstance(node, LVLoadDing0):
+                    node.peak_load *= 4
+                elif isinstance(node, GeneratorDing0):
+                    node.capacity *= 4
+        return lv_grids
+
+    def test_voltage_deltas(self, lv_grids):
+        assert any(isinstance(node, GeneratorDing0)
+                   for lv_grid in lv_grids for node in lv_grid._graph)
+
+        crit_nodes_count = 0
+        for lv_grid in lv_grids:
+            v_delta, crit_nodes = lv_voltage_deltas_per_node(lv_grid)
+            estimation = LVVoltageEstimationDing0(lv_grid)
+
+            assert set(estimation.nodes) == set(v_delta)
+            for node, (v_delta_load, v_delta_gen) in v_delta.items():
+                idx = estimation.node_idx[node]
+                assert estimation.v_delta_load[idx] == \
+                    pytest.approx(v_delta_load, rel=1e-9, abs=1e-12)
+                assert estimation.v_delta_gen[idx] == \
+                    pytest.approx(v_delta_gen, rel=1e-9, abs=1e-12)
+
+            estimated = get_critical_voltage_at_nodes(lv_grid)
+            assert [_['node'] for _ in estimated] == crit_nodes
+            for crit_node in estimated:
+                assert crit_node['v_diff'] == \
+                    pytest.approx(v_delta[crit_node['node']], rel=1e-9)
+            crit_nodes_count += len(crit_nodes)
+
+        assert crit_nodes_count > 0
+
+    def test_update_branches(self, lv_grids):
+        for lv_grid in lv_grids:
+            estimation = LVVoltageEstimationDing0(lv_grid)
+            estimation.critical_nodes()
+
+            # change type of every third branch (several per subtree)
+            lv_cables = lv_grid.network.static_data['LV_cables']
+            branches = [branch for _, _, branch in
+                        lv_grid._graph.edges(data='branch')][::3]
+            for branch in branches:
+                branch.type = lv_cables.loc['NAYY 4x1x35']
+            estimation.update_branches(branches)
+
+            rebuilt = LVVoltageEstimationDing0(lv_grid)
+            assert estimation.nodes == rebuilt.nodes
+            assert estimation.v_delta_load == \
+                pytest.approx(rebuilt.v_delta_load, rel=1e-9, abs=1e-12)
+            assert estimation.v_delta_gen == \
+                pytest.approx(rebuilt.v_delta_gen, rel=1e-9, abs=1e-12)
+            assert [(_['node'], _['v_diff']) for _ in
+                    estimation.critical_nodes()] == \
+                [(_['node'], pytest.approx(_['v_diff'], rel=1e-9))
+                 for _ in rebuilt.critical_nodes()]
+
+
+def mv_network():
+    """
+    Routed synthetic network with open circuit breakers (radial MV grids)
+    """
+    nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+    build_synthetic_mv_grid_districts(nd, [1], [6], seed=1)
+    nd.mv_parametrize_grid()
+    nd.validate_grid_districts()
+    nd.build_lv_grids()
+    nd.mv_routing()
+    nd.connect_generators()
+    nd.set_branch_ids()
+    nd.set_circuit_breakers()
+    nd.control_circuit_breakers(mode='open')
+    return nd
+
+
+def mv_voltage_delta(branch, old_type):
+    """
+    Reduction of voltage difference to HV-MV station (load case, feed-in
+    case) downstream of `branch` if its type was changed from `old_type`
+    """
+    omega = 2 * math.pi * cfg_ding0.get('assumptions', 'frequency')
+    v_delta = []
+    for case, (cos_phi, mode, convention) in enumerate([
+            (cfg_ding0.get('assumptions', 'cos_phi_load'),
+             cfg_ding0.get('assumptions', 'cos_phi_load_mode'), 'load'),
+            (cfg_ding0.get('assumptions', 'cos_phi_gen'),
+             cfg_ding0.get('assumptions', 'cos_phi_gen_mode'),
+             'generator')]):
+        r_delta = (old_type['R_per_km'] - branch.type['R_per_km']) * \
+            branch.length / 1e3
+        x_delta = (old_type['L_per_km'] - branch.type['L_per_km']) / 1e3 * \
+            omega * branch.length / 1e3
+        v_delta.append(branch.s_res[case] * (
+            r_delta * cos_phi + q_sign(mode, convention) * x_delta *
+            math.sin(math.acos(cos_phi))) / branch.type['U_n'] ** 2)
+    return v_delta
+
+
+class TestMVVoltageSensitivityDing0(object):
+
+    @pytest.fixture
+    def mv_grid(self):
+        """
+        MV grid with results of a (fake) power flow: voltage differences to
+        the HV-MV station grow linearly with the distance from the station
+        and exceed the limits at the far ends of rings
+        """
+        mv_grid = mv_network()._mv_grid_districts[0].mv_grid
+        distance = nx.single_source_dijkstra_path_length(
+            mv_grid._graph, mv_grid.station(),
+            weight=lambda _, __, data: data['branch'].length)
+        distance_max = max(distance.values())
+        for node in mv_grid._graph.nodes():
+            if node in distance:
+                node.voltage_res = [
+                    1. - 0.08 * distance[node] / distance_max,
+                    1. + 0.03 * distance[node] / distance_max]
+        for _, _, branch in mv_grid._graph.edges(data='branch'):
+            branch.s_res = [2., 1.]
+        return mv_grid
+
+    def test_critical_nodes(self, mv_grid):
+        crit_nodes = check_voltage(mv_grid, 'MV')
+        estimated = MVVoltageSensitivityDing0(mv_grid).critical_nodes()
+
+        assert 0 < len(crit_nodes) < len(mv_grid._graph)
+        assert set(estimated) == set(crit_nodes)
+        v_diff = [max(abs(1. - _.voltage_res[0]), abs(_.voltage_res[1] - 1.))
+                  for _ in estimated]
+        assert v_diff == sorted(v_diff, reverse=True)
+
+    def test_update_branches(self, mv_grid):
+        sensitivity = MVVoltageSensitivityDing0(mv_grid)
+
+        # reinforce branches on the paths to critical nodes
+        branches = mv_grid.find_and_union_paths(
+            mv_grid.station(), sensitivity.critical_nodes())
+        old_types = {branch: branch.type for branch in branches}
+        reinforced = reinforce_branches_voltage(mv_grid, branches)
+        assert reinforced
+        v_diff = sensitivity.v_diff.copy()
+        sensitivity.update_branches({branch: old_types[branch]
+                                     for branch in reinforced})
+
+        # voltages as estimated node by node along the paths from the station
+        tree = nx.dfs_tree(mv_grid._graph, mv_grid.station())
+        v_delta = {mv_grid.station(): [0., 0.]}
+        for parent, node in nx.dfs_edges(tree, mv_grid.station()):
+            branch = mv_grid._graph.adj[parent][node]['branch']
+            v_delta[node] = list(v_delta[parent])
+            if branch in reinforced:
+                v_delta[node] = [_ + __ for _, __ in zip(
+                    v_delta[node], mv_voltage_delta(branch, old_types[branch]))]
+        for node, (v_delta_load, v_delta_gen) in v_delta.items():
+            if getattr(node, 'voltage_res', None) is not None:
+                node.voltage_res = [
+                    1. - max(1. - node.voltage_res[0] - v_delta_load, 0),
+                    1. + max(node.voltage_res[1] - 1. - v_delta_gen, 0)]
+        rebuilt = MVVoltageSensitivityDing0(mv_grid)
+
+        assert sensitivity.nodes == rebuilt.nodes
+        assert sensitivity.v_diff == pytest.approx(rebuilt.v_diff, abs=1e-12,
+                                                   nan_ok=True)
+        assert set(sensitivity.critical_nodes()) == \
+            set(rebuilt.critical_nodes())
+        assert (sensitivity.v_diff < v_diff).any()
+
+    def test_screening_superset_of_power_flow(self):
+        nd = mv_network()
+        mv_grid = nd._mv_grid_districts[0].mv_grid
+        # increase generation to get voltage issues
+        for generator in mv_grid.generators():
+            generator.capacity *= 3
+        nd.run_powerflow(None, method='onthefly')
+        crit_nodes = check_voltage(mv_grid, 'MV')
+        assert crit_nodes
+
+        sensitivity = MVVoltageSensitivityDing0(mv_grid)
+        branches = mv_grid.find_and_union_paths(mv_grid.station(), crit_nodes)
+        old_types = {branch: branch.type for branch in branches}
+        reinforced = reinforce_branches_voltage(mv_grid, branches)
+        sensitivity.update_branches({branch: old_types[branch]
+                                     for branch in reinforced})
+        nd.run_powerflow(None, method='onthefly')
+
+        # screening must not miss voltage issues found by power flow
+        assert set(sensitivity.critical_nodes()) >= \
+            set(check_voltage(mv_grid, 'MV'))
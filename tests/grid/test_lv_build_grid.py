@@ -0,0 +1,167 @@
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.core.network import BranchDing0
+from ding0.core.network.cable_distributors import LVCableDistributorDing0
+from ding0.core.network.loads import LVLoadDing0
+from ding0.grid.lv_grid import build_grid
+from ding0.tools.diff import diff_networks
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+def build_lv_graph_residential_baseline(lvgd, selected_string_df):
+    """
+    Builds residential LV graph house by house as done before model grid
+    templates were introduced (reference implementation)
+    """
+    houses_connected = (
+        selected_string_df['occurence'] * selected_string_df[
+            'count house branch']).sum()
+
+    average_load = lvgd.peak_load_residential / houses_connected
+    average_consumption = lvgd.sector_consumption_residential / \
+        houses_connected
+
+    hh_branch = 0
+
+    for i, row in selected_string_df.iterrows():
+
+        branch_count_sum = len(list(
+            lvgd.lv_grid._graph.neighbors(lvgd.lv_grid.station())))
+
+        for branch_no in range(1, int(row['occurence']) + 1):
+
+            hh_branch += 1
+            for house_branch in range(1, row['count house branch'] + 1):
+                if house_branch % 2 == 0:
+                    variant = 'B'
+                else:
+                    variant = 'A'
+
+                lv_cable_dist = LVCableDistributorDing0(
+                    grid=lvgd.lv_grid,
+                    string_id=i,
+                    branch_no=branch_no + branch_count_sum,
+                    load_no=house_branch)
+                lvgd.lv_grid.add_cable_dist(lv_cable_dist)
+
+                lv_cable_dist_building = LVCableDistributorDing0(
+                    grid=lvgd.lv_grid,
+                    string_id=i,
+                    branch_no=branch_no + branch_count_sum,
+                    load_no=house_branch,
+                    in_building=True)
+                lvgd.lv_grid.add_cable_dist(lv_cable_dist_building)
+
+                lv_load = LVLoadDing0(grid=lvgd.lv_grid,
+                                      string_id=i,
+                                      branch_no=branch_no + branch_count_sum,
+                                      load_no=house_branch,
+                                      peak_load=average_load,
+                                      consumption={
+                                          'residential': average_consumption})
+                lvgd.lv_grid.add_load(lv_load)
+
+                cable_name = row['cable type'] + \
+                    ' 4x1x{}'.format(row['cable width'])
+                cable_type = lvgd.lv_grid.network.static_data[
+                    'LV_cables'].loc[cable_name]
+                branch_id = 'branch_{sector}{branch}_{load}'.format(
+                    branch=hh_branch, load=house_branch, sector='HH')
+
+                if house_branch == 1:
+                    node_from = lvgd.lv_grid.station()
+                else:
+                    node_from = lvgd.lv_grid._cable_distributors[-4]
+                lvgd.lv_grid._graph.add_edge(
+                    node_from,
+                    lv_cable_dist,
+                    branch=BranchDing0(length=row['distance house branch'],
+                                       kind='cable',
+                                       type=cable_type,
+                                       id_db=branch_id))
+
+                house_cable_name = row['cable type {}'.format(variant)] + \
+                    ' 4x1x{}'.format(row['cable width {}'.format(variant)])
+                house_cable_type = lvgd.lv_grid.network.static_data[
+                    'LV_cables'].loc[house_cable_name]
+                lvgd.lv_grid._graph.add_edge(
+                    lv_cable_dist,
+                    lv_cable_dist_building,
+                    branch=BranchDing0(
+                        length=row['length house branch {}'.format(variant)],
+                        kind='cable',
+                        type=house_cable_type,
+                        id_db=branch_id))
+                lvgd.lv_grid._graph.add_edge(
+                    lv_cable_dist_building,
+                    lv_load,
+                    branch=BranchDing0(length=1,
+                                       kind='cable',
+                                       type=house_cable_type,
+                                       id_db=branch_id))
+
+
+def build_residential_branches_baseline(lvgd):
+    """Builds residential branches with the reference implementation"""
+    if lvgd.population > 0 and lvgd.peak_load_residential > 0:
+        build_lv_graph_residential_baseline(
+            lvgd, build_grid.select_grid_model_residential(lvgd))
+
+
+class TestModelGridTemplates(object):
+
+    def network(self):
+        nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+        build_synthetic_mv_grid_districts(nd, [1, 2], [4, 5], seed=1)
+        nd.mv_parametrize_grid()
+        nd.validate_grid_districts()
+        return nd
+
+    def lv_branches(self, nd):
+        """Returns nodes, id, length and type of branches of all LV grids"""
+        return [(repr(node_one), repr(node_two), branch.id_db, branch.length,
+                 branch.type.name, branch.type['I_max_th'])
+                for mv_grid_district in nd.mv_grid_districts()
+                for lv_load_area in mv_grid_district.lv_load_areas()
+                for lv_grid_district in lv_load_area.lv_grid_districts()
+                for node_one, node_two, branch in
+                lv_grid_district.lv_grid._graph.edges(data='branch')]
+
+    def lv_loads(self, nd):
+        """Returns peak load and consumption of loads of all LV grids"""
+        return [(repr(load), load.peak_load, load.consumption)
+                for mv_grid_district in nd.mv_grid_districts()
+                for lv_load_area in mv_grid_district.lv_load_areas()
+                for lv_grid_district in lv_load_area.lv_grid_districts()
+                for load in lv_grid_district.lv_grid.loads()]
+
+    def test_template_equals_direct_construction(self, monkeypatch):
+        templated = self.network()
+        templated.build_lv_grids(processes=1)
+
+        monkeypatch.setattr(build_grid, 'build_residential_branches',
+                            build_residential_branches_baseline)
+        direct = self.network()
+        direct.build_lv_grids(processes=1)
+
+        assert diff_networks(templated, direct).empty
+        branches = self.lv_branches(templated)
+        assert len(branches) > 0
+        assert branches == self.lv_branches(direct)
+        assert self.lv_loads(templated) == self.lv_loads(direct)
+
+    def test_templates_per_static_data(self):
+        self.network().build_lv_grids(processes=1)
+
+        # network with other cable types in the same process
+        nd = self.network()
+        lv_cables = nd.static_data['LV_cables'].copy()
+        lv_cables['I_max_th'] *= 2
+        nd._static_data = dict(nd.static_data, LV_cables=lv_cables)
+        nd.build_lv_grids(processes=1)
+
+        branches = self.lv_branches(nd)
+        assert len(branches) > 0
+        for _, _, _, _, name, i_max_th in branches:
+            assert i_max_th == pytest.approx(lv_cables.loc[name, 'I_max_th'])
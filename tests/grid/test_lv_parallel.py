@@ -0,0 +1,51 @@
+from ding0.core import NetworkDing0
+from ding0.tools.diff import diff_networks
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+class TestLVParallel(object):
+
+    def network(self, processes):
+        """
+        Synthetic network with LV grids built and LV generators connected
+        in `processes` processes
+        """
+        nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+        build_synthetic_mv_grid_districts(nd, [1, 2], [4, 5], seed=1)
+        nd.mv_parametrize_grid()
+        nd.validate_grid_districts()
+        nd.build_lv_grids(processes=processes)
+        nd.mv_routing()
+        nd.connect_generators(processes=processes)
+        nd.set_branch_ids()
+        return nd
+
+    def lv_branches(self, nd):
+        """Returns nodes, id and type of branches of all LV grids"""
+        return [(repr(lv_grid), repr(node_one), repr(node_two), branch.id_db,
+                 branch.type.name)
+                for mv_grid_district in nd.mv_grid_districts()
+                for lv_load_area in mv_grid_district.lv_load_areas()
+                for lv_grid_district in lv_load_area.lv_grid_districts()
+                for lv_grid in [lv_grid_district.lv_grid]
+                for node_one, node_two, branch in
+                lv_grid._graph.edges(data='branch')]
+
+    def test_processes(self):
+        serial = self.network(processes=1)
+        parallel = self.network(processes=2)
+
+        assert diff_networks(serial, parallel).empty
+        branches = self.lv_branches(serial)
+        assert len(branches) > 0
+        assert branches == self.lv_branches(parallel)
+
+        # LV generators are part of the graphs of their LV grids
+        for mv_grid_district in parallel.mv_grid_districts():
+            for lv_load_area in mv_grid_district.lv_load_areas():
+                for lv_grid_district in lv_load_area.lv_grid_districts():
+                    lv_grid = lv_grid_district.lv_grid
+                    assert lv_grid.station() in lv_grid._graph
+                    for generator in lv_grid.generators():
+                        assert generator in lv_grid._graph
+                        assert generator.lv_grid is lv_grid
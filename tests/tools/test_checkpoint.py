@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.tools.checkpoint import CheckpointDing0
+from ding0.tools.diff import diff_networks
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+def model_draft_orm(condition):
+    """ORM mapping with version conditions as in model_draft mode"""
+    return {'version_condition_{}'.format(_): condition
+            for _ in ['mvgd', 'mv_stations', 'la', 'lvgd', 'mvlvst', 're',
+                      'conv']}
+
+
+def import_synthetic_mv_grid_districts(self, session,
+                                       mv_grid_districts_no=None):
+    """Replaces step 1 of :meth:`NetworkDing0.run_ding0` (generators are
+    built as well, step 2 is skipped)"""
+    build_synthetic_mv_grid_districts(self, mv_grid_districts_no, 3, seed=1)
+
+
+def skip_import_generators(self, session, debug=False):
+    pass
+
+
+def fail(*args, **kwargs):
+    raise RuntimeError('Step must not be performed.')
+
+
+class TestCheckpoint(object):
+
+    def network(self, orm):
+        nd = NetworkDing0(name='synthetic', run_id='test', orm=orm)
+        build_synthetic_mv_grid_districts(nd, [1], [3], seed=1)
+        nd.build_lv_grids()
+        return nd
+
+    def test_save_resume(self, tmpdir):
+        network = self.network(model_draft_orm(1 == 1))
+        # primitives which are equal to items of the ORM mapping
+        network.flags = [True, False, None]
+        random.seed(3)
+        checkpoint = CheckpointDing0(network, str(tmpdir), [1], steps=[5])
+        checkpoint.save(4)
+        checkpoint.save(5, msg=['msg'])
+        expected_random = random.random()
+
+        # resumed with a different data source
+        resumed = NetworkDing0(name='synthetic', run_id='test',
+                               orm=model_draft_orm(object()))
+        orm = resumed.orm
+        step, msg = CheckpointDing0(resumed, str(tmpdir), [1]).load()
+
+        assert (step, msg) == (5, ['msg'])
+        assert random.random() == expected_random
+        assert resumed.orm is orm
+        assert resumed.flags == [True, False, None]
+        assert [type(_) for _ in resumed.flags[:2]] == [bool, bool]
+        assert diff_networks(network, resumed).empty
+        mv_grid_district, = resumed.mv_grid_districts()
+        assert mv_grid_district.mv_grid.network is resumed
+
+    def test_run_ding0_resume_requires_checkpoint_path(self, monkeypatch):
+        monkeypatch.setattr(NetworkDing0, 'import_mv_grid_districts', fail)
+        nd = NetworkDing0(name='synthetic', run_id='test',
+                          orm=model_draft_orm(1 == 1))
+        with pytest.raises(ValueError):
+            nd.run_ding0(None, mv_grid_districts_no=[1], resume=True)
+
+    def test_run_ding0_resume(self, tmpdir, monkeypatch):
+        monkeypatch.setattr(NetworkDing0, 'import_mv_grid_districts',
+                            import_synthetic_mv_grid_districts)
+        monkeypatch.setattr(NetworkDing0, 'import_generators',
+                            skip_import_generators)
+
+        random.seed(1)
+        reference = NetworkDing0(name='synthetic', run_id='test',
+                                 orm=model_draft_orm(1 == 1))
+        reference.run_ding0(None, mv_grid_districts_no=[1])
+
+        # run crashes in step 7, after checkpoint of step 6 was saved
+        connect_generators = NetworkDing0.connect_generators
+        monkeypatch.setattr(NetworkDing0, 'connect_generators', fail)
+        random.seed(1)
+        interrupted = NetworkDing0(name='synthetic', run_id='test',
+                                   orm=model_draft_orm(1 == 1))
+        with pytest.raises(RuntimeError):
+            interrupted.run_ding0(None, mv_grid_districts_no=[1],
+                                  checkpoint_path=str(tmpdir),
+                                  checkpoint_steps=[6])
+        monkeypatch.setattr(NetworkDing0, 'connect_generators',
+                            connect_generators)
+
+        # steps 1 to 6 are not performed again
+        for step in ['import_mv_grid_districts', 'import_generators',
+                     'mv_parametrize_grid', 'validate_grid_districts',
+                     'build_lv_grids', 'mv_routing']:
+            monkeypatch.setattr(NetworkDing0, step, fail)
+        random.seed(2)
+        resumed = NetworkDing0(name='synthetic', run_id='test',
+                               orm=model_draft_orm(1 == 1))
+        resumed.run_ding0(None, mv_grid_districts_no=[1],
+                          checkpoint_path=str(tmpdir), checkpoint_steps=[6],
+                          resume=True)
+
+        assert len(list(resumed.mv_grid_districts())) == 1
+        assert diff_networks(reference, resumed).empty
+
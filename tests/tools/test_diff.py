@@ -0,0 +1,78 @@
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.tools.diff import diff_hashes, diff_networks, network_hashes
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+class TestDiff(object):
+
+    def network(self):
+        nd = NetworkDing0(name='synthetic', run_id='test')
+        build_synthetic_mv_grid_districts(nd, [1, 2], [3, 4], seed=1)
+        nd.build_lv_grids()
+        return nd
+
+    def routed_network(self, reverse_circuit_breakers=False):
+        nd = NetworkDing0(name='synthetic', run_id='test')
+        build_synthetic_mv_grid_districts(nd, [1], [8], seed=1)
+        nd.mv_parametrize_grid()
+        nd.validate_grid_districts()
+        nd.build_lv_grids()
+        nd.mv_routing()
+        nd.connect_generators()
+        nd.set_branch_ids()
+        if reverse_circuit_breakers:
+            for mv_grid_district in nd.mv_grid_districts():
+                mv_grid_district.mv_grid._circuit_breakers.reverse()
+        nd.set_circuit_breakers()
+        return nd
+
+    def test_diff_circuit_breakers(self):
+        network_one = self.routed_network()
+        network_two = self.routed_network(reverse_circuit_breakers=True)
+
+        circuit_breakers = [
+            [(repr(circuit_breaker), circuit_breaker.branch.id_db)
+             for circuit_breaker in mv_grid_district.mv_grid.circuit_breakers()]
+            for mv_grid_district in (
+                list(network_one.mv_grid_districts())[0],
+                list(network_two.mv_grid_districts())[0])]
+        assert len(circuit_breakers[0]) > 1
+        assert circuit_breakers[0] != circuit_breakers[1]
+
+        assert diff_hashes(network_hashes(network_one),
+                           network_hashes(network_two)).empty
+
+    def test_diff(self):
+        network_one = self.network()
+        network_two = self.network()
+        assert diff_networks(network_one, network_two).empty
+
+        hashes_one = network_hashes(network_one)
+        lv_grid_district = list(list(
+            list(network_two.mv_grid_districts())[1].lv_load_areas()
+        )[0].lv_grid_districts())[0]
+        lv_grid = lv_grid_district.lv_grid
+        node_one, node_two, branch = list(
+            lv_grid._graph.edges(data='branch'))[0]
+        branch.length += 1.
+        load = [_ for _ in lv_grid._graph.nodes()
+                if type(_).__name__ == 'LVLoadDing0'][-1]
+        lv_grid._graph.remove_node(load)
+
+        differences = diff_hashes(hashes_one, network_hashes(network_two))
+        assert set(differences['mv_grid_district']) == {2}
+        assert set(differences['grid']) == {repr(lv_grid)}
+        changed = differences[differences['change'] == 'changed']
+        assert changed['attribute'].tolist() == ['length']
+        assert changed['value_two'].iloc[0] == \
+            pytest.approx(changed['value_one'].iloc[0] + 1.)
+        removed = differences[differences['element'] == 'node']
+        assert removed['name'].tolist() == [repr(load)]
+        assert removed['change'].tolist() == ['removed']
+
+        del hashes_one[1]
+        differences = diff_hashes(hashes_one, network_hashes(network_one))
+        assert differences[['element', 'name', 'change']].values.tolist() == \
+            [['mv_grid_district', '1', 'added']]
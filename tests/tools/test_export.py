@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from ding0.tools.export import EXPORT_TABLES, ExportWriterDing0, \
+    exported_mv_grid_districts, read_export
+
+
+class TestExport(object):
+
+    @pytest.fixture
+    def tables(self):
+        """
+        Tables of one MV grid district as returned by export_network()
+        """
+        tables = [pd.DataFrame() for _ in EXPORT_TABLES]
+        tables[6] = pd.DataFrame({'MV_grid_id': [3],
+                                  'id_db': ['MVGridDing0_MV_3_3'],
+                                  'geom': ['POINT (10 51)'],
+                                  'population': [1000],
+                                  'voltage_nom': [20],
+                                  'run_id': ['1']},
+                                 index=[1])
+        # consumption of other sectors is missing as in export_network()
+        tables[11] = pd.DataFrame({'id_db': ['AggregatedLoad_MV_3_1'],
+                                   'MV_grid_id_db': ['MVGridDing0_MV_3_3'],
+                                   'geom': [None],
+                                   'consumption_retail': [12.],
+                                   'is_aggregated': [True],
+                                   'run_id': ['1']},
+                                  index=[1])
+        return tables
+
+    @pytest.mark.parametrize('format', ['parquet', 'csv'])
+    def test_write_read(self, tmpdir, tables, format):
+        if format == 'parquet':
+            pytest.importorskip('pyarrow')
+        path = str(tmpdir)
+        writer = ExportWriterDing0(path, formats=[format])
+        writer.write_tables(3, tables)
+        writer.write_tables(4, tables)
+
+        assert exported_mv_grid_districts(path) == [3, 4]
+
+        data = read_export(path, tables=['mv_grid', 'mv_load', 'line'],
+                           mv_grid_districts_no=[4], format=format)
+        assert sorted(data) == ['line', 'mv_grid', 'mv_load']
+        assert data['mv_grid']['mv_grid_district'].tolist() == [4]
+        assert data['mv_grid']['population'].dtype == float
+        mv_load = data['mv_load']
+        assert list(mv_load.columns) == \
+            [column for column, _ in dict(EXPORT_TABLES)['mv_load']] + \
+            ['mv_grid_district']
+        assert mv_load['consumption_retail'].tolist() == [12.]
+        assert mv_load['consumption_industrial'].isnull().all()
+        assert mv_load['geom'].isnull().all()
+        assert mv_load['is_aggregated'].tolist() == [True]
+        # tables without rows have columns nonetheless
+        assert data['line'].empty
+        assert 'node1' in data['line'].columns
+
+        # rewritten district without loads
+        tables[11] = pd.DataFrame()
+        writer.write_tables(4, tables)
+        assert read_export(path, tables=['mv_load'],
+                           format=format)['mv_load'][
+            'mv_grid_district'].tolist() == [3]
+        assert exported_mv_grid_districts(path, tables=['mv_load']) == [3]
+
+    def test_unknown_format(self, tmpdir):
+        with pytest.raises(ValueError):
+            ExportWriterDing0(str(tmpdir), formats=['xlsx'])
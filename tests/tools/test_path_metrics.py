@@ -0,0 +1,118 @@
+from math import nan
+
+import networkx as nx
+import pandas as pd
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.core.network import BranchDing0
+from ding0.tools import results
+from ding0.tools.path_metrics import path_metrics, compose_path_metrics
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+def path_metrics_baseline(graph, root, omega, impedance=0j):
+    """
+    Metrics of paths from `root` walked node by node (as
+    :func:`~.ding0.tools.results.calculate_mvgd_stats` did before
+    :func:`path_metrics`)
+    """
+    metrics = {}
+    for node in graph.nodes():
+        if not nx.has_path(graph, root, node):
+            continue
+        path = nx.shortest_path(graph, root, node)
+        path_impedance = impedance
+        path_length = 0.
+        for i in range(len(path) - 1):
+            branch = graph.adj[path[i]][path[i + 1]]['branch']
+            path_impedance += (branch.type['L_per_km'] * 1e-3 * omega *
+                               branch.length) * 1j + \
+                              (branch.type['R_per_km'] * branch.length)
+            path_length += branch.length
+        if len(path) > 1:
+            i_max_th = graph.adj[path[0]][path[1]]['branch'].type['I_max_th']
+        else:
+            i_max_th = nan
+        metrics[node] = (path_impedance, path_length, i_max_th)
+    return metrics
+
+
+class TestPathMetrics(object):
+
+    @pytest.fixture
+    def graph(self):
+        """
+        Ring 0-1-2-3-0 with stub 2-4, branch types differ in thermal limit
+        """
+        types = [pd.Series({'R_per_km': 0.1, 'L_per_km': 0.3,
+                            'I_max_th': 200. + 100. * k})
+                 for k in range(2)]
+        graph = nx.Graph()
+        for k, (u, v, length) in enumerate([(0, 1, 100.), (1, 2, 200.),
+                                            (2, 3, 50.), (3, 0, 400.),
+                                            (2, 4, 10.)]):
+            graph.add_edge(u, v, branch=BranchDing0(length=length,
+                                                    type=types[k % 2]))
+        return graph
+
+    def test_path_metrics(self, graph):
+        omega = 100.
+        metrics = path_metrics(graph, 0, omega, impedance=1j)
+
+        assert set(metrics) == set(graph.nodes())
+        for node, (impedance, length, i_max_th) in metrics.items():
+            path = nx.shortest_path(graph, 0, node)
+            branches = [graph.adj[u][v]['branch']
+                        for u, v in zip(path[:-1], path[1:])]
+            assert length == pytest.approx(sum(_.length for _ in branches))
+            assert impedance == pytest.approx(1j + sum(
+                _.length * (_.type['R_per_km'] +
+                            _.type['L_per_km'] * 1e-3 * omega * 1j)
+                for _ in branches))
+            if branches:
+                assert i_max_th == branches[0].type['I_max_th']
+
+        # thermal limit of first segment is inherited along path
+        assert metrics[4][2] == metrics[2][2]
+
+    def test_compose_path_metrics(self, graph):
+        metrics = path_metrics(graph, 2, 100.)
+        composed = compose_path_metrics((1j, 1000., 50.), metrics)
+
+        assert composed[2] == (1j, 1000., 50.)
+        assert composed[4][0] == pytest.approx(metrics[4][0] + 1j)
+        assert composed[4][1] == pytest.approx(1010.)
+        assert all(_[2] == 50. for _ in composed.values())
+
+    def test_calculate_mvgd_stats(self, monkeypatch):
+        nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+        build_synthetic_mv_grid_districts(nd, [1], [8], seed=1)
+        nd.mv_parametrize_grid()
+        nd.validate_grid_districts()
+        nd.build_lv_grids()
+        nd.mv_routing()
+        nd.connect_generators()
+        nd.set_branch_ids()
+        nd.set_circuit_breakers()
+        # rings are kept open while paths are walked, hence paths are unique
+        # (in closed rings, ties of paths with the same count of hops may be
+        # resolved differently), they are closed when rings are collected
+        monkeypatch.setattr(nd, 'control_circuit_breakers',
+                            lambda mode: None)
+
+        def calculate_mvgd_stats():
+            NetworkDing0.control_circuit_breakers(nd, mode='open')
+            return results.calculate_mvgd_stats(nd)
+
+        stats = calculate_mvgd_stats()
+        monkeypatch.setattr(results, 'path_metrics', path_metrics_baseline)
+        baseline = calculate_mvgd_stats()
+
+        for column in [
+                'Length of MV max path', 'Length of MVLV max path',
+                'Impedance Z of path to terminal node (mean value)',
+                'Length of path from MV station to terminal node '
+                '(mean value)']:
+            assert stats[column].iloc[0] > 0.
+        pd.testing.assert_frame_equal(stats, baseline)
@@ -0,0 +1,98 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from pyproj import Proj, transform
+
+from ding0.core import NetworkDing0
+from ding0.tools import plots
+from ding0.tools.plots import mv_topology_geometry, plot_mv_topology
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+@pytest.fixture(scope='module')
+def mv_grid():
+    """
+    MV grid of a routed synthetic MV grid district with power flow results
+    """
+    nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+    build_synthetic_mv_grid_districts(nd, [1], [5], seed=1)
+    nd.mv_parametrize_grid()
+    nd.validate_grid_districts()
+    nd.build_lv_grids()
+    nd.mv_routing()
+    nd.connect_generators()
+    nd.set_branch_ids()
+    nd.set_circuit_breakers()
+    nd.control_circuit_breakers(mode='open')
+    nd.run_powerflow(None, method='onthefly')
+    return nd._mv_grid_districts[0].mv_grid
+
+
+class TestPlots(object):
+
+    def test_mv_topology_geometry(self, mv_grid):
+        geometry = mv_topology_geometry(mv_grid)
+        nodes = geometry['nodes']
+        positions = geometry['positions']
+
+        assert nodes == list(mv_grid._graph.nodes())
+        assert positions.shape == (len(nodes), 2)
+        assert list(geometry['node_types']) == [
+            type(node).__name__ if type(node).__name__ in plots.NODE_TYPES
+            else 'n/a' for node in nodes]
+        assert 'MVStationDing0' in geometry['node_types']
+
+        # positions are projected to pseudo mercator
+        in_proj = Proj(init='epsg:{}'.format(
+            mv_grid.network.config['geo']['srid']))
+        out_proj = Proj(init='epsg:3857')
+        for node, position in zip(nodes, positions):
+            assert position.tolist() == pytest.approx(
+                transform(in_proj, out_proj, node.geo_data.x,
+                          node.geo_data.y))
+
+        # segments connect nodes of branches
+        edges = list(mv_grid._graph.edges(data='branch'))
+        assert geometry['segments'].shape == (len(edges), 2, 2)
+        assert geometry['branches'] == [branch for _, _, branch in edges]
+        for (node_one, node_two, _), segment in \
+                zip(edges, geometry['segments']):
+            np.testing.assert_array_equal(
+                segment, positions[[nodes.index(node_one),
+                                    nodes.index(node_two)]])
+
+        # extent covers nodes and MV grid district
+        xmin, xmax, ymin, ymax = geometry['extent']
+        assert xmin < positions[:, 0].min()
+        assert xmax > positions[:, 0].max()
+        assert ymin < positions[:, 1].min()
+        assert ymax > positions[:, 1].max()
+        bounds = mv_grid.grid_district.geo_data.bounds
+        x_district, y_district = transform(in_proj, out_proj,
+                                           [bounds[0], bounds[2]],
+                                           [bounds[1], bounds[3]])
+        assert xmin < min(x_district) and xmax > max(x_district)
+        assert ymin < min(y_district) and ymax > max(y_district)
+
+    @pytest.mark.parametrize('line_color, node_color, testcase', [
+        (None, 'type', 'load'),
+        ('loading', 'voltage', 'load'),
+        ('loading', 'voltage', 'feedin')])
+    def test_plot_mv_topology(self, mv_grid, tmpdir, monkeypatch,
+                              line_color, node_color, testcase):
+        plt.switch_backend('Agg')
+        monkeypatch.setattr(plots, 'use_gpd', False)
+        monkeypatch.setattr(plots, 'get_default_home_dir',
+                            lambda: str(tmpdir))
+        geometry = mv_topology_geometry(mv_grid)
+
+        plot_mv_topology(mv_grid, subtitle='test', filename='test.png',
+                         testcase=testcase, line_color=line_color,
+                         node_color=node_color, background_map=False,
+                         geometry=geometry)
+
+        assert os.path.exists(str(tmpdir.join(
+            'ding0_grid_{}_test.png'.format(mv_grid.id_db))))
+        assert plt.get_fignums() == []
@@ -0,0 +1,136 @@
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.tools.profiling import ProfilerDing0, count_pf_calls, \
+    count_grid_objects, write_metrics, read_metrics, aggregate_metrics, \
+    metrics_per_mv_grid_district
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+def synthetic_network(monkeypatch):
+    """
+    Network whose import steps of :meth:`NetworkDing0.run_ding0` build
+    synthetic MV grid districts instead of importing them from database
+    """
+    nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+    monkeypatch.setattr(
+        nd, 'import_mv_grid_districts',
+        lambda session, mv_grid_districts_no=None:
+        build_synthetic_mv_grid_districts(nd, mv_grid_districts_no, 3,
+                                          seed=1))
+    monkeypatch.setattr(nd, 'import_generators',
+                        lambda session, debug=False: None)
+    return nd
+
+
+def metrics_record(mv_grid_districts, wall_time):
+    steps = [{'step': no, 'name': name, 'wall_time': wall_time,
+              'cpu_time': wall_time, 'peak_rss': 100. * no,
+              'nodes': 10 * len(mv_grid_districts),
+              'branches': 9 * len(mv_grid_districts),
+              'pf_calls': len(mv_grid_districts) * (no - 1),
+              'mv_grid_districts': {
+                  str(_): {'nodes': 10, 'branches': 9, 'pf_calls': no - 1}
+                  for _ in mv_grid_districts}}
+             for no, name in [(1, 'import_mv_grid_districts'),
+                              (2, 'run_powerflow')]]
+    return {'network': 'network', 'mv_grid_districts': mv_grid_districts,
+            'wall_time': 2 * wall_time, 'cpu_time': 2 * wall_time,
+            'peak_rss': 200., 'steps': steps}
+
+
+class TestMetrics(object):
+
+    @pytest.fixture
+    def records(self, tmpdir):
+        path = str(tmpdir.join('metrics.jsonl'))
+        write_metrics([metrics_record([1], 1.)], path)
+        write_metrics([metrics_record([2, 3], 2.)], path)
+        return read_metrics(path)
+
+    def test_aggregate_metrics(self, records):
+        metrics = aggregate_metrics(records)
+        assert len(records) == 2
+        assert metrics.loc[(2, 'run_powerflow'), 'runs'] == 2
+        assert metrics.loc[(2, 'run_powerflow'), 'wall_time'] == \
+            pytest.approx(3.)
+        assert metrics.loc[(2, 'run_powerflow'), 'peak_rss'] == \
+            pytest.approx(200.)
+        assert metrics.loc[(2, 'run_powerflow'), 'nodes'] == 30
+        assert metrics.loc[(2, 'run_powerflow'), 'pf_calls'] == 3
+
+    def test_metrics_per_mv_grid_district(self, records):
+        metrics = metrics_per_mv_grid_district(records)
+        assert len(metrics) == 6
+        assert metrics.loc[(1, 1, 'import_mv_grid_districts'),
+                           'wall_time'] == pytest.approx(1.)
+        # times of runs of several MV grid districts cannot be split
+        assert metrics['wall_time'].isnull().sum() == 4
+        assert metrics.loc[(3, 2, 'run_powerflow'), 'pf_calls'] == 1
+
+
+class TestProfiler(object):
+
+    def test_step(self, monkeypatch):
+        nd = synthetic_network(monkeypatch)
+        nd.import_mv_grid_districts(None, mv_grid_districts_no=[1, 2])
+        mv_grid_district_1, mv_grid_district_2 = nd.mv_grid_districts()
+
+        profiler = ProfilerDing0(nd)
+        with profiler.step(1, 'powerflow'):
+            count_pf_calls(mv_grid_district_1.mv_grid,
+                           mv_grid_district_2.mv_grid)
+            count_pf_calls(mv_grid_district_2.mv_grid)
+        with profiler.step(2, 'no_powerflow'):
+            pass
+
+        step_1, step_2 = profiler.steps
+        assert (step_1['step'], step_1['name']) == (1, 'powerflow')
+        assert step_1['pf_calls'] == 3
+        assert step_1['mv_grid_districts'][1]['pf_calls'] == 1
+        assert step_1['mv_grid_districts'][2]['pf_calls'] == 2
+        assert step_2['pf_calls'] == 0
+        assert step_1['mv_grid_districts'][2]['nodes'] == \
+            count_grid_objects(mv_grid_district_2)[0]
+        assert step_1['nodes'] == sum(
+            count_grid_objects(_)[0] for _ in nd.mv_grid_districts())
+
+        # disabled profiler records nothing
+        profiler = ProfilerDing0(nd, enabled=False)
+        with profiler.step(1, 'powerflow'):
+            count_pf_calls(mv_grid_district_1.mv_grid)
+        assert profiler.steps == []
+
+    def test_run_ding0(self, monkeypatch):
+        nd = synthetic_network(monkeypatch)
+        nd.run_ding0(None, mv_grid_districts_no=[1, 2], profile=True)
+        record = nd.metrics
+        steps = record['steps']
+
+        assert record['mv_grid_districts'] == [1, 2]
+        assert [(_['step'], _['name']) for _ in steps] == [
+            (1, 'import_mv_grid_districts'), (2, 'import_generators'),
+            (3, 'mv_parametrize_grid'), (4, 'validate_grid_districts'),
+            (5, 'build_lv_grids'), (6, 'mv_routing'),
+            (7, 'connect_generators'), (8, 'set_branch_ids'),
+            (9, 'set_circuit_breakers'), (10, 'open_circuit_breakers'),
+            (11, 'run_powerflow'), (12, 'reinforce_grid'),
+            (13, 'close_circuit_breakers')]
+        assert record['wall_time'] == \
+            pytest.approx(sum(_['wall_time'] for _ in steps))
+
+        # object counts after step
+        assert steps[0]['nodes'] > 0
+        assert steps[4]['branches'] > steps[3]['branches']
+        for mv_grid_district in nd.mv_grid_districts():
+            nodes, branches = count_grid_objects(mv_grid_district)
+            metrics = steps[-1]['mv_grid_districts'][mv_grid_district.id_db]
+            assert (metrics['nodes'], metrics['branches']) == \
+                (nodes, branches)
+
+        # one power flow per MV grid in step 11, none before
+        assert [_['pf_calls'] for _ in steps[:10]] == [0] * 10
+        assert steps[10]['pf_calls'] == 2
+        assert [_['pf_calls']
+                for _ in steps[10]['mv_grid_districts'].values()] == [1, 1]
+
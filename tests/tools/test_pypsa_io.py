@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.tools.pypsa_io import run_powerflow_timeseries
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+def network():
+    """
+    Routed synthetic network of three MV grid districts with closed circuit
+    breakers
+    """
+    nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+    build_synthetic_mv_grid_districts(nd, [1, 2, 3], [3, 4, 5], seed=1)
+    nd.mv_parametrize_grid()
+    nd.validate_grid_districts()
+    nd.build_lv_grids()
+    nd.mv_routing()
+    nd.connect_generators()
+    nd.set_branch_ids()
+    nd.set_circuit_breakers()
+    nd.control_circuit_breakers(mode='close')
+    return nd
+
+
+def pf_results(nd):
+    """Returns voltages at nodes and apparent power on branches of MV grids"""
+    results = {}
+    for mv_grid_district in nd.mv_grid_districts():
+        mv_grid = mv_grid_district.mv_grid
+        for node in mv_grid._graph.nodes():
+            if getattr(node, 'voltage_res', None) is not None:
+                results[(repr(mv_grid), repr(node))] = node.voltage_res
+        for node_one, node_two, branch in \
+                mv_grid._graph.edges(data='branch'):
+            if getattr(branch, 's_res', None) is not None:
+                results[(repr(mv_grid), repr(node_one), repr(node_two))] = \
+                    branch.s_res
+    return results
+
+
+class TestPowerflowBatch(object):
+
+    @pytest.fixture(scope='class')
+    def reference(self):
+        """Results of one power flow per MV grid"""
+        nd = network()
+        for mv_grid_district in nd.mv_grid_districts():
+            mv_grid_district.mv_grid.run_powerflow(None, method='onthefly')
+        return pf_results(nd)
+
+    @pytest.mark.parametrize('batch_size', [1, 3])
+    def test_batch(self, reference, batch_size):
+        nd = network()
+        nd.run_powerflow(None, method='onthefly', batch_size=batch_size)
+        results = pf_results(nd)
+
+        assert len(reference) > 0
+        assert sorted(results) == sorted(reference)
+        for key, value in reference.items():
+            assert list(results[key]) == pytest.approx(list(value),
+                                                       rel=1e-6, abs=1e-9)
+
+
+class TestPowerflowTimeseries(object):
+
+    def test_chunks(self):
+        nd = network()
+        mv_grid = nd._mv_grid_districts[0].mv_grid
+        timerange = pd.date_range('2011-01-01', periods=10, freq='h')
+        load_profile = pd.Series(np.linspace(0.2, 1., 10), index=timerange)
+        generation_profile = pd.Series(np.linspace(1., 0., 10),
+                                       index=timerange)
+
+        results = {}
+        for chunk_size in [10, 3]:
+            components, components_data = mv_grid.export_to_pypsa(
+                None, 'onthefly')
+            results[chunk_size] = run_powerflow_timeseries(
+                components, components_data, mv_grid, timerange,
+                load_profile=load_profile,
+                generation_profile=generation_profile,
+                chunk_size=chunk_size)
+        single, chunked = results[10], results[3]
+
+        assert chunked.bus_ids == single.bus_ids
+        assert chunked.line_ids == single.line_ids
+        assert chunked.grid_id == mv_grid.id_db
+        assert not np.isnan(single.v_mag_pu).any()
+        assert not np.isnan(single.s_res).any()
+        # chunks after the first one reuse the network (skip_pre=True)
+        np.testing.assert_allclose(chunked.v_mag_pu, single.v_mag_pu,
+                                   rtol=1e-8)
+        np.testing.assert_allclose(chunked.s_res, single.s_res,
+                                   rtol=1e-8, atol=1e-10)
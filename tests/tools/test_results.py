@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import re
+import types
+
+import pandas as pd
+import pytest
+from sqlalchemy import Boolean, Column, Float, Integer, String, \
+    create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+from ding0.core import NetworkDing0
+from ding0.tools import results
+from ding0.tools.results import OEDB_EXPORT_TABLES, _copy_value, \
+    export_data_to_oedb, export_network, write_table_bulk
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+# digests of tables returned by export_network() before tables were collected
+# per grid as columns, see table_digest()
+EXPORT_NETWORK_DIGESTS = os.path.join(os.path.dirname(os.path.dirname(
+    __file__)), 'data', 'export_network.json')
+
+# tables returned by export_network() (after run_id)
+EXPORTED_TABLES = ['lv_grid', 'lv_gen', 'lv_cd', 'mvlv_stations',
+                   'mvlv_trafos', 'lv_loads', 'mv_grid', 'mv_gen', 'mv_cd',
+                   'hvmv_stations', 'hvmv_trafos', 'mv_loads', 'lines',
+                   'mvlv_mapping']
+
+# attributes of string columns of ding0's tables of the OEDB
+STRING_ATTRIBUTES = ['run_id', 'edge_name', 'grid_id_db', 'node1', 'node2',
+                     'type_kind', 'type_name', 'id_db', 'lv_grid_id_db',
+                     'mv_grid_id_db', 'geom', 'type', 'subtype']
+
+
+def _canonical(value):
+    """
+    Returns `value` of an exported table as comparable value: numbers are
+    rounded, nulls are None and coordinates of WKT geometries are rounded
+    """
+    if isinstance(value, str):
+        return re.sub(r'-?\d+\.\d+',
+                      lambda number: '{:.6f}'.format(float(number.group())),
+                      value)
+    if value is None or value != value:
+        return None
+    if isinstance(value, bool):
+        return value
+    return round(float(value), 6) + 0.
+
+
+def table_digest(table):
+    """
+    Returns digest of an exported table: count of rows and hashes of index
+    and columns (in order of columns)
+    """
+    def _hash(values):
+        return hashlib.md5(repr([_canonical(value) for value in values]
+                                ).encode()).hexdigest()
+
+    return {'rows': len(table),
+            'index': _hash(table.index.tolist()),
+            'columns': [[column, _hash(table[column].tolist())]
+                        for column in table.columns]}
+
+
+def export_network_digests(nd, mode):
+    """Returns digests of tables returned by export_network() by name"""
+    run_id, *tables = export_network(nd, mode=mode)
+    assert run_id == nd.metadata['run_id']
+    return {name: table_digest(table)
+            for name, table in zip(EXPORTED_TABLES, tables)}
+
+
+def export_network_network():
+    """
+    Synthetic network of two MV grid districts with an aggregated load area
+    each
+    """
+    nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+    build_synthetic_mv_grid_districts(nd, [1, 2], [2, 3], seed=1)
+    for mv_grid_district in nd.mv_grid_districts():
+        list(mv_grid_district.lv_load_areas())[0].peak_load = 60000.
+    nd.mv_parametrize_grid()
+    nd.validate_grid_districts()
+    nd.build_lv_grids()
+    nd.mv_routing()
+    nd.connect_generators()
+    nd.set_branch_ids()
+    nd.set_circuit_breakers()
+    return nd
+
+
+def model_draft():
+    """
+    Stand-in of egoio's model_draft with an ORM class per table type of
+    `OEDB_EXPORT_TABLES`
+
+    Geometries are stored as EWKT, column names differ from attributes
+    (which are the keys of columns) as in egoio for some columns.
+    """
+    base = declarative_base()
+    models = {}
+    for tabletype, (model_name, attributes) in OEDB_EXPORT_TABLES.items():
+        columns = {'__tablename__': tabletype,
+                   'id': Column(Integer, primary_key=True)}
+        for attribute, _ in attributes:
+            if attribute in STRING_ATTRIBUTES:
+                column_type = String
+            elif attribute == 'is_aggregated':
+                column_type = Boolean
+            else:
+                column_type = Float
+            columns[attribute] = Column(attribute.lower(), column_type)
+        models[model_name] = type(model_name, (base,), columns)
+    return base, types.SimpleNamespace(**models)
+
+
+class TestExportNetwork(object):
+
+    @pytest.fixture(scope='class')
+    def network(self):
+        return export_network_network()
+
+    @pytest.mark.parametrize('mode', ['', 'MV', 'LV'])
+    def test_export_network(self, network, mode):
+        with open(EXPORT_NETWORK_DIGESTS) as file:
+            expected = json.load(file)[mode]
+        digests = export_network_digests(network, mode)
+
+        for name in EXPORTED_TABLES:
+            assert digests[name] == expected[name], name
+
+    def test_export_network_per_district(self):
+        nd = export_network_network()
+        nd.control_circuit_breakers(mode='open')
+        mv_grid_district_1, mv_grid_district_2 = nd.mv_grid_districts()
+
+        tables = dict(zip(EXPORTED_TABLES, export_network(
+            nd, mv_grid_districts=[mv_grid_district_1])[1:]))
+
+        # only circuit breakers of exported MV grid district are closed
+        circuit_breakers_1 = list(
+            mv_grid_district_1.mv_grid.circuit_breakers())
+        circuit_breakers_2 = list(
+            mv_grid_district_2.mv_grid.circuit_breakers())
+        assert circuit_breakers_1 and circuit_breakers_2
+        assert all(_.status == 'closed' for _ in circuit_breakers_1)
+        assert all(_.status == 'open' for _ in circuit_breakers_2)
+        assert tables['mv_grid']['MV_grid_id'].tolist() == \
+            [mv_grid_district_1.mv_grid.id_db]
+
+
+class TestExportToOEDB(object):
+
+    @pytest.fixture
+    def session(self, monkeypatch):
+        """
+        Session of an SQLite database with ding0's tables of the OEDB
+        """
+        base, md = model_draft()
+        monkeypatch.setattr(results, 'md', md)
+        engine = create_engine('sqlite://')
+        base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def tables(self):
+        """
+        Tables exported from a synthetic network with aggregated load areas
+        """
+        return dict(zip(EXPORTED_TABLES,
+                        export_network(export_network_network())[1:]))
+
+    def test_export_data_to_oedb(self, session, tables):
+        export_data_to_oedb(session, 4326, *tables.values(), batch_size=7)
+
+        for tabletype, (model_name, attributes) in OEDB_EXPORT_TABLES.items():
+            table = tables[tabletype]
+            written = pd.read_sql_table(tabletype, session.get_bind())
+            assert len(written) == len(table) > 0, tabletype
+            assert written['id'].tolist() == list(range(1, len(table) + 1))
+
+            for attribute, column in attributes:
+                values = written[attribute.lower()]
+                if column not in table.columns:
+                    assert values.isnull().all()
+                    continue
+                expected = table[column].reset_index(drop=True)
+                # nulls (None and NaN) are written as NULL
+                assert values.isnull().tolist() == \
+                    expected.isnull().tolist(), (tabletype, attribute)
+                if attribute == 'geom':
+                    expected = 'SRID=4326;' + expected[expected.notnull()]
+                    assert values[values.notnull()].tolist() == \
+                        expected.tolist()
+                elif attribute in STRING_ATTRIBUTES:
+                    valid = expected.notnull()
+                    assert values[valid].tolist() == \
+                        expected[valid].astype(str).tolist()
+                elif attribute != 'is_aggregated':
+                    pd.testing.assert_series_equal(
+                        values.astype(float), expected.astype(float),
+                        check_names=False)
+
+        mv_loads = pd.read_sql_table('mv_loads', session.get_bind())
+        assert mv_loads['is_aggregated'].all()
+        # consumption of sectors without load is missing
+        assert mv_loads.filter(like='consumption').isnull().values.any()
+
+    def test_nulls_and_geometries(self, session):
+        table = pd.DataFrame({
+            'id_db': ['gen_1', 'gen_2', None],
+            'MV_grid_id_db': ['mv_grid_1'] * 3,
+            'geom': ['POINT (10 51)', '', None],
+            'type': ['solar', 'wind', 'solar'],
+            'v_level': [4, 5, 4],
+            'nominal_capacity': [10.5, float('nan'), 3.],
+            'is_aggregated': [False, True, False],
+            'run_id': ['1', '1', '1']})
+
+        count = results.export_network_to_oedb(session, table, 'mv_gen', 3035,
+                                               batch_size=2)
+
+        assert count == 3
+        written = pd.read_sql_table('mv_gen', session.get_bind())
+        # empty geometries are written as NULL
+        assert written['geom'].iloc[0] == 'SRID=3035;POINT (10 51)'
+        assert written['geom'].isnull().tolist() == [False, True, True]
+        assert written['id_db'].isnull().tolist() == [False, False, True]
+        assert written['nominal_capacity'].isnull().tolist() == \
+            [False, True, False]
+        assert written['is_aggregated'].tolist() == [False, True, False]
+        # subtype is not exported
+        assert written['subtype'].isnull().all()
+
+    def test_copy(self):
+        class Cursor(object):
+            def copy_expert(self, sql, buffer):
+                self.sql = sql
+                self.data = buffer.read()
+
+            def close(self):
+                pass
+
+        cursor = Cursor()
+        session = types.SimpleNamespace(
+            get_bind=lambda: types.SimpleNamespace(
+                dialect=postgresql.dialect()),
+            connection=lambda: types.SimpleNamespace(
+                connection=types.SimpleNamespace(cursor=lambda: cursor)))
+        _, md = model_draft()
+        db_table = md.EgoGridDing0HvmvTransformer.__table__
+
+        count = write_table_bulk(
+            session, db_table,
+            {'id_db': ['trafo\t1', None], 'x': [0.1, None],
+             's_nom': [40000., 63000.]},
+            method='copy')
+
+        assert count == 2
+        assert cursor.sql == 'COPY hvmv_trafos (id_db, x, s_nom) FROM STDIN'
+        assert cursor.data == 'trafo\\t1\t0.1\t40000.0\n\\N\t\\N\t63000.0\n'
+
+        with pytest.raises(ValueError):
+            write_table_bulk(session, db_table, {'x': [1.]}, method='bulk')
+
+    @pytest.mark.parametrize('value, expected', [
+        (None, '\\N'),
+        ('', ''),
+        ('lv_grid_1', 'lv_grid_1'),
+        ('a\tb', 'a\\tb'),
+        ('a\nb\r', 'a\\nb\\r'),
+        ('C:\\ding0', 'C:\\\\ding0'),
+        ('\\N', '\\\\N'),
+        (1, '1'),
+        (0.4, '0.4'),
+        (True, 'True')])
+    def test_copy_value(self, value, expected):
+        assert _copy_value(value) == expected
+        # fields are separated by tabs, rows by newlines
+        assert '\t' not in _copy_value(value)
+        assert '\n' not in _copy_value(value)
@@ -0,0 +1,102 @@
+import os
+import time
+
+import pytest
+
+from ding0.tools.scheduler import read_results, run_tasks
+
+
+def task_function(task):
+    """Runs a task of kind 'sleep', 'raise', 'exit' or 'flaky'"""
+    kind, value = task
+    if kind == 'sleep':
+        time.sleep(value)
+        return os.getpid()
+    if kind == 'raise':
+        raise RuntimeError('task {} failed'.format(value))
+    if kind == 'exit':
+        os._exit(value)
+    if kind == 'flaky':
+        # fails at first attempt only (after a short while), the pid of the
+        # first attempt is written to file `value`
+        if not os.path.exists(value):
+            with open(value, 'w') as f:
+                f.write(str(os.getpid()))
+            time.sleep(0.2)
+            raise RuntimeError('first attempt')
+        return os.getpid()
+
+
+class TestRunTasks(object):
+
+    def test_failures(self, tmpdir):
+        results_file = str(tmpdir.join('results.pkl'))
+        tasks = [('sleep', 0.), ('raise', 1), ('sleep', 30.), ('exit', 3),
+                 ('flaky', str(tmpdir.join('flaky'))), ('sleep', 0.01)]
+
+        records = run_tasks(task_function, tasks, processes=2, timeout=2.,
+                            retries=1, results_file=results_file)
+
+        assert [record['task'] for record in records] == tasks
+        assert [record['status'] for record in records] == \
+            ['ok', 'error', 'timeout', 'crashed', 'ok', 'ok']
+        assert [record['attempts'] for record in records] == \
+            [1, 2, 2, 2, 2, 1]
+        assert 'RuntimeError: task 1 failed' in records[1]['error']
+        assert records[2]['error'] == 'Task exceeded timeout of 2.0 s.'
+        assert records[3]['error'] == 'Worker exited with code 3.'
+        assert [record['result'] is None for record in records] == \
+            [False, True, True, True, False, False]
+        assert records[2]['duration'] == pytest.approx(2., abs=1.)
+
+        # all records are streamed in order of completion
+        streamed = read_results(results_file)
+        assert len(streamed) == len(tasks)
+        assert sorted(streamed, key=lambda record: tasks.index(
+            record['task'])) == records
+
+    def test_retry_in_fresh_worker(self, tmpdir):
+        flaky = str(tmpdir.join('flaky'))
+        # other tasks are finished before the flaky task fails, hence a
+        # worker that ran them is idle when the retry is dispatched
+        tasks = [('sleep', 0.), ('sleep', 0.), ('flaky', flaky),
+                 ('sleep', 0.)]
+
+        records = run_tasks(task_function, tasks, processes=2, retries=1)
+
+        assert [record['status'] for record in records] == ['ok'] * 4
+        assert records[2]['attempts'] == 2
+        with open(flaky) as f:
+            pids = [int(f.read())]
+        pids += [record['result'] for task_no, record in enumerate(records)
+                 if task_no != 2]
+        # retry ran in a worker that has not run any task before
+        assert records[2]['result'] not in pids
+
+    def test_max_tasks_per_worker(self, tmpdir):
+        results_file = str(tmpdir.join('results.pkl'))
+        tasks = [('sleep', 0.01 * task_no) for task_no in range(6)]
+
+        records = run_tasks(task_function, tasks, processes=2,
+                            weights=[1, 2, 3, 4, 5, 6],
+                            max_tasks_per_worker=1,
+                            results_file=results_file)
+
+        assert all(record['status'] == 'ok' for record in records)
+        assert all(record['attempts'] == 1 for record in records)
+        # each task ran in a fresh worker
+        pids = [record['result'] for record in records]
+        assert len(set(pids)) == len(tasks)
+        assert os.getpid() not in pids
+        assert len(read_results(results_file)) == len(tasks)
+
+    def test_weights(self, tmpdir):
+        results_file = str(tmpdir.join('results.pkl'))
+        tasks = [('sleep', 0.001 * task_no) for task_no in range(5)]
+
+        run_tasks(task_function, tasks, processes=1,
+                  weights=[0, 5, 2, 4, 3], results_file=results_file)
+
+        # single worker: tasks finish in descending order of weight
+        assert [record['task'] for record in read_results(results_file)] == \
+            [tasks[1], tasks[3], tasks[4], tasks[2], tasks[0]]
@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.tools.results import save_nd_to_pickle
+from ding0.tools.stats import aggregate_stats, read_stats, run_stats, \
+    stats_mv_grid_districts, write_district_stats
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+def pickle_synthetic_network(path, mv_grid_district_no):
+    """Pickles a synthetic network of one MV grid district as done by
+    :func:`~.ding0.tools.stats.process_stats_district`"""
+    nd = NetworkDing0(name='synthetic', run_id='test', orm={})
+    build_synthetic_mv_grid_districts(nd, [mv_grid_district_no], [3],
+                                      seed=1)
+    nd.mv_parametrize_grid()
+    nd.validate_grid_districts()
+    nd.build_lv_grids()
+    nd.mv_routing()
+    nd.connect_generators()
+    nd.set_branch_ids()
+    nd.set_circuit_breakers()
+    nd.control_circuit_breakers(mode='open')
+    nd.run_powerflow(None, method='onthefly')
+    nd.reinforce_grid()
+    nd.control_circuit_breakers(mode='close')
+    save_nd_to_pickle(nd, path=path, filename='ding0_grids__{}.pkl'.format(
+        mv_grid_district_no))
+
+
+class TestStats(object):
+
+    @pytest.fixture
+    def path(self, tmpdir):
+        """
+        Stats of two MV grid districts with different columns
+        """
+        path = str(tmpdir.join('stats'))
+        write_district_stats(path, 4, {
+            'mv_stats': pd.DataFrame({'b': [2.], 'a': [1.]}, index=[4]),
+            'lv_stats': pd.DataFrame({'a': [5., 6.]}, index=[41, 40])})
+        write_district_stats(path, 3, {
+            'mv_stats': pd.DataFrame({'c': [3.]}, index=[3])})
+        return path
+
+    def test_read_aggregate(self, tmpdir, path):
+        assert stats_mv_grid_districts(path) == [3, 4]
+
+        data = read_stats(path)
+        assert data['mv_stats'].index.tolist() == [3, 4]
+        assert data['mv_stats'].columns.tolist() == ['a', 'b', 'c']
+        assert data['mv_stats'].loc[3].tolist() == [0., 0., 3.]
+        assert data['lv_stats'].index.tolist() == [40, 41]
+        assert data['mv_crit_nodes'].empty
+
+        filename = str(tmpdir.join('ding0_grids__3_to_4'))
+        counts = aggregate_stats(path, filename)
+        assert counts == {'mv_stats': 2, 'lv_stats': 2}
+        mv_stats = pd.read_csv(filename + '_mv_stats.csv', index_col=0)
+        pd.testing.assert_frame_equal(mv_stats, data['mv_stats'],
+                                      check_index_type=False)
+
+        with pytest.raises(ValueError):
+            read_stats(path, tables=['mv_grid'])
+
+    def test_resume(self, tmpdir, path):
+        # districts with stats are skipped, pickle of district 5 is missing
+        records = run_stats([3, 4, 5], path, n_of_processes=1,
+                            pickle_path=str(tmpdir), timeout=60)
+        assert [record['task'] for record in records] == [5]
+        assert records[0]['status'] == 'error'
+        assert stats_mv_grid_districts(path) == [3, 4]
+
+    def test_resume_mode(self, tmpdir, path):
+        pickle_synthetic_network(str(tmpdir), 5)
+
+        records = run_stats([3, 4, 5], path, n_of_processes=1, mode='MV',
+                            pickle_path=str(tmpdir), timeout=600)
+        assert [(record['task'], record['status']) for record in records] \
+            == [(5, 'ok')]
+        assert records[0]['result']['mv_stats'] == 1
+        assert 'lv_stats' not in records[0]['result']
+        assert stats_mv_grid_districts(path) == [3, 4, 5]
+        assert 5 in read_stats(path, tables=['mv_stats'])['mv_stats'].index
+
+        # MV and LV stats are requested: districts 3 and 5 lack LV stats
+        records = run_stats([3, 4, 5], path, n_of_processes=1,
+                            pickle_path=str(tmpdir), timeout=600)
+        assert [(record['task'], record['status']) for record in records] \
+            == [(3, 'error'), (5, 'ok')]
+        assert stats_mv_grid_districts(
+            path, tables=['mv_stats', 'lv_stats']) == [4, 5]
+        assert records[1]['result']['lv_stats'] > 0
+        lv_stats = read_stats(path, tables=['lv_stats'],
+                              mv_grid_districts_no=[5])['lv_stats']
+        assert len(lv_stats) == records[1]['result']['lv_stats']
+
+        # critical nodes and branches are requested additionally
+        records = run_stats([5], path, n_of_processes=1, critical=True,
+                            pickle_path=str(tmpdir), timeout=600)
+        assert [(record['task'], record['status']) for record in records] \
+            == [(5, 'ok')]
+        assert set(records[0]['result']) == {
+            'mv_stats', 'lv_stats', 'mv_crit_nodes', 'mv_crit_edges',
+            'lv_crit_nodes', 'lv_crit_edges'}
+
+        # stats of all tables cover requests of fewer tables
+        assert run_stats([4, 5], path, n_of_processes=1, mode='MV',
+                         pickle_path=str(tmpdir)) == []
+
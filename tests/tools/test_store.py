@@ -0,0 +1,77 @@
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.tools.diff import diff_networks
+from ding0.tools.store import GridStoreDing0, district_topology, \
+    merge_grid_stores, save_nd_to_store
+from ding0.tools.synthetic import build_synthetic_mv_grid_districts
+
+
+class TestStore(object):
+
+    @pytest.fixture
+    def network(self):
+        nd = NetworkDing0(name='synthetic', run_id='test')
+        build_synthetic_mv_grid_districts(nd, [1, 2, 3], [3, 4, 5], seed=1)
+        nd.build_lv_grids()
+        return nd
+
+    def test_save_load(self, tmpdir, network):
+        filename = str(tmpdir.join('grids.store'))
+        save_nd_to_store(network, filename)
+        store = GridStoreDing0(filename)
+
+        assert store.mv_grid_districts_no == [1, 2, 3]
+        assert 4 not in store
+
+        mv_grid_district = store.mv_grid_district(2)
+        original = list(network.mv_grid_districts())[1]
+        assert list(store.network.mv_grid_districts()) == [mv_grid_district]
+        assert mv_grid_district.mv_grid.network is store.network
+        assert store.mv_grid_district(2) is mv_grid_district
+        assert [repr(_) for _ in mv_grid_district.lv_load_areas()] == \
+            [repr(_) for _ in original.lv_load_areas()]
+
+        topology = district_topology(original)
+        assert store.topology(2)['nodes'].tolist() == \
+            topology['nodes'].tolist()
+        assert district_topology(mv_grid_district)['branches'].tolist() == \
+            topology['branches'].tolist()
+        assert len(topology['branches']) > 0
+
+        with pytest.raises(KeyError):
+            store.mv_grid_district(4)
+
+    def test_save_load_model_draft(self, tmpdir):
+        # version conditions of model_draft mode are plain bools
+        orm = {'version_condition_{}'.format(_): 1 == 1
+               for _ in ['mvgd', 'mv_stations', 'la', 'lvgd', 'mvlvst', 're',
+                         'conv']}
+        nd = NetworkDing0(name='synthetic', run_id='test', orm=orm)
+        build_synthetic_mv_grid_districts(nd, [1, 2], [3, 4], seed=1)
+        nd.build_lv_grids()
+        filename = str(tmpdir.join('grids.store'))
+        save_nd_to_store(nd, filename)
+
+        loaded = GridStoreDing0(filename).load_network()
+        assert diff_networks(nd, loaded).empty
+        lv_load_area = list(list(loaded.mv_grid_districts())[0]
+                            .lv_load_areas())[0]
+        assert type(lv_load_area.is_aggregated) is bool
+
+    def test_merge(self, tmpdir, network):
+        mv_grid_districts = list(network.mv_grid_districts())
+        filenames = [str(tmpdir.join('grids_{}.store'.format(k)))
+                     for k in range(2)]
+        save_nd_to_store(network, filenames[0], mv_grid_districts[2:])
+        save_nd_to_store(network, filenames[1], mv_grid_districts[:2])
+
+        filename = str(tmpdir.join('grids.store'))
+        merge_grid_stores(filenames, filename)
+        nd = GridStoreDing0(filename).load_network()
+        assert sorted(_.id_db for _ in nd.mv_grid_districts()) == [1, 2, 3]
+
+        with pytest.raises(ValueError):
+            merge_grid_stores([filename, filenames[0]],
+                              str(tmpdir.join('twice.store')))
+        assert tmpdir.join('twice.store').check() is False
@@ -0,0 +1,62 @@
+import pytest
+
+from ding0.core import NetworkDing0
+from ding0.tools.synthetic import synthetic_mv_grid_district_data, \
+    build_synthetic_mv_grid_districts
+
+
+class TestSynthetic(object):
+
+    @pytest.fixture
+    def data(self):
+        return synthetic_mv_grid_district_data(1, 20, seed=1)
+
+    def test_synthetic_mv_grid_district_data(self, data):
+        lv_load_areas = data['lv_load_areas']
+        lv_grid_districts = data['lv_grid_districts']
+
+        assert len(lv_load_areas) == 20
+        assert lv_grid_districts.index.is_unique
+        assert set(data['lv_stations'].index) == set(lv_grid_districts.index)
+        # load areas hold the sums of their LV grid districts
+        assert lv_grid_districts.groupby('la_id')['peak_load'].sum(). \
+            sort_index().values == \
+            pytest.approx(lv_load_areas['peak_load'].sort_index().values)
+        # load areas lie within MV grid district, station does not
+        assert all(data['geo_data'].contains(geom)
+                   for geom in lv_load_areas['geo_centre'])
+        assert not any(geom.contains(data['station_geo_data'])
+                       for geom in lv_load_areas['geo_area'])
+        # sector loads require sector counts (see build_grid)
+        assert ((lv_grid_districts['peak_load_retail'] > 0) ==
+                (lv_grid_districts['sector_count_retail'] > 0)).all()
+
+    def test_synthetic_data_reproducible(self, data):
+        data_2 = synthetic_mv_grid_district_data(1, 20, seed=1)
+        assert data_2['re_generators']['electrical_capacity'].equals(
+            data['re_generators']['electrical_capacity'])
+        assert data_2['lv_grid_districts']['population'].equals(
+            data['lv_grid_districts']['population'])
+
+    def test_build_synthetic_mv_grid_districts(self):
+        nd = NetworkDing0(name='synthetic')
+        mv_grid_districts = build_synthetic_mv_grid_districts(
+            nd, [1, 2], [5, 10], seed=1)
+
+        assert [_.id_db for _ in nd.mv_grid_districts()] == [1, 2]
+        assert [len(list(_.lv_load_areas())) for _ in mv_grid_districts] == \
+            [5, 10]
+        # MV grid districts do not overlap
+        assert not mv_grid_districts[0].geo_data.intersects(
+            mv_grid_districts[1].geo_data)
+
+        data = synthetic_mv_grid_district_data(2, 10, seed=2)
+        lv_grid_districts = [lv_grid_district
+                             for lv_load_area in
+                             mv_grid_districts[1].lv_load_areas()
+                             for lv_grid_district in
+                             lv_load_area.lv_grid_districts()]
+        assert len(lv_grid_districts) == len(data['lv_grid_districts'])
+        assert sum(len(list(_.lv_grid.generators()))
+                   for _ in lv_grid_districts) == \
+            (data['re_generators']['voltage_level'] >= 6).sum()